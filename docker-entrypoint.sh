@@ -48,8 +48,13 @@ case "${FLASK_DEBUG,,}" in
   *)
     : "${GUNICORN_BIND:=0.0.0.0:5000}"
     : "${GUNICORN_WORKERS:=2}"
+    # Each open /import/queue-events stream holds one thread; see
+    # IMPORT_EVENT_STREAM_MAX_CLIENTS before lowering this.
     : "${GUNICORN_THREADS:=4}"
     : "${GUNICORN_TIMEOUT:=120}"
+    # /metrics scrapes land on any worker; shared counters keep them consistent.
+    : "${PROVIDER_TELEMETRY_DIR:=${DATA_DIR:-/data}/telemetry}"
+    export PROVIDER_TELEMETRY_DIR
     echo "Starting Gunicorn application server..."
     exec gunicorn \
       --bind "$GUNICORN_BIND" \
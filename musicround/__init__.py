@@ -404,6 +404,15 @@ def create_app(config=None):
     # Initialize extensions with app
     db.init_app(app)
     csrf.init_app(app)
+
+    from musicround.helpers.query_profiler import init_query_profiler
+    init_query_profiler(app)
+    from musicround.helpers.runtime_profiler import init_runtime_profiler
+    init_runtime_profiler(app)
+
+    if app.config.get('PROVIDER_TELEMETRY_ENABLED', True):
+        from musicround.helpers.provider_telemetry import install_requests_telemetry
+        install_requests_telemetry(app.config)
     
     # Register custom Jinja filters
     @app.template_filter('timestamp_to_datetime')
@@ -534,7 +543,7 @@ def create_app(config=None):
             
     # Initialize Deezer client - import inside the function to avoid circular dependency
     from musicround.deezer_client import DeezerClient
-    app.config['deezer'] = DeezerClient()
+    app.config['deezer'] = DeezerClient(app.config.get('DEEZER_API_BASE_URL'))
     
     # Register blueprints
     from musicround.routes.core import core_bp
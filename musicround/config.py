@@ -73,6 +73,10 @@ class Config:
     DROPBOX_APP_KEY = os.getenv("DROPBOX_APP_KEY", "")
     DROPBOX_APP_SECRET = os.getenv("DROPBOX_APP_SECRET", "")
     DROPBOX_REDIRECT_URI = os.getenv("DROPBOX_REDIRECT_URI", "http://localhost:5000/users/dropbox/callback")
+    # Round exports: files larger than one chunk go through an upload session in
+    # chunks of this size (a multiple of 4 MiB), and this many files upload at once.
+    DROPBOX_UPLOAD_CHUNK_MB = _int_from_env("DROPBOX_UPLOAD_CHUNK_MB", 8)
+    DROPBOX_UPLOAD_CONCURRENCY = _int_from_env("DROPBOX_UPLOAD_CONCURRENCY", 3)
     
     MAIL_HOST = os.getenv("MAIL_HOST", "localhost")
     try:
@@ -85,16 +89,62 @@ class Config:
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD", "")
     MAIL_SENDER = os.getenv("MAIL_SENDER", "quizzical-beats@example.com")
     MAIL_RECIPIENT = os.getenv("MAIL_RECIPIENT", "admin@example.com")
+    # Scheduled round emails: due exports are sent on this many worker
+    # threads, which share the same number of pooled SMTP connections.
+    SCHEDULED_EMAIL_WORKERS = _int_from_env("SCHEDULED_EMAIL_WORKERS", 4)
+    # An export still processing this long after it was claimed is claimed
+    # again; keep it well above the time one delivery can take.
+    SCHEDULED_EMAIL_CLAIM_TIMEOUT_SECONDS = _int_from_env("SCHEDULED_EMAIL_CLAIM_TIMEOUT_SECONDS", 1800)
     EMAIL_VERIFICATION_REQUIRED = bool_from_config(
         os.getenv("EMAIL_VERIFICATION_REQUIRED", "False")
     )
     IMPORT_JOB_EMAIL_NOTIFICATIONS = bool_from_config(
         os.getenv("IMPORT_JOB_EMAIL_NOTIFICATIONS", "False")
     )
+    # Server-sent import progress streams. Every open stream holds one gunicorn
+    # thread (GUNICORN_THREADS per worker), so each process serves at most
+    # MAX_CLIENTS streams and answers further clients with 503 so they poll.
+    # Streams close after the max duration so browsers reconnect instead of
+    # pinning a thread; the resync interval catches transitions made by
+    # workers in other processes.
+    IMPORT_EVENT_STREAM_MAX_CLIENTS = _int_from_env("IMPORT_EVENT_STREAM_MAX_CLIENTS", 2)
+    IMPORT_EVENT_STREAM_MAX_SECONDS = _float_from_env("IMPORT_EVENT_STREAM_MAX_SECONDS", 60.0)
+    IMPORT_EVENT_STREAM_HEARTBEAT_SECONDS = _float_from_env(
+        "IMPORT_EVENT_STREAM_HEARTBEAT_SECONDS", 15.0
+    )
+    IMPORT_EVENT_STREAM_RESYNC_SECONDS = _float_from_env("IMPORT_EVENT_STREAM_RESYNC_SECONDS", 60.0)
+    # MCP tool jobs: a running job owned by another process counts as
+    # interrupted, and can be resumed, once it has not recorded an item for
+    # this long.
+    TOOL_JOB_STALE_SECONDS = _int_from_env("TOOL_JOB_STALE_SECONDS", 900)
 
     # Round artifact storage. These directories must already exist and be
     # writable before MP3/PDF generation, export, scheduling, or delivery.
     DATA_DIR = os.getenv("DATA_DIR", "/data")
+    # Incremental backups split files into fixed-size, content-addressed
+    # chunks below DATA_DIR/backups/chunk_store. Chunks newer than the GC
+    # grace period survive collection so in-flight backups stay intact.
+    BACKUP_CHUNK_SIZE = _int_from_env("BACKUP_CHUNK_SIZE", 4 * 1024 * 1024)
+    BACKUP_CHUNK_COMPRESSION_LEVEL = _int_from_env("BACKUP_CHUNK_COMPRESSION_LEVEL", 3)
+    BACKUP_GC_GRACE_SECONDS = _int_from_env("BACKUP_GC_GRACE_SECONDS", 3600)
+    # ZIP backups stream members into the archive. Deflate level applies to
+    # the database and config; MP3s are stored uncompressed. Worker threads
+    # snapshot the database and hash members ahead of the writer.
+    BACKUP_COMPRESSION_LEVEL = _int_from_env("BACKUP_COMPRESSION_LEVEL", 6)
+    BACKUP_ARCHIVE_WORKERS = _int_from_env("BACKUP_ARCHIVE_WORKERS", 4)
+    # Logical backups page through each table in primary-key order; this is
+    # the number of rows fetched (and inserted on restore) per batch.
+    BACKUP_LOGICAL_BATCH_SIZE = _int_from_env("BACKUP_LOGICAL_BATCH_SIZE", 5000)
+    # SQLite snapshots copy this many pages per step and sleep in between so
+    # writers can commit. "passive" WAL checkpoints never block writers; use
+    # "truncate" only off-peak. After BACKUP_SQLITE_MAX_RESTARTS restarts
+    # caused by concurrent writes, the rest is copied in one step.
+    BACKUP_SQLITE_STEP_PAGES = _int_from_env("BACKUP_SQLITE_STEP_PAGES", 1024)
+    BACKUP_SQLITE_STEP_SLEEP_MS = _int_from_env("BACKUP_SQLITE_STEP_SLEEP_MS", 25)
+    BACKUP_SQLITE_WAL_CHECKPOINT = os.getenv("BACKUP_SQLITE_WAL_CHECKPOINT", "passive").strip().lower()
+    BACKUP_SQLITE_MAX_RESTARTS = _int_from_env("BACKUP_SQLITE_MAX_RESTARTS", 5)
+    # Threads used by full backup verification; 0 means one per CPU core.
+    BACKUP_VERIFY_WORKERS = _int_from_env("BACKUP_VERIFY_WORKERS", 0)
     ROUND_MP3_DIR = os.getenv("ROUND_MP3_DIR", "/data/rounds")
     ROUND_PDF_DIR = os.getenv("ROUND_PDF_DIR", "/data/pdfs")
     ROUND_PREVIEW_TARGET_DBFS = _float_from_env("ROUND_PREVIEW_TARGET_DBFS", -16.0)
@@ -109,6 +159,15 @@ class Config:
     ROUND_ARTIFACT_S3_ACCESS_KEY_ID = os.getenv("ROUND_ARTIFACT_S3_ACCESS_KEY_ID", "")
     ROUND_ARTIFACT_S3_SECRET_ACCESS_KEY = os.getenv("ROUND_ARTIFACT_S3_SECRET_ACCESS_KEY", "")
     ROUND_ARTIFACT_S3_ADDRESSING_STYLE = os.getenv("ROUND_ARTIFACT_S3_ADDRESSING_STYLE", "auto")
+    # Streaming S3 transfers: multipart part / ranged-GET size (minimum 5 MiB)
+    # and how many parts are uploaded or prefetched at once.
+    ROUND_ARTIFACT_S3_PART_SIZE_MB = _int_from_env("ROUND_ARTIFACT_S3_PART_SIZE_MB", 8)
+    ROUND_ARTIFACT_S3_MAX_CONCURRENCY = _int_from_env("ROUND_ARTIFACT_S3_MAX_CONCURRENCY", 4)
+    # Local read-through cache in front of S3, evicted least recently used first.
+    ROUND_ARTIFACT_CACHE_MAX_MB = _int_from_env("ROUND_ARTIFACT_CACHE_MAX_MB", 2048)
+    # The database inventory index is rebuilt from a bucket listing when older
+    # than this; 0 keeps it until an index write fails or it is rebuilt manually.
+    ROUND_ARTIFACT_INDEX_MAX_AGE_SECONDS = _int_from_env("ROUND_ARTIFACT_INDEX_MAX_AGE_SECONDS", 3600)
     # Openmusic demo endpoint is the default discovery source. A local mirror is optional.
     OMDB_SERVER_URL = os.getenv("OMDB_SERVER_URL", "https://server.openmusic.app")
     OMDB_SERVER_TIMEOUT = _int_from_env("OMDB_SERVER_TIMEOUT", 10)
@@ -125,6 +184,9 @@ class Config:
     # resolves album artwork in addition to exact ISRC matches.
     SPOTIFY_ARCHIVE_CATALOG_TIMEOUT = _int_from_env("SPOTIFY_ARCHIVE_CATALOG_TIMEOUT", 30)
     SPOTIFY_ARCHIVE_BULK_TIMEOUT = _int_from_env("SPOTIFY_ARCHIVE_BULK_TIMEOUT", 1800)
+    # Concurrent chunk requests during archive backfills. Each bulk request is
+    # a sequential scan on the archive host, so keep this small.
+    SPOTIFY_ARCHIVE_MAX_IN_FLIGHT = _int_from_env("SPOTIFY_ARCHIVE_MAX_IN_FLIGHT", 2)
     APP_TIMEZONE = os.getenv("APP_TIMEZONE", "Europe/Berlin")
     
     # Automation settings
@@ -188,6 +250,48 @@ class Config:
     STATIC_ASSET_CACHE_ENABLED = bool_from_config(os.getenv("STATIC_ASSET_CACHE_ENABLED", "True"))
     STATIC_ASSET_CACHE_SECONDS = _int_from_env("STATIC_ASSET_CACHE_SECONDS", 86400)
 
+    # /healthz serves cached component checks. A background sampler refreshes
+    # each component on its interval; checks that overrun the timeout are
+    # reported as failed until they complete.
+    HEALTH_SAMPLER_BACKGROUND = bool_from_config(os.getenv("HEALTH_SAMPLER_BACKGROUND", "True"))
+    HEALTH_SAMPLE_INTERVAL_SECONDS = _int_from_env("HEALTH_SAMPLE_INTERVAL_SECONDS", 15)
+    HEALTH_STORAGE_SAMPLE_INTERVAL_SECONDS = _int_from_env("HEALTH_STORAGE_SAMPLE_INTERVAL_SECONDS", 60)
+    HEALTH_CHECK_TIMEOUT_SECONDS = _float_from_env("HEALTH_CHECK_TIMEOUT_SECONDS", 5.0)
+
+    # Opt-in SQL profiling per request, MCP tool, and tool job. Statements
+    # slower than QUERY_PROFILER_SLOW_MS are logged; statements repeated at
+    # least QUERY_PROFILER_REPEAT_THRESHOLD times in one scope are flagged as
+    # likely N+1 queries. Debug apps also send X-DB-* response headers.
+    QUERY_PROFILER_ENABLED = bool_from_config(os.getenv("QUERY_PROFILER_ENABLED", "False"))
+    QUERY_PROFILER_HEADERS = bool_from_config(os.getenv("QUERY_PROFILER_HEADERS", "False"))
+    QUERY_PROFILER_SLOW_MS = _float_from_env("QUERY_PROFILER_SLOW_MS", 200.0)
+    QUERY_PROFILER_REPEAT_THRESHOLD = _int_from_env("QUERY_PROFILER_REPEAT_THRESHOLD", 5)
+    QUERY_PROFILER_SAMPLE_SIZE = _int_from_env("QUERY_PROFILER_SAMPLE_SIZE", 500)
+
+    # On-demand CPU profiles armed by administrators under Admin > Runtime
+    # Profiles. Arms and saved profiles live in RUNTIME_PROFILER_DIR (default
+    # DATA_DIR/profiles), which all app, MCP, and worker processes must share.
+    RUNTIME_PROFILER_DIR = os.getenv("RUNTIME_PROFILER_DIR")
+    RUNTIME_PROFILER_SAMPLE_INTERVAL_MS = _float_from_env("RUNTIME_PROFILER_SAMPLE_INTERVAL_MS", 5.0)
+    RUNTIME_PROFILER_MAX_PROFILES = _int_from_env("RUNTIME_PROFILER_MAX_PROFILES", 50)
+
+    # Latency, status, retry, and rate-limit counters for outbound provider
+    # calls, served as Prometheus text at /metrics. Scrapers authenticate with
+    # X-Automation-Token, or with "Authorization: Bearer <METRICS_TOKEN>" when
+    # a separate read-only token is preferred.
+    # Counters are per process; with several workers, set PROVIDER_TELEMETRY_DIR
+    # to a directory every process shares (the container entrypoint uses
+    # DATA_DIR/telemetry) so each scrape returns the totals of all of them.
+    PROVIDER_TELEMETRY_ENABLED = bool_from_config(os.getenv("PROVIDER_TELEMETRY_ENABLED", "True"))
+    PROVIDER_TELEMETRY_DIR = os.getenv("PROVIDER_TELEMETRY_DIR")
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+    # Deezer and Spotify API base URLs. Unset means the public endpoints; CI and
+    # load tests point them at the offline stand-in (run.py providers standin).
+    DEEZER_API_BASE_URL = os.getenv("DEEZER_API_BASE_URL")
+    SPOTIFY_API_BASE_URL = os.getenv("SPOTIFY_API_BASE_URL")
+    SPOTIFY_ACCOUNTS_BASE_URL = os.getenv("SPOTIFY_ACCOUNTS_BASE_URL")
+
     # Minimal in-app authentication throttles. These are per-process safety nets,
     # not a replacement for edge/WAF rate limiting.
     LOGIN_RATE_LIMIT_ATTEMPTS = _int_from_env("LOGIN_RATE_LIMIT_ATTEMPTS", 5)
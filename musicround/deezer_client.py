@@ -6,6 +6,7 @@ import time
 from flask import current_app
 from musicround.models import Song, db
 from musicround.helpers.metadata import get_song_metadata_by_isrc, normalize_deezer_rank
+from musicround.helpers.provider_urls import deezer_api_url
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +16,8 @@ class DeezerClient:
     Handles searching and importing songs, albums, and playlists
     """
     
-    def __init__(self):
-        self.base_url = "https://api.deezer.com"
+    def __init__(self, base_url=None):
+        self.base_url = (base_url or deezer_api_url()).rstrip("/")
         self.logger = logging.getLogger(__name__)
     
     def _make_request(self, endpoint, params=None):
@@ -0,0 +1,350 @@
+"""
+Local cache tier and shared inventory index for object-store round artifacts.
+
+:class:`ArtifactDiskCache` keeps recently used artifacts on local disk, in the
+layout the S3 store already uses for render paths
+(``<cache_dir>/<kind>/round_<id>.<kind>``). A SQLite index next to the files
+records each file's object key, ETag, size, and last access. A hit is served
+only while its ETag still matches the object, and the least recently used
+files are evicted once the cache grows past its byte budget. SQLite keeps the
+index consistent across web workers that share one cache directory.
+
+:class:`ArtifactInventoryIndex` mirrors the bucket's artifact listing in the
+application database. Every replica writes it on upload and delete, so
+inventory and readiness reports and ETag lookups do not have to list or HEAD
+the bucket. When the index has never been built or is older than its maximum
+age, the caller rebuilds it from one bucket listing.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from datetime import datetime, timedelta
+from typing import IO, Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+CACHE_INDEX_NAME = ".cache-index.sqlite3"
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+DEFAULT_INDEX_MAX_AGE_SECONDS = 3600
+INDEX_SETTING_KEY = "round_artifact_index"
+
+
+class ArtifactDiskCache:
+    """Size-bounded LRU cache of artifact files keyed by object key and ETag."""
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max(0, int(max_bytes))
+        self.index_path = os.path.join(root, CACHE_INDEX_NAME)
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(self.root, exist_ok=True)
+        conn = sqlite3.connect(self.index_path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, path TEXT NOT NULL, etag TEXT, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        return conn
+
+    def lookup(self, key: str, etag: str | None) -> str | None:
+        """Return the cached file for ``key`` if it holds the object version ``etag``."""
+        if not etag:
+            return None
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT path, etag, size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] != etag:
+                return None
+            path, _etag, size = row
+            try:
+                if os.stat(path).st_size != size:
+                    raise FileNotFoundError(path)
+            except FileNotFoundError:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        return path
+
+    def add(self, key: str, path: str, etag: str | None, size: int) -> None:
+        """Record a file already written at ``path`` and evict older entries if needed."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, path, etag, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, path, etag, int(size), time.time()),
+            )
+        self.evict(keep=key)
+
+    def fill(self, key: str, path: str, etag: str | None, size: int) -> "_CacheFill":
+        """Return a sink that writes ``path`` atomically and records it on commit."""
+        return _CacheFill(self, key, path, etag, size)
+
+    def discard(self, key: str) -> None:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT path FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        if row is not None:
+            _remove_quietly(row[0])
+
+    def evict(self, keep: str | None = None) -> int:
+        """Remove least recently used files until the cache fits its budget; return bytes freed."""
+        freed = 0
+        with closing(self._connect()) as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            rows = conn.execute(
+                "SELECT key, path, size FROM entries ORDER BY last_access ASC"
+            ).fetchall()
+            for key, path, size in rows:
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                _remove_quietly(path)
+                total -= size
+                freed += size
+        if freed:
+            logger.debug("Evicted %s bytes from the artifact cache", freed)
+        return freed
+
+    def stats(self) -> dict[str, int]:
+        with closing(self._connect()) as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": count, "bytes": total, "max_bytes": self.max_bytes}
+
+
+class _CacheFill:
+    """Write-through sink used while an artifact is uploaded or downloaded."""
+
+    def __init__(self, cache: ArtifactDiskCache, key: str, path: str, etag: str | None, size: int):
+        self._cache = cache
+        self._key = key
+        self._path = path
+        self.etag = etag
+        self.size = size
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._partial = f"{path}.{uuid.uuid4().hex}.partial"
+        self._file: IO[bytes] | None = open(self._partial, "wb")
+        self.written = 0
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self.written += len(data)
+
+    def commit(self, etag: str | None = None) -> str:
+        """Move the file into place and record it under ``etag`` (or the one given earlier)."""
+        self._file.close()
+        self._file = None
+        os.replace(self._partial, self._path)
+        self._cache.add(self._key, self._path, etag or self.etag, self.written)
+        return self._path
+
+    def abort(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        _remove_quietly(self._partial)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class ArtifactInventoryIndex:
+    """Database mirror of the artifact objects under one bucket prefix.
+
+    Index writes run in their own short transaction so they never commit or
+    roll back the caller's session. Index failures are logged and mark the
+    index stale, which makes the next inventory rebuild it from the bucket.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str,
+        max_age_seconds: int = DEFAULT_INDEX_MAX_AGE_SECONDS,
+        enabled: bool = True,
+    ):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.max_age_seconds = max(0, int(max_age_seconds))
+        # Minimal diagnostic apps have no database; the index is then skipped
+        # and callers fall back to HEAD requests and bucket listings.
+        self.enabled = enabled
+
+    @staticmethod
+    def _tables():
+        from musicround.models import RoundArtifactObject, SystemSetting
+
+        return RoundArtifactObject.__table__, SystemSetting.__table__
+
+    @staticmethod
+    def _engine():
+        from musicround.models import db
+
+        return db.engine
+
+    def _key_prefix(self) -> str:
+        return f"{self.prefix}/" if self.prefix else ""
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return ``{"size", "etag"}`` for an indexed object, or None."""
+        from sqlalchemy import select
+
+        if not self.enabled:
+            return None
+        try:
+            objects, _settings = self._tables()
+            with self._engine().connect() as conn:
+                row = conn.execute(
+                    select(objects.c.size, objects.c.etag)
+                    .where(objects.c.bucket == self.bucket, objects.c.key == key)
+                ).first()
+        except Exception:
+            logger.debug("Artifact index lookup failed for %s", key, exc_info=True)
+            return None
+        if row is None:
+            return None
+        return {"size": int(row.size), "etag": row.etag}
+
+    def record(self, key: str, kind: str, size: int, etag: str | None) -> None:
+        if not self.enabled:
+            return
+        try:
+            objects, _settings = self._tables()
+            with self._engine().begin() as conn:
+                conn.execute(
+                    objects.delete().where(objects.c.bucket == self.bucket, objects.c.key == key)
+                )
+                conn.execute(objects.insert().values(
+                    bucket=self.bucket,
+                    key=key,
+                    kind=kind,
+                    size=int(size),
+                    etag=etag,
+                    updated_at=datetime.utcnow(),
+                ))
+        except Exception:
+            logger.warning("Could not record %s in the artifact index", key, exc_info=True)
+            self.invalidate()
+
+    def remove(self, key: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            objects, _settings = self._tables()
+            with self._engine().begin() as conn:
+                conn.execute(
+                    objects.delete().where(objects.c.bucket == self.bucket, objects.c.key == key)
+                )
+        except Exception:
+            logger.warning("Could not remove %s from the artifact index", key, exc_info=True)
+            self.invalidate()
+
+    def _read_marker(self, conn) -> dict[str, Any] | None:
+        from sqlalchemy import select
+
+        _objects, settings = self._tables()
+        value = conn.execute(
+            select(settings.c.value).where(settings.c.key == INDEX_SETTING_KEY)
+        ).scalar()
+        try:
+            marker = json.loads(value) if value else None
+        except ValueError:
+            return None
+        if not isinstance(marker, dict):
+            return None
+        if marker.get("bucket") != self.bucket or marker.get("prefix") != self.prefix:
+            return None
+        return marker
+
+    def _write_marker(self, conn, value: str | None) -> None:
+        _objects, settings = self._tables()
+        conn.execute(settings.delete().where(settings.c.key == INDEX_SETTING_KEY))
+        if value is not None:
+            conn.execute(settings.insert().values(key=INDEX_SETTING_KEY, value=value))
+
+    def totals(self, kind: str) -> dict[str, Any] | None:
+        """Return indexed file count and bytes for ``kind``, or None when the index is stale."""
+        from sqlalchemy import func, select
+
+        if not self.enabled:
+            return None
+        try:
+            objects, _settings = self._tables()
+            with self._engine().connect() as conn:
+                marker = self._read_marker(conn)
+                if marker is None:
+                    return None
+                synced_at = datetime.fromisoformat(marker["synced_at"])
+                if self.max_age_seconds and datetime.utcnow() - synced_at > timedelta(seconds=self.max_age_seconds):
+                    return None
+                count, total = conn.execute(
+                    select(func.count(objects.c.id), func.coalesce(func.sum(objects.c.size), 0))
+                    .where(
+                        objects.c.bucket == self.bucket,
+                        objects.c.kind == kind,
+                        objects.c.key.startswith(self._key_prefix(), autoescape=True),
+                    )
+                ).one()
+        except Exception:
+            logger.debug("Artifact index totals unavailable", exc_info=True)
+            return None
+        return {"file_count": int(count), "total_bytes": int(total), "synced_at": marker["synced_at"]}
+
+    def rebuild(self, items: Iterable[dict[str, Any]]) -> bool:
+        """Replace the indexed rows with a bucket listing of ``{"key", "kind", "size", "etag"}``."""
+        if not self.enabled:
+            return False
+        try:
+            objects, _settings = self._tables()
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "bucket": self.bucket,
+                    "key": item["key"],
+                    "kind": item["kind"],
+                    "size": int(item["size"]),
+                    "etag": item.get("etag"),
+                    "updated_at": now,
+                }
+                for item in items
+            ]
+            with self._engine().begin() as conn:
+                conn.execute(objects.delete().where(
+                    objects.c.bucket == self.bucket,
+                    objects.c.key.startswith(self._key_prefix(), autoescape=True),
+                ))
+                if rows:
+                    conn.execute(objects.insert(), rows)
+                self._write_marker(conn, json.dumps({
+                    "bucket": self.bucket,
+                    "prefix": self.prefix,
+                    "synced_at": now.isoformat(),
+                }))
+        except Exception:
+            logger.warning("Could not rebuild the artifact index", exc_info=True)
+            return False
+        return True
+
+    def invalidate(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            with self._engine().begin() as conn:
+                if self._read_marker(conn) is not None:
+                    self._write_marker(conn, None)
+        except Exception:
+            logger.debug("Could not invalidate the artifact index", exc_info=True)
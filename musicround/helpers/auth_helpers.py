@@ -8,6 +8,7 @@ from functools import wraps
 from datetime import datetime, timedelta
 import requests
 from musicround.helpers.logging_utils import oauth_token_log_summary
+from musicround.helpers.provider_urls import spotify_accounts_url, spotify_api_url
 
 # Initialize OAuth object
 oauth = OAuth()
@@ -72,16 +73,16 @@ def init_oauth(app):
             name='spotify',
             client_id=app.config.get('SPOTIFY_CLIENT_ID'),
             client_secret=app.config.get('SPOTIFY_CLIENT_SECRET'),
-            api_base_url='https://api.spotify.com/v1/',
-            authorize_url='https://accounts.spotify.com/authorize',
+            api_base_url=spotify_api_url(config=app.config) + '/',
+            authorize_url=spotify_accounts_url('authorize', app.config),
             authorize_params={'show_dialog': 'true'}, # Force re-approval
-            access_token_url='https://accounts.spotify.com/api/token',
+            access_token_url=spotify_accounts_url('api/token', app.config),
             access_token_params=None,
-            refresh_token_url='https://accounts.spotify.com/api/token',
+            refresh_token_url=spotify_accounts_url('api/token', app.config),
             client_kwargs={
                 'scope': app.config.get('SPOTIFY_SCOPE')
             },
-            userinfo_endpoint='https://api.spotify.com/v1/me' # Added for fetching user info
+            userinfo_endpoint=spotify_api_url('me', app.config) # Added for fetching user info
         )
         app.logger.info("Spotify OAuth client registered")
     else:
@@ -173,7 +174,7 @@ def get_spotify_user_info(token):
         # but since we provided an absolute one, it should use that.
         # The error "Invalid URL 'me'" suggests that 'me' alone was passed somewhere.
         # Let's ensure we are calling the fully qualified endpoint via the client.
-        resp = oauth.spotify.get('https://api.spotify.com/v1/me', token=token)
+        resp = oauth.spotify.get(spotify_api_url('me'), token=token)
         resp.raise_for_status() # Raise an exception for HTTP errors (4xx or 5xx)
         profile = resp.json()
         current_app.logger.debug(f"Spotify user info response: {profile}")
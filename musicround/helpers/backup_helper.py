@@ -8,16 +8,52 @@ import logging
 import sqlite3
 import stat
 import zipfile
+from concurrent.futures import wait
 from datetime import datetime
 import tempfile
 from flask import current_app
 
+from musicround.helpers.backup_archive import (
+    DEFAULT_ARCHIVE_COMPRESSION_LEVEL,
+    DEFAULT_ARCHIVE_WORKERS,
+    SQLITE_HEADER,
+    BackupArchiveWriter,
+    read_archive_manifest,
+    verify_archive_members,
+)
+from musicround.helpers.backup_store import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_COMPRESSION_LEVEL,
+    DEFAULT_GC_GRACE_SECONDS,
+    MANIFEST_FORMAT,
+    MANIFEST_FORMAT_VERSION,
+    MANIFEST_SUFFIX,
+    ChunkStore,
+    ChunkStoreError,
+    manifest_digests,
+    merge_stats,
+    read_manifest,
+    write_manifest,
+)
+from musicround.helpers.logical_backup import (
+    DEFAULT_LOGICAL_BATCH_SIZE,
+    LOGICAL_MANIFEST_MEMBER,
+    dump_database,
+    read_logical_manifest,
+    restore_database,
+)
 from musicround.helpers.database_config import (
     database_summary,
     is_sqlite_database_uri,
     managed_database_requirement_error,
 )
 from musicround.helpers.paths import app_data_path, backup_dir
+from musicround.helpers.sqlite_backup import (
+    DEFAULT_MAX_RESTARTS,
+    DEFAULT_STEP_PAGES,
+    DEFAULT_WAL_CHECKPOINT,
+    online_backup,
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -32,6 +68,12 @@ BACKUP_SQLITE_MEMORY_MESSAGE = (
     "In-memory databases cannot be backed up."
 )
 POSTGRES_BACKUP_ENV_KEYS = ("PGHOST", "PGDATABASE", "PGUSER", "PGPASSWORD")
+BACKUP_CHUNK_STORE_DIRNAME = "chunk_store"
+LOGICAL_BACKUP_SUFFIX = ".logical.zip"
+VERIFY_QUICK = "quick"
+VERIFY_FULL = "full"
+VERIFY_LEVELS = (VERIFY_QUICK, VERIFY_FULL)
+VERIFY_CACHE_SUFFIX = ".verify.json"
 
 
 def _database_backup_plan(application_backup):
@@ -63,6 +105,7 @@ def _database_backup_plan(application_backup):
                     "--host=\"$PGHOST\" --username=\"$PGUSER\" \"$PGDATABASE\""
                 ),
                 "kubectl cnpg backup <cluster-name> --namespace <namespace>",
+                "python /app/run.py backup create --auto --logical",
             ],
             "verification_commands": [
                 "pg_restore --list /backups/<dump-file>.dump",
@@ -71,6 +114,7 @@ def _database_backup_plan(application_backup):
             "notes": [
                 "Provide PGPASSWORD through the authorized runtime environment, not in command text.",
                 "Prefer managed snapshots or CloudNativePG backups for HA deployments.",
+                "Logical application backups are portable table dumps, not a replacement for point-in-time recovery.",
             ],
         }
 
@@ -128,7 +172,7 @@ def _configured_sqlite_database_path():
 
 
 def _find_database_member(file_list):
-    for filename in BACKUP_DATABASE_FILENAMES:
+    for filename in BACKUP_DATABASE_FILENAMES + (LOGICAL_MANIFEST_MEMBER,):
         if filename in file_list:
             return filename
     return None
@@ -175,7 +219,375 @@ def _validate_sqlite_database(db_path):
     return True, None
 
 
-def create_backup(backup_name=None, include_mp3s=True, include_config=True):
+def _mp3_source_dir():
+    return os.path.join(os.path.dirname(current_app.root_path), 'mp3')
+
+
+def _env_file_path():
+    return os.path.join(os.path.dirname(current_app.root_path), '.env')
+
+
+def _sqlite_backup_options():
+    """Read the stepped online-backup settings while an app context is active."""
+    config = current_app.config
+    return {
+        'pages': config.get('BACKUP_SQLITE_STEP_PAGES', DEFAULT_STEP_PAGES),
+        'sleep_seconds': config.get('BACKUP_SQLITE_STEP_SLEEP_MS', 25) / 1000.0,
+        'wal_checkpoint': config.get('BACKUP_SQLITE_WAL_CHECKPOINT', DEFAULT_WAL_CHECKPOINT),
+        'max_restarts': config.get('BACKUP_SQLITE_MAX_RESTARTS', DEFAULT_MAX_RESTARTS),
+    }
+
+
+def _snapshot_sqlite_database(db_path, destination, options=None, progress=None):
+    """Copy a consistent snapshot of the live SQLite database to ``destination``.
+
+    The copy is stepped (see ``online_backup``) so writers are not locked
+    out for the whole backup. ``options`` must be resolved by the caller
+    when this runs off the request thread.
+    """
+    if options is None:
+        options = _sqlite_backup_options()
+    stats = online_backup(db_path, destination, progress=progress, **options)
+    logger.info(
+        f"SQLite snapshot: {stats['pages']} pages in {stats['steps']} steps, "
+        f"{stats['restarts']} restarts ({stats['journal_mode']} journal)"
+    )
+    return stats
+
+
+def _system_settings_json():
+    """Export system settings as JSON text; return None when they cannot be read."""
+    try:
+        from musicround.models import SystemSetting
+        return json.dumps(SystemSetting.all_settings(), indent=2)
+    except Exception as e:
+        logger.error(f"Error backing up system settings: {str(e)}")
+        return None
+
+
+def _write_system_settings(settings_path):
+    """Export system settings to ``settings_path``; return False when they cannot be read."""
+    settings_json = _system_settings_json()
+    if settings_json is None:
+        return False
+    with open(settings_path, 'w') as f:
+        f.write(settings_json)
+    return True
+
+
+def _is_incremental_backup_name(backup_filename):
+    return backup_filename.endswith(MANIFEST_SUFFIX)
+
+
+def _chunk_store():
+    return ChunkStore(
+        os.path.join(backup_dir(), BACKUP_CHUNK_STORE_DIRNAME),
+        chunk_size=current_app.config.get('BACKUP_CHUNK_SIZE', DEFAULT_CHUNK_SIZE),
+        compression_level=current_app.config.get(
+            'BACKUP_CHUNK_COMPRESSION_LEVEL', DEFAULT_COMPRESSION_LEVEL
+        ),
+    )
+
+
+def _incremental_manifest_paths():
+    backups_path = backup_dir()
+    if not os.path.isdir(backups_path):
+        return []
+    return [
+        os.path.join(backups_path, filename)
+        for filename in os.listdir(backups_path)
+        if _is_incremental_backup_name(filename)
+    ]
+
+
+def _latest_incremental_entries():
+    """Return the newest readable manifest's file entries keyed by path."""
+    latest = None
+    for manifest_path in _incremental_manifest_paths():
+        try:
+            manifest = read_manifest(manifest_path)
+        except ChunkStoreError:
+            continue
+        if latest is None or manifest.get("timestamp", "") > latest.get("timestamp", ""):
+            latest = manifest
+    if latest is None:
+        return {}
+    return {entry["path"]: entry for entry in latest["files"]}
+
+
+def garbage_collect_backup_chunks(grace_seconds=None):
+    """
+    Delete chunk-store data that no incremental backup manifest references.
+
+    An unreadable manifest aborts the collection rather than risk deleting
+    chunks it might still reference.
+
+    Returns:
+        dict: Operation status plus removed/freed/kept chunk counters
+    """
+    if grace_seconds is None:
+        grace_seconds = current_app.config.get('BACKUP_GC_GRACE_SECONDS', DEFAULT_GC_GRACE_SECONDS)
+    try:
+        live = set()
+        for manifest_path in _incremental_manifest_paths():
+            live |= manifest_digests(read_manifest(manifest_path))
+        result = _chunk_store().garbage_collect(live, grace_seconds=grace_seconds)
+    except ChunkStoreError as e:
+        logger.error(f"Backup chunk garbage collection skipped: {str(e)}")
+        return {
+            "status": "error",
+            "message": "Chunk garbage collection skipped because a backup manifest is unreadable."
+        }
+    except Exception as e:
+        logger.error(f"Error collecting backup chunks: {str(e)}")
+        return {
+            "status": "error",
+            "message": _safe_backup_error_message("Backup chunk garbage collection")
+        }
+    logger.info(
+        f"Backup chunk GC removed {result['removed_chunks']} chunks ({result['freed_bytes']} bytes)"
+    )
+    return {
+        "status": "success",
+        "message": f"Removed {result['removed_chunks']} unreferenced backup chunks",
+        **result,
+    }
+
+
+def _create_incremental_backup(backup_name, include_mp3s, include_config, progress=None):
+    """Store changed chunks only and write a manifest referencing every file."""
+    backups_path = backup_dir()
+    os.makedirs(backups_path, exist_ok=True)
+    manifest_path = os.path.join(backups_path, f"{backup_name}{MANIFEST_SUFFIX}")
+
+    db_path, database_error = _configured_sqlite_database_path()
+    if database_error:
+        return {"status": "error", "message": database_error, "path": None}
+    if not os.path.exists(db_path):
+        logger.error(f"Database not found at {db_path}")
+        return {"status": "error", "message": "Database file not found.", "path": None}
+
+    store = _chunk_store()
+    previous_entries = _latest_incremental_entries()
+    files = []
+    stats = {}
+
+    def add(source_path, arcname, reuse_previous=True):
+        previous = previous_entries.get(arcname) if reuse_previous else None
+        entry, file_stats = store.put_file(source_path, arcname, previous)
+        files.append(entry)
+        merge_stats(stats, file_stats)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_db = os.path.join(temp_dir, 'song_data.db')
+        _snapshot_sqlite_database(db_path, temp_db, progress=progress)
+        add(temp_db, 'song_data.db', reuse_previous=False)
+
+        if include_mp3s:
+            mp3_dir = _mp3_source_dir()
+            if os.path.exists(mp3_dir):
+                for mp3_file in sorted(os.listdir(mp3_dir)):
+                    if mp3_file.endswith('.mp3'):
+                        add(os.path.join(mp3_dir, mp3_file), f"mp3/{mp3_file}")
+            else:
+                logger.warning(f"MP3 directory not found at {mp3_dir}")
+
+        if include_config:
+            env_path = _env_file_path()
+            if os.path.exists(env_path):
+                add(env_path, 'config/.env')
+            settings_path = os.path.join(temp_dir, 'system_settings.json')
+            if _write_system_settings(settings_path):
+                add(settings_path, 'config/system_settings.json', reuse_previous=False)
+
+    from musicround.version import VERSION_INFO
+
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "format_version": MANIFEST_FORMAT_VERSION,
+        "backup_name": backup_name,
+        "timestamp": datetime.now().isoformat(),
+        "version": VERSION_INFO['version'],
+        "release_name": VERSION_INFO['release_name'],
+        "includes_mp3s": include_mp3s,
+        "includes_config": include_config,
+        "chunk_size": store.chunk_size,
+        "stats": stats,
+        "files": files,
+    }
+    write_manifest(manifest_path, manifest)
+    logger.info(
+        f"Incremental backup {backup_name}: {stats.get('new_chunks', 0)} new chunks, "
+        f"{stats.get('reused_chunks', 0)} reused, {stats.get('stored_bytes', 0)} bytes stored"
+    )
+    return {
+        "status": "success",
+        "message": "Incremental backup created successfully",
+        "path": manifest_path,
+        "name": backup_name,
+        "size": stats.get('stored_bytes', 0),
+        "format": "incremental",
+        "stats": stats,
+        "timestamp": manifest["timestamp"],
+    }
+
+
+def _backup_metadata(backup_name, include_mp3s, include_config, **extra):
+    from musicround.version import VERSION_INFO
+
+    return {
+        "backup_name": backup_name,
+        "timestamp": datetime.now().isoformat(),
+        "version": VERSION_INFO['version'],
+        "release_name": VERSION_INFO['release_name'],
+        "includes_mp3s": include_mp3s,
+        "includes_config": include_config,
+        **extra,
+    }
+
+
+def _backup_archive_writer(backup_path):
+    return BackupArchiveWriter(
+        backup_path,
+        compression_level=current_app.config.get(
+            'BACKUP_COMPRESSION_LEVEL', DEFAULT_ARCHIVE_COMPRESSION_LEVEL
+        ),
+        workers=current_app.config.get('BACKUP_ARCHIVE_WORKERS', DEFAULT_ARCHIVE_WORKERS),
+    )
+
+
+def _add_archive_sources(archive, include_mp3s, include_config):
+    """Stream configuration and MP3 files into a backup archive."""
+    if include_config:
+        env_path = _env_file_path()
+        if os.path.exists(env_path):
+            archive.add_file(env_path, 'config/.env')
+        settings_json = _system_settings_json()
+        if settings_json is not None:
+            archive.add_bytes('config/system_settings.json', settings_json.encode())
+
+    if include_mp3s:
+        mp3_dir = _mp3_source_dir()
+        if os.path.exists(mp3_dir):
+            archive.add_files([
+                (os.path.join(mp3_dir, mp3_file), f"mp3/{mp3_file}")
+                for mp3_file in sorted(os.listdir(mp3_dir))
+                if mp3_file.endswith('.mp3')
+            ])
+        else:
+            logger.warning(f"MP3 directory not found at {mp3_dir}")
+
+
+def _is_logical_backup_name(backup_filename):
+    return backup_filename.endswith(LOGICAL_BACKUP_SUFFIX)
+
+
+def _create_logical_backup(backup_name, include_mp3s, include_config):
+    """Write a ZIP whose database is a per-table NDJSON dump, for any backend."""
+    from musicround.models import db
+
+    backups_path = backup_dir()
+    os.makedirs(backups_path, exist_ok=True)
+    backup_path = os.path.join(backups_path, f"{backup_name}{LOGICAL_BACKUP_SUFFIX}")
+    metadata = _backup_metadata(
+        backup_name,
+        include_mp3s,
+        include_config,
+        backup_format='logical',
+        database_backend=db.engine.dialect.name,
+    )
+
+    with _backup_archive_writer(backup_path) as archive:
+        archive.add_bytes('backup_metadata.json', json.dumps(metadata, indent=2).encode())
+        _add_archive_sources(archive, include_mp3s, include_config)
+        manifest = dump_database(
+            db.engine,
+            db.metadata,
+            archive.open_member,
+            batch_size=current_app.config.get('BACKUP_LOGICAL_BATCH_SIZE', DEFAULT_LOGICAL_BATCH_SIZE),
+            compression_level=archive.compression_level,
+        )
+        archive.add_bytes(LOGICAL_MANIFEST_MEMBER, json.dumps(manifest, indent=2).encode())
+
+    rows = sum(table['rows'] for table in manifest['tables'])
+    logger.info(f"Logical backup {backup_name}: {len(manifest['tables'])} tables, {rows} rows")
+    return {
+        "status": "success",
+        "message": "Logical backup created successfully",
+        "path": backup_path,
+        "name": backup_name,
+        "size": os.path.getsize(backup_path),
+        "format": "logical",
+        "tables": len(manifest['tables']),
+        "rows": rows,
+        "timestamp": metadata["timestamp"],
+    }
+
+
+def _restore_logical_backup(backup_path, backup_filename):
+    """Reload a logical database dump plus any MP3s and config in the archive."""
+    from musicround.models import db
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with zipfile.ZipFile(backup_path, 'r') as zipf:
+            unsafe_member = _validate_zip_members(zipf, temp_dir)
+            if unsafe_member:
+                logger.error(f"Unsafe path found in backup archive: {unsafe_member}")
+                return {
+                    "status": "error",
+                    "message": f"Backup archive contains unsafe path: {unsafe_member}"
+                }
+            names = zipf.namelist()
+            if LOGICAL_MANIFEST_MEMBER not in names:
+                return {
+                    "status": "error",
+                    "message": "Database dump not found in backup"
+                }
+            metadata = {"includes_mp3s": True, "includes_config": True}
+            if 'backup_metadata.json' in names:
+                with zipf.open('backup_metadata.json') as f:
+                    metadata = json.load(f)
+            with zipf.open(LOGICAL_MANIFEST_MEMBER) as f:
+                manifest = read_logical_manifest(f)
+
+            # Table members are read straight from the archive; only MP3s and
+            # config are extracted, because they are restored as files.
+            zipf.extractall(temp_dir, members=[
+                name for name in names if name.startswith(('mp3/', 'config/'))
+            ])
+            db.session.remove()
+            restored = restore_database(
+                db.engine,
+                db.metadata,
+                manifest,
+                zipf.open,
+                batch_size=current_app.config.get('BACKUP_LOGICAL_BATCH_SIZE', DEFAULT_LOGICAL_BATCH_SIZE),
+            )
+            logger.info(f"Restored {sum(restored.values())} rows into {len(restored)} tables")
+
+        if metadata.get("includes_mp3s", True):
+            _restore_mp3_dir(os.path.join(temp_dir, 'mp3'), timestamp)
+        if metadata.get("includes_config", True):
+            _restore_config_dir(os.path.join(temp_dir, 'config'), timestamp)
+
+    return {
+        "status": "success",
+        "message": "Backup restored successfully",
+        "backup_name": backup_filename,
+        "restored_tables": len(restored),
+        "restored_rows": sum(restored.values()),
+    }
+
+
+def create_backup(
+    backup_name=None,
+    include_mp3s=True,
+    include_config=True,
+    incremental=False,
+    logical=False,
+    progress=None,
+):
     """
     Create a full system backup including database, MP3s, and configuration.
     
@@ -183,15 +595,32 @@ def create_backup(backup_name=None, include_mp3s=True, include_config=True):
         backup_name: Optional name for the backup (defaults to timestamp)
         include_mp3s: Whether to include MP3 files in the backup
         include_config: Whether to include configuration files
+        incremental: Write a chunk-store manifest instead of a ZIP archive,
+            storing only data that changed since earlier backups
+        logical: Dump the database as per-table NDJSON instead of copying the
+            SQLite file; works on every supported database backend
+        progress: Optional ``callback(copied_pages, total_pages)`` for the
+            SQLite snapshot; it may run on a worker thread
         
     Returns:
         dict: Backup information including path and status
+
+    Raises:
+        ValueError: If both ``incremental`` and ``logical`` are requested;
+            the chunk store only holds file-level database snapshots
     """
+    if incremental and logical:
+        raise ValueError("A backup can be incremental or logical, not both.")
     try:
         # Generate backup name if not provided
         if not backup_name:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_name = f"backup_{timestamp}"
+
+        if incremental:
+            return _create_incremental_backup(backup_name, include_mp3s, include_config, progress)
+        if logical:
+            return _create_logical_backup(backup_name, include_mp3s, include_config)
         
         # Ensure backup directory exists
         backups_path = backup_dir()
@@ -199,106 +628,48 @@ def create_backup(backup_name=None, include_mp3s=True, include_config=True):
         
         # Create backup zip file path
         backup_path = os.path.join(backups_path, f"{backup_name}.zip")
-        
-        # Create a temporary directory for collecting files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Step 1: Backup the database
-            db_path, database_error = _configured_sqlite_database_path()
-            if database_error:
-                return {
-                    "status": "error",
-                    "message": database_error,
-                    "path": None
-                }
-            
-            if os.path.exists(db_path):
-                # Create a copy of the database (to avoid locking issues)
-                temp_db = os.path.join(temp_dir, 'song_data.db')
-                
-                # Connect to source database and back it up
-                conn = sqlite3.connect(db_path)
-                backup_conn = sqlite3.connect(temp_db)
-                conn.backup(backup_conn)
-                conn.close()
-                backup_conn.close()
-                
-                logger.info(f"Database backed up to {temp_db}")
-            else:
-                logger.error(f"Database not found at {db_path}")
-                return {
-                    "status": "error",
-                    "message": "Database file not found.",
-                    "path": None
-                }
-            
-            # Step 2: Copy MP3 files if requested
-            if include_mp3s:
-                mp3_dir = os.path.join(os.path.dirname(current_app.root_path), 'mp3')
-                if os.path.exists(mp3_dir):
-                    mp3_backup_dir = os.path.join(temp_dir, 'mp3')
-                    os.makedirs(mp3_backup_dir, exist_ok=True)
-                    
-                    # Copy all MP3 files
-                    for mp3_file in os.listdir(mp3_dir):
-                        if mp3_file.endswith('.mp3'):
-                            source_path = os.path.join(mp3_dir, mp3_file)
-                            dest_path = os.path.join(mp3_backup_dir, mp3_file)
-                            shutil.copy2(source_path, dest_path)
-                    
-                    logger.info(f"MP3 files backed up to {mp3_backup_dir}")
-                else:
-                    logger.warning(f"MP3 directory not found at {mp3_dir}")
-            
-            # Step 3: Add configuration files if requested
-            if include_config:
-                config_dir = os.path.join(temp_dir, 'config')
-                os.makedirs(config_dir, exist_ok=True)
-                
-                # Copy .env file if it exists
-                env_path = os.path.join(os.path.dirname(current_app.root_path), '.env')
-                if os.path.exists(env_path):
-                    shutil.copy2(env_path, os.path.join(config_dir, '.env'))
-                    logger.info(f".env file backed up")
-                
-                # Extract system settings from database and save as JSON
-                try:
-                    from musicround.models import SystemSetting
-                    settings = SystemSetting.all_settings()
-                    
-                    # Save settings to JSON file
-                    settings_path = os.path.join(config_dir, 'system_settings.json')
-                    with open(settings_path, 'w') as f:
-                        json.dump(settings, f, indent=2)
-                    
-                    logger.info(f"System settings backed up to {settings_path}")
-                except Exception as e:
-                    logger.error(f"Error backing up system settings: {str(e)}")
-            
-            # Step 4: Add backup metadata file with version info and timestamp
-            from musicround.version import VERSION_INFO
-            
-            metadata = {
-                "backup_name": backup_name,
-                "timestamp": datetime.now().isoformat(),
-                "version": VERSION_INFO['version'],
-                "release_name": VERSION_INFO['release_name'],
-                "includes_mp3s": include_mp3s,
-                "includes_config": include_config
+
+        db_path, database_error = _configured_sqlite_database_path()
+        if database_error:
+            return {
+                "status": "error",
+                "message": database_error,
+                "path": None
             }
-            
-            metadata_path = os.path.join(temp_dir, 'backup_metadata.json')
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
-            
-            # Step 5: Create a ZIP archive of all backed up content
-            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add all files from temp directory to ZIP
-                for root, _, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        # Add file to ZIP with a relative path
-                        arcname = os.path.relpath(file_path, temp_dir)
-                        zipf.write(file_path, arcname)
+        if not os.path.exists(db_path):
+            logger.error(f"Database not found at {db_path}")
+            return {
+                "status": "error",
+                "message": "Database file not found.",
+                "path": None
+            }
+
+        metadata = _backup_metadata(backup_name, include_mp3s, include_config)
+
+        # Only the database is staged (next to the archive, so no cross-device
+        # copy): a consistent SQLite snapshot needs a real file. Everything
+        # else is streamed from its source straight into the ZIP.
+        snapshot_path = os.path.join(backups_path, f".{backup_name}.db.partial")
+        with _backup_archive_writer(backup_path) as archive:
+            snapshot = archive.submit(
+                _snapshot_sqlite_database,
+                db_path,
+                snapshot_path,
+                _sqlite_backup_options(),
+                progress,
+            )
+            try:
+                archive.add_bytes('backup_metadata.json', json.dumps(metadata, indent=2).encode())
+
+                _add_archive_sources(archive, include_mp3s, include_config)
+
+                snapshot.result()
+                archive.add_file(snapshot_path, 'song_data.db')
+            finally:
+                wait([snapshot])
+                if os.path.exists(snapshot_path):
+                    os.remove(snapshot_path)
+        logger.info(f"Backup written to {backup_path} ({len(archive.entries)} files)")
         
         # Get backup file size
         backup_size = os.path.getsize(backup_path)
@@ -336,7 +707,27 @@ def list_backups():
     backups = []
     
     for filename in os.listdir(backups_path):
-        if filename.endswith('.zip'):
+        if _is_incremental_backup_name(filename):
+            backup_path = os.path.join(backups_path, filename)
+            try:
+                manifest = read_manifest(backup_path)
+            except ChunkStoreError as e:
+                logger.error(f"Error reading backup manifest {filename}: {str(e)}")
+                continue
+            file_info = os.stat(backup_path)
+            metadata = {key: value for key, value in manifest.items() if key != 'files'}
+            stats = manifest.get('stats') or {}
+            metadata.update({
+                'backup_format': 'incremental',
+                'file_name': filename,
+                'file_path': backup_path,
+                'file_size': stats.get('logical_bytes', 0),
+                'stored_bytes': stats.get('stored_bytes', 0),
+                'file_date': datetime.fromtimestamp(file_info.st_mtime).isoformat(),
+            })
+            metadata['verification'] = _cached_verification(backup_path)
+            backups.append(metadata)
+        elif filename.endswith('.zip'):
             backup_path = os.path.join(backups_path, filename)
             try:
                 # Extract metadata from ZIP file
@@ -351,6 +742,7 @@ def list_backups():
                             metadata['file_name'] = filename
                             metadata['file_path'] = backup_path
                             metadata['file_date'] = datetime.fromtimestamp(file_info.st_mtime).isoformat()
+                            metadata['verification'] = _cached_verification(backup_path)
                             
                             backups.append(metadata)
                     else:
@@ -364,7 +756,8 @@ def list_backups():
                             'file_date': datetime.fromtimestamp(file_info.st_mtime).isoformat(),
                             'timestamp': datetime.fromtimestamp(file_info.st_mtime).isoformat(),
                             'version': 'Unknown',
-                            'release_name': 'Unknown'
+                            'release_name': 'Unknown',
+                            'verification': _cached_verification(backup_path),
                         })
             except Exception as e:
                 logger.error(f"Error reading backup metadata from {filename}: {str(e)}")
@@ -395,6 +788,9 @@ def delete_backup(backup_filename):
     
     try:
         os.remove(backup_path)
+        _discard_verification(backup_path)
+        if _is_incremental_backup_name(backup_filename):
+            garbage_collect_backup_chunks()
         return {
             "status": "success",
             "message": f"Backup {backup_filename} deleted successfully"
@@ -406,6 +802,152 @@ def delete_backup(backup_filename):
             "message": _safe_backup_error_message("Backup deletion")
         }
 
+def _restore_mp3_dir(mp3_backup_dir, timestamp):
+    """Replace the MP3 directory with a backup copy, keeping the current one aside."""
+    if not os.path.exists(mp3_backup_dir):
+        return
+    mp3_dir = _mp3_source_dir()
+    
+    # Create backup of current MP3 files
+    if os.path.exists(mp3_dir):
+        mp3_backup = f"{mp3_dir}.{timestamp}.bak"
+        shutil.copytree(mp3_dir, mp3_backup)
+        logger.info(f"Created backup of current MP3 files at {mp3_backup}")
+    
+    # Remove current MP3 directory and replace with backup
+    if os.path.exists(mp3_dir):
+        shutil.rmtree(mp3_dir)
+    
+    # Create MP3 directory if it doesn't exist
+    os.makedirs(mp3_dir, exist_ok=True)
+    
+    # Copy MP3 files from backup
+    for mp3_file in os.listdir(mp3_backup_dir):
+        if mp3_file.endswith('.mp3'):
+            source_path = os.path.join(mp3_backup_dir, mp3_file)
+            dest_path = os.path.join(mp3_dir, mp3_file)
+            shutil.copy2(source_path, dest_path)
+    
+    logger.info(f"Restored MP3 files from backup")
+
+
+def _restore_config_dir(config_backup_dir, timestamp):
+    """Restore .env and system settings from an extracted backup config directory."""
+    if os.path.exists(config_backup_dir):
+        # Restore .env file if present in backup
+        env_backup_path = os.path.join(config_backup_dir, '.env')
+        if os.path.exists(env_backup_path):
+            env_path = _env_file_path()
+
+            # Backup current .env
+            if os.path.exists(env_path):
+                env_backup = f"{env_path}.{timestamp}.bak"
+                shutil.copy2(env_path, env_backup)
+                logger.info(f"Created backup of current .env file at {env_backup}")
+
+            # Restore .env from backup
+            shutil.copy2(env_backup_path, env_path)
+            logger.info(f"Restored .env file from backup")
+
+        # Restore system settings from JSON if present
+        settings_backup_path = os.path.join(config_backup_dir, 'system_settings.json')
+        if os.path.exists(settings_backup_path):
+            try:
+                with open(settings_backup_path, 'r') as f:
+                    settings = json.load(f)
+
+                # Import within function to avoid circular imports
+                from musicround.models import SystemSetting, db
+
+                # Restore each setting
+                for key, value in settings.items():
+                    SystemSetting.set(key, value)
+
+                logger.info("Restored system settings from backup")
+            except Exception as e:
+                logger.error(f"Error restoring system settings: {str(e)}")
+
+
+def _restore_incremental_backup(manifest_path, backup_filename, db_path):
+    """
+    Restore from a chunk-store manifest, rewriting only files that differ.
+
+    MP3s that already match the manifest are left in place; replaced or
+    surplus files are moved into a timestamped ``.bak`` directory.
+    """
+    manifest = read_manifest(manifest_path)
+    entries = {entry["path"]: entry for entry in manifest["files"]}
+    db_entry = next((entries[name] for name in BACKUP_DATABASE_FILENAMES if name in entries), None)
+    if db_entry is None:
+        logger.error("Database file not found in backup")
+        return {"status": "error", "message": "Database file not found in backup"}
+
+    store = _chunk_store()
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        staged_db = os.path.join(temp_dir, 'song_data.db')
+        store.restore_file(db_entry, staged_db)
+        is_valid_db, validation_error = _validate_sqlite_database(staged_db)
+        if not is_valid_db:
+            logger.error(f"Database file in backup failed validation: {validation_error}")
+            return {"status": "error", "message": "Database file in backup failed validation"}
+
+        config_entries = [entry for path, entry in entries.items() if path.startswith('config/')]
+        if manifest.get("includes_config", True):
+            for entry in config_entries:
+                store.restore_file(entry, os.path.join(temp_dir, entry["path"]))
+
+        if os.path.exists(db_path):
+            db_current_backup = f"{db_path}.{timestamp}.bak"
+            shutil.copy2(db_path, db_current_backup)
+            logger.info(f"Created backup of current database at {db_current_backup}")
+        shutil.copy2(staged_db, db_path)
+        logger.info("Restored database from incremental backup")
+
+        restored_files = unchanged_files = 0
+        if manifest.get("includes_mp3s", True):
+            mp3_dir = _mp3_source_dir()
+            os.makedirs(mp3_dir, exist_ok=True)
+            mp3_backup = f"{mp3_dir}.{timestamp}.bak"
+            wanted = {
+                path.split('/', 1)[1]: entry
+                for path, entry in entries.items()
+                if path.startswith('mp3/') and path.endswith('.mp3')
+            }
+
+            def set_aside(filename):
+                os.makedirs(mp3_backup, exist_ok=True)
+                shutil.move(os.path.join(mp3_dir, filename), os.path.join(mp3_backup, filename))
+
+            for filename in os.listdir(mp3_dir):
+                if filename.endswith('.mp3') and filename not in wanted:
+                    set_aside(filename)
+            for filename, entry in wanted.items():
+                destination = os.path.join(mp3_dir, filename)
+                if store.matches_entry(entry, destination):
+                    unchanged_files += 1
+                    continue
+                if os.path.exists(destination):
+                    set_aside(filename)
+                store.restore_file(entry, destination)
+                restored_files += 1
+            logger.info(
+                f"Restored {restored_files} MP3 files from incremental backup; "
+                f"{unchanged_files} already matched"
+            )
+
+        if manifest.get("includes_config", True):
+            _restore_config_dir(os.path.join(temp_dir, 'config'), timestamp)
+
+    return {
+        "status": "success",
+        "message": "Backup restored successfully",
+        "backup_name": backup_filename,
+        "restored_files": restored_files,
+        "unchanged_files": unchanged_files,
+    }
+
+
 def restore_backup(backup_filename):
     """
     Restore system from a backup file.
@@ -425,12 +967,32 @@ def restore_backup(backup_filename):
             "message": f"Backup file {backup_filename} not found"
         }
 
+    if _is_logical_backup_name(backup_filename):
+        try:
+            return _restore_logical_backup(backup_path, backup_filename)
+        except Exception as e:
+            logger.error(f"Error restoring backup {backup_filename}: {str(e)}")
+            return {
+                "status": "error",
+                "message": _safe_backup_error_message("Backup restore")
+            }
+
     db_path, database_error = _configured_sqlite_database_path()
     if database_error:
         return {
             "status": "error",
             "message": database_error
         }
+
+    if _is_incremental_backup_name(backup_filename):
+        try:
+            return _restore_incremental_backup(backup_path, backup_filename, db_path)
+        except Exception as e:
+            logger.error(f"Error restoring backup {backup_filename}: {str(e)}")
+            return {
+                "status": "error",
+                "message": _safe_backup_error_message("Backup restore")
+            }
     
     try:
         # Create a temporary directory for extracting backup
@@ -490,68 +1052,11 @@ def restore_backup(backup_filename):
             
             # Restore MP3 files if included in backup
             if metadata.get("includes_mp3s", True):
-                mp3_backup_dir = os.path.join(temp_dir, 'mp3')
-                if os.path.exists(mp3_backup_dir):
-                    mp3_dir = os.path.join(os.path.dirname(current_app.root_path), 'mp3')
-                    
-                    # Create backup of current MP3 files
-                    if os.path.exists(mp3_dir):
-                        mp3_backup = f"{mp3_dir}.{timestamp}.bak"
-                        shutil.copytree(mp3_dir, mp3_backup)
-                        logger.info(f"Created backup of current MP3 files at {mp3_backup}")
-                    
-                    # Remove current MP3 directory and replace with backup
-                    if os.path.exists(mp3_dir):
-                        shutil.rmtree(mp3_dir)
-                    
-                    # Create MP3 directory if it doesn't exist
-                    os.makedirs(mp3_dir, exist_ok=True)
-                    
-                    # Copy MP3 files from backup
-                    for mp3_file in os.listdir(mp3_backup_dir):
-                        if mp3_file.endswith('.mp3'):
-                            source_path = os.path.join(mp3_backup_dir, mp3_file)
-                            dest_path = os.path.join(mp3_dir, mp3_file)
-                            shutil.copy2(source_path, dest_path)
-                    
-                    logger.info(f"Restored MP3 files from backup")
+                _restore_mp3_dir(os.path.join(temp_dir, 'mp3'), timestamp)
             
             # Restore config files if included in backup
             if metadata.get("includes_config", True):
-                config_backup_dir = os.path.join(temp_dir, 'config')
-                if os.path.exists(config_backup_dir):
-                    # Restore .env file if present in backup
-                    env_backup_path = os.path.join(config_backup_dir, '.env')
-                    if os.path.exists(env_backup_path):
-                        env_path = os.path.join(os.path.dirname(current_app.root_path), '.env')
-                        
-                        # Backup current .env
-                        if os.path.exists(env_path):
-                            env_backup = f"{env_path}.{timestamp}.bak"
-                            shutil.copy2(env_path, env_backup)
-                            logger.info(f"Created backup of current .env file at {env_backup}")
-                        
-                        # Restore .env from backup
-                        shutil.copy2(env_backup_path, env_path)
-                        logger.info(f"Restored .env file from backup")
-                    
-                    # Restore system settings from JSON if present
-                    settings_backup_path = os.path.join(config_backup_dir, 'system_settings.json')
-                    if os.path.exists(settings_backup_path):
-                        try:
-                            with open(settings_backup_path, 'r') as f:
-                                settings = json.load(f)
-                            
-                            # Import within function to avoid circular imports
-                            from musicround.models import SystemSetting, db
-                            
-                            # Restore each setting
-                            for key, value in settings.items():
-                                SystemSetting.set(key, value)
-                            
-                            logger.info("Restored system settings from backup")
-                        except Exception as e:
-                            logger.error(f"Error restoring system settings: {str(e)}")
+                _restore_config_dir(os.path.join(temp_dir, 'config'), timestamp)
         
         return {
             "status": "success",
@@ -566,16 +1071,214 @@ def restore_backup(backup_filename):
             "message": _safe_backup_error_message("Backup restore")
         }
 
-def verify_backup(backup_filename):
+def _verification_cache_path(backup_path):
+    return f"{backup_path}{VERIFY_CACHE_SUFFIX}"
+
+
+def _verification_key(backup_path):
+    """Return what a cached result depends on: the file, plus chunk GC for manifests."""
+    file_stat = os.stat(backup_path)
+    key = {'mtime_ns': file_stat.st_mtime_ns, 'size': file_stat.st_size}
+    if _is_incremental_backup_name(backup_path):
+        key['chunk_gc_ns'] = _chunk_store().gc_generation()
+    return key
+
+
+def _cached_verification(backup_path, level=VERIFY_QUICK):
+    """Return a stored verification result if the backup is unchanged.
+
+    A full result also answers quick requests; a quick one never answers a
+    full request. Incremental backups keep their data in the shared chunk
+    store, which chunk GC or disk corruption change without touching the
+    manifest, so their quick results are also keyed by the last chunk GC and
+    a full request on them always re-hashes the chunks.
+    """
+    incremental = _is_incremental_backup_name(backup_path)
+    if level == VERIFY_FULL and incremental:
+        return None
+    try:
+        key = _verification_key(backup_path)
+        with open(_verification_cache_path(backup_path), 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(cached, dict)
+        or any(cached.get(name) != value for name, value in key.items())
+        or (level == VERIFY_FULL and cached.get('level') != VERIFY_FULL)
+    ):
+        return None
+    return dict(cached.get('result') or {}, cached=True, verified_at=cached.get('verified_at'))
+
+
+def _store_verification(backup_path, level, result):
+    try:
+        key = _verification_key(backup_path)
+        with open(_verification_cache_path(backup_path), 'w') as f:
+            json.dump({
+                **key,
+                'level': level,
+                'verified_at': datetime.now().isoformat(),
+                'result': result,
+            }, f)
+    except OSError as e:
+        logger.warning(f"Could not cache verification result for {backup_path}: {str(e)}")
+
+
+def _discard_verification(backup_path):
+    try:
+        os.remove(_verification_cache_path(backup_path))
+    except FileNotFoundError:
+        pass
+
+
+def _verify_incremental_backup(manifest_path, backup_filename, level, progress):
+    """Check a manifest and its chunks: existence for quick, re-hashing for full."""
+    try:
+        manifest = read_manifest(manifest_path)
+    except ChunkStoreError as e:
+        return {"status": "error", "message": str(e), "is_valid": False}
+    paths = {entry["path"] for entry in manifest["files"]}
+    if not any(name in paths for name in BACKUP_DATABASE_FILENAMES):
+        return {
+            "status": "error",
+            "message": "Backup file does not contain a database",
+            "is_valid": False
+        }
+    store = _chunk_store()
+    digests = manifest_digests(manifest)
+    missing = [digest for digest in digests if not store.has_chunk(digest)]
+    if missing:
+        return {
+            "status": "error",
+            "message": f"Backup is missing {len(missing)} stored chunks",
+            "is_valid": False
+        }
+    if level == VERIFY_FULL:
+        corrupt = store.verify_chunks(digests, workers=_verify_workers(), progress=progress)
+        if corrupt:
+            return {
+                "status": "error",
+                "message": f"Backup has {len(corrupt)} corrupt stored chunks",
+                "is_valid": False
+            }
+    return {
+        "status": "success",
+        "message": "Backup file is valid",
+        "is_valid": True,
+        "version": manifest.get("version", "Unknown"),
+        "timestamp": manifest.get("timestamp", "Unknown"),
+        "checked_chunks": len(digests),
+    }
+
+
+def _verify_workers():
+    return current_app.config.get('BACKUP_VERIFY_WORKERS') or os.cpu_count() or DEFAULT_ARCHIVE_WORKERS
+
+
+def _database_member_is_valid(zipf, member_name):
+    """Cheap content check of the archive's database member."""
+    if member_name == LOGICAL_MANIFEST_MEMBER:
+        with zipf.open(member_name) as f:
+            manifest = read_logical_manifest(f)
+        return all(entry["member"] in zipf.NameToInfo for entry in manifest["tables"])
+    with zipf.open(member_name) as f:
+        return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+
+
+def _verify_zip_backup(backup_path, level, progress):
+    # Check if the file is a valid ZIP
+    if not zipfile.is_zipfile(backup_path):
+        return {
+            "status": "error",
+            "message": f"Backup file is not a valid ZIP archive",
+            "is_valid": False
+        }
+    
+    with zipfile.ZipFile(backup_path, 'r') as zipf:
+        # Check for essential files
+        db_member = _find_database_member(zipf.namelist())
+        if not db_member:
+            return {
+                "status": "error",
+                "message": "Backup file does not contain a database",
+                "is_valid": False
+            }
+
+        # Backups written before the checksum manifest existed are checked
+        # against their ZIP CRCs only.
+        entries = read_archive_manifest(zipf)
+        if entries is None:
+            entries = [
+                {"path": info.filename, "size": info.file_size}
+                for info in zipf.infolist() if not info.is_dir()
+            ]
+        mismatched = [
+            entry["path"] for entry in entries
+            if entry["path"] not in zipf.NameToInfo
+            or zipf.getinfo(entry["path"]).file_size != entry.get("size")
+        ]
+        if mismatched:
+            return {
+                "status": "error",
+                "message": f"Backup file contains corrupted files, first bad file: {mismatched[0]}",
+                "is_valid": False
+            }
+        if not _database_member_is_valid(zipf, db_member):
+            return {
+                "status": "error",
+                "message": "Database file in backup failed validation",
+                "is_valid": False
+            }
+        
+        # Extract metadata if available
+        if 'backup_metadata.json' in zipf.namelist():
+            with zipf.open('backup_metadata.json') as f:
+                metadata = json.load(f)
+        else:
+            metadata = {"version": "Unknown"}
+
+    if level == VERIFY_FULL:
+        # Decompress and hash every member across worker threads
+        failed = verify_archive_members(
+            backup_path, entries, workers=_verify_workers(), progress=progress
+        )
+        if failed:
+            return {
+                "status": "error",
+                "message": f"Backup file contains corrupted files, first bad file: {failed[0]}",
+                "is_valid": False
+            }
+    
+    # If we got here, the backup is valid
+    return {
+        "status": "success",
+        "message": "Backup file is valid",
+        "is_valid": True,
+        "version": metadata.get("version", "Unknown"),
+        "timestamp": metadata.get("timestamp", "Unknown"),
+        "checked_members": len(entries),
+    }
+
+
+def verify_backup(backup_filename, level=VERIFY_QUICK, progress=None, use_cache=True):
     """
     Verify the integrity of a backup file.
     
     Args:
         backup_filename: Name of the backup file to verify
+        level: ``'quick'`` checks the manifest, member sizes, and database
+            header; ``'full'`` also decompresses and SHA-256 checks every
+            member (or stored chunk) in parallel
+        progress: Optional ``callback(done, total)`` for full verification
+        use_cache: Return a stored result when the file has not changed
         
     Returns:
         dict: Verification result
     """
+    if level not in VERIFY_LEVELS:
+        raise ValueError(f"Unknown backup verification level: {level}")
+
     backups_path = backup_dir()
     backup_path = os.path.join(backups_path, backup_filename)
     
@@ -585,51 +1288,17 @@ def verify_backup(backup_filename):
             "message": f"Backup file {backup_filename} not found",
             "is_valid": False
         }
-    
+
+    if use_cache:
+        cached = _cached_verification(backup_path, level)
+        if cached is not None:
+            return cached
+
     try:
-        # Check if the file is a valid ZIP
-        if not zipfile.is_zipfile(backup_path):
-            return {
-                "status": "error",
-                "message": f"Backup file is not a valid ZIP archive",
-                "is_valid": False
-            }
-        
-        # Try to open the ZIP and extract metadata
-        with zipfile.ZipFile(backup_path, 'r') as zipf:
-            # Test the integrity of all files in the ZIP
-            test_result = zipf.testzip()
-            if test_result is not None:
-                return {
-                    "status": "error",
-                    "message": f"Backup file contains corrupted files, first bad file: {test_result}",
-                    "is_valid": False
-                }
-            
-            # Check for essential files
-            if not _find_database_member(zipf.namelist()):
-                return {
-                    "status": "error",
-                    "message": "Backup file does not contain a database",
-                    "is_valid": False
-                }
-            
-            # Extract metadata if available
-            if 'backup_metadata.json' in zipf.namelist():
-                with zipf.open('backup_metadata.json') as f:
-                    metadata = json.load(f)
-            else:
-                metadata = {"version": "Unknown"}
-        
-        # If we got here, the backup is valid
-        return {
-            "status": "success",
-            "message": "Backup file is valid",
-            "is_valid": True,
-            "version": metadata.get("version", "Unknown"),
-            "timestamp": metadata.get("timestamp", "Unknown")
-        }
-    
+        if _is_incremental_backup_name(backup_filename):
+            result = _verify_incremental_backup(backup_path, backup_filename, level, progress)
+        else:
+            result = _verify_zip_backup(backup_path, level, progress)
     except Exception as e:
         logger.error(f"Error verifying backup {backup_filename}: {str(e)}")
         return {
@@ -638,6 +1307,10 @@ def verify_backup(backup_filename):
             "is_valid": False
         }
 
+    result["level"] = level
+    _store_verification(backup_path, level, result)
+    return result
+
 def schedule_backup(schedule_time=None, frequency='daily', retention_days=30):
     """
     Schedule automatic backups.
@@ -968,18 +1641,26 @@ def apply_retention_policy(retention_days=30):
                 if backup_path and os.path.exists(backup_path):
                     try:
                         os.remove(backup_path)
+                        _discard_verification(backup_path)
                         deleted_backups.append({
                             'name': backup.get('backup_name') or os.path.basename(backup_path),
+                            'file': os.path.basename(backup_path),
                             'date': backup_time.isoformat()
                         })
                     except Exception as e:
                         logger.error(f"Error deleting old backup {backup_path}: {str(e)}")
         
+        # Chunks only referenced by expired manifests are reclaimed here
+        garbage_collection = None
+        if any(_is_incremental_backup_name(b['file']) for b in deleted_backups):
+            garbage_collection = garbage_collect_backup_chunks()
+
         return {
             "status": "success",
             "message": f"Retention policy applied: deleted {len(deleted_backups)} backups older than {retention_days} days",
             "deleted_count": len(deleted_backups),
-            "deleted_backups": deleted_backups
+            "deleted_backups": deleted_backups,
+            "garbage_collection": garbage_collection
         }
     
     except Exception as e:
@@ -0,0 +1,340 @@
+"""
+Content-addressed chunk store for incremental application backups.
+
+Files are split into fixed-size chunks named by the SHA-256 of their
+uncompressed bytes. An incremental backup is a JSON manifest that lists the
+chunks of every file, so data that did not change between runs is stored
+once no matter how many backups reference it. Chunks that no manifest
+references are removed by garbage collection.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator
+
+MANIFEST_FORMAT = "qb-incremental-backup"
+MANIFEST_FORMAT_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_COMPRESSION_LEVEL = 3
+DEFAULT_GC_GRACE_SECONDS = 3600
+_DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+_TEMP_PREFIX = ".tmp-"
+_GC_MARKER = "last_gc"
+
+
+class ChunkStoreError(ValueError):
+    """Raised when a manifest or chunk is missing, malformed, or corrupt."""
+
+
+def _empty_stats() -> dict[str, int]:
+    return {
+        "files": 0,
+        "unchanged_files": 0,
+        "new_chunks": 0,
+        "reused_chunks": 0,
+        "logical_bytes": 0,
+        "read_bytes": 0,
+        "stored_bytes": 0,
+    }
+
+
+def merge_stats(total: dict[str, int], part: dict[str, int]) -> dict[str, int]:
+    """Add one file's counters to a running backup total."""
+    for key, value in part.items():
+        total[key] = total.get(key, 0) + value
+    return total
+
+
+def file_sha256(path: str, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkStore:
+    """Deduplicating chunk storage below ``root``.
+
+    Chunks live at ``chunks/<first two hex digits>/<digest>`` and are
+    zlib-compressed on disk. Writes go through a temporary file and
+    ``os.replace`` so a crashed backup never leaves a truncated chunk under
+    its final name.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    ):
+        if chunk_size < 4096:
+            raise ValueError("Backup chunk size must be at least 4096 bytes.")
+        self.root = root
+        self.chunks_dir = os.path.join(root, "chunks")
+        self.gc_marker_path = os.path.join(root, _GC_MARKER)
+        self.chunk_size = int(chunk_size)
+        self.compression_level = max(0, min(9, int(compression_level)))
+
+    def chunk_path(self, digest: str) -> str:
+        if not _DIGEST_PATTERN.match(digest or ""):
+            raise ChunkStoreError("Backup manifest references an invalid chunk digest.")
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    def has_chunk(self, digest: str, touch: bool = False) -> bool:
+        """Return whether a chunk exists, optionally refreshing its GC grace period."""
+        path = self.chunk_path(digest)
+        try:
+            if touch:
+                os.utime(path)
+            else:
+                os.stat(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put_chunk(self, data: bytes) -> tuple[str, int]:
+        """Store ``data`` unless present; return its digest and the bytes written."""
+        digest = hashlib.sha256(data).hexdigest()
+        if self.has_chunk(digest, touch=True):
+            return digest, 0
+        path = self.chunk_path(digest)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        payload = zlib.compress(data, self.compression_level)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=_TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return digest, len(payload)
+
+    def read_chunk(self, digest: str) -> bytes:
+        """Return a chunk's bytes after checking them against the digest."""
+        path = self.chunk_path(digest)
+        try:
+            with open(path, "rb") as handle:
+                data = zlib.decompress(handle.read())
+        except FileNotFoundError:
+            raise ChunkStoreError(f"Backup chunk {digest} is missing.") from None
+        except zlib.error:
+            raise ChunkStoreError(f"Backup chunk {digest} is corrupt.") from None
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ChunkStoreError(f"Backup chunk {digest} is corrupt.")
+        return data
+
+    def put_file(
+        self,
+        source_path: str,
+        arcname: str,
+        previous: dict[str, Any] | None = None,
+    ) -> tuple[dict[str, Any], dict[str, int]]:
+        """Chunk a file into the store and return its manifest entry and counters.
+
+        When ``previous`` (the same path's entry from the last manifest) has
+        the same size and modification time and all of its chunks are still
+        present, it is reused without reading the file again.
+        """
+        stats = _empty_stats()
+        stats["files"] = 1
+        file_stat = os.stat(source_path)
+        stats["logical_bytes"] = file_stat.st_size
+        if (
+            previous
+            and previous.get("size") == file_stat.st_size
+            and previous.get("mtime_ns") == file_stat.st_mtime_ns
+            and all(self.has_chunk(digest, touch=True) for digest in previous.get("chunks", []))
+        ):
+            stats["unchanged_files"] = 1
+            stats["reused_chunks"] = len(previous["chunks"])
+            return dict(previous, path=arcname), stats
+
+        file_hash = hashlib.sha256()
+        chunks: list[str] = []
+        with open(source_path, "rb") as handle:
+            for data in iter(lambda: handle.read(self.chunk_size), b""):
+                file_hash.update(data)
+                digest, written = self.put_chunk(data)
+                chunks.append(digest)
+                stats["read_bytes"] += len(data)
+                if written:
+                    stats["new_chunks"] += 1
+                    stats["stored_bytes"] += written
+                else:
+                    stats["reused_chunks"] += 1
+        entry = {
+            "path": arcname,
+            "size": file_stat.st_size,
+            "mtime_ns": file_stat.st_mtime_ns,
+            "sha256": file_hash.hexdigest(),
+            "chunks": chunks,
+        }
+        return entry, stats
+
+    def iter_file(self, entry: dict[str, Any]) -> Iterator[bytes]:
+        for digest in entry.get("chunks", []):
+            yield self.read_chunk(digest)
+
+    def restore_file(self, entry: dict[str, Any], destination: str) -> None:
+        """Reassemble ``entry`` at ``destination`` atomically, verifying size and hash."""
+        directory = os.path.dirname(os.path.abspath(destination))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=_TEMP_PREFIX)
+        try:
+            file_hash = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, "wb") as handle:
+                for data in self.iter_file(entry):
+                    handle.write(data)
+                    file_hash.update(data)
+                    size += len(data)
+            if size != entry.get("size") or file_hash.hexdigest() != entry.get("sha256"):
+                raise ChunkStoreError(f"Restored file {entry.get('path')} failed its checksum.")
+            os.replace(temp_path, destination)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        if entry.get("mtime_ns"):
+            os.utime(destination, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+
+    def matches_entry(self, entry: dict[str, Any], path: str) -> bool:
+        """Return whether ``path`` already holds the entry's content."""
+        try:
+            file_stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if file_stat.st_size != entry.get("size"):
+            return False
+        if entry.get("mtime_ns") and file_stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        return file_sha256(path) == entry.get("sha256")
+
+    def verify_chunks(
+        self,
+        digests: Iterable[str],
+        workers: int = 4,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> list[str]:
+        """Read and re-hash chunks in parallel; return the digests that failed.
+
+        ``progress(done, total)`` counts chunks and runs in the calling thread.
+        """
+        digests = sorted(set(digests))
+        failed = []
+        with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="backup-verify") as executor:
+            futures = {executor.submit(self.read_chunk, digest): digest for digest in digests}
+            for done, future in enumerate(as_completed(futures), start=1):
+                if future.exception() is not None:
+                    failed.append(futures[future])
+                if progress is not None:
+                    progress(done, len(digests))
+        return sorted(failed)
+
+    def iter_chunks(self) -> Iterator[tuple[str, str]]:
+        if not os.path.isdir(self.chunks_dir):
+            return
+        for prefix in os.listdir(self.chunks_dir):
+            prefix_dir = os.path.join(self.chunks_dir, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                yield name, os.path.join(prefix_dir, name)
+
+    def garbage_collect(
+        self,
+        live_digests: Iterable[str],
+        grace_seconds: int = DEFAULT_GC_GRACE_SECONDS,
+    ) -> dict[str, int]:
+        """Delete chunks no manifest references.
+
+        Chunks written or reused within ``grace_seconds`` are kept even when
+        unreferenced, because a backup that is still running has not saved
+        its manifest yet.
+        """
+        live = set(live_digests)
+        cutoff = time.time() - max(0, grace_seconds)
+        result = {"removed_chunks": 0, "freed_bytes": 0, "kept_recent_chunks": 0, "live_chunks": 0}
+        for name, path in self.iter_chunks():
+            if name in live:
+                result["live_chunks"] += 1
+                continue
+            try:
+                chunk_stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if chunk_stat.st_mtime > cutoff:
+                result["kept_recent_chunks"] += 1
+                continue
+            os.remove(path)
+            if not name.startswith(_TEMP_PREFIX):
+                result["removed_chunks"] += 1
+                result["freed_bytes"] += chunk_stat.st_size
+        if result["removed_chunks"]:
+            with open(self.gc_marker_path, "w") as handle:
+                handle.write(str(time.time_ns()))
+        return result
+
+    def gc_generation(self) -> int:
+        """Return when a collection last removed chunks, in ns; 0 if it never did."""
+        try:
+            return os.stat(self.gc_marker_path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+
+def manifest_digests(manifest: dict[str, Any]) -> set[str]:
+    return {digest for entry in manifest.get("files", []) for digest in entry.get("chunks", [])}
+
+
+def read_manifest(path: str) -> dict[str, Any]:
+    """Load and structurally validate an incremental backup manifest."""
+    try:
+        with open(path, "r") as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError) as exc:
+        raise ChunkStoreError("Backup manifest is unreadable.") from exc
+    if not isinstance(manifest, dict) or manifest.get("format") != MANIFEST_FORMAT:
+        raise ChunkStoreError("File is not an incremental backup manifest.")
+    if manifest.get("format_version") != MANIFEST_FORMAT_VERSION:
+        raise ChunkStoreError("Unsupported incremental backup manifest version.")
+    files = manifest.get("files")
+    if not isinstance(files, list):
+        raise ChunkStoreError("Backup manifest has no file list.")
+    for entry in files:
+        path_name = str(entry.get("path") or "") if isinstance(entry, dict) else ""
+        if (
+            not path_name
+            or path_name.startswith("/")
+            or ".." in path_name.split("/")
+            or not isinstance(entry.get("chunks"), list)
+            or not all(_DIGEST_PATTERN.match(str(digest)) for digest in entry["chunks"])
+        ):
+            raise ChunkStoreError("Backup manifest contains an invalid file entry.")
+    return manifest
+
+
+def write_manifest(path: str, manifest: dict[str, Any]) -> None:
+    """Write a manifest atomically so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=_TEMP_PREFIX, suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as handle:
+            json.dump(manifest, handle, indent=2)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
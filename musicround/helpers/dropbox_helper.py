@@ -4,10 +4,14 @@ Helpers for Dropbox API integration
 from flask import current_app, flash, url_for, redirect, session
 from musicround.helpers.auth_helpers import get_oauth_redirect_uri
 from musicround.helpers.logging_utils import redact_authorization_header
+from musicround.helpers.provider_telemetry import record_provider_retry
 import requests
+import io
 import json
 import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from flask_login import current_user
 
@@ -20,6 +24,14 @@ DROPBOX_REFRESH_ERROR_MESSAGE = 'Dropbox token refresh failed. Please try again
 DROPBOX_UPLOAD_ERROR_MESSAGE = 'Dropbox upload failed. Please try again or reconnect Dropbox.'
 DROPBOX_SHARED_LINK_ERROR_MESSAGE = 'Dropbox shared-link creation failed. Please try again or reconnect Dropbox.'
 DROPBOX_API_TIMEOUT_SECONDS = 10
+# Upload-session appends carry a whole chunk, so they get a longer timeout.
+DROPBOX_CONTENT_TIMEOUT_SECONDS = 120
+DROPBOX_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DROPBOX_UPLOAD_CONCURRENCY = 3
+DROPBOX_UPLOAD_MAX_RETRIES = 4
+DROPBOX_RETRY_BACKOFF_SECONDS = 1.0
+DROPBOX_CONTENT_URL = 'https://content.dropboxapi.com/2'
+DROPBOX_API_URL = 'https://api.dropboxapi.com/2'
 
 
 def format_dropbox_path(path):
@@ -337,6 +349,21 @@ def refresh_dropbox_token_if_needed(user, force=False):
         current_app.logger.error(f"Error refreshing Dropbox token: {str(e)}")
         return {'success': False, 'message': DROPBOX_REFRESH_ERROR_MESSAGE}
 
+def _upload_size(data):
+    """Return the byte length of upload data, or None for a stream of unknown size."""
+    if data is None:
+        return 0
+    if hasattr(data, 'read'):
+        size = getattr(data, 'size', None)
+        if size is None and hasattr(data, 'fileno'):
+            try:
+                size = os.fstat(data.fileno()).st_size
+            except (OSError, ValueError):
+                size = None
+        return size
+    return len(data)
+
+
 def upload_to_dropbox(access_token, dropbox_path, data, mode='binary'):
     """
     Upload data to Dropbox
@@ -344,7 +371,8 @@ def upload_to_dropbox(access_token, dropbox_path, data, mode='binary'):
     Args:
         access_token: Dropbox access token
         dropbox_path: Destination path in Dropbox (including filename)
-        data: The data to upload (bytes for binary mode, string for text mode)
+        data: The data to upload (bytes for binary mode, string for text mode),
+              or a readable binary stream, which is sent without buffering it
         mode: 'binary' or 'text'
         
     Returns:
@@ -361,7 +389,7 @@ def upload_to_dropbox(access_token, dropbox_path, data, mode='binary'):
             "Upload to Dropbox - Path: %s, Token present: %s, Data size: %s bytes",
             dropbox_path,
             bool(access_token),
-            len(data) if data else 0,
+            _upload_size(data),
         )
         
         headers = {
@@ -471,6 +499,20 @@ def create_shared_link(access_token, dropbox_path):
         if response.status_code == 409 and "shared_link_already_exists" in response.text:
             current_app.logger.debug("Shared link already exists, retrieving existing link")
             
+            # The conflict usually carries the existing link, which saves a list call.
+            try:
+                existing = response.json()['error']['shared_link_already_exists']['metadata']
+                url = existing['url']
+            except (ValueError, KeyError, TypeError):
+                url = None
+            if url:
+                current_app.logger.info(f"Retrieved existing shared link: {url}")
+                return {
+                    'success': True,
+                    'message': 'Existing shared link retrieved',
+                    'url': url
+                }
+            
             # Get existing links
             list_data = {
                 'path': dropbox_path
@@ -538,6 +580,291 @@ def create_shared_link(access_token, dropbox_path):
             'message': DROPBOX_SHARED_LINK_ERROR_MESSAGE
         }
 
+class _DropboxUploadError(Exception):
+    """Raised inside an upload session when Dropbox rejects a request for good."""
+
+    def __init__(self, status_code=None):
+        super().__init__(DROPBOX_UPLOAD_ERROR_MESSAGE)
+        self.status_code = status_code
+
+
+def _retry_delay(response, attempt):
+    """Honour Retry-After on 429/503 responses, otherwise back off exponentially."""
+    if response is not None:
+        try:
+            return max(0.0, float(response.headers.get('Retry-After')))
+        except (TypeError, ValueError, AttributeError):
+            pass
+    return DROPBOX_RETRY_BACKOFF_SECONDS * (2 ** attempt)
+
+
+def _post_with_retry(url, **kwargs):
+    """POST to Dropbox, retrying timeouts, connection errors, 429s, and 5xx responses."""
+    for attempt in range(DROPBOX_UPLOAD_MAX_RETRIES + 1):
+        response = None
+        try:
+            response = requests.post(url, **kwargs)
+        except (requests.Timeout, requests.ConnectionError):
+            if attempt == DROPBOX_UPLOAD_MAX_RETRIES:
+                raise
+        else:
+            if response.status_code != 429 and response.status_code < 500:
+                return response
+            if attempt == DROPBOX_UPLOAD_MAX_RETRIES:
+                return response
+        delay = _retry_delay(response, attempt)
+        current_app.logger.warning(
+            "Transient Dropbox error on %s (attempt %s), retrying in %.1fs",
+            url.rsplit('/2/', 1)[-1], attempt + 1, delay,
+        )
+        record_provider_retry(url)
+        time.sleep(delay)
+
+
+def _correct_offset(response):
+    """Return the offset Dropbox expects after an ``incorrect_offset`` lookup failure."""
+    try:
+        error = response.json().get('error', {})
+    except ValueError:
+        return None
+    lookup = error.get('lookup_failed') or error
+    if lookup.get('.tag') != 'incorrect_offset':
+        return None
+    return lookup.get('correct_offset')
+
+
+def _session_append(access_token, session_id, offset, chunk, close):
+    """Append ``chunk`` at ``offset`` and return the new session offset.
+
+    A retried append whose first attempt actually landed comes back as
+    ``incorrect_offset``; the offset Dropbox reports tells us how much of the
+    chunk it already has, so only the remainder is sent again.
+    """
+    start = offset
+    end = start + len(chunk)
+    while True:
+        response = _post_with_retry(
+            f'{DROPBOX_CONTENT_URL}/files/upload_session/append_v2',
+            headers={
+                'Authorization': f'Bearer {access_token}',
+                'Dropbox-API-Arg': json.dumps({
+                    'cursor': {'session_id': session_id, 'offset': offset},
+                    'close': close,
+                }),
+                'Content-Type': 'application/octet-stream',
+            },
+            data=chunk[offset - start:],
+            timeout=DROPBOX_CONTENT_TIMEOUT_SECONDS,
+        )
+        if response.status_code == 200:
+            return end
+        correct = _correct_offset(response) if response.status_code == 409 else None
+        if correct is None or not start <= correct <= end:
+            current_app.logger.error(
+                "Dropbox upload session append failed: status %s", response.status_code
+            )
+            raise _DropboxUploadError(response.status_code)
+        if correct == end:
+            # The whole chunk (and its close flag) landed on an earlier attempt.
+            return end
+        current_app.logger.info(
+            "Resuming Dropbox upload session at offset %s (sent from %s)", correct, offset
+        )
+        offset = correct
+
+
+def _upload_session(access_token, stream, chunk_size):
+    """Upload ``stream`` through an upload session and return its finish cursor."""
+    chunk = stream.read(chunk_size)
+    # Read one chunk ahead so the last request can close the session.
+    following = stream.read(chunk_size) if chunk else b''
+    response = _post_with_retry(
+        f'{DROPBOX_CONTENT_URL}/files/upload_session/start',
+        headers={
+            'Authorization': f'Bearer {access_token}',
+            'Dropbox-API-Arg': json.dumps({'close': not following}),
+            'Content-Type': 'application/octet-stream',
+        },
+        data=chunk,
+        timeout=DROPBOX_CONTENT_TIMEOUT_SECONDS,
+    )
+    if response.status_code != 200:
+        current_app.logger.error(
+            "Dropbox upload session start failed: status %s", response.status_code
+        )
+        raise _DropboxUploadError(response.status_code)
+    session_id = response.json()['session_id']
+
+    offset = len(chunk)
+    while following:
+        chunk = following
+        following = stream.read(chunk_size)
+        offset = _session_append(access_token, session_id, offset, chunk, close=not following)
+    return {'session_id': session_id, 'offset': offset}
+
+
+def _finish_upload_sessions(access_token, sessions):
+    """Commit closed upload sessions with one finish_batch call.
+
+    ``sessions`` maps each Dropbox path to its cursor; returns one result per
+    path in the same shape as :func:`upload_to_dropbox`.
+    """
+    paths = list(sessions)
+    response = _post_with_retry(
+        f'{DROPBOX_API_URL}/files/upload_session/finish_batch_v2',
+        headers={
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/json',
+        },
+        json={'entries': [
+            {
+                'cursor': sessions[path],
+                'commit': {'path': path, 'mode': 'overwrite', 'autorename': True, 'mute': False},
+            }
+            for path in paths
+        ]},
+        timeout=DROPBOX_CONTENT_TIMEOUT_SECONDS,
+    )
+    if response.status_code != 200:
+        current_app.logger.error(
+            "Dropbox upload session finish failed: status %s", response.status_code
+        )
+        return {
+            path: {
+                'success': False,
+                'message': DROPBOX_UPLOAD_ERROR_MESSAGE,
+                'status_code': response.status_code,
+            }
+            for path in paths
+        }
+
+    results = {}
+    entries = response.json().get('entries', [])
+    for index, path in enumerate(paths):
+        entry = dict(entries[index]) if index < len(entries) else {'.tag': 'failure'}
+        if entry.pop('.tag', None) == 'success':
+            current_app.logger.info(f"File uploaded successfully: {entry.get('path_display')}")
+            results[path] = {
+                'success': True,
+                'message': 'File uploaded successfully',
+                'metadata': entry,
+            }
+        else:
+            current_app.logger.error(f"Dropbox upload session commit failed for {path}: {entry}")
+            results[path] = {'success': False, 'message': DROPBOX_UPLOAD_ERROR_MESSAGE}
+    return results
+
+
+def _run_in_app_context(items, worker, max_workers):
+    """Map ``worker`` over ``items`` on a thread pool that shares the app context."""
+    app = current_app._get_current_object()
+
+    def run(item):
+        with app.app_context():
+            return worker(item)
+
+    workers = max(1, min(int(max_workers), len(items)))
+    if workers == 1:
+        return [worker(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dropbox') as executor:
+        return list(executor.map(run, items))
+
+
+def upload_files_to_dropbox(access_token, uploads, chunk_size=None, max_workers=None):
+    """
+    Upload several independent files to Dropbox concurrently.
+
+    Files that fit in one chunk use a single files/upload call. Larger files
+    and streams of unknown size go through an upload session: the data is
+    appended chunk by chunk, transient failures are retried and resumed from
+    the offset Dropbox reports, and all sessions are committed together with
+    one finish_batch call.
+
+    Args:
+        access_token: Dropbox access token
+        uploads: list of dicts with 'path', 'data', and optional 'mode'
+                 ('binary' or 'text'); data may be bytes, str, or a stream
+        chunk_size: upload-session chunk size in bytes
+        max_workers: how many files to upload at once
+
+    Returns:
+        list: one {'success', 'message', 'metadata'|'status_code'} dict per upload, in order
+    """
+    if not uploads:
+        return []
+    config = current_app.config
+    chunk_size = int(chunk_size or config.get('DROPBOX_UPLOAD_CHUNK_MB', 8) * 1024 * 1024)
+    # Dropbox requires every non-final append to be a multiple of 4 MiB.
+    chunk_size = max(4, chunk_size // (4 * 1024 * 1024) * 4) * 1024 * 1024
+    max_workers = max_workers or config.get('DROPBOX_UPLOAD_CONCURRENCY', DROPBOX_UPLOAD_CONCURRENCY)
+
+    def upload_one(upload):
+        data = upload['data']
+        mode = upload.get('mode', 'binary')
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        size = _upload_size(data)
+        if size is not None and size <= chunk_size:
+            return upload_to_dropbox(access_token, upload['path'], data, mode=mode)
+        if not hasattr(data, 'read'):
+            data = io.BytesIO(data)
+        try:
+            return {'session': _upload_session(access_token, data, chunk_size)}
+        except _DropboxUploadError as exc:
+            return {
+                'success': False,
+                'message': DROPBOX_UPLOAD_ERROR_MESSAGE,
+                'status_code': exc.status_code,
+            }
+        except Exception as exc:
+            current_app.logger.error(f"Exception in Dropbox upload session: {str(exc)}")
+            return {'success': False, 'message': DROPBOX_UPLOAD_ERROR_MESSAGE}
+
+    results = _run_in_app_context(uploads, upload_one, max_workers)
+
+    sessions = {
+        format_dropbox_path(upload['path']): result['session']
+        for upload, result in zip(uploads, results)
+        if 'session' in result
+    }
+    if sessions:
+        try:
+            finished = _finish_upload_sessions(access_token, sessions)
+        except Exception as exc:
+            current_app.logger.error(f"Exception finishing Dropbox upload sessions: {str(exc)}")
+            finished = {
+                path: {'success': False, 'message': DROPBOX_UPLOAD_ERROR_MESSAGE}
+                for path in sessions
+            }
+        results = [
+            finished[format_dropbox_path(upload['path'])] if 'session' in result else result
+            for upload, result in zip(uploads, results)
+        ]
+    return results
+
+
+def create_shared_links(access_token, dropbox_paths, max_workers=None):
+    """
+    Create shared links for several files concurrently.
+
+    Dropbox has no batch endpoint for shared links, so this issues the
+    per-file calls in parallel.
+
+    Returns:
+        list: one create_shared_link result per path, in order
+    """
+    if not dropbox_paths:
+        return []
+    max_workers = max_workers or current_app.config.get(
+        'DROPBOX_UPLOAD_CONCURRENCY', DROPBOX_UPLOAD_CONCURRENCY
+    )
+    return _run_in_app_context(
+        list(dropbox_paths),
+        lambda path: create_shared_link(access_token, path),
+        max_workers,
+    )
+
+
 def get_dropbox_account_info(access_token):
     """
     Get account information for a Dropbox user
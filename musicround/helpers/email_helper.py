@@ -1,15 +1,23 @@
 """
 Email helper functions for Quizzical Beats
 """
+import base64
+import io
 import smtplib
+import threading
+from contextlib import contextmanager
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
 from flask import current_app
 
+from musicround.helpers.provider_telemetry import record_provider_retry, track_provider_call
+
 EMAIL_CONFIGURATION_ERROR = "Email server configuration is incomplete. Check the server logs."
 EMAIL_DELIVERY_ERROR = "Email delivery failed. Check the server logs."
+# A multiple of 57 raw bytes, so every block encodes to whole 76-character lines.
+ATTACHMENT_ENCODE_BLOCK_SIZE = 57 * 16 * 1024
 
 
 def email_configuration_status(required=False):
@@ -90,7 +98,85 @@ def send_account_verification_email(recipient, username, verification_url):
     )
 
 
-def send_email(recipient, subject, body_text, attachments=None):
+def _encode_attachment_stream(stream):
+    """Base64-encode a binary stream block by block without reading it whole."""
+    encoded = io.StringIO()
+    for block in iter(lambda: stream.read(ATTACHMENT_ENCODE_BLOCK_SIZE), b""):
+        encoded.write(base64.encodebytes(block).decode("ascii"))
+    return encoded.getvalue()
+
+
+class SMTPConnectionPool:
+    """Logged-in SMTP connections shared by a batch of deliveries.
+
+    Each connection is used by one thread at a time and returned to the pool
+    afterwards, so a burst of messages pays for the TCP, TLS, and AUTH
+    handshakes once per connection instead of once per message. Connections
+    the server has dropped are replaced on the next use. Call :meth:`close`
+    when the batch is done.
+    """
+
+    def __init__(self, size=4):
+        config = current_app.config
+        self.size = max(1, int(size))
+        self._host = config.get('MAIL_HOST')
+        self._port = config.get('MAIL_PORT')
+        self._username = config.get('MAIL_USERNAME')
+        self._password = config.get('MAIL_PASSWORD')
+        self._use_tls = config.get('MAIL_USE_TLS', False)
+        self._use_ssl = config.get('MAIL_USE_SSL', False)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self.opened = 0
+
+    def _open(self):
+        smtp_client = smtplib.SMTP_SSL if self._use_ssl else smtplib.SMTP
+        server = smtp_client(self._host, self._port, timeout=30)
+        try:
+            if not self._use_ssl and self._use_tls:
+                server.starttls()
+            server.login(self._username, self._password)
+        except BaseException:
+            server.close()
+            raise
+        with self._lock:
+            self.opened += 1
+        return server
+
+    @contextmanager
+    def connection(self, fresh=False):
+        """Yield a logged-in connection; it goes back to the pool unless it failed."""
+        with self._slots:
+            server = None
+            if not fresh:
+                with self._lock:
+                    server = self._idle.pop() if self._idle else None
+            if server is None:
+                server = self._open()
+            try:
+                yield server
+            except BaseException:
+                _quit_quietly(server)
+                raise
+            with self._lock:
+                self._idle.append(server)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server in idle:
+            _quit_quietly(server)
+
+
+def _quit_quietly(server):
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+def send_email(recipient, subject, body_text, attachments=None, smtp_pool=None):
     """
     Sends an email with optional attachments.
     
@@ -99,9 +185,12 @@ def send_email(recipient, subject, body_text, attachments=None):
         subject (str): Email subject
         body_text (str): Plain text email body
         attachments (list): Optional list of attachment dictionaries with keys:
-                            - 'data': The binary data of the attachment
+                            - 'data': The binary data of the attachment, or a
+                              readable binary stream that is encoded in blocks
                             - 'filename': Filename for the attachment
                             - 'mimetype': Mimetype string like 'application/pdf'
+        smtp_pool (SMTPConnectionPool): Optional pool whose connection is reused
+                                        instead of opening a new one
                             
     Returns:
         tuple: (success, message) where success is a boolean and message contains
@@ -156,8 +245,12 @@ def send_email(recipient, subject, body_text, attachments=None):
                 attachment.get('mimetype', 'application/octet-stream').split('/')[0],
                 attachment.get('mimetype', 'application/octet-stream').split('/')[1]
             )
-            part.set_payload(attachment['data'])
-            encoders.encode_base64(part)
+            if hasattr(attachment['data'], 'read'):
+                part.set_payload(_encode_attachment_stream(attachment['data']))
+                part['Content-Transfer-Encoding'] = 'base64'
+            else:
+                part.set_payload(attachment['data'])
+                encoders.encode_base64(part)
             part.add_header(
                 'Content-Disposition',
                 f'attachment; filename={attachment["filename"]}'
@@ -166,8 +259,23 @@ def send_email(recipient, subject, body_text, attachments=None):
 
     try:
         current_app.logger.info(f"Attempting to send email to {recipient} via {mail_host}:{mail_port}")
+        if smtp_pool is not None:
+            payload = msg.as_string()
+            with track_provider_call('smtp', '/sendmail'):
+                try:
+                    with smtp_pool.connection() as server:
+                        server.sendmail(mail_sender, recipient, payload)
+                except smtplib.SMTPServerDisconnected:
+                    # An idle pooled connection may have been closed by the server.
+                    current_app.logger.debug("Pooled SMTP connection was closed; reconnecting")
+                    record_provider_retry('smtp', '/sendmail')
+                    with smtp_pool.connection(fresh=True) as server:
+                        server.sendmail(mail_sender, recipient, payload)
+            current_app.logger.info(f"Email sent successfully from {mail_sender} to {recipient}")
+            return True, f'Email sent successfully to {recipient}!'
+
         smtp_client = smtplib.SMTP_SSL if mail_use_ssl else smtplib.SMTP
-        with smtp_client(mail_host, mail_port, timeout=30) as server:
+        with track_provider_call('smtp', '/sendmail'), smtp_client(mail_host, mail_port, timeout=30) as server:
             if mail_use_ssl:
                 current_app.logger.debug("Implicit TLS SMTP connection established")
             elif mail_use_tls:
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import threading
 import json
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from queue import PriorityQueue, Empty
@@ -17,10 +19,13 @@ from musicround.models import ImportJobRecord, User, db
 from musicround.helpers.database_config import bool_from_config
 from musicround.helpers.email_helper import send_email
 from musicround.helpers.import_helper import ImportHelper
+from musicround.helpers.query_profiler import profile_scope
+from musicround.helpers.runtime_profiler import capture_profile
 from musicround.helpers.spotify_helper import get_spotify_token
 
 
 IMPORT_JOB_FAILURE_MESSAGE = "Import job failed. Check the server logs."
+IMPORT_JOB_STATUSES = ("pending", "processing", "completed", "failed", "dead_letter")
 
 
 def _safe_result_error_summary(errors: list[Any]) -> str | None:
@@ -96,6 +101,98 @@ def _safe_import_result_metadata(result: Any) -> dict[str, Any] | None:
     return {"playlist_positions": safe_positions}
 
 
+def import_job_event_payload(
+    record: ImportJobRecord,
+    previous_status: Optional[str] = None,
+) -> dict[str, Any]:
+    """Return the compact job-transition payload pushed to progress subscribers."""
+    return {
+        "job_id": record.id,
+        "user_id": record.user_id,
+        "service_name": record.service_name,
+        "item_type": record.item_type,
+        "item_id": record.item_id,
+        "priority": record.priority,
+        "status": record.status,
+        "previous_status": previous_status,
+        "attempt_count": record.attempt_count or 0,
+        "max_attempts": record.max_attempts or 3,
+        "imported_count": record.imported_count or 0,
+        "skipped_count": record.skipped_count or 0,
+        "error_message": record.error_message,
+        "completed_at": record.completed_at.isoformat() if record.completed_at else None,
+    }
+
+
+def apply_import_event_to_stats(stats: dict[str, int], event: dict[str, Any]) -> dict[str, int]:
+    """Move one job between status counters without querying the database."""
+    previous_status = event.get("previous_status")
+    status = event.get("status")
+    if previous_status == status:
+        return stats
+    if previous_status in stats:
+        stats[previous_status] = max(0, stats[previous_status] - 1)
+    if status in stats:
+        stats[status] += 1
+    return stats
+
+
+class ImportEventBus:
+    """In-process fan-out of import job state transitions.
+
+    Workers publish every status change here so progress streams can push
+    updates instead of re-querying the job table. A bounded history lets
+    reconnecting subscribers resume from their last seen sequence number.
+    """
+
+    def __init__(self, history_size: int = 500) -> None:
+        self._events: deque[dict[str, Any]] = deque(maxlen=max(1, history_size))
+        self._sequence = 0
+        self._condition = threading.Condition()
+
+    @property
+    def latest_sequence(self) -> int:
+        """Return the sequence number of the newest published event."""
+        with self._condition:
+            return self._sequence
+
+    def publish(
+        self,
+        record: Optional[ImportJobRecord],
+        previous_status: Optional[str] = None,
+    ) -> Optional[dict[str, Any]]:
+        """Record a job transition and wake every waiting subscriber."""
+        if record is None:
+            return None
+        payload = import_job_event_payload(record, previous_status)
+        with self._condition:
+            self._sequence += 1
+            event = {
+                "sequence": self._sequence,
+                "emitted_at": datetime.utcnow().isoformat(),
+                **payload,
+            }
+            self._events.append(event)
+            self._condition.notify_all()
+        return event
+
+    def events_since(self, sequence: int) -> list[dict[str, Any]]:
+        """Return buffered events newer than ``sequence`` in publish order."""
+        with self._condition:
+            return [event for event in self._events if event["sequence"] > sequence]
+
+    def wait_for_events(self, sequence: int, timeout: float) -> list[dict[str, Any]]:
+        """Block until an event newer than ``sequence`` exists or ``timeout`` passes."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._condition:
+            while self._sequence <= sequence:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._condition.wait(remaining)
+            return [event for event in self._events if event["sequence"] > sequence]
+
+
 @dataclass(order=True)
 class ImportJob:
     """Represents a single import job."""
@@ -117,6 +214,7 @@ class ImportQueue:
         self._queue: PriorityQueue[tuple[int, int, ImportJob]] = PriorityQueue()
         self._counter = 0
         self._lock = threading.Lock()
+        self.events = ImportEventBus()
 
     @staticmethod
     def normalize_priority(priority: Any, default: int = 10) -> int:
@@ -157,6 +255,7 @@ class ImportQueue:
         )
         db.session.add(record)
         db.session.commit()
+        self.events.publish(record)
         self.enqueue_record(record, spotify_token=spotify_token)
         return record
 
@@ -187,6 +286,8 @@ class ImportQueue:
             )
         if records:
             db.session.commit()
+            for record in records:
+                self.events.publish(record, previous_status="processing")
         return len(records)
 
     def enqueue_pending_records(self) -> int:
@@ -267,7 +368,9 @@ class ImportWorker(threading.Thread):
                 if job is None:
                     continue
                 try:
-                    self._process_job(job)
+                    scope_name = f"import_{job.service_name}_{job.item_type}"
+                    with profile_scope("job", scope_name, self.app), capture_profile("job", scope_name, self.app):
+                        self._process_job(job)
                 finally:
                     if from_local_queue:
                         self.queue.task_done()
@@ -348,6 +451,7 @@ class ImportWorker(threading.Thread):
                     _safe_import_result_metadata(result),
                 )
                 db.session.commit()
+                self.queue.events.publish(record, previous_status="processing")
                 self._notify_terminal_job(record)
             except Exception as exc:  # pylint: disable=broad-except
                 current_app.logger.error("Import job failed: %s", exc, exc_info=True)
@@ -392,6 +496,7 @@ class ImportWorker(threading.Thread):
             record.attempt_count = (record.attempt_count or 0) + 1
             db.session.add(record)
             db.session.commit()
+            self.queue.events.publish(record, previous_status="pending")
         return record
 
     def _mark_completed(
@@ -436,6 +541,7 @@ class ImportWorker(threading.Thread):
         record.completed_at = datetime.utcnow()
         db.session.add(record)
         db.session.commit()
+        self.queue.events.publish(record, previous_status="processing")
 
     def _notify_terminal_job(self, record: Optional[ImportJobRecord]) -> None:
         if (
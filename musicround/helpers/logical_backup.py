@@ -0,0 +1,303 @@
+"""
+Backend-agnostic logical database backup and restore.
+
+Every table in the SQLAlchemy metadata is streamed in primary-key order
+using keyset batches (``WHERE pk > last ORDER BY pk LIMIT n``), so memory is
+bounded by the batch size and large catalogs never load a whole table into
+Python. Each table becomes one gzip-compressed NDJSON member. Restore
+reloads the tables in foreign-key dependency order inside one transaction
+and resets autoincrement sequences. The same code runs on SQLite and
+PostgreSQL.
+"""
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import decimal
+import gzip
+import io
+import json
+import logging
+from contextlib import contextmanager
+from typing import IO, Any, Callable, ContextManager, Iterator
+
+from sqlalchemy import MetaData, Table, func, inspect, select, tuple_, update
+from sqlalchemy import column as sa_column
+from sqlalchemy import table as sa_table
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+LOGICAL_BACKUP_FORMAT = "qb-logical-backup"
+LOGICAL_BACKUP_FORMAT_VERSION = 1
+LOGICAL_MANIFEST_MEMBER = "database/manifest.json"
+DEFAULT_LOGICAL_BATCH_SIZE = 5000
+
+MemberOpener = Callable[[str], ContextManager[IO[bytes]]]
+
+
+class LogicalBackupError(ValueError):
+    """Raised when a logical backup is malformed or does not fit the schema."""
+
+
+def table_member(table_name: str) -> str:
+    return f"database/{table_name}.ndjson.gz"
+
+
+def _python_type(column) -> type | None:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (dt.datetime, dt.date, dt.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode("ascii")
+    return value
+
+
+def _decoder(column) -> Callable[[Any], Any] | None:
+    """Return a function turning a JSON value back into the column's Python type."""
+    python_type = _python_type(column)
+    if python_type is dt.datetime:
+        return dt.datetime.fromisoformat
+    if python_type is dt.date:
+        return dt.date.fromisoformat
+    if python_type is dt.time:
+        return dt.time.fromisoformat
+    if python_type is decimal.Decimal:
+        return decimal.Decimal
+    if python_type is bytes:
+        return base64.b64decode
+    return None
+
+
+@contextmanager
+def _snapshot(connection: Connection) -> Iterator[Connection]:
+    """Read every table from one snapshot inside a single read transaction.
+
+    PostgreSQL gets a read-only ``REPEATABLE READ`` transaction. The pysqlite
+    driver does not begin a transaction for plain SELECTs, so on SQLite an
+    explicit ``BEGIN`` holds one read snapshot (WAL) or shared lock until the
+    dump is done.
+    """
+    if connection.dialect.name == "postgresql":
+        connection = connection.execution_options(
+            isolation_level="REPEATABLE READ",
+            postgresql_readonly=True,
+        )
+    elif connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("BEGIN")
+    try:
+        yield connection
+    finally:
+        connection.rollback()
+
+
+def iter_table_rows(
+    connection: Connection,
+    table: Table,
+    batch_size: int = DEFAULT_LOGICAL_BATCH_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """Yield a table's rows in primary-key order, one keyset batch at a time."""
+    primary_key = list(table.primary_key.columns)
+    if not primary_key:
+        # Without a key there is nothing to page on; fall back to a
+        # server-side cursor, which still keeps client memory bounded.
+        result = connection.execution_options(
+            stream_results=True, yield_per=batch_size
+        ).execute(select(table))
+        for row in result.mappings():
+            yield dict(row)
+        return
+
+    last_key = None
+    while True:
+        statement = select(table).order_by(*primary_key).limit(batch_size)
+        if last_key is not None:
+            if len(primary_key) == 1:
+                statement = statement.where(primary_key[0] > last_key[0])
+            else:
+                statement = statement.where(tuple_(*primary_key) > tuple_(*last_key))
+        rows = connection.execute(statement).mappings().all()
+        for row in rows:
+            yield dict(row)
+        if len(rows) < batch_size:
+            return
+        last_key = [rows[-1][column.name] for column in primary_key]
+
+
+def _alembic_revision(connection: Connection) -> str | None:
+    if not inspect(connection).has_table("alembic_version"):
+        return None
+    version_table = sa_table("alembic_version", sa_column("version_num"))
+    return connection.execute(select(version_table.c.version_num)).scalar()
+
+
+def dump_database(
+    engine: Engine,
+    metadata: MetaData,
+    open_member: MemberOpener,
+    batch_size: int = DEFAULT_LOGICAL_BATCH_SIZE,
+    compression_level: int = 6,
+) -> dict[str, Any]:
+    """Write every metadata table through ``open_member`` and return the manifest.
+
+    ``open_member(name)`` must return a context manager yielding a writable
+    binary stream; the caller decides whether that is a ZIP member or a file.
+    The manifest itself is not written here.
+    """
+    tables = []
+    with engine.connect() as raw_connection, _snapshot(raw_connection) as connection:
+        existing = set(inspect(connection).get_table_names())
+        for table in metadata.sorted_tables:
+            if table.name not in existing:
+                logger.warning("Skipping table %s: it does not exist in the database", table.name)
+                continue
+            member = table_member(table.name)
+            row_count = 0
+            with open_member(member) as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=compression_level, mtime=0) as gz:
+                    writer = io.TextIOWrapper(gz, encoding="utf-8", newline="\n")
+                    for row in iter_table_rows(connection, table, batch_size):
+                        writer.write(json.dumps(
+                            {key: _encode_value(value) for key, value in row.items()},
+                            separators=(",", ":"),
+                        ))
+                        writer.write("\n")
+                        row_count += 1
+                    writer.flush()
+                    writer.detach()
+            tables.append({
+                "name": table.name,
+                "member": member,
+                "columns": [column.name for column in table.columns],
+                "rows": row_count,
+            })
+        revision = _alembic_revision(connection)
+        dialect = connection.dialect.name
+    return {
+        "format": LOGICAL_BACKUP_FORMAT,
+        "format_version": LOGICAL_BACKUP_FORMAT_VERSION,
+        "source_dialect": dialect,
+        "alembic_revision": revision,
+        "batch_size": batch_size,
+        "tables": tables,
+    }
+
+
+def read_logical_manifest(handle: IO[bytes]) -> dict[str, Any]:
+    try:
+        manifest = json.load(handle)
+    except ValueError as exc:
+        raise LogicalBackupError("Logical backup manifest is unreadable.") from exc
+    if not isinstance(manifest, dict) or manifest.get("format") != LOGICAL_BACKUP_FORMAT:
+        raise LogicalBackupError("File is not a logical database backup.")
+    if manifest.get("format_version") != LOGICAL_BACKUP_FORMAT_VERSION:
+        raise LogicalBackupError("Unsupported logical backup version.")
+    if not isinstance(manifest.get("tables"), list):
+        raise LogicalBackupError("Logical backup manifest has no table list.")
+    for entry in manifest["tables"]:
+        if not isinstance(entry, dict) or entry.get("member") != table_member(str(entry.get("name"))):
+            raise LogicalBackupError("Logical backup manifest contains an invalid table entry.")
+    return manifest
+
+
+def _iter_member_rows(handle: IO[bytes]) -> Iterator[dict[str, Any]]:
+    with gzip.GzipFile(fileobj=handle, mode="rb") as gz:
+        for line in io.TextIOWrapper(gz, encoding="utf-8"):
+            if line.strip():
+                yield json.loads(line)
+
+
+def _reset_sequence(connection: Connection, table: Table) -> None:
+    """Move the table's autoincrement sequence past the restored rows."""
+    column = table.autoincrement_column
+    if column is None:
+        return
+    max_id = select(func.max(column)).scalar_subquery()
+    if connection.dialect.name == "postgresql":
+        connection.execute(select(func.setval(
+            # Quoted, because tables such as "user" are reserved words.
+            func.pg_get_serial_sequence(
+                connection.dialect.identifier_preparer.format_table(table),
+                column.name,
+            ),
+            func.coalesce(max_id, 1),
+            max_id.is_not(None),
+        )))
+    elif connection.dialect.name == "sqlite" and table.dialect_options["sqlite"].get("autoincrement"):
+        sequence = sa_table("sqlite_sequence", sa_column("name"), sa_column("seq"))
+        connection.execute(
+            update(sequence)
+            .where(sequence.c.name == table.name)
+            .values(seq=func.coalesce(max_id, 0))
+        )
+
+
+def restore_database(
+    engine: Engine,
+    metadata: MetaData,
+    manifest: dict[str, Any],
+    open_member: MemberOpener,
+    batch_size: int = DEFAULT_LOGICAL_BATCH_SIZE,
+) -> dict[str, int]:
+    """Replace the database contents with a logical backup in one transaction.
+
+    Existing rows are deleted in reverse dependency order, backed-up rows are
+    inserted in dependency order with ``executemany`` batches, and sequences
+    are reset. Columns the current schema no longer has are dropped with a
+    warning; tables it no longer has are skipped.
+    """
+    entries = {entry["name"]: entry for entry in manifest["tables"]}
+    unknown = sorted(set(entries) - set(metadata.tables))
+    for name in unknown:
+        logger.warning("Skipping backed-up table %s: it is not in the current schema", name)
+
+    restored = {}
+    with engine.begin() as connection:
+        existing = set(inspect(connection).get_table_names())
+        tables = [table for table in metadata.sorted_tables if table.name in existing]
+        for table in reversed(tables):
+            connection.execute(table.delete())
+
+        for table in tables:
+            entry = entries.get(table.name)
+            if entry is None:
+                continue
+            dropped = sorted(set(entry["columns"]) - set(table.columns.keys()))
+            if dropped:
+                logger.warning("Dropping backed-up columns %s.%s", table.name, ", ".join(dropped))
+            decoders = {
+                column.name: decoder
+                for column in table.columns
+                if column.name in entry["columns"] and (decoder := _decoder(column)) is not None
+            }
+            keep = [name for name in entry["columns"] if name in table.columns]
+            insert = table.insert()
+            pending = []
+            count = 0
+            with open_member(entry["member"]) as handle:
+                for row in _iter_member_rows(handle):
+                    values = {name: row.get(name) for name in keep}
+                    for name, decoder in decoders.items():
+                        if values.get(name) is not None:
+                            values[name] = decoder(values[name])
+                    pending.append(values)
+                    if len(pending) >= batch_size:
+                        connection.execute(insert, pending)
+                        count += len(pending)
+                        pending = []
+            if pending:
+                connection.execute(insert, pending)
+                count += len(pending)
+            if count != entry.get("rows", count):
+                raise LogicalBackupError(f"Table {table.name} is truncated in the backup.")
+            _reset_sequence(connection, table)
+            restored[table.name] = count
+    return restored
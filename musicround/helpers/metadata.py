@@ -3,6 +3,8 @@ import json
 import statistics
 import musicbrainzngs
 from flask import current_app
+from musicround.helpers.provider_telemetry import track_provider_call
+from musicround.helpers.provider_urls import deezer_api_url
 from collections import Counter
 import traceback  # Added for detailed error tracking
 
@@ -41,7 +43,7 @@ def _deezer_client_request(deezer_id, app=None):
             return deezer_client.get_track(deezer_id)
         return deezer_client._make_request(f"track/{deezer_id}")
 
-    response = requests.get(f"https://api.deezer.com/track/{deezer_id}", timeout=10)
+    response = requests.get(deezer_api_url(f"track/{deezer_id}", app.config if app else None), timeout=10)
     return response.json() if response.status_code == 200 else None
 
 
@@ -52,7 +54,7 @@ def _deezer_album_request(album_id, app=None):
             return deezer_client.get_album(album_id)
         return deezer_client._make_request(f"album/{album_id}")
 
-    response = requests.get(f"https://api.deezer.com/album/{album_id}", timeout=10)
+    response = requests.get(deezer_api_url(f"album/{album_id}", app.config if app else None), timeout=10)
     return response.json() if response.status_code == 200 else None
 
 
@@ -518,7 +520,8 @@ def get_musicbrainz_data(isrc, logger=None):
     
     try:
         # Search MusicBrainz by ISRC
-        mb_results = musicbrainzngs.search_recordings(isrc=isrc, limit=1)
+        with track_provider_call('musicbrainz', '/recording'):
+            mb_results = musicbrainzngs.search_recordings(isrc=isrc, limit=1)
         if mb_results and mb_results.get('recording-list') and len(mb_results['recording-list']) > 0:
             recording = mb_results['recording-list'][0]
             
@@ -622,7 +625,7 @@ def get_deezer_data(isrc, app=None):
         
         if not deezer_client:
             # If no client in app context, make direct API call
-            response = requests.get(f"https://api.deezer.com/track/isrc:{isrc}", timeout=10)
+            response = requests.get(deezer_api_url(f"track/isrc:{isrc}", app.config if app else None), timeout=10)
             if response.status_code == 200:
                 track = response.json()
             else:
@@ -660,7 +663,7 @@ def get_deezer_data(isrc, app=None):
                 if deezer_client:
                     album = deezer_client.get_album(album_id)
                 else:
-                    album_response = requests.get(f"https://api.deezer.com/album/{album_id}", timeout=10)
+                    album_response = requests.get(deezer_api_url(f"album/{album_id}", app.config if app else None), timeout=10)
                     album = album_response.json() if album_response.status_code == 200 else None
                 
                 if album and not album.get('error'):
@@ -9,6 +9,7 @@ from flask import current_app
 
 from musicround.helpers.email_helper import send_email
 from musicround.helpers.oauth_notifications import collect_oauth_token_notifications
+from musicround.helpers.provider_telemetry import provider_telemetry
 from musicround.models import ImportJobRecord, RoundExport
 
 
@@ -80,6 +81,24 @@ def _backup_issue_rows(backup_readiness: dict[str, Any]) -> list[dict[str, Any]]
     ]
 
 
+def _provider_telemetry_rows(limit: int) -> list[dict[str, Any]]:
+    """Per-provider call totals and last known quota for this process."""
+    return [
+        {
+            "provider": row["provider"],
+            "calls": row["calls"],
+            "errors": row["errors"],
+            "rate_limited": row["rate_limited"],
+            "retries": row["retries"],
+            "average_ms": row["average_ms"],
+            "p95_ms_upper_bound": row["p95_ms_upper_bound"],
+            "quota_remaining": (row["quota"] or {}).get("remaining"),
+            "quota_limit": (row["quota"] or {}).get("limit"),
+        }
+        for row in provider_telemetry.summary()["providers"][:limit]
+    ]
+
+
 def _summary_body(summary: dict[str, Any]) -> str:
     lines = [
         "Quizzical Beats notification summary",
@@ -131,6 +150,19 @@ def _summary_body(summary: dict[str, Any]) -> str:
                 f"- user #{item['user_id']} {item['service']} "
                 f"{item['issue_code']} ({item['status']})"
             )
+    if summary["provider_telemetry"]:
+        lines.extend(["", "Provider calls since this process started:"])
+        for item in summary["provider_telemetry"]:
+            line = (
+                f"- {item['provider']} calls={item['calls']} errors={item['errors']} "
+                f"rate_limited={item['rate_limited']} retries={item['retries']} "
+                f"avg_ms={item['average_ms']}"
+            )
+            if item["quota_remaining"] is not None:
+                line += f" quota_remaining={item['quota_remaining']}"
+                if item["quota_limit"] is not None:
+                    line += f"/{item['quota_limit']}"
+            lines.append(line)
     lines.extend(["", "No credentials or provider tokens are included in this digest."])
     return "\n".join(lines)
 
@@ -203,6 +235,7 @@ def notification_admin_summary(
             }
             for item in dead_letters
         ],
+        "provider_telemetry": _provider_telemetry_rows(limit),
     }
     summary["actionable_count"] = (
         summary["oauth_token_candidate_count"]
@@ -0,0 +1,528 @@
+"""Scalable benchmark suite with a bulk synthetic catalog and JSON baselines.
+
+``run.py performance smoke`` checks a few thousand songs against fixed
+thresholds. This suite measures how catalog search, analytics, replacement
+suggestions, playlist resolution, round list rendering, and MP3 assembly
+behave at 100k to 1M songs. It works in four steps:
+
+1. :func:`create_bench_fixture` bulk-inserts tagged songs, rounds, exports,
+   and import jobs at one of :data:`BENCH_SCALES`.
+2. Each scenario in :data:`BENCH_SCENARIOS` runs after a warm-up.
+3. Duration and query count are reported as percentiles.
+4. :func:`compare_bench_results` diffs two saved results and flags
+   regressions.
+
+MP3 assembly fetches tracks and previews from the offline provider stand-in
+(:mod:`musicround.helpers.provider_standin`) and needs ffmpeg; it is skipped when ffmpeg is missing. Fixture rows are tagged with a
+unique marker and deleted afterwards. Even so, run large scales against a
+scratch database.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import random
+import shutil
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Any, Callable, Iterator
+from uuid import uuid4
+
+import sqlalchemy
+from flask import current_app
+from flask_login import login_user, logout_user
+from sqlalchemy import delete, insert, select
+
+from musicround import db
+from musicround.deezer_client import DeezerClient
+from musicround.helpers.provider_standin import StandinOptions, running_provider_standin, standin_config_overrides
+from musicround.helpers.query_profiler import _percentiles, capture_queries
+from musicround.helpers.storage_health import round_artifact_store
+from musicround.models import (
+    ImportJobRecord,
+    Round,
+    RoundAccessEvent,
+    RoundExport,
+    Song,
+    SongTag,
+    Tag,
+    User,
+)
+from musicround.services import automation
+
+BENCH_FORMAT_VERSION = 1
+BENCH_SCALES = {
+    "small": {"songs": 2_000, "rounds": 50, "tags": 25, "exports_per_round": 1, "import_jobs": 100},
+    "medium": {"songs": 100_000, "rounds": 1_000, "tags": 200, "exports_per_round": 2, "import_jobs": 5_000},
+    "large": {"songs": 1_000_000, "rounds": 5_000, "tags": 500, "exports_per_round": 2, "import_jobs": 20_000},
+}
+ROUND_SIZE = 8
+INSERT_CHUNK_SIZE = 5_000
+PLAYLIST_LINES = 50
+GENRES = ("Rock", "Pop", "Soul", "Hip Hop", "Electronic", "Jazz", "Country", "Metal")
+IMPORT_JOB_STATUSES = ("completed",) * 8 + ("failed", "dead_letter")
+
+
+@dataclass(frozen=True)
+class BenchScale:
+    name: str
+    songs: int
+    rounds: int
+    tags: int
+    exports_per_round: int
+    import_jobs: int
+
+    @classmethod
+    def resolve(cls, name: str = "small", **overrides: int | None) -> "BenchScale":
+        """Return a preset scale with any non-None counts overridden."""
+        if name not in BENCH_SCALES:
+            raise ValueError(f"scale must be one of: {', '.join(BENCH_SCALES)}.")
+        counts = dict(BENCH_SCALES[name])
+        counts.update({key: value for key, value in overrides.items() if value is not None})
+        if counts["songs"] < ROUND_SIZE:
+            raise ValueError(f"songs must be at least {ROUND_SIZE}.")
+        if counts["rounds"] < 1 or counts["tags"] < 1:
+            raise ValueError("rounds and tags must be at least 1.")
+        if counts["exports_per_round"] < 0 or counts["import_jobs"] < 0:
+            raise ValueError("exports_per_round and import_jobs must not be negative.")
+        custom = any(counts[key] != value for key, value in BENCH_SCALES[name].items())
+        return cls(name=f"{name}+custom" if custom else name, **counts)
+
+
+@dataclass
+class BenchFixture:
+    marker: str
+    user_id: int
+    round_ids: list[int]
+    artist_count: int
+    scale: BenchScale
+
+
+@dataclass(frozen=True)
+class BenchScenario:
+    name: str
+    operation: Callable[[BenchFixture, int], Any]
+    skip_reason: Callable[[], str | None] = lambda: None
+
+
+def _round_name(marker: str, index: int) -> str:
+    return f"Performance Bench {marker} {index}"
+
+
+def _bulk_insert(model, rows: Iterator[dict[str, Any]]) -> int:
+    """Insert rows in chunks with executemany; return the number inserted."""
+    inserted = 0
+    chunk: list[dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == INSERT_CHUNK_SIZE:
+            db.session.execute(insert(model), chunk)
+            inserted += len(chunk)
+            chunk = []
+    if chunk:
+        db.session.execute(insert(model), chunk)
+        inserted += len(chunk)
+    return inserted
+
+
+def create_bench_fixture(scale: BenchScale, seed: int = 1) -> BenchFixture:
+    """Bulk-load a synthetic catalog; row contents depend only on ``seed``."""
+    marker = f"perf-bench-{uuid4().hex[:12]}"
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    artist_count = max(1, scale.songs // 10)
+    # Keep synthetic Deezer IDs far above real ones so the unique index never collides.
+    deezer_base = 10**15 + (uuid4().int % 10**6) * 10**7
+
+    user = User(username=marker, email=f"{marker}@example.test")
+    db.session.add(user)
+    db.session.flush()
+
+    _bulk_insert(Tag, ({"name": f"{marker}-tag-{index}", "created_at": now} for index in range(scale.tags)))
+    tag_ids = db.session.scalars(
+        select(Tag.id).where(Tag.name.like(f"{marker}-tag-%")).order_by(Tag.id)
+    ).all()
+
+    _bulk_insert(Song, (
+        {
+            "title": f"Bench Song {index}",
+            "artist": f"Bench Artist {index % artist_count}",
+            "album_name": f"Bench Album {index // 12}",
+            "genre": GENRES[index % len(GENRES)],
+            "year": 1960 + index % 65,
+            "tempo": 70.0 + (index * 13) % 110,
+            "duration_ms": 150_000 + (index * 7919) % 120_000,
+            "popularity": index % 100,
+            "used_count": index % 5,
+            "isrc": f"QZB{index:09d}",
+            "deezer_id": deezer_base + index,
+            "preview_url": f"https://example.test/{marker}/{index}.mp3",
+            "source": marker,
+            "import_date": now - timedelta(days=index % 1000),
+            "added_at": now - timedelta(days=index % 1000),
+        }
+        for index in range(scale.songs)
+    ))
+    song_ids = db.session.scalars(
+        select(Song.id).where(Song.source == marker).order_by(Song.id)
+    ).all()
+
+    def song_tags() -> Iterator[dict[str, Any]]:
+        for index, song_id in enumerate(song_ids):
+            first = tag_ids[index % len(tag_ids)]
+            yield {"song_id": song_id, "tag_id": first, "created_at": now}
+            second = tag_ids[(index * 7 + 3) % len(tag_ids)]
+            if index % 3 == 0 and second != first:
+                yield {"song_id": song_id, "tag_id": second, "created_at": now}
+
+    _bulk_insert(SongTag, song_tags())
+
+    round_dates = [now - timedelta(days=rng.randrange(730)) for _ in range(scale.rounds)]
+    _bulk_insert(Round, (
+        {
+            "name": _round_name(marker, index),
+            "round_type": "manual",
+            "round_criteria_used": "Performance bench synthetic fixture",
+            "songs": ",".join(str(song_id) for song_id in rng.sample(song_ids, ROUND_SIZE)),
+            "genre": GENRES[index % len(GENRES)],
+            "user_id": user.id,
+            "review_status": "approved" if index % 2 else "draft",
+            "created_at": round_dates[index],
+        }
+        for index in range(scale.rounds)
+    ))
+    round_ids = db.session.scalars(
+        select(Round.id).where(Round.name.like(f"Performance Bench {marker} %")).order_by(Round.id)
+    ).all()
+
+    _bulk_insert(RoundExport, (
+        {
+            "round_id": round_id,
+            "user_id": user.id,
+            "export_type": "email" if export_index % 2 == 0 else "dropbox",
+            "status": "failed" if rng.random() < 0.1 else "success",
+            "destination": f"{marker}@example.test",
+            "timestamp": round_dates[index] + timedelta(hours=export_index + 1),
+        }
+        for index, round_id in enumerate(round_ids)
+        for export_index in range(scale.exports_per_round)
+    ))
+    _bulk_insert(ImportJobRecord, (
+        {
+            "service_name": "spotify" if index % 2 else "deezer",
+            "item_type": ("playlist", "album", "track")[index % 3],
+            "item_id": f"{marker}-{index}",
+            "user_id": user.id,
+            "status": IMPORT_JOB_STATUSES[index % len(IMPORT_JOB_STATUSES)],
+            "created_at": now - timedelta(minutes=index),
+            "imported_count": index % 40,
+        }
+        for index in range(scale.import_jobs)
+    ))
+    db.session.commit()
+    return BenchFixture(
+        marker=marker,
+        user_id=user.id,
+        round_ids=list(round_ids),
+        artist_count=artist_count,
+        scale=scale,
+    )
+
+
+def cleanup_bench_fixture(marker: str) -> None:
+    """Delete every row and generated MP3 that belongs to ``marker``."""
+    round_ids = select(Round.id).where(Round.name.like(f"Performance Bench {marker} %"))
+    song_ids = select(Song.id).where(Song.source == marker)
+    store = round_artifact_store()
+    for round_id in db.session.scalars(round_ids.where(Round.mp3_generated.is_(True))).all():
+        store.delete("mp3", round_id)
+    user_id = db.session.scalar(select(User.id).where(User.username == marker))
+    statements = [
+        delete(RoundExport).where(RoundExport.round_id.in_(round_ids)),
+        delete(RoundAccessEvent).where(RoundAccessEvent.round_id.in_(round_ids)),
+        delete(SongTag).where(SongTag.song_id.in_(song_ids)),
+        delete(Round).where(Round.id.in_(round_ids)),
+        delete(Song).where(Song.source == marker),
+        delete(Tag).where(Tag.name.like(f"{marker}-tag-%")),
+    ]
+    if user_id is not None:
+        statements += [
+            delete(ImportJobRecord).where(ImportJobRecord.user_id == user_id),
+            delete(User).where(User.id == user_id),
+        ]
+    for statement in statements:
+        db.session.execute(statement.execution_options(synchronize_session=False))
+    db.session.commit()
+
+
+def _clear_find_songs_cache() -> None:
+    with automation._FIND_SONGS_CACHE_LOCK:
+        automation._FIND_SONGS_CACHE.clear()
+
+
+def _dispatch_as_fixture_user(fixture: BenchFixture, path: str) -> dict[str, Any]:
+    """Render ``path`` through the full request pipeline as the fixture user."""
+    user = db.session.get(User, fixture.user_id)
+    with current_app.test_request_context(path):
+        login_user(user)
+        try:
+            response = current_app.full_dispatch_request()
+        finally:
+            logout_user()
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} returned HTTP {response.status_code}.")
+    return {"bytes": len(response.get_data())}
+
+
+def _find_songs(fixture: BenchFixture, iteration: int) -> dict[str, Any]:
+    # Every iteration is a cold search; cache hits would hide query cost.
+    _clear_find_songs_cache()
+    result = automation.find_songs(
+        query="Bench",
+        genre=GENRES[iteration % len(GENRES)],
+        has_preview=True,
+        limit=20,
+    )
+    return {"count": result.get("count"), "total": result.get("total")}
+
+
+def _view_songs(fixture: BenchFixture, iteration: int) -> dict[str, Any]:
+    return _dispatch_as_fixture_user(fixture, f"/view-songs?q=Bench&page={iteration % 5 + 1}&per_page=50")
+
+
+def _round_analytics_summary(fixture: BenchFixture, iteration: int) -> dict[str, Any]:
+    result = automation.round_analytics_summary(months=24, limit=20)
+    return {"recent_round_count": result.get("recent_round_count")}
+
+
+def _suggest_replacement_songs(fixture: BenchFixture, iteration: int) -> dict[str, Any]:
+    round_id = fixture.round_ids[iteration % len(fixture.round_ids)]
+    result = automation.suggest_replacement_songs(round_id=round_id, position=1, limit=10)
+    return {"count": len(result.get("suggestions") or [])}
+
+
+def _resolve_text_playlist(fixture: BenchFixture, iteration: int) -> dict[str, Any]:
+    step = max(1, fixture.scale.songs // PLAYLIST_LINES)
+    lines = []
+    for line in range(PLAYLIST_LINES):
+        index = (line * step + iteration) % fixture.scale.songs
+        lines.append(f"Bench Artist {index % fixture.artist_count} - Bench Song {index}")
+    result = automation.resolve_text_playlist("\n".join(lines), limit=PLAYLIST_LINES)
+    return {"resolved_count": result.get("resolved_count")}
+
+
+def _rounds_list(fixture: BenchFixture, iteration: int) -> dict[str, Any]:
+    return _dispatch_as_fixture_user(fixture, f"/rounds/?page={iteration % 3 + 1}&per_page=50")
+
+
+def _mp3_assembly(audio_path: str) -> Callable[[BenchFixture, int], dict[str, Any]]:
+    def operation(fixture: BenchFixture, iteration: int) -> dict[str, Any]:
+        round_id = fixture.round_ids[iteration % len(fixture.round_ids)]
+        previous_client = current_app.config.get("deezer")
+        with running_provider_standin(StandinOptions(audio_dir=audio_path)) as base_url:
+            current_app.config["deezer"] = DeezerClient(standin_config_overrides(base_url)["DEEZER_API_BASE_URL"])
+            try:
+                result = automation.generate_round_mp3(round_id, user_id=fixture.user_id)
+            finally:
+                current_app.config["deezer"] = previous_client
+        return {"bytes": result["bytes"]}
+
+    return operation
+
+
+def _mp3_skip_reason(audio_path: str) -> Callable[[], str | None]:
+    def reason() -> str | None:
+        if shutil.which("ffmpeg") is None:
+            return "ffmpeg is not installed."
+        if not os.path.isfile(audio_path):
+            return f"Audio fixture {os.path.basename(audio_path)} was not found."
+        return None
+
+    return reason
+
+
+def _scenarios(audio_path: str) -> list[BenchScenario]:
+    return [
+        BenchScenario("find_songs", _find_songs),
+        BenchScenario("view_songs", _view_songs),
+        BenchScenario("round_analytics_summary", _round_analytics_summary),
+        BenchScenario("suggest_replacement_songs", _suggest_replacement_songs),
+        BenchScenario("resolve_text_playlist", _resolve_text_playlist),
+        BenchScenario("rounds_list", _rounds_list),
+        BenchScenario("mp3_assembly", _mp3_assembly(audio_path), _mp3_skip_reason(audio_path)),
+    ]
+
+
+BENCH_SCENARIOS = tuple(scenario.name for scenario in _scenarios(""))
+
+
+def _stats(values: list[float]) -> dict[str, float]:
+    return {
+        "min": round(min(values), 3),
+        "mean": round(sum(values) / len(values), 3),
+        **_percentiles(values),
+    }
+
+
+def _run_scenario(scenario: BenchScenario, fixture: BenchFixture, repeat: int, warmup: int) -> dict[str, Any]:
+    skip_reason = scenario.skip_reason()
+    if skip_reason:
+        return {"status": "skipped", "message": skip_reason}
+    durations: list[float] = []
+    query_counts: list[float] = []
+    details: Any = None
+    try:
+        for iteration in range(warmup + repeat):
+            with capture_queries("bench", scenario.name) as queries:
+                started = perf_counter()
+                details = scenario.operation(fixture, iteration)
+                duration_ms = (perf_counter() - started) * 1000
+            if iteration >= warmup:
+                durations.append(duration_ms)
+                query_counts.append(queries.query_count)
+    except Exception as exc:
+        db.session.rollback()
+        current_app.logger.warning("Benchmark scenario %s failed: %s", scenario.name, exc, exc_info=True)
+        return {"status": "error", "message": str(exc)[:300]}
+    return {
+        "status": "ok",
+        "duration_ms": _stats(durations),
+        "query_count": _stats(query_counts),
+        "details": details,
+    }
+
+
+def run_performance_bench(
+    *,
+    scale: BenchScale | None = None,
+    repeat: int = 5,
+    warmup: int = 1,
+    scenarios: list[str] | None = None,
+    audio_fixture: str | None = None,
+    seed: int = 1,
+) -> dict[str, Any]:
+    """Load a synthetic fixture, run the selected scenarios, and clean up."""
+    scale = scale or BenchScale.resolve()
+    if repeat < 1 or repeat > 1000:
+        raise ValueError("repeat must be between 1 and 1000.")
+    if warmup < 0:
+        raise ValueError("warmup must not be negative.")
+    unknown = sorted(set(scenarios or ()) - set(BENCH_SCENARIOS))
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}. Choose from: {', '.join(BENCH_SCENARIOS)}.")
+    audio_path = audio_fixture or os.path.join(current_app.root_path, "static", "audio", "outro.mp3")
+    selected = [scenario for scenario in _scenarios(audio_path) if not scenarios or scenario.name in scenarios]
+
+    started = perf_counter()
+    fixture = create_bench_fixture(scale, seed=seed)
+    fixture_seconds = perf_counter() - started
+    try:
+        results = {scenario.name: _run_scenario(scenario, fixture, repeat, warmup) for scenario in selected}
+    finally:
+        cleanup_bench_fixture(fixture.marker)
+
+    errors = [name for name, result in results.items() if result["status"] == "error"]
+    return {
+        "ok": not errors,
+        "format_version": BENCH_FORMAT_VERSION,
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "scale": asdict(scale),
+        "seed": seed,
+        "repeat": repeat,
+        "warmup": warmup,
+        "fixture_seconds": round(fixture_seconds, 3),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "database": db.engine.dialect.name,
+        },
+        "scenarios": results,
+        "failed_scenarios": errors,
+    }
+
+
+def load_bench_result(path: str) -> dict[str, Any]:
+    """Read a saved benchmark result, rejecting files from another format version."""
+    with open(path, encoding="utf-8") as handle:
+        try:
+            result = json.load(handle)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{path} is not valid JSON: {exc}") from exc
+    if not isinstance(result, dict) or result.get("format_version") != BENCH_FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {BENCH_FORMAT_VERSION} benchmark result.")
+    return result
+
+
+def compare_bench_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    *,
+    metric: str = "p50",
+    tolerance: float = 0.2,
+    min_delta_ms: float = 5.0,
+) -> dict[str, Any]:
+    """Compare two results; a scenario regresses when it is both relatively and absolutely slower.
+
+    Query counts are deterministic for a given scale, so any increase in the
+    median query count is a regression as well.
+    """
+    if metric not in ("min", "mean", "p50", "p90", "p99", "max"):
+        raise ValueError("metric must be one of min, mean, p50, p90, p99, max.")
+    if tolerance < 0:
+        raise ValueError("tolerance must not be negative.")
+    warnings = []
+    if baseline.get("scale") != current.get("scale"):
+        warnings.append("Baseline and current runs used different scales; timings are not comparable.")
+    if baseline.get("environment", {}).get("database") != current.get("environment", {}).get("database"):
+        warnings.append("Baseline and current runs used different database backends.")
+
+    rows = []
+    for name in sorted(set(baseline.get("scenarios", {})) | set(current.get("scenarios", {}))):
+        before = baseline.get("scenarios", {}).get(name) or {}
+        after = current.get("scenarios", {}).get(name) or {}
+        row: dict[str, Any] = {"name": name}
+        if before.get("status") != "ok" or after.get("status") != "ok":
+            row["status"] = "not_compared"
+            row["baseline_status"] = before.get("status", "missing")
+            row["current_status"] = after.get("status", "missing")
+            rows.append(row)
+            continue
+        baseline_ms = before["duration_ms"][metric]
+        current_ms = after["duration_ms"][metric]
+        delta_ms = current_ms - baseline_ms
+        baseline_queries = before["query_count"]["p50"]
+        current_queries = after["query_count"]["p50"]
+        row.update({
+            "baseline_ms": baseline_ms,
+            "current_ms": current_ms,
+            "change_pct": round(delta_ms / baseline_ms * 100, 1) if baseline_ms else None,
+            "baseline_queries": baseline_queries,
+            "current_queries": current_queries,
+        })
+        reasons = []
+        if delta_ms > baseline_ms * tolerance and delta_ms >= min_delta_ms:
+            reasons.append(f"{metric} {baseline_ms}ms -> {current_ms}ms")
+        if current_queries > baseline_queries:
+            reasons.append(f"queries {baseline_queries:g} -> {current_queries:g}")
+        if reasons:
+            row["status"] = "regressed"
+            row["reasons"] = reasons
+        elif -delta_ms > baseline_ms * tolerance and -delta_ms >= min_delta_ms:
+            row["status"] = "improved"
+        else:
+            row["status"] = "unchanged"
+        rows.append(row)
+
+    regressions = [row for row in rows if row["status"] == "regressed"]
+    return {
+        "ok": not regressions,
+        "metric": metric,
+        "tolerance": tolerance,
+        "min_delta_ms": min_delta_ms,
+        "scenarios": rows,
+        "regressions": regressions,
+        "warnings": warnings,
+    }
@@ -8,6 +8,7 @@ from typing import Any, Callable
 from uuid import uuid4
 
 from musicround import db
+from musicround.helpers.query_profiler import capture_queries
 from musicround.models import Round, Song, User
 from musicround.services import automation
 
@@ -141,13 +142,16 @@ def run_performance_smoke(
 
         results = []
         for check in checks:
-            duration, details = _duration_ms(check.operation)
+            with capture_queries("smoke", check.name) as queries:
+                duration, details = _duration_ms(check.operation)
             results.append(
                 {
                     "name": check.name,
                     "duration_ms": round(duration, 3),
                     "threshold_ms": check.threshold_ms,
                     "ok": duration <= check.threshold_ms,
+                    "query_count": queries.query_count,
+                    "repeated_statements": queries.repeated_statements()[:3],
                     "details": _summarize_details(details),
                 }
             )
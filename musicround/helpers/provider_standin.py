@@ -0,0 +1,597 @@
+"""Offline stand-in for the Deezer and Spotify APIs.
+
+Imports, enrichment, and MP3 generation call the public Deezer and Spotify
+APIs and download preview MP3s. That cannot run in CI and is rate-limited in
+staging. The stand-in is a small Flask app that serves the endpoints the code
+uses with deterministic synthetic data:
+
+* Deezer under ``/deezer``: tracks, ISRC lookup, albums, playlists, search,
+  and the chart.
+* Spotify under ``/spotify/v1``: tracks, albums, playlists, search, audio
+  features, ``me``, new releases, and user playlists. A client-credentials or
+  refresh token comes from ``/spotify/accounts/api/token``.
+* Preview MP3s under ``/previews``, served from the bundled audio fixtures
+  or from ``audio_dir`` (a directory of MP3s, or a single MP3).
+
+Every provider route can be slowed down (``latency_ms`` +/- ``jitter_ms``) and
+made to fail at random with HTTP 500 or with HTTP 429 plus ``Retry-After``.
+Injection is seeded, so a run is reproducible. A request can force a fault
+with ``X-Standin-Fault: 429|500|none``. ``/_standin/stats`` reports request
+and fault counts, and ``POST /_standin/faults`` changes the fault settings of
+a running server.
+
+Point the app at it with :func:`standin_config_overrides`. Run it with
+``run.py providers standin``, or in-process with :func:`running_provider_standin`.
+MusicBrainz, Last.fm, and ACRCloud are not emulated.
+"""
+from __future__ import annotations
+
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Iterator
+
+from flask import Flask, abort, jsonify, redirect, request, send_from_directory, url_for
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+ALBUM_SIZE = 12
+ARTIST_COUNT = 500
+DEFAULT_PAGE_LIMIT = 25
+MAX_PAGE_LIMIT = 100
+FAULT_HEADER = "X-Standin-Fault"
+SPOTIFY_ID_PREFIX = "standin"
+
+_ISRC_RE = re.compile(r"^QZS(\d{9})$")
+
+
+@dataclass
+class StandinOptions:
+    """Latency and fault injection settings for the provider stand-in."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: int = 1
+    seed: int | None = None
+    audio_dir: str | None = None
+
+    def __post_init__(self):
+        if self.latency_ms < 0 or self.jitter_ms < 0:
+            raise ValueError("Latency and jitter must not be negative.")
+        for name in ("error_rate", "rate_limit_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1.")
+        if self.error_rate + self.rate_limit_rate > 1.0:
+            raise ValueError("error_rate and rate_limit_rate must add up to at most 1.")
+        if self.retry_after_seconds < 0:
+            raise ValueError("retry_after_seconds must not be negative.")
+
+
+class _FaultInjector:
+    """Seeded latency and fault decisions, shared by the server's threads."""
+
+    def __init__(self, options: StandinOptions):
+        self.options = options
+        self._rng = random.Random(options.seed)
+        self._lock = threading.Lock()
+        self.requests: Counter[str] = Counter()
+        self.faults: Counter[str] = Counter()
+
+    def update(self, changes: dict[str, Any]) -> StandinOptions:
+        allowed = {field.name for field in fields(StandinOptions)} - {"seed", "audio_dir"}
+        unknown = sorted(set(changes) - allowed)
+        if unknown:
+            raise ValueError(f"Unknown fault settings: {', '.join(unknown)}")
+        values = asdict(self.options)
+        for key, value in changes.items():
+            values[key] = int(value) if key == "retry_after_seconds" else float(value)
+        options = StandinOptions(**values)
+        with self._lock:
+            self.options = options
+        return options
+
+    def decide(self, endpoint: str, forced: str | None) -> tuple[float, str | None]:
+        with self._lock:
+            options = self.options
+            self.requests[endpoint] += 1
+            delay = options.latency_ms
+            if options.jitter_ms:
+                delay += self._rng.uniform(-options.jitter_ms, options.jitter_ms)
+            roll = self._rng.random()
+            if forced in {"429", "500"}:
+                fault = forced
+            elif forced == "none":
+                fault = None
+            elif roll < options.rate_limit_rate:
+                fault = "429"
+            elif roll < options.rate_limit_rate + options.error_rate:
+                fault = "500"
+            else:
+                fault = None
+            if fault:
+                self.faults[fault] += 1
+        return max(delay, 0.0) / 1000.0, fault
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "request_count": sum(self.requests.values()),
+                "faults": dict(self.faults),
+                "options": asdict(self.options),
+            }
+
+
+def _number(value: str) -> int | None:
+    return int(value) if value.isdigit() else None
+
+
+def _spotify_number(spotify_id: str) -> int:
+    """Map a Spotify ID to a track/album/playlist number, stable across runs."""
+    suffix = spotify_id[len(SPOTIFY_ID_PREFIX):] if spotify_id.startswith(SPOTIFY_ID_PREFIX) else ""
+    if suffix.isdigit():
+        return int(suffix)
+    return zlib.crc32(spotify_id.encode("utf-8")) % 1_000_000_000 + 1
+
+
+def _spotify_id(number: int) -> str:
+    return f"{SPOTIFY_ID_PREFIX}{number:015d}"
+
+
+def _isrc(track_id: int) -> str:
+    return f"QZS{track_id % 1_000_000_000:09d}"
+
+
+def _album_id(track_id: int) -> int:
+    return (track_id - 1) // ALBUM_SIZE + 1
+
+
+def _album_track_ids(album_id: int) -> list[int]:
+    first = (album_id - 1) * ALBUM_SIZE + 1
+    return list(range(first, first + ALBUM_SIZE))
+
+
+def _artist_id(number: int) -> int:
+    return number % ARTIST_COUNT + 1
+
+
+def _playlist_track_ids(playlist_id: int) -> list[int]:
+    size = 20 + playlist_id % 181
+    return [playlist_id * 1000 + position for position in range(1, size + 1)]
+
+
+def _search_ids(query: str, count: int) -> list[int]:
+    start = zlib.crc32(query.strip().lower().encode("utf-8")) % 1_000_000 + 1
+    return [start + offset for offset in range(count)]
+
+
+def _page_args(offset_name: str) -> tuple[int, int]:
+    try:
+        offset = max(int(request.args.get(offset_name, 0)), 0)
+        limit = int(request.args.get("limit", DEFAULT_PAGE_LIMIT))
+    except ValueError:
+        abort(400)
+    return offset, min(max(limit, 1), MAX_PAGE_LIMIT)
+
+
+def _next_url(offset_name: str, offset: int, limit: int, total: int) -> str | None:
+    if offset + limit >= total:
+        return None
+    args = request.args.to_dict()
+    args.update({offset_name: offset + limit, "limit": limit})
+    return url_for(request.endpoint, **request.view_args, **args, _external=True)
+
+
+def create_standin_app(options: StandinOptions | None = None) -> Flask:
+    """Build the stand-in WSGI app."""
+    options = options or StandinOptions()
+    audio_dir = os.path.abspath(
+        options.audio_dir or os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "audio")
+    )
+    if os.path.isfile(audio_dir):
+        audio_dir, preview_files = os.path.dirname(audio_dir), [os.path.basename(audio_dir)]
+    elif os.path.isdir(audio_dir):
+        preview_files = sorted(name for name in os.listdir(audio_dir) if name.lower().endswith(".mp3"))
+    else:
+        preview_files = []
+    injector = _FaultInjector(options)
+
+    app = Flask(__name__)
+    app.config["PROVIDER_STANDIN"] = injector
+
+    def preview_url(number: int) -> str:
+        if not preview_files:
+            return ""
+        return url_for("preview", filename=preview_files[number % len(preview_files)], _external=True)
+
+    @app.before_request
+    def inject_faults():
+        if request.endpoint is None or request.path.startswith("/_standin/"):
+            return None
+        delay, fault = injector.decide(request.url_rule.rule, request.headers.get(FAULT_HEADER))
+        if delay:
+            time.sleep(delay)
+        if fault == "429":
+            response = jsonify(error={"status": 429, "message": "API rate limit exceeded"})
+            response.status_code = 429
+            response.headers["Retry-After"] = str(injector.options.retry_after_seconds)
+            return response
+        if fault == "500":
+            response = jsonify(error={"status": 500, "message": "Injected stand-in failure"})
+            response.status_code = 500
+            return response
+        return None
+
+    # Control endpoints
+    @app.get("/_standin/stats")
+    def standin_stats():
+        return jsonify(injector.stats())
+
+    @app.post("/_standin/faults")
+    def standin_faults():
+        try:
+            updated = injector.update(request.get_json(silent=True) or {})
+        except (TypeError, ValueError) as exc:
+            return jsonify(error=str(exc)), 400
+        return jsonify(options=asdict(updated))
+
+    @app.get("/previews/<path:filename>")
+    def preview(filename):
+        return send_from_directory(audio_dir, filename, mimetype="audio/mpeg")
+
+    # Deezer
+    def deezer_artist(artist_id: int) -> dict[str, Any]:
+        return {
+            "id": artist_id,
+            "name": f"Standin Artist {artist_id}",
+            "picture_xl": f"https://standin.invalid/artist/{artist_id}.jpg",
+            "type": "artist",
+        }
+
+    def deezer_album_summary(album_id: int) -> dict[str, Any]:
+        return {
+            "id": album_id,
+            "title": f"Standin Album {album_id}",
+            "cover": f"https://standin.invalid/album/{album_id}.jpg",
+            "cover_xl": f"https://standin.invalid/album/{album_id}-xl.jpg",
+            "release_date": f"{1960 + album_id % 65}-{album_id % 12 + 1:02d}-01",
+            "type": "album",
+        }
+
+    def deezer_track(track_id: int, full: bool = True) -> dict[str, Any]:
+        artist = deezer_artist(_artist_id(_album_id(track_id)))
+        track = {
+            "id": track_id,
+            "readable": True,
+            "title": f"Standin Song {track_id}",
+            "title_short": f"Standin Song {track_id}",
+            "duration": 150 + track_id % 150,
+            "rank": track_id * 7919 % 1_000_000,
+            "preview": preview_url(track_id),
+            "artist": artist,
+            "album": deezer_album_summary(_album_id(track_id)),
+            "type": "track",
+        }
+        if full:
+            track.update({
+                "isrc": _isrc(track_id),
+                "track_position": (track_id - 1) % ALBUM_SIZE + 1,
+                "disk_number": 1,
+                "release_date": track["album"]["release_date"],
+                "bpm": 80 + track_id % 100,
+                "contributors": [artist],
+            })
+        return track
+
+    def deezer_error():
+        return jsonify(error={"type": "DataException", "message": "no data", "code": 800})
+
+    def deezer_page(ids: list[int], total: int | None = None, full: bool = False):
+        offset, limit = _page_args("index")
+        total = len(ids) if total is None else total
+        return jsonify(
+            data=[deezer_track(track_id, full) for track_id in ids[offset:offset + limit]],
+            total=total,
+            next=_next_url("index", offset, limit, total),
+        )
+
+    @app.get("/deezer/track/<track_ref>")
+    def deezer_track_view(track_ref):
+        match = _ISRC_RE.match(track_ref[len("isrc:"):]) if track_ref.startswith("isrc:") else None
+        track_id = int(match.group(1)) if match else _number(track_ref)
+        if not track_id:
+            return deezer_error()
+        return jsonify(deezer_track(track_id))
+
+    @app.get("/deezer/album/<int:album_id>")
+    def deezer_album(album_id):
+        track_ids = _album_track_ids(album_id)
+        return jsonify({
+            **deezer_album_summary(album_id),
+            "artist": deezer_artist(_artist_id(album_id)),
+            "nb_tracks": len(track_ids),
+            "tracks": {"data": [deezer_track(track_id, full=False) for track_id in track_ids]},
+        })
+
+    @app.get("/deezer/album/<int:album_id>/tracks")
+    def deezer_album_tracks(album_id):
+        return deezer_page(_album_track_ids(album_id))
+
+    @app.get("/deezer/playlist/<int:playlist_id>")
+    def deezer_playlist(playlist_id):
+        track_ids = _playlist_track_ids(playlist_id)
+        return jsonify({
+            "id": playlist_id,
+            "title": f"Standin Playlist {playlist_id}",
+            "nb_tracks": len(track_ids),
+            "picture_xl": f"https://standin.invalid/playlist/{playlist_id}.jpg",
+            "tracks": {"data": [deezer_track(track_id, full=False) for track_id in track_ids]},
+            "type": "playlist",
+        })
+
+    @app.get("/deezer/playlist/<int:playlist_id>/tracks")
+    def deezer_playlist_tracks(playlist_id):
+        return deezer_page(_playlist_track_ids(playlist_id))
+
+    @app.get("/deezer/search/<kind>")
+    def deezer_search(kind):
+        offset, limit = _page_args("index")
+        ids = _search_ids(request.args.get("q", ""), offset + limit)[offset:]
+        if kind == "track":
+            data = [deezer_track(track_id, full=False) for track_id in ids]
+        elif kind == "album":
+            data = [{**deezer_album_summary(album_id), "artist": deezer_artist(_artist_id(album_id)), "nb_tracks": ALBUM_SIZE} for album_id in ids]
+        elif kind == "playlist":
+            data = [{"id": playlist_id, "title": f"Standin Playlist {playlist_id}", "nb_tracks": len(_playlist_track_ids(playlist_id)), "type": "playlist"} for playlist_id in ids]
+        else:
+            return deezer_error()
+        total = MAX_PAGE_LIMIT * 10
+        return jsonify(data=data, total=total, next=_next_url("index", offset, limit, total))
+
+    @app.get("/deezer/chart/<int:genre_id>/tracks")
+    def deezer_chart_tracks(genre_id):
+        offset, limit = _page_args("index")
+        data = []
+        for position in range(offset + 1, offset + limit + 1):
+            track = deezer_track(genre_id * 1000 + position, full=False)
+            track["position"] = position
+            data.append(track)
+        return jsonify(data=data, total=MAX_PAGE_LIMIT, next=_next_url("index", offset, limit, MAX_PAGE_LIMIT))
+
+    # Spotify
+    def require_bearer():
+        header = request.headers.get("Authorization", "")
+        if not header.startswith("Bearer ") or not header[7:].strip():
+            response = jsonify(error={"status": 401, "message": "No token provided"})
+            response.status_code = 401
+            abort(response)
+
+    def spotify_artist(artist_id: int) -> dict[str, Any]:
+        return {"id": _spotify_id(artist_id), "name": f"Standin Artist {artist_id}", "type": "artist"}
+
+    def spotify_album_summary(album_id: int) -> dict[str, Any]:
+        return {
+            "id": _spotify_id(album_id),
+            "name": f"Standin Album {album_id}",
+            "album_type": "album",
+            "artists": [spotify_artist(_artist_id(album_id))],
+            "images": [{"url": f"https://standin.invalid/album/{album_id}.jpg", "height": 640, "width": 640}],
+            "release_date": f"{1960 + album_id % 65}-{album_id % 12 + 1:02d}-01",
+            "release_date_precision": "day",
+            "total_tracks": ALBUM_SIZE,
+            "type": "album",
+        }
+
+    def spotify_track(track_id: int) -> dict[str, Any]:
+        album_id = _album_id(track_id)
+        return {
+            "id": _spotify_id(track_id),
+            "name": f"Standin Song {track_id}",
+            "artists": [spotify_artist(_artist_id(album_id))],
+            "album": spotify_album_summary(album_id),
+            "duration_ms": (150 + track_id % 150) * 1000,
+            "popularity": track_id * 7919 % 101,
+            "preview_url": preview_url(track_id),
+            "external_ids": {"isrc": _isrc(track_id)},
+            "external_urls": {"spotify": f"https://open.spotify.com/track/{_spotify_id(track_id)}"},
+            "track_number": (track_id - 1) % ALBUM_SIZE + 1,
+            "uri": f"spotify:track:{_spotify_id(track_id)}",
+            "type": "track",
+        }
+
+    def spotify_audio_features(track_id: int) -> dict[str, Any]:
+        return {
+            "id": _spotify_id(track_id),
+            "danceability": track_id % 100 / 100,
+            "energy": track_id * 3 % 100 / 100,
+            "key": track_id % 12,
+            "loudness": -(track_id % 20),
+            "mode": track_id % 2,
+            "speechiness": track_id * 7 % 100 / 1000,
+            "acousticness": track_id * 11 % 100 / 100,
+            "instrumentalness": track_id * 13 % 100 / 1000,
+            "liveness": track_id * 17 % 100 / 100,
+            "valence": track_id * 19 % 100 / 100,
+            "tempo": float(80 + track_id % 100),
+            "duration_ms": (150 + track_id % 150) * 1000,
+            "time_signature": 4,
+            "type": "audio_features",
+        }
+
+    def spotify_paging(items: list[Any], offset: int, limit: int, total: int) -> dict[str, Any]:
+        return {
+            "href": request.base_url,
+            "items": items,
+            "limit": limit,
+            "offset": offset,
+            "total": total,
+            "next": _next_url("offset", offset, limit, total),
+            "previous": None,
+        }
+
+    def spotify_playlist_summary(playlist_id: int) -> dict[str, Any]:
+        return {
+            "id": _spotify_id(playlist_id),
+            "name": f"Standin Playlist {playlist_id}",
+            "description": "",
+            "images": [{"url": f"https://standin.invalid/playlist/{playlist_id}.jpg"}],
+            "owner": {"id": "standin-user", "display_name": "Standin User"},
+            "tracks": {"total": len(_playlist_track_ids(playlist_id))},
+            "type": "playlist",
+        }
+
+    @app.post("/spotify/accounts/api/token")
+    def spotify_token():
+        grant_type = request.form.get("grant_type")
+        if grant_type not in {"client_credentials", "refresh_token", "authorization_code"}:
+            return jsonify(error="unsupported_grant_type"), 400
+        payload = {
+            "access_token": f"standin-{os.urandom(8).hex()}",
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "scope": request.form.get("scope", ""),
+        }
+        if grant_type != "client_credentials":
+            payload["refresh_token"] = request.form.get("refresh_token") or "standin-refresh"
+        return jsonify(payload)
+
+    @app.get("/spotify/accounts/authorize")
+    def spotify_authorize():
+        redirect_uri = request.args.get("redirect_uri")
+        if not redirect_uri:
+            return jsonify(error="invalid_request"), 400
+        separator = "&" if "?" in redirect_uri else "?"
+        return redirect(f"{redirect_uri}{separator}code=standin-code&state={request.args.get('state', '')}")
+
+    @app.get("/spotify/v1/me")
+    def spotify_me():
+        require_bearer()
+        return jsonify(id="standin-user", display_name="Standin User", email="standin@example.invalid", product="premium")
+
+    @app.get("/spotify/v1/tracks/<spotify_id>")
+    def spotify_track_view(spotify_id):
+        require_bearer()
+        return jsonify(spotify_track(_spotify_number(spotify_id)))
+
+    @app.get("/spotify/v1/tracks")
+    def spotify_tracks():
+        require_bearer()
+        ids = [value for value in request.args.get("ids", "").split(",") if value]
+        return jsonify(tracks=[spotify_track(_spotify_number(value)) for value in ids[:50]])
+
+    @app.get("/spotify/v1/albums/<spotify_id>")
+    def spotify_album(spotify_id):
+        require_bearer()
+        album_id = _spotify_number(spotify_id)
+        tracks = [spotify_track(track_id) for track_id in _album_track_ids(album_id)]
+        return jsonify({**spotify_album_summary(album_id), "tracks": spotify_paging(tracks, 0, ALBUM_SIZE, ALBUM_SIZE)})
+
+    @app.get("/spotify/v1/albums/<spotify_id>/tracks")
+    def spotify_album_tracks(spotify_id):
+        require_bearer()
+        offset, limit = _page_args("offset")
+        track_ids = _album_track_ids(_spotify_number(spotify_id))
+        items = [spotify_track(track_id) for track_id in track_ids[offset:offset + limit]]
+        return jsonify(spotify_paging(items, offset, limit, len(track_ids)))
+
+    @app.get("/spotify/v1/playlists/<spotify_id>")
+    def spotify_playlist(spotify_id):
+        require_bearer()
+        playlist_id = _spotify_number(spotify_id)
+        track_ids = _playlist_track_ids(playlist_id)
+        limit = MAX_PAGE_LIMIT
+        items = [{"track": spotify_track(track_id)} for track_id in track_ids[:limit]]
+        paging = spotify_paging(items, 0, limit, len(track_ids))
+        if paging["next"]:
+            paging["next"] = url_for("spotify_playlist_tracks", spotify_id=spotify_id, offset=limit, limit=limit, _external=True)
+        return jsonify({**spotify_playlist_summary(playlist_id), "tracks": paging})
+
+    @app.get("/spotify/v1/playlists/<spotify_id>/tracks")
+    def spotify_playlist_tracks(spotify_id):
+        require_bearer()
+        offset, limit = _page_args("offset")
+        track_ids = _playlist_track_ids(_spotify_number(spotify_id))
+        items = [{"track": spotify_track(track_id)} for track_id in track_ids[offset:offset + limit]]
+        return jsonify(spotify_paging(items, offset, limit, len(track_ids)))
+
+    @app.get("/spotify/v1/users/<user_id>/playlists")
+    def spotify_user_playlists(user_id):
+        require_bearer()
+        offset, limit = _page_args("offset")
+        total = 3 + zlib.crc32(user_id.encode("utf-8")) % 60
+        base = zlib.crc32(user_id.encode("utf-8")) % 1_000_000
+        items = [spotify_playlist_summary(base + index) for index in range(offset, min(offset + limit, total))]
+        return jsonify(spotify_paging(items, offset, limit, total))
+
+    @app.get("/spotify/v1/search")
+    def spotify_search():
+        require_bearer()
+        offset, limit = _page_args("offset")
+        ids = _search_ids(request.args.get("q", ""), offset + limit)[offset:]
+        total = MAX_PAGE_LIMIT * 10
+        builders = {
+            "track": ("tracks", spotify_track),
+            "album": ("albums", spotify_album_summary),
+            "playlist": ("playlists", spotify_playlist_summary),
+        }
+        payload = {}
+        for kind in request.args.get("type", "track").split(","):
+            if kind in builders:
+                key, build = builders[kind]
+                payload[key] = spotify_paging([build(number) for number in ids], offset, limit, total)
+        return jsonify(payload)
+
+    @app.get("/spotify/v1/audio-features/<spotify_id>")
+    def spotify_audio_features_view(spotify_id):
+        require_bearer()
+        return jsonify(spotify_audio_features(_spotify_number(spotify_id)))
+
+    @app.get("/spotify/v1/audio-features")
+    def spotify_audio_features_batch():
+        require_bearer()
+        ids = [value for value in request.args.get("ids", "").split(",") if value]
+        return jsonify(audio_features=[spotify_audio_features(_spotify_number(value)) for value in ids[:100]])
+
+    @app.get("/spotify/v1/browse/new-releases")
+    def spotify_new_releases():
+        require_bearer()
+        offset, limit = _page_args("offset")
+        items = [spotify_album_summary(album_id) for album_id in range(offset + 1, offset + limit + 1)]
+        return jsonify(albums=spotify_paging(items, offset, limit, MAX_PAGE_LIMIT))
+
+    return app
+
+
+def standin_config_overrides(base_url: str) -> dict[str, str]:
+    """Return the app config that points Deezer and Spotify calls at a stand-in."""
+    base_url = base_url.rstrip("/")
+    return {
+        "DEEZER_API_BASE_URL": f"{base_url}/deezer",
+        "SPOTIFY_API_BASE_URL": f"{base_url}/spotify/v1",
+        "SPOTIFY_ACCOUNTS_BASE_URL": f"{base_url}/spotify/accounts",
+    }
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+@contextmanager
+def running_provider_standin(options: StandinOptions | None = None, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+    """Serve the stand-in on a background thread and yield its base URL."""
+    server = make_server(host, port, create_standin_app(options), threaded=True, request_handler=_QuietRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, name="provider-standin", daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
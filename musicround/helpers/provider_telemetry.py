@@ -0,0 +1,524 @@
+"""Latency, status, retry, and rate-limit telemetry for outbound provider calls.
+
+Most provider traffic goes through ``requests``, whether by module-level
+calls or by sessions. :func:`install_requests_telemetry` wraps
+``HTTPAdapter.send``, so every such call is measured without changing call
+sites. The host picks the provider (:data:`PROVIDER_HOSTS`, plus configured
+URLs such as ``OMDB_SERVER_URL``, matched by host and path prefix so the
+provider stand-in's ``/deezer`` and ``/spotify`` routes are told apart). The
+path, with IDs collapsed to ``{id}``,
+is the endpoint. Urllib3 retries done inside a mounted adapter are counted
+from the response's retry history.
+
+SDK clients that do not use ``requests`` (Polly, OpenAI, MusicBrainz, SMTP)
+are wrapped at their call sites with :func:`track_provider_call`. Retry loops
+in application code report each retry with :func:`record_provider_retry`.
+
+Counters live in one per-process :class:`ProviderTelemetry`. Gunicorn runs
+several workers, and a scrape lands on any one of them, so with
+``PROVIDER_TELEMETRY_DIR`` set every process also writes its counters to its
+own file in that directory (:meth:`ProviderTelemetry.share`), and reads merge
+all files. Every worker then answers with the same totals, and a worker that
+exits keeps its file, so totals never go backwards. Files not updated for
+a day are removed. The merged counters are exposed as Prometheus text
+(:meth:`ProviderTelemetry.prometheus_text`) and summarized for the admin
+notification digest. URLs, query strings, and headers other than rate-limit
+headers are never stored.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Iterator, Mapping
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PROVIDER_HOSTS = {
+    "api.deezer.com": "deezer",
+    "dzcdn.net": "deezer",
+    "api.spotify.com": "spotify",
+    "accounts.spotify.com": "spotify",
+    "scdn.co": "spotify",
+    "musicbrainz.org": "musicbrainz",
+    "ws.audioscrobbler.com": "lastfm",
+    "acrcloud.com": "acrcloud",
+    "dropboxapi.com": "dropbox",
+    "dropbox.com": "dropbox",
+    "api.openai.com": "openai",
+    "api.elevenlabs.io": "elevenlabs",
+    "itunes.apple.com": "apple",
+    "mzstatic.com": "apple",
+}
+CONFIGURED_PROVIDER_URLS = {
+    "OMDB_SERVER_URL": "omdb",
+    "SPOTIFY_ARCHIVE_CATALOG_URL": "spotify_archive",
+    "OPENAI_URL": "openai",
+    "DEEZER_API_BASE_URL": "deezer",
+    "SPOTIFY_API_BASE_URL": "spotify",
+    "SPOTIFY_ACCOUNTS_BASE_URL": "spotify",
+}
+# Rate-limit headers, most common first; ``requests`` matches them case-insensitively.
+RATE_LIMIT_REMAINING_HEADERS = ("X-RateLimit-Remaining", "RateLimit-Remaining")
+RATE_LIMIT_LIMIT_HEADERS = ("X-RateLimit-Limit", "RateLimit-Limit")
+MAX_ENDPOINT_SEGMENTS = 4
+SHARE_FLUSH_SECONDS = 5.0
+# Idle processes rewrite their file this often, so only files of exited
+# processes reach SHARE_RETENTION_SECONDS and are removed.
+SHARE_HEARTBEAT_SECONDS = 3600.0
+SHARE_RETENTION_SECONDS = 86400.0
+
+_ID_SEGMENT = re.compile(r"^(?:\d{3,}|[0-9a-f]{16,}|[A-Za-z0-9]{22}|[0-9a-f-]{36})$")
+_PREFIXED_ID_SEGMENT = re.compile(r"^(\w+):.+$")
+
+
+def endpoint_label(path: str) -> str:
+    """Return ``path`` with ID-like segments collapsed, e.g. ``/track/{id}``."""
+    segments = []
+    for segment in path.split("/"):
+        if not segment:
+            continue
+        prefixed = _PREFIXED_ID_SEGMENT.match(segment)
+        if prefixed:
+            segment = f"{prefixed.group(1)}:{{id}}"
+        elif _ID_SEGMENT.match(segment) and any(char.isdigit() for char in segment):
+            segment = "{id}"
+        segments.append(segment)
+        if len(segments) == MAX_ENDPOINT_SEGMENTS:
+            break
+    return "/" + "/".join(segments)
+
+
+def _header(headers: Mapping[str, str] | None, names: tuple[str, ...]) -> str | None:
+    if not headers:
+        return None
+    for name in names:
+        value = headers.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _int_or_none(value: Any) -> int | None:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class ProviderTelemetry:
+    """Thread-safe counters and latency histograms per provider and endpoint."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._extra_routes: dict[str, list[tuple[str, str]]] = {}
+        self._series: dict[tuple[str, str], dict[str, Any]] = {}
+        self._quota: dict[str, dict[str, Any]] = {}
+        self._share_dir: str | None = None
+        self._share_path: str | None = None
+        self._share_pid: int | None = None
+        self._dirty = False
+        self._flushed_at = 0.0
+        self._stop_flush = threading.Event()
+
+    def configure(self, config: Mapping[str, Any]) -> None:
+        """Classify configured provider URLs, such as a self-hosted OMDb server."""
+        for key, provider in CONFIGURED_PROVIDER_URLS.items():
+            parts = urlsplit(str(config.get(key) or ""))
+            if not parts.hostname:
+                continue
+            routes = self._extra_routes.setdefault(parts.hostname.lower(), [])
+            route = (parts.path.rstrip("/"), provider)
+            if route not in routes:
+                routes.append(route)
+                routes.sort(key=lambda item: -len(item[0]))
+
+    def classify(self, url: str) -> tuple[str, str] | None:
+        """Return ``(provider, endpoint)`` for a provider URL, or None for other hosts."""
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        provider = None
+        for prefix, name in self._extra_routes.get(host, ()):
+            if parts.path == prefix or parts.path.startswith(prefix + "/"):
+                provider = name
+                break
+        if provider is None:
+            for suffix, name in PROVIDER_HOSTS.items():
+                if host == suffix or host.endswith("." + suffix):
+                    provider = name
+                    break
+        if provider is None:
+            return None
+        return provider, endpoint_label(parts.path)
+
+    def _new_series(self) -> dict[str, Any]:
+        return {
+            "statuses": Counter(),
+            "buckets": [0] * len(self.buckets),
+            "count": 0,
+            "sum": 0.0,
+            "retries": 0,
+            "rate_limited": 0,
+        }
+
+    def _series_for(self, provider: str, endpoint: str) -> dict[str, Any]:
+        series = self._series.get((provider, endpoint))
+        if series is None:
+            series = self._series[(provider, endpoint)] = self._new_series()
+        return series
+
+    def record(
+        self,
+        provider: str,
+        endpoint: str,
+        seconds: float,
+        status: int | str | None = None,
+        headers: Mapping[str, str] | None = None,
+        retries: int = 0,
+    ) -> None:
+        """Record one finished call; ``status`` is an HTTP code or ``"error"``/``"ok"``."""
+        status_label = str(status) if status is not None else "ok"
+        rate_limited = status_label == "429"
+        with self._lock:
+            self._dirty = True
+            series = self._series_for(provider, endpoint)
+            series["count"] += 1
+            series["sum"] += seconds
+            series["statuses"][status_label] += 1
+            series["retries"] += max(0, retries)
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series["buckets"][index] += 1
+                    break
+            if rate_limited:
+                series["rate_limited"] += 1
+            remaining = _int_or_none(_header(headers, RATE_LIMIT_REMAINING_HEADERS))
+            if remaining is not None or rate_limited:
+                quota = self._quota.setdefault(provider, {})
+                quota["updated_at"] = datetime.utcnow().isoformat(timespec="seconds")
+                if remaining is not None:
+                    quota["remaining"] = remaining
+                limit = _int_or_none(_header(headers, RATE_LIMIT_LIMIT_HEADERS))
+                if limit is not None:
+                    quota["limit"] = limit
+                if rate_limited:
+                    quota["last_rate_limited_at"] = quota["updated_at"]
+                    retry_after = _int_or_none(_header(headers, ("Retry-After",)))
+                    if retry_after is not None:
+                        quota["retry_after_seconds"] = retry_after
+
+    def record_retry(self, provider: str, endpoint: str) -> None:
+        with self._lock:
+            self._dirty = True
+            self._series_for(provider, endpoint)["retries"] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._quota.clear()
+
+    def share(self, directory: str, flush_seconds: float = SHARE_FLUSH_SECONDS) -> None:
+        """Write this process's counters below ``directory`` and merge peers' files on read."""
+        pid = os.getpid()
+        with self._lock:
+            if self._share_pid == pid and self._share_dir == directory:
+                return
+            first_share = self._share_dir is None
+            self._stop_flush.set()
+            self._stop_flush = threading.Event()
+            # The random suffix keeps a restarted container from reusing a dead process's file.
+            self._share_dir = directory
+            self._share_path = os.path.join(directory, f"{pid}-{uuid.uuid4().hex[:8]}.json")
+            self._share_pid = pid
+            self._dirty = True
+            stop = self._stop_flush
+
+        def loop() -> None:
+            while not stop.wait(flush_seconds):
+                try:
+                    self.flush()
+                except OSError as exc:
+                    logger.warning("Could not write provider telemetry to %s: %s", directory, exc)
+
+        threading.Thread(target=loop, name="provider-telemetry-flush", daemon=True).start()
+        if first_share:
+            atexit.register(self.flush)
+
+    def flush(self, force: bool = False) -> None:
+        """Write this process's counters to its share file if they changed."""
+        if self._share_path is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not (force or self._dirty or now - self._flushed_at >= SHARE_HEARTBEAT_SECONDS):
+                return
+            self._dirty = False
+            self._flushed_at = now
+            series, quota = self._local_copy()
+        payload = {
+            "pid": self._share_pid,
+            "buckets": list(self.buckets),
+            "series": [
+                {"provider": provider, "endpoint": endpoint, **values}
+                for (provider, endpoint), values in series.items()
+            ],
+            "quota": quota,
+        }
+        os.makedirs(self._share_dir, exist_ok=True)
+        temporary = f"{self._share_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(temporary, self._share_path)
+        self._prune_shared(time.time())
+
+    def _prune_shared(self, now: float) -> None:
+        for path in self._shared_files():
+            try:
+                if now - os.path.getmtime(path) > SHARE_RETENTION_SECONDS:
+                    os.remove(path)
+            except OSError:
+                continue
+
+    def _shared_files(self) -> list[str]:
+        try:
+            names = os.listdir(self._share_dir)
+        except OSError:
+            return []
+        return [
+            os.path.join(self._share_dir, name)
+            for name in names
+            if name.endswith(".json") and os.path.join(self._share_dir, name) != self._share_path
+        ]
+
+    def _local_copy(self) -> tuple[dict[tuple[str, str], dict[str, Any]], dict[str, dict[str, Any]]]:
+        series = {
+            key: {**value, "statuses": Counter(value["statuses"]), "buckets": list(value["buckets"])}
+            for key, value in self._series.items()
+        }
+        quota = {provider: dict(values) for provider, values in self._quota.items()}
+        return series, quota
+
+    def _copy(self) -> tuple[dict[tuple[str, str], dict[str, Any]], dict[str, dict[str, Any]]]:
+        """Return this process's counters plus those shared by peer processes."""
+        with self._lock:
+            series, quota = self._local_copy()
+        if self._share_path is None:
+            return series, quota
+        for path in self._shared_files():
+            try:
+                with open(path, encoding="utf-8") as handle:
+                    peer = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            if peer.get("buckets") != list(self.buckets):
+                continue
+            for row in peer.get("series", ()):
+                merged = series.setdefault((row["provider"], row["endpoint"]), self._new_series())
+                merged["statuses"].update(row["statuses"])
+                merged["buckets"] = [a + b for a, b in zip(merged["buckets"], row["buckets"])]
+                for key in ("count", "sum", "retries", "rate_limited"):
+                    merged[key] += row[key]
+            for provider, values in peer.get("quota", {}).items():
+                # Keep every field, preferring the most recently reported values.
+                current = quota.get(provider, {})
+                if values.get("updated_at", "") >= current.get("updated_at", ""):
+                    quota[provider] = {**current, **values}
+                else:
+                    quota[provider] = {**values, **current}
+        return series, quota
+
+    def _quantile(self, buckets: list[int], count: int, quantile: float) -> float | None:
+        """Estimate a quantile as the upper bound of the bucket that contains it."""
+        if not count:
+            return None
+        target = quantile * count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, buckets):
+            seen += bucket_count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def summary(self) -> dict[str, Any]:
+        """Return per-provider totals, slowest endpoints, and last known quota."""
+        series, quota = self._copy()
+        providers: dict[str, dict[str, Any]] = {}
+        for (provider, endpoint), values in sorted(series.items()):
+            errors = sum(
+                count for status, count in values["statuses"].items()
+                if status == "error" or (status.isdigit() and int(status) >= 500)
+            )
+            row = providers.setdefault(provider, {
+                "provider": provider,
+                "calls": 0,
+                "errors": 0,
+                "rate_limited": 0,
+                "retries": 0,
+                "total_seconds": 0.0,
+                "buckets": [0] * len(self.buckets),
+                "endpoints": [],
+            })
+            row["calls"] += values["count"]
+            row["errors"] += errors
+            row["rate_limited"] += values["rate_limited"]
+            row["retries"] += values["retries"]
+            row["total_seconds"] += values["sum"]
+            row["buckets"] = [a + b for a, b in zip(row["buckets"], values["buckets"])]
+            row["endpoints"].append({
+                "endpoint": endpoint,
+                "calls": values["count"],
+                "errors": errors,
+                "rate_limited": values["rate_limited"],
+                "retries": values["retries"],
+                "average_ms": round(values["sum"] / values["count"] * 1000, 1) if values["count"] else None,
+                "p95_ms_upper_bound": self._bound_ms(self._quantile(values["buckets"], values["count"], 0.95)),
+                "statuses": dict(values["statuses"]),
+            })
+        rows = []
+        for provider, row in providers.items():
+            buckets = row.pop("buckets")
+            total_seconds = row.pop("total_seconds")
+            row["average_ms"] = round(total_seconds / row["calls"] * 1000, 1) if row["calls"] else None
+            row["p95_ms_upper_bound"] = self._bound_ms(self._quantile(buckets, row["calls"], 0.95))
+            row["endpoints"] = sorted(
+                row["endpoints"], key=lambda item: -(item["average_ms"] or 0)
+            )[:5]
+            row["quota"] = quota.get(provider)
+            rows.append(row)
+        rows.sort(key=lambda item: -item["calls"])
+        return {"providers": rows}
+
+    @staticmethod
+    def _bound_ms(seconds: float | None) -> float | None:
+        if seconds is None:
+            return None
+        return None if seconds == float("inf") else round(seconds * 1000, 1)
+
+    def prometheus_text(self) -> str:
+        """Render the counters in the Prometheus text exposition format."""
+        series, quota = self._copy()
+        lines = [
+            "# HELP qb_provider_requests_total Outbound provider calls by status.",
+            "# TYPE qb_provider_requests_total counter",
+        ]
+        for (provider, endpoint), values in sorted(series.items()):
+            for status, count in sorted(values["statuses"].items()):
+                lines.append(
+                    f"qb_provider_requests_total{_labels(provider=provider, endpoint=endpoint, status=status)} {count}"
+                )
+        lines += [
+            "# HELP qb_provider_request_duration_seconds Outbound provider call latency.",
+            "# TYPE qb_provider_request_duration_seconds histogram",
+        ]
+        for (provider, endpoint), values in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, values["buckets"]):
+                cumulative += bucket_count
+                labels = _labels(provider=provider, endpoint=endpoint, le=repr(float(bound)))
+                lines.append(f"qb_provider_request_duration_seconds_bucket{labels} {cumulative}")
+            labels = _labels(provider=provider, endpoint=endpoint, le="+Inf")
+            lines.append(f"qb_provider_request_duration_seconds_bucket{labels} {values['count']}")
+            labels = _labels(provider=provider, endpoint=endpoint)
+            lines.append(f"qb_provider_request_duration_seconds_sum{labels} {values['sum']:.6f}")
+            lines.append(f"qb_provider_request_duration_seconds_count{labels} {values['count']}")
+        for name, key, help_text in (
+            ("qb_provider_retries_total", "retries", "Retried outbound provider calls."),
+            ("qb_provider_rate_limited_total", "rate_limited", "Provider responses with HTTP 429."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (provider, endpoint), values in sorted(series.items()):
+                lines.append(f"{name}{_labels(provider=provider, endpoint=endpoint)} {values[key]}")
+        for name, key, help_text in (
+            ("qb_provider_quota_remaining", "remaining", "Last reported remaining provider quota."),
+            ("qb_provider_quota_limit", "limit", "Last reported provider quota limit."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for provider, values in sorted(quota.items()):
+                if key in values:
+                    lines.append(f"{name}{_labels(provider=provider)} {values[key]}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    escaped = []
+    for name, value in labels.items():
+        text = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{text}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+provider_telemetry = ProviderTelemetry()
+
+
+@contextmanager
+def track_provider_call(provider: str, endpoint: str) -> Iterator[None]:
+    """Measure a non-``requests`` provider call; exceptions are recorded as ``error``."""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        provider_telemetry.record(provider, endpoint, time.perf_counter() - started, "error")
+        raise
+    provider_telemetry.record(provider, endpoint, time.perf_counter() - started, "ok")
+
+
+def record_provider_retry(url_or_provider: str, endpoint: str | None = None) -> None:
+    """Count one application-level retry, given a request URL or a provider and endpoint."""
+    if endpoint is None:
+        classified = provider_telemetry.classify(url_or_provider)
+        if classified is None:
+            return
+        url_or_provider, endpoint = classified
+    provider_telemetry.record_retry(url_or_provider, endpoint)
+
+
+_install_lock = threading.Lock()
+
+
+def install_requests_telemetry(config: Mapping[str, Any] | None = None) -> None:
+    """Measure every ``requests`` call to a known provider. Safe to call repeatedly."""
+    from requests.adapters import HTTPAdapter
+
+    if config is not None:
+        provider_telemetry.configure(config)
+        if config.get("PROVIDER_TELEMETRY_DIR"):
+            provider_telemetry.share(config["PROVIDER_TELEMETRY_DIR"])
+    with _install_lock:
+        if getattr(HTTPAdapter.send, "_provider_telemetry", False):
+            return
+        original_send = HTTPAdapter.send
+
+        def send(self, request, *args, **kwargs):
+            classified = provider_telemetry.classify(request.url or "")
+            if classified is None:
+                return original_send(self, request, *args, **kwargs)
+            started = time.perf_counter()
+            try:
+                response = original_send(self, request, *args, **kwargs)
+            except Exception:
+                provider_telemetry.record(*classified, time.perf_counter() - started, "error")
+                raise
+            retry_state = getattr(getattr(response, "raw", None), "retries", None)
+            provider_telemetry.record(
+                *classified,
+                time.perf_counter() - started,
+                response.status_code,
+                headers=response.headers,
+                retries=len(getattr(retry_state, "history", None) or ()),
+            )
+            return response
+
+        send._provider_telemetry = True
+        send.__wrapped__ = original_send
+        HTTPAdapter.send = send
@@ -0,0 +1,38 @@
+"""Configurable base URLs for the Deezer and Spotify APIs.
+
+Production uses the public endpoints. ``DEEZER_API_BASE_URL``,
+``SPOTIFY_API_BASE_URL``, and ``SPOTIFY_ACCOUNTS_BASE_URL`` can point the app
+at the offline provider stand-in (see :mod:`musicround.helpers.provider_standin`)
+for CI and load tests.
+"""
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+from flask import current_app, has_app_context
+
+DEFAULT_DEEZER_API_BASE_URL = "https://api.deezer.com"
+DEFAULT_SPOTIFY_API_BASE_URL = "https://api.spotify.com/v1"
+DEFAULT_SPOTIFY_ACCOUNTS_BASE_URL = "https://accounts.spotify.com"
+
+
+def _url(key: str, default: str, path: str, config: Mapping[str, Any] | None) -> str:
+    if config is None and has_app_context():
+        config = current_app.config
+    base = ((config or {}).get(key) or default).rstrip("/")
+    return f"{base}/{path.lstrip('/')}" if path else base
+
+
+def deezer_api_url(path: str = "", config: Mapping[str, Any] | None = None) -> str:
+    """Return a Deezer API URL such as ``https://api.deezer.com/track/3135556``."""
+    return _url("DEEZER_API_BASE_URL", DEFAULT_DEEZER_API_BASE_URL, path, config)
+
+
+def spotify_api_url(path: str = "", config: Mapping[str, Any] | None = None) -> str:
+    """Return a Spotify Web API URL such as ``https://api.spotify.com/v1/tracks/<id>``."""
+    return _url("SPOTIFY_API_BASE_URL", DEFAULT_SPOTIFY_API_BASE_URL, path, config)
+
+
+def spotify_accounts_url(path: str = "", config: Mapping[str, Any] | None = None) -> str:
+    """Return a Spotify accounts URL such as ``https://accounts.spotify.com/api/token``."""
+    return _url("SPOTIFY_ACCOUNTS_BASE_URL", DEFAULT_SPOTIFY_ACCOUNTS_BASE_URL, path, config)
@@ -0,0 +1,351 @@
+"""Opt-in SQL instrumentation for requests, MCP tools, and worker jobs.
+
+SQLAlchemy cursor events attribute every statement to the innermost active
+:class:`QueryScope`. A scope counts queries, sums their database time, and
+fingerprints each statement (literals and ``IN`` lists collapsed) so that
+one statement repeated many times in a single unit of work, the usual N+1
+pattern, stands out.
+
+:func:`capture_queries` opens a bare scope for tests and smoke checks.
+:class:`QueryProfiler` keeps a bounded sample of finished scopes per
+endpoint, tool, or job, reports percentiles, and logs statements slower than
+``QUERY_PROFILER_SLOW_MS``. Applications enable it with
+``QUERY_PROFILER_ENABLED``; see :func:`init_query_profiler`.
+
+Statement parameters are never recorded, since they can hold tokens or
+personal data.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_QUERY_MS = 200.0
+DEFAULT_REPEAT_THRESHOLD = 5
+DEFAULT_SAMPLE_SIZE = 500
+DEFAULT_SLOW_LOG_SIZE = 100
+STATEMENT_PREVIEW_CHARS = 500
+PERCENTILES = (50, 90, 99)
+
+_ACTIVE_SCOPE: ContextVar["QueryScope | None"] = ContextVar("query_profiler_scope", default=None)
+_LISTENERS_LOCK = threading.Lock()
+_listeners_installed = False
+
+_IN_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_fingerprint(statement: str) -> str:
+    """Normalize ``statement`` so that repeats with different values compare equal."""
+    fingerprint = _STRING_LITERAL.sub("?", statement)
+    fingerprint = _NUMBER_LITERAL.sub("?", fingerprint)
+    fingerprint = _IN_LIST.sub("(?)", fingerprint)
+    return _WHITESPACE.sub(" ", fingerprint).strip()
+
+
+class QueryScope:
+    """Queries issued by one request, tool call, or job."""
+
+    def __init__(self, kind: str, name: str, repeat_threshold: int = DEFAULT_REPEAT_THRESHOLD):
+        self.kind = kind
+        self.name = name
+        self.repeat_threshold = max(2, int(repeat_threshold))
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.fingerprints: Counter[str] = Counter()
+        self.started = time.perf_counter()
+        self.duration_seconds: float | None = None
+        self.profiler: QueryProfiler | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}:{self.name}"
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.query_count += 1
+        self.db_seconds += seconds
+        self.fingerprints[statement_fingerprint(statement)] += 1
+        if self.profiler is not None:
+            self.profiler._check_slow(self, statement, seconds)
+
+    def repeated_statements(self) -> list[dict[str, Any]]:
+        """Return statements issued at least ``repeat_threshold`` times, most frequent first."""
+        return [
+            {"fingerprint": fingerprint, "count": count}
+            for fingerprint, count in self.fingerprints.most_common()
+            if count >= self.repeat_threshold
+        ]
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "scope": self.key,
+            "query_count": self.query_count,
+            "db_ms": round(self.db_seconds * 1000, 3),
+            "duration_ms": round((self.duration_seconds or 0.0) * 1000, 3),
+            "repeated_statements": self.repeated_statements(),
+        }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # The start time lives on the execution context, which is discarded with
+    # the statement, so a statement that raises leaves nothing behind.
+    if context is not None and _ACTIVE_SCOPE.get() is not None:
+        context._query_profiler_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    scope = _ACTIVE_SCOPE.get()
+    started = getattr(context, "_query_profiler_started", None)
+    if scope is None or started is None:
+        return
+    scope.record(statement, time.perf_counter() - started)
+
+
+def _install_listeners() -> None:
+    global _listeners_installed
+    with _LISTENERS_LOCK:
+        if _listeners_installed:
+            return
+        # Engine-class listeners also cover engines created after this call.
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _listeners_installed = True
+
+
+@contextmanager
+def capture_queries(
+    kind: str = "capture",
+    name: str = "block",
+    repeat_threshold: int = DEFAULT_REPEAT_THRESHOLD,
+) -> Iterator[QueryScope]:
+    """Count the queries issued inside the block on this thread or task."""
+    _install_listeners()
+    scope = QueryScope(kind, name, repeat_threshold)
+    token = _ACTIVE_SCOPE.set(scope)
+    try:
+        yield scope
+    finally:
+        scope.duration_seconds = time.perf_counter() - scope.started
+        _ACTIVE_SCOPE.reset(token)
+
+
+def current_query_scope() -> QueryScope | None:
+    return _ACTIVE_SCOPE.get()
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {**{f"p{percentile}": 0.0 for percentile in PERCENTILES}, "max": 0.0}
+    ordered = sorted(values)
+    result = {}
+    for percentile in PERCENTILES:
+        # Nearest-rank percentile.
+        index = max(0, -(-percentile * len(ordered) // 100) - 1)
+        result[f"p{percentile}"] = round(ordered[index], 3)
+    result["max"] = round(ordered[-1], 3)
+    return result
+
+
+class QueryProfiler:
+    """Per-process aggregate of finished query scopes."""
+
+    def __init__(
+        self,
+        slow_query_ms: float = DEFAULT_SLOW_QUERY_MS,
+        repeat_threshold: int = DEFAULT_REPEAT_THRESHOLD,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        slow_log_size: int = DEFAULT_SLOW_LOG_SIZE,
+    ):
+        self.slow_query_ms = max(0.0, float(slow_query_ms))
+        self.repeat_threshold = max(2, int(repeat_threshold))
+        self.sample_size = max(1, int(sample_size))
+        self._lock = threading.Lock()
+        self._scopes: dict[str, dict[str, Any]] = {}
+        self._slow_queries: deque[dict[str, Any]] = deque(maxlen=max(1, int(slow_log_size)))
+        self.started_at = datetime.utcnow()
+
+    @classmethod
+    def from_config(cls, config) -> "QueryProfiler":
+        return cls(
+            slow_query_ms=config.get("QUERY_PROFILER_SLOW_MS", DEFAULT_SLOW_QUERY_MS),
+            repeat_threshold=config.get("QUERY_PROFILER_REPEAT_THRESHOLD", DEFAULT_REPEAT_THRESHOLD),
+            sample_size=config.get("QUERY_PROFILER_SAMPLE_SIZE", DEFAULT_SAMPLE_SIZE),
+            slow_log_size=config.get("QUERY_PROFILER_SLOW_LOG_SIZE", DEFAULT_SLOW_LOG_SIZE),
+        )
+
+    def start(self, kind: str, name: str) -> tuple[QueryScope, Any]:
+        """Activate a scope; pass the returned pair to :meth:`finish`."""
+        _install_listeners()
+        scope = QueryScope(kind, name, self.repeat_threshold)
+        scope.profiler = self
+        return scope, _ACTIVE_SCOPE.set(scope)
+
+    def finish(self, scope: QueryScope, token: Any) -> None:
+        scope.duration_seconds = time.perf_counter() - scope.started
+        try:
+            _ACTIVE_SCOPE.reset(token)
+        except ValueError:
+            # Streamed responses finish in a different context; the scope is
+            # still recorded, and the request context that held it goes away.
+            pass
+        self._record(scope)
+
+    @contextmanager
+    def scope(self, kind: str, name: str) -> Iterator[QueryScope]:
+        scope, token = self.start(kind, name)
+        try:
+            yield scope
+        finally:
+            self.finish(scope, token)
+
+    def _check_slow(self, scope: QueryScope, statement: str, seconds: float) -> None:
+        duration_ms = seconds * 1000
+        if duration_ms < self.slow_query_ms:
+            return
+        preview = _WHITESPACE.sub(" ", statement).strip()[:STATEMENT_PREVIEW_CHARS]
+        logger.warning("Slow query (%.1f ms) in %s: %s", duration_ms, scope.key, preview)
+        with self._lock:
+            self._slow_queries.append({
+                "scope": scope.key,
+                "duration_ms": round(duration_ms, 3),
+                "statement": preview,
+                "at": datetime.utcnow().isoformat(),
+            })
+
+    def _record(self, scope: QueryScope) -> None:
+        repeated = scope.repeated_statements()
+        with self._lock:
+            stats = self._scopes.get(scope.key)
+            if stats is None:
+                stats = self._scopes[scope.key] = {
+                    "kind": scope.kind,
+                    "name": scope.name,
+                    "count": 0,
+                    "samples": deque(maxlen=self.sample_size),
+                    "repeated": {},
+                }
+            stats["count"] += 1
+            stats["samples"].append(
+                (scope.query_count, scope.db_seconds * 1000, (scope.duration_seconds or 0.0) * 1000)
+            )
+            for item in repeated:
+                seen = stats["repeated"].setdefault(item["fingerprint"], {"occurrences": 0, "max_count": 0})
+                seen["occurrences"] += 1
+                seen["max_count"] = max(seen["max_count"], item["count"])
+
+    def snapshot(self, kind: str | None = None, limit: int = 100) -> dict[str, Any]:
+        """Return per-scope percentiles, repeated statements, and the slow-query log."""
+        with self._lock:
+            scopes = [
+                (key, stats["kind"], stats["name"], stats["count"], list(stats["samples"]), dict(stats["repeated"]))
+                for key, stats in self._scopes.items()
+                if kind is None or stats["kind"] == kind
+            ]
+            slow_queries = list(self._slow_queries)
+        rows = []
+        for key, scope_kind, name, count, samples, repeated in scopes:
+            queries = _percentiles([sample[0] for sample in samples])
+            db_ms = _percentiles([sample[1] for sample in samples])
+            rows.append({
+                "scope": key,
+                "kind": scope_kind,
+                "name": name,
+                "count": count,
+                "sampled": len(samples),
+                "queries": queries,
+                "db_ms": db_ms,
+                "duration_ms": _percentiles([sample[2] for sample in samples]),
+                "repeated_statements": sorted(
+                    ({"fingerprint": fingerprint, **seen} for fingerprint, seen in repeated.items()),
+                    key=lambda item: (-item["max_count"], -item["occurrences"]),
+                )[:10],
+            })
+        rows.sort(key=lambda row: (-row["db_ms"]["p90"], -row["queries"]["p90"], row["scope"]))
+        return {
+            "enabled": True,
+            "since": self.started_at.isoformat(),
+            "slow_query_ms": self.slow_query_ms,
+            "repeat_threshold": self.repeat_threshold,
+            "scopes": rows[:limit],
+            "slow_queries": list(reversed(slow_queries)),
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._scopes.clear()
+            self._slow_queries.clear()
+            self.started_at = datetime.utcnow()
+
+
+def query_profiler(app=None) -> QueryProfiler | None:
+    """Return the profiler of ``app`` (default: the current app) when it is enabled."""
+    if app is None:
+        from flask import current_app, has_app_context
+
+        if not has_app_context():
+            return None
+        app = current_app
+    return app.extensions.get("query_profiler")
+
+
+@contextmanager
+def profile_scope(kind: str, name: str, app=None) -> Iterator[QueryScope | None]:
+    """Profile the block as ``kind:name`` when the app has profiling enabled."""
+    profiler = query_profiler(app)
+    if profiler is None:
+        yield None
+        return
+    with profiler.scope(kind, name) as scope:
+        yield scope
+
+
+def init_query_profiler(app) -> None:
+    """Profile every request when ``QUERY_PROFILER_ENABLED`` is set.
+
+    Debug apps, or apps with ``QUERY_PROFILER_HEADERS``, also get
+    ``X-DB-Query-Count``, ``X-DB-Time-Ms``, and ``X-DB-Repeated-Statements``
+    response headers.
+    """
+    if not app.config.get("QUERY_PROFILER_ENABLED"):
+        return
+    from flask import g, request
+
+    profiler = QueryProfiler.from_config(app.config)
+    app.extensions["query_profiler"] = profiler
+
+    @app.before_request
+    def start_query_profile():
+        if request.endpoint == "static":
+            return
+        g.query_profile = profiler.start("request", request.endpoint or "unmatched")
+
+    @app.after_request
+    def add_query_profile_headers(response):
+        active = g.get("query_profile")
+        if active is None or not (app.debug or app.config.get("QUERY_PROFILER_HEADERS")):
+            return response
+        scope = active[0]
+        response.headers["X-DB-Query-Count"] = str(scope.query_count)
+        response.headers["X-DB-Time-Ms"] = f"{scope.db_seconds * 1000:.1f}"
+        response.headers["X-DB-Repeated-Statements"] = str(len(scope.repeated_statements()))
+        return response
+
+    @app.teardown_request
+    def finish_query_profile(exc):
+        active = g.pop("query_profile", None)
+        if active is not None:
+            profiler.finish(*active)
@@ -0,0 +1,484 @@
+"""On-demand CPU profiles of requests, MCP tools, and worker jobs.
+
+An administrator arms a capture for the next N requests of an endpoint, the
+next call of an MCP tool, or the next background job (an ``ImportWorker``
+import or a tool job). Names are the ones the query profiler uses
+(``rounds.view_round``, ``search_songs``, ``import_deezer_playlist``) and may
+be glob patterns such as ``import_*``. The matching unit of work is then
+profiled in one of two modes:
+
+* ``sample``: a helper thread samples the worker thread's stack every
+  ``RUNTIME_PROFILER_SAMPLE_INTERVAL_MS``. The result is a folded-stack file
+  for flamegraph.pl, speedscope, or Firefox Profiler.
+* ``cprofile``: deterministic :mod:`cProfile` tracing of the worker thread,
+  saved as a ``pstats`` file. It is more precise but slower while it runs.
+
+Arms live in ``armed.json`` next to the saved profiles, so every web worker,
+the MCP server, and the import worker that share the data directory see them.
+Each process re-reads the file at most once a second, which keeps the cost of
+an unarmed check to a clock read. Claims take an exclusive file lock, so an
+arm for one request is used once even with several processes. Arms expire
+after an hour by default, and only the newest ``RUNTIME_PROFILER_MAX_PROFILES``
+profiles are kept.
+"""
+from __future__ import annotations
+
+import cProfile
+import fcntl
+import fnmatch
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterator
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KINDS = ("request", "mcp", "job")
+PROFILE_MODES = ("sample", "cprofile")
+PROFILE_FILE_EXTENSIONS = {"sample": "folded", "cprofile": "pstats"}
+DEFAULT_SAMPLE_INTERVAL_MS = 5.0
+DEFAULT_MAX_PROFILES = 50
+DEFAULT_ARM_TTL_SECONDS = 3600
+MAX_ARM_COUNT = 100
+ARM_CHECK_INTERVAL_SECONDS = 1.0
+TOP_FUNCTIONS = 15
+
+_PROFILE_ID = re.compile(r"^[A-Za-z0-9_.-]+$")
+_UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+# Python 3.12+ allows one active cProfile per process.
+_CPROFILE_LOCK = threading.Lock()
+
+
+@dataclass
+class ProfileArm:
+    """A pending request to profile the next ``remaining`` matching units of work."""
+
+    id: str
+    kind: str
+    name: str
+    mode: str
+    count: int
+    remaining: int
+    armed_by: str | None
+    armed_at: str
+    expires_at: str
+
+    def expired(self, now: datetime) -> bool:
+        return datetime.fromisoformat(self.expires_at) <= now
+
+    def matches(self, kind: str, name: str, now: datetime) -> bool:
+        return self.kind == kind and fnmatch.fnmatchcase(name, self.name) and not self.expired(now)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or os.path.basename(code.co_filename)
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _folded_stack(frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class _StackSampler(threading.Thread):
+    """Sample one thread's stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval_seconds: float):
+        super().__init__(name="runtime-profiler-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            self.stacks[_folded_stack(frame)] += 1
+
+    def stop(self) -> Counter[str]:
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+class ProfileCapture:
+    """One running profile, started and stopped on the profiled thread."""
+
+    def __init__(self, profiler: "RuntimeProfiler", arm: ProfileArm, kind: str, name: str):
+        self.profiler = profiler
+        self.arm = arm
+        self.kind = kind
+        self.name = name
+        self.mode = arm.mode
+        self.started_at = datetime.utcnow()
+        self._started = 0.0
+        self._sampler: _StackSampler | None = None
+        self._cprofile: cProfile.Profile | None = None
+
+    def start(self) -> "ProfileCapture":
+        if self.mode == "cprofile" and _CPROFILE_LOCK.acquire(blocking=False):
+            self._cprofile = cProfile.Profile()
+        else:
+            # Another capture holds cProfile; sampling still works alongside it.
+            self.mode = "sample"
+            self._sampler = _StackSampler(threading.get_ident(), self.profiler.sample_interval_ms / 1000)
+        self._started = time.perf_counter()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        else:
+            self._sampler.start()
+        return self
+
+    def stop(self, error: BaseException | None = None) -> dict[str, Any] | None:
+        duration_ms = (time.perf_counter() - self._started) * 1000
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            _CPROFILE_LOCK.release()
+            data = self._cprofile
+            top, detail = _cprofile_top(data), {}
+        else:
+            data = self._sampler.stop()
+            top, detail = _sample_top(data), {
+                "sample_count": sum(data.values()),
+                "sample_interval_ms": self.profiler.sample_interval_ms,
+            }
+        metadata = {
+            "id": _profile_id(self.started_at, self.kind, self.name),
+            "kind": self.kind,
+            "name": self.name,
+            "mode": self.mode,
+            "arm_id": self.arm.id,
+            "armed_by": self.arm.armed_by,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "status": "ok" if error is None else f"error: {type(error).__name__}",
+            "pid": os.getpid(),
+            "top_functions": top,
+            **detail,
+        }
+        try:
+            return self.profiler._save(metadata, data)
+        except OSError as exc:
+            logger.warning("Could not save runtime profile for %s:%s: %s", self.kind, self.name, exc)
+            return None
+
+
+def _profile_id(started_at: datetime, kind: str, name: str) -> str:
+    slug = _UNSAFE_NAME_CHARS.sub("-", name).strip("-")[:60] or "unnamed"
+    return f"{started_at:%Y%m%dT%H%M%S}-{kind}-{slug}-{uuid4().hex[:6]}"
+
+
+def _sample_top(stacks: Counter[str]) -> list[dict[str, Any]]:
+    total = sum(stacks.values())
+    own: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        own[stack.rsplit(";", 1)[-1]] += count
+    return [
+        {"function": function, "samples": count, "percent": round(count * 100 / total, 1)}
+        for function, count in own.most_common(TOP_FUNCTIONS)
+    ]
+
+
+def _cprofile_top(profile: cProfile.Profile) -> list[dict[str, Any]]:
+    profile.create_stats()
+    rows = sorted(profile.stats.items(), key=lambda item: -item[1][2])[:TOP_FUNCTIONS]
+    return [
+        {
+            "function": f"{os.path.basename(filename)}:{line}({function})",
+            "calls": calls,
+            "self_ms": round(own_seconds * 1000, 3),
+            "cumulative_ms": round(cumulative_seconds * 1000, 3),
+        }
+        for (filename, line, function), (_primitive, calls, own_seconds, cumulative_seconds, _callers) in rows
+    ]
+
+
+class RuntimeProfiler:
+    """Armed captures and saved profiles in one directory shared by all processes."""
+
+    def __init__(
+        self,
+        directory: str,
+        sample_interval_ms: float = DEFAULT_SAMPLE_INTERVAL_MS,
+        max_profiles: int = DEFAULT_MAX_PROFILES,
+    ):
+        self.directory = directory
+        self.sample_interval_ms = max(1.0, float(sample_interval_ms))
+        self.max_profiles = max(1, int(max_profiles))
+        self._checked_at = float("-inf")
+        self._arms_mtime: int | None = None
+        self._cached_arms: tuple[ProfileArm, ...] = ()
+
+    @classmethod
+    def from_config(cls, config) -> "RuntimeProfiler":
+        return cls(
+            directory=config.get("RUNTIME_PROFILER_DIR")
+            or os.path.join(config.get("DATA_DIR", "/data"), "profiles"),
+            sample_interval_ms=config.get("RUNTIME_PROFILER_SAMPLE_INTERVAL_MS", DEFAULT_SAMPLE_INTERVAL_MS),
+            max_profiles=config.get("RUNTIME_PROFILER_MAX_PROFILES", DEFAULT_MAX_PROFILES),
+        )
+
+    @property
+    def arms_path(self) -> str:
+        return os.path.join(self.directory, "armed.json")
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, "armed.lock"), "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read_arms(self) -> list[ProfileArm]:
+        try:
+            with open(self.arms_path, encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable runtime profiler arms file: %s", exc)
+            return []
+        return [ProfileArm(**item) for item in payload.get("arms", [])]
+
+    def _write_arms(self, arms: list[ProfileArm]) -> None:
+        temporary = f"{self.arms_path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump({"arms": [asdict(arm) for arm in arms]}, handle, indent=2)
+        os.replace(temporary, self.arms_path)
+        self._checked_at = float("-inf")
+
+    def _current_arms(self) -> tuple[ProfileArm, ...]:
+        now = time.monotonic()
+        if now - self._checked_at < ARM_CHECK_INTERVAL_SECONDS:
+            return self._cached_arms
+        self._checked_at = now
+        try:
+            mtime = os.stat(self.arms_path).st_mtime_ns
+        except OSError:
+            self._arms_mtime, self._cached_arms = None, ()
+            return ()
+        if mtime != self._arms_mtime:
+            self._arms_mtime, self._cached_arms = mtime, tuple(self._read_arms())
+        return self._cached_arms
+
+    def arm(
+        self,
+        kind: str,
+        name: str,
+        count: int = 1,
+        mode: str = "sample",
+        armed_by: str | None = None,
+        ttl_seconds: int = DEFAULT_ARM_TTL_SECONDS,
+    ) -> ProfileArm:
+        """Profile the next ``count`` units of work of ``kind`` whose name matches ``name``."""
+        name = (name or "").strip()
+        if kind not in PROFILE_KINDS:
+            raise ValueError(f"Unknown profile kind {kind!r}; expected one of {', '.join(PROFILE_KINDS)}.")
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}; expected one of {', '.join(PROFILE_MODES)}.")
+        if not name:
+            raise ValueError("A name or glob pattern is required.")
+        if not 1 <= int(count) <= MAX_ARM_COUNT:
+            raise ValueError(f"Count must be between 1 and {MAX_ARM_COUNT}.")
+        now = datetime.utcnow()
+        arm = ProfileArm(
+            id=uuid4().hex[:12],
+            kind=kind,
+            name=name,
+            mode=mode,
+            count=int(count),
+            remaining=int(count),
+            armed_by=armed_by,
+            armed_at=now.isoformat(),
+            expires_at=(now + timedelta(seconds=max(1, int(ttl_seconds)))).isoformat(),
+        )
+        with self._locked():
+            arms = [item for item in self._read_arms() if not item.expired(now)]
+            arms.append(arm)
+            self._write_arms(arms)
+        return arm
+
+    def disarm(self, arm_id: str) -> bool:
+        with self._locked():
+            arms = self._read_arms()
+            remaining = [arm for arm in arms if arm.id != arm_id]
+            if len(remaining) == len(arms):
+                return False
+            self._write_arms(remaining)
+        return True
+
+    def arms(self) -> list[ProfileArm]:
+        now = datetime.utcnow()
+        return [arm for arm in self._read_arms() if not arm.expired(now)]
+
+    def claim(self, kind: str, name: str) -> ProfileArm | None:
+        """Use up one matching arm, or return None. Cheap when nothing is armed."""
+        arms = self._current_arms()
+        if not arms:
+            return None
+        now = datetime.utcnow()
+        if not any(arm.matches(kind, name, now) for arm in arms):
+            return None
+        claimed = None
+        with self._locked():
+            current = self._read_arms()
+            kept = []
+            for arm in current:
+                if arm.expired(now):
+                    continue
+                if claimed is None and arm.matches(kind, name, now):
+                    arm.remaining -= 1
+                    claimed = arm
+                    if arm.remaining <= 0:
+                        continue
+                kept.append(arm)
+            if len(kept) != len(current) or claimed is not None:
+                self._write_arms(kept)
+        return claimed
+
+    def start(self, kind: str, name: str) -> ProfileCapture | None:
+        """Start a capture when an arm matches; pass the result to :meth:`ProfileCapture.stop`."""
+        try:
+            arm = self.claim(kind, name)
+        except OSError as exc:
+            logger.warning("Runtime profiler arms are unavailable: %s", exc)
+            return None
+        if arm is None:
+            return None
+        return ProfileCapture(self, arm, kind, name).start()
+
+    @contextmanager
+    def capture(self, kind: str, name: str) -> Iterator[ProfileCapture | None]:
+        active = self.start(kind, name)
+        if active is None:
+            yield None
+            return
+        try:
+            yield active
+        except BaseException as exc:
+            active.stop(exc)
+            raise
+        else:
+            active.stop()
+
+    def _save(self, metadata: dict[str, Any], data: cProfile.Profile | Counter[str]) -> dict[str, Any]:
+        os.makedirs(self.directory, exist_ok=True)
+        filename = f"{metadata['id']}.{PROFILE_FILE_EXTENSIONS[metadata['mode']]}"
+        path = os.path.join(self.directory, filename)
+        if isinstance(data, cProfile.Profile):
+            data.dump_stats(path)
+        else:
+            with open(path, "w", encoding="utf-8") as handle:
+                for stack, count in data.most_common():
+                    handle.write(f"{stack} {count}\n")
+        metadata.update(filename=filename, size_bytes=os.path.getsize(path))
+        with open(os.path.join(self.directory, f"{metadata['id']}.json"), "w", encoding="utf-8") as handle:
+            json.dump(metadata, handle, indent=2)
+        logger.info("Saved runtime profile %s (%s ms)", metadata["id"], metadata["duration_ms"])
+        self._prune()
+        return metadata
+
+    def profiles(self) -> list[dict[str, Any]]:
+        """Return saved profile metadata, newest first."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        profiles = []
+        for filename in names:
+            if not filename.endswith(".json") or filename == "armed.json":
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding="utf-8") as handle:
+                    profiles.append(json.load(handle))
+            except (OSError, ValueError):
+                continue
+        profiles.sort(key=lambda item: item.get("started_at", ""), reverse=True)
+        return profiles
+
+    def profile(self, profile_id: str) -> dict[str, Any] | None:
+        if not _PROFILE_ID.match(profile_id or ""):
+            return None
+        try:
+            with open(os.path.join(self.directory, f"{profile_id}.json"), encoding="utf-8") as handle:
+                metadata = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        metadata["path"] = os.path.join(self.directory, metadata["filename"])
+        return metadata if os.path.isfile(metadata["path"]) else None
+
+    def delete_profile(self, profile_id: str) -> bool:
+        metadata = self.profile(profile_id)
+        if metadata is None:
+            return False
+        for path in (metadata["path"], os.path.join(self.directory, f"{profile_id}.json")):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return True
+
+    def _prune(self) -> None:
+        for metadata in self.profiles()[self.max_profiles:]:
+            self.delete_profile(metadata["id"])
+
+
+def runtime_profiler(app=None) -> RuntimeProfiler | None:
+    """Return the runtime profiler of ``app`` (default: the current app)."""
+    if app is None:
+        from flask import current_app, has_app_context
+
+        if not has_app_context():
+            return None
+        app = current_app
+    return app.extensions.get("runtime_profiler")
+
+
+@contextmanager
+def capture_profile(kind: str, name: str, app=None) -> Iterator[ProfileCapture | None]:
+    """Profile the block as ``kind:name`` when an administrator armed a matching capture."""
+    profiler = runtime_profiler(app)
+    if profiler is None:
+        yield None
+        return
+    with profiler.capture(kind, name) as capture:
+        yield capture
+
+
+def init_runtime_profiler(app) -> None:
+    """Check every request against the armed captures."""
+    from flask import g, request
+
+    app.extensions["runtime_profiler"] = RuntimeProfiler.from_config(app.config)
+
+    @app.before_request
+    def start_runtime_profile():
+        if request.endpoint == "static":
+            return
+        profiler = app.extensions.get("runtime_profiler")
+        if profiler is not None:
+            g.runtime_profile = profiler.start("request", request.endpoint or "unmatched")
+
+    @app.teardown_request
+    def finish_runtime_profile(exc):
+        active = g.pop("runtime_profile", None)
+        if active is not None:
+            active.stop(exc)
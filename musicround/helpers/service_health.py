@@ -3,7 +3,12 @@
 from __future__ import annotations
 
 import os
-from typing import Any
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from datetime import datetime, timezone
+from typing import Any, Callable
 
 from flask import current_app
 from sqlalchemy import func, text
@@ -320,17 +325,19 @@ def dropbox_service_health(user: Any | None = None) -> dict[str, Any]:
     return payload
 
 
-def application_health_payload(include_storage: bool = True) -> dict[str, Any]:
-    """Return a public-safe health payload for uptime checks."""
-    services = {
-        "database": database_service_health(),
-        "import_queue": import_queue_service_health(),
-        "spotify": spotify_service_health(),
-        "email": email_service_health(required=False),
+def _health_checks(include_storage: bool = True) -> dict[str, Callable[[], dict[str, Any]]]:
+    checks = {
+        "database": database_service_health,
+        "import_queue": import_queue_service_health,
+        "spotify": spotify_service_health,
+        "email": lambda: email_service_health(required=False),
     }
     if include_storage:
-        services["artifact_storage"] = artifact_storage_service_health()
+        checks["artifact_storage"] = artifact_storage_service_health
+    return checks
 
+
+def _health_payload(services: dict[str, dict[str, Any]]) -> dict[str, Any]:
     ok = all(service.get("ok", False) for service in services.values())
     status = "ok" if ok else "degraded"
     return {
@@ -340,3 +347,207 @@ def application_health_payload(include_storage: bool = True) -> dict[str, Any]:
         "release": VERSION_INFO["release_name"],
         "services": services,
     }
+
+
+def application_health_payload(include_storage: bool = True) -> dict[str, Any]:
+    """Return a public-safe health payload for uptime checks."""
+    services = {name: check() for name, check in _health_checks(include_storage).items()}
+    return _health_payload(services)
+
+
+def _failed_check_payload(code: str, message: str) -> dict[str, Any]:
+    issues = [_issue(code, message, hint="Check the server logs for this health component.")]
+    return {"status": "error", "ok": False, "issues": issues}
+
+
+class HealthSampler:
+    """Keeps recent results of each health component for cheap probes.
+
+    Components run concurrently on a small thread pool, each on its own
+    interval. A component is never checked twice at once, so a slow storage
+    or database probe cannot pile up behind frequent liveness probes. Callers
+    get the cached result plus its age. A check that has been running longer
+    than the timeout, and a result older than two intervals (plus the
+    timeout), both report the component as failed, so a hung check cannot
+    keep serving its last good result.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        checks: dict[str, Callable[[], dict[str, Any]]],
+        intervals: dict[str, float],
+        timeout: float,
+    ):
+        self.app = app
+        self.checks = checks
+        self.intervals = intervals
+        self.timeout = max(0.1, float(timeout))
+        self._samples: dict[str, dict[str, Any]] = {}
+        self._inflight: dict[str, Future] = {}
+        self._started: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(checks),
+            thread_name_prefix="health-check",
+        )
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _run_check(self, name: str) -> None:
+        with self.app.app_context():
+            started = time.monotonic()
+            try:
+                payload = self.checks[name]()
+            except Exception as exc:
+                current_app.logger.error("Health check %s failed: %s", name, exc, exc_info=True)
+                payload = _failed_check_payload("health_check_failed", f"The {name} health check failed.")
+            duration = time.monotonic() - started
+        with self._lock:
+            self._samples[name] = {
+                "payload": payload,
+                "monotonic": time.monotonic(),
+                "sampled_at": datetime.now(timezone.utc).isoformat(),
+                "duration_seconds": round(duration, 3),
+            }
+            self._inflight.pop(name, None)
+            self._started.pop(name, None)
+
+    def _due(self, name: str, now: float) -> bool:
+        sample = self._samples.get(name)
+        return sample is None or now - sample["monotonic"] >= self.intervals[name]
+
+    def refresh(self, names: list[str] | None = None, wait: bool = True) -> None:
+        """Start checks for components that are due and optionally wait for them."""
+        now = time.monotonic()
+        pending = []
+        with self._lock:
+            for name in names or list(self.checks):
+                future = self._inflight.get(name)
+                if future is None and self._due(name, now):
+                    future = self._executor.submit(self._run_check, name)
+                    self._inflight[name] = future
+                    self._started[name] = now
+                if future is not None:
+                    pending.append((name, future))
+        if not wait or not pending:
+            return
+        wait_futures([future for _name, future in pending], timeout=self.timeout)
+        with self._lock:
+            for name, future in pending:
+                if not future.done() and name not in self._samples:
+                    # First result is still running; report the overrun until it lands.
+                    self._samples[name] = {
+                        "payload": _failed_check_payload(
+                            "health_check_timed_out",
+                            f"The {name} health check did not finish in time.",
+                        ),
+                        "monotonic": float("-inf"),
+                        "sampled_at": None,
+                        "duration_seconds": None,
+                    }
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the cached application health payload with sample ages."""
+        if self.running:
+            # The background loop keeps samples fresh; only fill gaps here.
+            missing = [name for name in self.checks if name not in self._samples]
+            if missing:
+                self.refresh(missing)
+        else:
+            self.refresh()
+
+        now = time.monotonic()
+        services = {}
+        with self._lock:
+            samples = dict(self._samples)
+            started = dict(self._started)
+        for name in self.checks:
+            sample = samples[name]
+            age = now - sample["monotonic"] if sample["sampled_at"] else None
+            running = now - started[name] if name in started else None
+            stale = age is None or age > 2 * self.intervals[name] + self.timeout
+            if running is not None and running > self.timeout:
+                service = _failed_check_payload(
+                    "health_check_timed_out",
+                    f"The {name} health check did not finish in time.",
+                )
+            elif stale:
+                service = _failed_check_payload(
+                    "health_sample_stale",
+                    f"The {name} health check has not reported a recent result.",
+                )
+            else:
+                service = dict(sample["payload"])
+            service["sample"] = {
+                "sampled_at": sample["sampled_at"],
+                "age_seconds": round(age, 3) if age is not None else None,
+                "interval_seconds": self.intervals[name],
+                "duration_seconds": sample["duration_seconds"],
+                "running_seconds": round(running, 3) if running is not None else None,
+                "stale": stale,
+            }
+            services[name] = service
+        payload = _health_payload(services)
+        payload["stale"] = any(service["sample"]["stale"] for service in services.values())
+        return payload
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Refresh due components from a daemon thread until :meth:`stop`."""
+        if self.running:
+            return
+        self._stop.clear()
+        tick = max(0.5, min(self.intervals.values()) / 3)
+
+        def loop() -> None:
+            while not self._stop.wait(tick):
+                try:
+                    self.refresh(wait=False)
+                except Exception:
+                    self.app.logger.exception("Health sampler refresh failed")
+
+        self._thread = threading.Thread(target=loop, name="health-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_SAMPLER_LOCK = threading.Lock()
+
+
+def application_health_sampler() -> HealthSampler:
+    """Return this app's health sampler, creating and starting it on first use."""
+    app = current_app._get_current_object()
+    sampler = app.extensions.get("health_sampler")
+    if sampler is None:
+        with _SAMPLER_LOCK:
+            sampler = app.extensions.get("health_sampler")
+            if sampler is None:
+                config = app.config
+                interval = max(1, int(config.get("HEALTH_SAMPLE_INTERVAL_SECONDS", 15)))
+                storage_interval = max(1, int(config.get("HEALTH_STORAGE_SAMPLE_INTERVAL_SECONDS", 60)))
+                checks = _health_checks()
+                intervals = {name: interval for name in checks}
+                intervals["artifact_storage"] = storage_interval
+                sampler = HealthSampler(
+                    app,
+                    checks,
+                    intervals,
+                    timeout=config.get("HEALTH_CHECK_TIMEOUT_SECONDS", 5.0),
+                )
+                app.extensions["health_sampler"] = sampler
+                # Started lazily so forking servers create the thread in each worker.
+                if config.get("HEALTH_SAMPLER_BACKGROUND", True) and not app.testing:
+                    sampler.start()
+    return sampler
+
+
+def cached_application_health_payload() -> dict[str, Any]:
+    """Return the health payload from the sampler instead of probing every service."""
+    return application_health_sampler().snapshot()
@@ -2,9 +2,23 @@
 
 from __future__ import annotations
 
-from typing import Any
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator
 
 import requests
+from requests.adapters import HTTPAdapter
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+ISRC_LOOKUP_LIMIT = 500
+BULK_ISRC_LOOKUP_LIMIT = 10_000
+BULK_AUDIO_FEATURE_LOOKUP_LIMIT = 50_000
+DEFAULT_PIPELINE_BATCH_ROWS = 500
+
+_session_local = threading.local()
+_adapter_lock = threading.Lock()
 
 
 class SpotifyArchiveError(ValueError):
@@ -15,6 +29,36 @@ def _base_url(app) -> str:
     return str(app.config.get("SPOTIFY_ARCHIVE_CATALOG_URL") or "").rstrip("/")
 
 
+def _max_in_flight(app) -> int:
+    return max(1, int(app.config.get("SPOTIFY_ARCHIVE_MAX_IN_FLIGHT") or 1))
+
+
+def _session(app) -> requests.Session:
+    """Return this thread's session, sharing one keep-alive pool per app.
+
+    ``requests.Session`` is not thread-safe, but its urllib3 pool is. Every
+    thread gets its own session mounted on the app's shared adapter, so
+    pipelined bulk requests reuse warm connections to the archive service.
+    """
+    adapter = app.extensions.get("spotify_archive_http_adapter")
+    if adapter is None:
+        with _adapter_lock:
+            adapter = app.extensions.get("spotify_archive_http_adapter")
+            if adapter is None:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(4, _max_in_flight(app)))
+                app.extensions["spotify_archive_http_adapter"] = adapter
+    sessions = getattr(_session_local, "sessions", None)
+    if sessions is None:
+        sessions = _session_local.sessions = {}
+    session = sessions.get(id(adapter))
+    if session is None:
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        sessions[id(adapter)] = session
+    return session
+
+
 def spotify_archive_catalog_status(app) -> dict[str, Any]:
     """Return a credential-safe readiness summary for the optional archive."""
     base_url = _base_url(app)
@@ -99,7 +143,7 @@ def lookup_spotify_archive_isrcs(app, isrcs: list[str]) -> dict[str, Any]:
     normalized = sorted({str(value).strip().upper() for value in isrcs if str(value).strip()})
     if not normalized:
         return {"results": [], "snapshot": None}
-    if len(normalized) > 500:
+    if len(normalized) > ISRC_LOOKUP_LIMIT:
         raise SpotifyArchiveError("Archive ISRC lookup supports at most 500 values per request.")
     base_url = _base_url(app)
     if not base_url:
@@ -128,13 +172,13 @@ def bulk_lookup_spotify_archive_isrcs(app, isrcs: list[str]) -> dict[str, Any]:
     normalized = sorted({str(value).strip().upper() for value in isrcs if str(value).strip()})
     if not normalized:
         return {"results": [], "snapshot": None}
-    if len(normalized) > 10_000:
+    if len(normalized) > BULK_ISRC_LOOKUP_LIMIT:
         raise SpotifyArchiveError("Archive bulk ISRC lookup supports at most 10000 values.")
     base_url = _base_url(app)
     if not base_url:
         raise SpotifyArchiveError("Offline Spotify archive catalog is not configured.")
     try:
-        response = requests.post(
+        response = _session(app).post(
             f"{base_url}/v1/isrc-bulk-lookup",
             json={"isrcs": normalized},
             timeout=app.config.get("SPOTIFY_ARCHIVE_BULK_TIMEOUT", 1800),
@@ -157,13 +201,13 @@ def bulk_lookup_spotify_archive_audio_features(app, spotify_ids: list[str]) -> d
     normalized = sorted({str(value).strip() for value in spotify_ids if str(value).strip()})
     if not normalized:
         return {"results": [], "snapshot": None}
-    if len(normalized) > 50_000:
+    if len(normalized) > BULK_AUDIO_FEATURE_LOOKUP_LIMIT:
         raise SpotifyArchiveError("Archive audio-features lookup supports at most 50000 values.")
     base_url = _base_url(app)
     if not base_url:
         raise SpotifyArchiveError("Offline Spotify archive catalog is not configured.")
     try:
-        response = requests.post(
+        response = _session(app).post(
             f"{base_url}/v1/audio-features-bulk-lookup",
             json={"spotify_ids": normalized},
             timeout=app.config.get("SPOTIFY_ARCHIVE_BULK_TIMEOUT", 1800),
@@ -179,3 +223,168 @@ def bulk_lookup_spotify_archive_audio_features(app, spotify_ids: list[str]) -> d
     if not isinstance(payload.get("results"), list):
         raise SpotifyArchiveError("Offline Spotify archive catalog returned invalid data.")
     return payload
+
+
+def _stream_bulk_lookup(
+    app, path: str, field: str, values: list[str], failure_message: str
+) -> Iterator[dict[str, Any]]:
+    """POST a bulk lookup in NDJSON mode and yield results as lines arrive.
+
+    Only one decoded line is held at a time. A stream that stops before the
+    service's ``end`` frame raises instead of looking like a short result.
+    """
+    base_url = _base_url(app)
+    if not base_url:
+        raise SpotifyArchiveError("Offline Spotify archive catalog is not configured.")
+    try:
+        response = _session(app).post(
+            f"{base_url}{path}",
+            json={field: values},
+            headers={"Accept": NDJSON_MIMETYPE},
+            timeout=app.config.get("SPOTIFY_ARCHIVE_BULK_TIMEOUT", 1800),
+            stream=True,
+        )
+    except requests.RequestException as exc:
+        raise SpotifyArchiveError("Offline Spotify archive catalog is unavailable.") from exc
+    try:
+        if not response.ok:
+            raise SpotifyArchiveError(failure_message)
+        if NDJSON_MIMETYPE not in response.headers.get("Content-Type", ""):
+            raise SpotifyArchiveError("Offline Spotify archive catalog does not support streaming.")
+        for line in response.iter_lines():
+            if not line:
+                continue
+            try:
+                frame = json.loads(line)
+            except ValueError as exc:
+                raise SpotifyArchiveError(
+                    "Offline Spotify archive catalog returned invalid data."
+                ) from exc
+            frame_type = frame.get("type") if isinstance(frame, dict) else None
+            if frame_type == "result" and isinstance(frame.get("result"), dict):
+                yield frame["result"]
+            elif frame_type == "end":
+                return
+            elif frame_type == "error":
+                app.logger.warning("Spotify archive stream failed: %s", frame.get("error"))
+                raise SpotifyArchiveError(failure_message)
+            elif frame_type != "meta":
+                raise SpotifyArchiveError("Offline Spotify archive catalog returned invalid data.")
+    except requests.RequestException as exc:
+        raise SpotifyArchiveError("Offline Spotify archive catalog is unavailable.") from exc
+    finally:
+        response.close()
+    raise SpotifyArchiveError("Offline Spotify archive catalog stream ended early.")
+
+
+def stream_spotify_archive_isrcs(app, isrcs: list[str]) -> Iterator[dict[str, Any]]:
+    """Yield the best archive match per ISRC while the bulk scan streams back.
+
+    Accepts the same 10000-value bound as ``bulk_lookup_spotify_archive_isrcs``
+    but never materialises the full result list.
+    """
+    normalized = sorted({str(value).strip().upper() for value in isrcs if str(value).strip()})
+    if not normalized:
+        return
+    if len(normalized) > BULK_ISRC_LOOKUP_LIMIT:
+        raise SpotifyArchiveError("Archive bulk ISRC lookup supports at most 10000 values.")
+    yield from _stream_bulk_lookup(
+        app, "/v1/isrc-bulk-lookup", "isrcs", normalized,
+        "Offline Spotify archive ISRC bulk lookup failed.",
+    )
+
+
+def stream_spotify_archive_audio_features(
+    app, spotify_ids: list[str]
+) -> Iterator[dict[str, Any]]:
+    """Yield archive audio features per Spotify ID as the offline scan finds them."""
+    normalized = sorted({str(value).strip() for value in spotify_ids if str(value).strip()})
+    if not normalized:
+        return
+    if len(normalized) > BULK_AUDIO_FEATURE_LOOKUP_LIMIT:
+        raise SpotifyArchiveError("Archive audio-features lookup supports at most 50000 values.")
+    yield from _stream_bulk_lookup(
+        app, "/v1/audio-features-bulk-lookup", "spotify_ids", normalized,
+        "Offline Spotify archive audio-features lookup failed.",
+    )
+
+
+_CHUNK_DONE = object()
+
+
+def pipelined_spotify_archive_lookup(
+    app,
+    values: list[str],
+    lookup: Callable[[Any, list[str]], Iterable[dict[str, Any]]],
+    *,
+    chunk_size: int,
+    max_in_flight: int | None = None,
+    batch_rows: int = DEFAULT_PIPELINE_BATCH_ROWS,
+) -> Iterator[list[dict[str, Any]]]:
+    """Split ``values`` into service-sized chunks and yield result batches as they land.
+
+    At most ``max_in_flight`` chunk requests run at once (default
+    ``SPOTIFY_ARCHIVE_MAX_IN_FLIGHT``). Workers hand rows over in batches of
+    ``batch_rows`` through a bounded queue, so the caller can write one batch
+    while later chunks are still being fetched and memory stays bounded.
+    Batches arrive in completion order, not chunk order. The first lookup
+    failure is raised here after any rows that arrived before it. ``app`` must
+    be the application object, not the ``current_app`` proxy: each worker
+    pushes its own app context around ``lookup``.
+    """
+    chunks = [values[start:start + chunk_size] for start in range(0, len(values), chunk_size)]
+    if not chunks:
+        return
+    workers = min(max_in_flight or _max_in_flight(app), len(chunks))
+    handoff: queue.Queue = queue.Queue(maxsize=workers * 4)
+    cancelled = threading.Event()
+
+    def put(item) -> bool:
+        while not cancelled.is_set():
+            try:
+                handoff.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch(chunk: list[str]) -> None:
+        batch: list[dict[str, Any]] = []
+        rows = None
+        with app.app_context():
+            try:
+                rows = lookup(app, chunk)
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= batch_rows:
+                        if not put(batch):
+                            return
+                        batch = []
+                if batch and not put(batch):
+                    return
+                put(_CHUNK_DONE)
+            except Exception as exc:  # handed to the consuming thread
+                if batch and not put(batch):
+                    return
+                put(exc)
+            finally:
+                close = getattr(rows, "close", None)
+                if close is not None:
+                    close()
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="spotify-archive")
+    remaining = len(chunks)
+    try:
+        for chunk in chunks:
+            executor.submit(fetch, chunk)
+        while remaining:
+            item = handoff.get()
+            if item is _CHUNK_DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        cancelled.set()
+        executor.shutdown(wait=not remaining, cancel_futures=True)
@@ -9,6 +9,7 @@ import requests
 import logging
 from flask import current_app
 from musicround.helpers.paths import app_data_path
+from musicround.helpers.provider_urls import spotify_accounts_url, spotify_api_url
 
 class SpotifyDirectClient:
     """
@@ -19,8 +20,8 @@ class SpotifyDirectClient:
         self.client_id = client_id or current_app.config['SPOTIFY_CLIENT_ID']
         self.client_secret = client_secret or current_app.config['SPOTIFY_CLIENT_SECRET']
         self.cache_path = cache_path or app_data_path('.spotifycache')
-        self.base_url = 'https://api.spotify.com/v1'
-        self.token_url = 'https://accounts.spotify.com/api/token'
+        self.base_url = spotify_api_url()
+        self.token_url = spotify_accounts_url('api/token')
         self.access_token = bearer_token  # Use provided bearer token if available
         self.token_expiry = 0
         self.refresh_token = None
@@ -35,7 +36,10 @@ class SpotifyDirectClient:
             backoff_factor=0.5,
             status_forcelist=[429, 500, 502, 503, 504]
         )
-        self.session.mount('https://', HTTPAdapter(max_retries=retries))
+        adapter = HTTPAdapter(max_retries=retries)
+        self.session.mount('https://', adapter)
+        # Plain HTTP is only used by the local provider stand-in.
+        self.session.mount('http://', adapter)
         
         # Only load tokens from cache if bearer token was not provided
         if not bearer_token:
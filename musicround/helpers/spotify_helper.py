@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from flask import current_app, flash, session
 from flask_login import current_user
 from musicround.models import db, SystemSetting
+from musicround.helpers.provider_urls import spotify_accounts_url, spotify_api_url
 
 # How long a manually-supplied bearer token (see update_bearer_token) is
 # trusted for. These tokens aren't obtained through this app's OAuth client
@@ -61,7 +62,7 @@ def refresh_spotify_token(refresh_token):
     }
 
     try:
-        response = requests.post('https://accounts.spotify.com/api/token', data=data, timeout=10)
+        response = requests.post(spotify_accounts_url('api/token'), data=data, timeout=10)
     except requests.RequestException as e:
         current_app.logger.error(f"Network error refreshing Spotify token: {e}")
         return None
@@ -357,7 +358,7 @@ def get_spotify_user_info(access_token):
     }
     
     try:
-        response = requests.get('https://api.spotify.com/v1/me', headers=headers, timeout=10)
+        response = requests.get(spotify_api_url('me'), headers=headers, timeout=10)
         
         if response.status_code == 200:
             return response.json()
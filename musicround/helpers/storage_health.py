@@ -2,15 +2,42 @@
 
 from __future__ import annotations
 
+import io
+import logging
 import os
 import tempfile
+import threading
 import uuid
-from typing import Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import IO, Any, Iterator
 
 from flask import current_app
 
+from musicround.helpers.artifact_cache import (
+    DEFAULT_INDEX_MAX_AGE_SECONDS,
+    ArtifactDiskCache,
+    ArtifactInventoryIndex,
+)
+
+logger = logging.getLogger(__name__)
+
 ROUND_ARTIFACT_KINDS = {"mp3", "pdf"}
 SUPPORTED_ROUND_ARTIFACT_BACKENDS = {"filesystem", "s3"}
+ROUND_ARTIFACT_CONTENT_TYPES = {"mp3": "audio/mpeg", "pdf": "application/pdf"}
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_S3_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_S3_MAX_CONCURRENCY = 4
+STREAM_COPY_SIZE = 1024 * 1024
+
+
+def copy_stream(source: IO[bytes], target: IO[bytes], block_size: int = STREAM_COPY_SIZE) -> int:
+    """Copy ``source`` to ``target`` in bounded blocks and return the byte count."""
+    copied = 0
+    for block in iter(lambda: source.read(block_size), b""):
+        target.write(block)
+        copied += len(block)
+    return copied
 
 
 class FilesystemRoundArtifactStore:
@@ -50,6 +77,39 @@ class FilesystemRoundArtifactStore:
             artifact_file.write(data)
         return path
 
+    def open_read(self, kind: str, round_id: int) -> IO[bytes]:
+        """Return a binary stream over the artifact; the caller closes it."""
+        return open(self.path(kind, round_id), "rb")
+
+    @contextmanager
+    def open_write(self, kind: str, round_id: int) -> Iterator[IO[bytes]]:
+        """Yield a writable stream that replaces the artifact when the block exits.
+
+        Content goes to a sibling ``.partial`` file first, so readers never
+        see a half-written artifact and a failed write keeps the old one.
+        """
+        path = self.path(kind, round_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial_path = f"{path}.{uuid.uuid4().hex}.partial"
+        try:
+            with open(partial_path, "wb") as artifact_file:
+                yield artifact_file
+            os.replace(partial_path, path)
+        except BaseException:
+            try:
+                os.remove(partial_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def persist_file(self, kind: str, round_id: int, source_path: str) -> str:
+        """Store a locally rendered file as the artifact without reading it into memory."""
+        path = self.path(kind, round_id)
+        if os.path.abspath(source_path) != os.path.abspath(path):
+            with open(source_path, "rb") as source, self.open_write(kind, round_id) as target:
+                copy_stream(source, target)
+        return path
+
     def delete(self, kind: str, round_id: int) -> bool:
         path = self.path(kind, round_id)
         if not os.path.exists(path):
@@ -102,8 +162,292 @@ def _s3_client():
     )
 
 
+def _s3_error_code(exc: Exception) -> str:
+    response = getattr(exc, "response", {}) or {}
+    return str((response.get("Error") or {}).get("Code") or "")
+
+
+class _S3MultipartWriter(io.RawIOBase):
+    """Writable stream that uploads an S3 object in parallel multipart parts.
+
+    Writes are buffered into ``part_size`` parts; full parts are uploaded on
+    a small thread pool while the caller keeps writing, and at most
+    ``max_concurrency`` parts are in flight, which bounds memory to roughly
+    ``(max_concurrency + 1) * part_size``. Objects that fit in one part are
+    sent with a single ``put_object``. :meth:`close` completes the upload;
+    :meth:`abort` cancels it so no orphaned parts are left behind. When a
+    ``cache_fill`` sink is given, the bytes are also teed into the local
+    cache; committing it is left to the caller once the ETag is known.
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        key: str,
+        content_type: str,
+        part_size: int = DEFAULT_S3_PART_SIZE,
+        max_concurrency: int = DEFAULT_S3_MAX_CONCURRENCY,
+        cache_fill=None,
+    ):
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+        self._content_type = content_type
+        self._part_size = max(S3_MIN_PART_SIZE, int(part_size))
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._parts: list[Future] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots = threading.BoundedSemaphore(self._max_concurrency)
+        self.cache_fill = cache_fill
+        self.size = 0
+        self.etag: str | None = None
+        self._finished = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self._finished:
+            raise ValueError("write to a closed artifact stream")
+        data = bytes(data)
+        self._buffer.extend(data)
+        if self.cache_fill is not None:
+            self.cache_fill.write(data)
+        self.size += len(data)
+        while len(self._buffer) >= self._part_size:
+            part = bytes(self._buffer[:self._part_size])
+            del self._buffer[:self._part_size]
+            self._submit_part(part)
+        return len(data)
+
+    def _submit_part(self, data: bytes) -> None:
+        if self._upload_id is None:
+            response = self._client.create_multipart_upload(
+                Bucket=self._bucket,
+                Key=self._key,
+                ContentType=self._content_type,
+            )
+            self._upload_id = response["UploadId"]
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_concurrency,
+                thread_name_prefix="artifact-upload",
+            )
+        # Fail fast instead of queueing more parts behind a broken upload.
+        for future in self._parts:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+        self._slots.acquire()
+        part_number = len(self._parts) + 1
+        try:
+            future = self._executor.submit(self._upload_part, part_number, data)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._parts.append(future)
+
+    def _upload_part(self, part_number: int, data: bytes) -> dict[str, Any]:
+        try:
+            response = self._client.upload_part(
+                Bucket=self._bucket,
+                Key=self._key,
+                UploadId=self._upload_id,
+                PartNumber=part_number,
+                Body=data,
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Upload what is buffered and complete the object."""
+        if self._finished:
+            return
+        try:
+            if self._upload_id is None:
+                response = self._client.put_object(
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    Body=bytes(self._buffer),
+                    ContentType=self._content_type,
+                )
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+                parts = [future.result() for future in self._parts]
+                response = self._client.complete_multipart_upload(
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+            self.etag = (response or {}).get("ETag")
+            self._buffer = bytearray()
+        except BaseException:
+            self.abort()
+            raise
+        self._finished = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        super().close()
+
+    def abort(self) -> None:
+        """Cancel the upload and discard buffered and cached bytes."""
+        if self._finished:
+            return
+        self._finished = True
+        self._buffer = bytearray()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._upload_id is not None:
+            try:
+                self._client.abort_multipart_upload(
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    UploadId=self._upload_id,
+                )
+            except Exception:
+                logger.warning("Could not abort multipart upload of %s", self._key, exc_info=True)
+        if self.cache_fill is not None:
+            self.cache_fill.abort()
+        super().close()
+
+
+class _S3RangeReader(io.RawIOBase):
+    """Seekable read stream over an S3 object using ranged GETs.
+
+    The object is fetched in ``part_size`` ranges and the next
+    ``max_concurrency`` ranges are prefetched in parallel, so memory stays
+    bounded by the read-ahead window. Every range is requested with
+    ``IfMatch`` on the ETag seen when the stream was opened, so an object
+    replaced mid-read fails instead of returning mixed content. A
+    ``cache_fill`` sink receives the bytes of a front-to-back read and is
+    committed to the local cache when the stream is closed at the end.
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        key: str,
+        size: int,
+        etag: str | None = None,
+        part_size: int = DEFAULT_S3_PART_SIZE,
+        max_concurrency: int = DEFAULT_S3_MAX_CONCURRENCY,
+        cache_fill=None,
+    ):
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+        self.size = int(size)
+        self._etag = etag
+        self._part_size = max(1, int(part_size))
+        self._read_ahead = max(1, int(max_concurrency))
+        self._position = 0
+        self._ranges: dict[int, Future] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._read_ahead,
+            thread_name_prefix="artifact-download",
+        )
+        self._cache_fill = cache_fill
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def _fetch(self, index: int) -> bytes:
+        start = index * self._part_size
+        end = min(start + self._part_size, self.size) - 1
+        kwargs = {"Bucket": self._bucket, "Key": self._key, "Range": f"bytes={start}-{end}"}
+        if self._etag:
+            kwargs["IfMatch"] = self._etag
+        body = self._client.get_object(**kwargs)["Body"]
+        try:
+            return body.read()
+        finally:
+            close = getattr(body, "close", None)
+            if close is not None:
+                close()
+
+    def _range(self, index: int) -> bytes:
+        last = (self.size - 1) // self._part_size
+        for stale in [key for key in self._ranges if key < index or key > index + self._read_ahead]:
+            self._ranges.pop(stale).cancel()
+        for ahead in range(index, min(index + self._read_ahead, last + 1)):
+            if ahead not in self._ranges:
+                self._ranges[ahead] = self._executor.submit(self._fetch, ahead)
+        return self._ranges[index].result()
+
+    def readinto(self, buffer) -> int:
+        if self.closed:
+            raise ValueError("read from a closed artifact stream")
+        view = memoryview(buffer).cast("B")
+        filled = 0
+        while filled < len(view) and self._position < self.size:
+            index, offset = divmod(self._position, self._part_size)
+            data = self._range(index)
+            count = min(len(view) - filled, len(data) - offset)
+            if count <= 0:
+                raise IOError(f"Short ranged read from s3://{self._bucket}/{self._key}")
+            view[filled:filled + count] = data[offset:offset + count]
+            if self._cache_fill is not None:
+                if self._cache_fill.written == self._position:
+                    self._cache_fill.write(data[offset:offset + count])
+                else:
+                    # Non-sequential access: this read cannot populate the cache.
+                    self._cache_fill.abort()
+                    self._cache_fill = None
+            filled += count
+            self._position += count
+        return filled
+
+    def close(self) -> None:
+        if not self.closed:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._ranges.clear()
+            if self._cache_fill is not None:
+                if self._cache_fill.written == self.size:
+                    try:
+                        self._cache_fill.commit()
+                    except OSError:
+                        logger.warning("Could not cache %s", self._key, exc_info=True)
+                        self._cache_fill.abort()
+                else:
+                    self._cache_fill.abort()
+                self._cache_fill = None
+        super().close()
+
+
 class S3RoundArtifactStore:
-    """S3-compatible round storage with an ephemeral cache for render/download APIs."""
+    """S3-compatible round storage with a local LRU cache tier.
+
+    Reads are served from the disk cache while its copy still has the
+    object's current ETag. Writes go through to both the bucket and the
+    cache. The ETag and size of every object come from the shared
+    :class:`ArtifactInventoryIndex`, which is also what inventory reports
+    read, so repeated downloads and health checks do not touch the bucket.
+    """
 
     backend = "s3"
 
@@ -112,8 +456,27 @@ class S3RoundArtifactStore:
         self.bucket = (current_app.config.get("ROUND_ARTIFACT_S3_BUCKET") or "").strip()
         self.prefix = (current_app.config.get("ROUND_ARTIFACT_S3_PREFIX") or "round-artifacts").strip("/")
         self.cache_dir = current_app.config.get("ROUND_ARTIFACT_CACHE_DIR", "/tmp/quizzicalbeats-artifacts")
+        self.part_size = max(
+            S3_MIN_PART_SIZE,
+            int(current_app.config.get("ROUND_ARTIFACT_S3_PART_SIZE_MB", 8) or 0) * 1024 * 1024,
+        )
+        self.max_concurrency = max(
+            1, int(current_app.config.get("ROUND_ARTIFACT_S3_MAX_CONCURRENCY", DEFAULT_S3_MAX_CONCURRENCY) or 1)
+        )
         if not self.bucket:
             raise RuntimeError("ROUND_ARTIFACT_S3_BUCKET must be set for the S3 artifact backend.")
+        self.cache = ArtifactDiskCache(
+            self.cache_dir,
+            max_bytes=int(current_app.config.get("ROUND_ARTIFACT_CACHE_MAX_MB", 2048) or 0) * 1024 * 1024,
+        )
+        self.index = ArtifactInventoryIndex(
+            self.bucket,
+            self.prefix,
+            max_age_seconds=current_app.config.get(
+                "ROUND_ARTIFACT_INDEX_MAX_AGE_SECONDS", DEFAULT_INDEX_MAX_AGE_SECONDS
+            ),
+            enabled="sqlalchemy" in current_app.extensions,
+        )
 
     def filename(self, kind: str, round_id: int) -> str:
         if kind not in ROUND_ARTIFACT_KINDS:
@@ -123,79 +486,223 @@ class S3RoundArtifactStore:
     def key(self, kind: str, round_id: int) -> str:
         return "/".join(part for part in (self.prefix, kind, self.filename(kind, round_id)) if part)
 
-    def path(self, kind: str, round_id: int) -> str:
-        """Return a local, disposable cache path and hydrate it when the object exists."""
-        path = os.path.join(self.cache_dir, kind, self.filename(kind, round_id))
-        if not os.path.exists(path) and self.exists(kind, round_id):
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(path, "wb") as artifact_file:
-                self.client.download_fileobj(self.bucket, self.key(kind, round_id), artifact_file)
-        return path
+    def cache_path(self, kind: str, round_id: int) -> str:
+        return os.path.join(self.cache_dir, kind, self.filename(kind, round_id))
 
-    def exists(self, kind: str, round_id: int) -> bool:
+    def _object_info(self, kind: str, round_id: int, refresh: bool = False) -> dict[str, Any] | None:
+        """Return ``{"size", "etag"}`` from the index, falling back to HEAD.
+
+        A HEAD result is written back to the index so the next lookup is local.
+        """
+        key = self.key(kind, round_id)
+        if not refresh:
+            info = self.index.get(key)
+            if info is not None and info.get("etag"):
+                return info
         try:
-            self.client.head_object(Bucket=self.bucket, Key=self.key(kind, round_id))
-            return True
+            head = self.client.head_object(Bucket=self.bucket, Key=key)
         except Exception as exc:
-            response = getattr(exc, "response", {}) or {}
-            status = str((response.get("Error") or {}).get("Code") or "")
-            if status in {"404", "NoSuchKey", "NotFound"}:
-                return False
+            if _s3_error_code(exc) in {"404", "NoSuchKey", "NotFound"}:
+                self.index.remove(key)
+                return None
             raise
+        info = {"size": int(head["ContentLength"]), "etag": head.get("ETag")}
+        self.index.record(key, kind, info["size"], info["etag"])
+        return info
+
+    def cached_path(self, kind: str, round_id: int) -> str | None:
+        """Return the local copy when it holds the current object version, else None."""
+        info = self._object_info(kind, round_id)
+        if info is None:
+            return None
+        return self.cache.lookup(self.key(kind, round_id), info["etag"])
+
+    def path(self, kind: str, round_id: int) -> str:
+        """Return a local cache path, hydrated with the current object when one exists."""
+        cached = self.cached_path(kind, round_id)
+        if cached is not None:
+            return cached
+        path = self.cache_path(kind, round_id)
+        info = self._object_info(kind, round_id, refresh=True)
+        if info is not None:
+            fill = self.cache.fill(self.key(kind, round_id), path, info["etag"], info["size"])
+            try:
+                with self._open_remote(kind, round_id, info) as remote:
+                    copy_stream(remote, fill)
+            except BaseException:
+                fill.abort()
+                raise
+            fill.commit()
+        return path
+
+    def exists(self, kind: str, round_id: int) -> bool:
+        return self._object_info(kind, round_id) is not None
 
     def size(self, kind: str, round_id: int) -> int:
-        response = self.client.head_object(Bucket=self.bucket, Key=self.key(kind, round_id))
-        return int(response["ContentLength"])
+        info = self._object_info(kind, round_id)
+        if info is None:
+            raise FileNotFoundError(self.key(kind, round_id))
+        return info["size"]
 
     def read_bytes(self, kind: str, round_id: int) -> bytes:
-        response = self.client.get_object(Bucket=self.bucket, Key=self.key(kind, round_id))
-        data = response["Body"].read()
-        path = os.path.join(self.cache_dir, kind, self.filename(kind, round_id))
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "wb") as artifact_file:
-            artifact_file.write(data)
-        return data
+        with self.open_read(kind, round_id) as artifact_file:
+            return artifact_file.read()
 
     def write_bytes(self, kind: str, round_id: int, data: bytes) -> str:
-        self.client.put_object(
-            Bucket=self.bucket,
-            Key=self.key(kind, round_id),
-            Body=data,
-            ContentType="audio/mpeg" if kind == "mp3" else "application/pdf",
-        )
-        path = os.path.join(self.cache_dir, kind, self.filename(kind, round_id))
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "wb") as artifact_file:
+        with self.open_write(kind, round_id) as artifact_file:
             artifact_file.write(data)
+        return self.cache_path(kind, round_id)
+
+    def _open_remote(self, kind: str, round_id: int, info: dict[str, Any], cache_fill=None) -> _S3RangeReader:
+        return _S3RangeReader(
+            self.client,
+            self.bucket,
+            self.key(kind, round_id),
+            size=info["size"],
+            etag=info["etag"],
+            part_size=self.part_size,
+            max_concurrency=self.max_concurrency,
+            cache_fill=cache_fill,
+        )
+
+    def open_read(self, kind: str, round_id: int) -> IO[bytes]:
+        """Return a stream over the artifact, from the local cache when it is current.
+
+        On a miss the object is read with parallel ranged GETs and a complete
+        front-to-back read is kept in the cache for the next caller.
+        """
+        key = self.key(kind, round_id)
+        info = self._object_info(kind, round_id)
+        if info is None:
+            raise FileNotFoundError(key)
+        cached = self.cache.lookup(key, info["etag"])
+        if cached is not None:
+            try:
+                return open(cached, "rb")
+            except FileNotFoundError:
+                pass  # Evicted by another worker since the lookup.
+        # Confirm the indexed version before downloading, so a stale index
+        # entry cannot fail every ranged GET on its ETag precondition.
+        info = self._object_info(kind, round_id, refresh=True)
+        if info is None:
+            raise FileNotFoundError(key)
+        fill = self.cache.fill(key, self.cache_path(kind, round_id), info["etag"], info["size"])
+        return self._open_remote(kind, round_id, info, cache_fill=fill)
+
+    def _writer(self, kind: str, round_id: int, cache: bool) -> _S3MultipartWriter:
+        key = self.key(kind, round_id)
+        return _S3MultipartWriter(
+            self.client,
+            self.bucket,
+            key,
+            ROUND_ARTIFACT_CONTENT_TYPES[kind],
+            part_size=self.part_size,
+            max_concurrency=self.max_concurrency,
+            cache_fill=self.cache.fill(key, self.cache_path(kind, round_id), None, 0) if cache else None,
+        )
+
+    def _finish_write(self, kind: str, round_id: int, writer: _S3MultipartWriter) -> None:
+        """Complete an upload, then record it in the index and the local cache."""
+        writer.close()
+        key = self.key(kind, round_id)
+        etag = writer.etag
+        if not etag:
+            info = self._object_info(kind, round_id, refresh=True)
+            etag = info["etag"] if info else None
+        else:
+            self.index.record(key, kind, writer.size, etag)
+        if writer.cache_fill is not None:
+            writer.cache_fill.commit(etag)
+        else:
+            self.cache.add(key, self.cache_path(kind, round_id), etag, writer.size)
+
+    @contextmanager
+    def open_write(self, kind: str, round_id: int) -> Iterator[IO[bytes]]:
+        """Yield a stream that multipart-uploads the artifact and writes it through to the cache.
+
+        The object is only completed when the block exits cleanly; an
+        exception aborts the upload and the previous object stays in place.
+        """
+        writer = self._writer(kind, round_id, cache=True)
+        try:
+            yield writer
+        except BaseException:
+            writer.abort()
+            raise
+        self._finish_write(kind, round_id, writer)
+
+    def persist_file(self, kind: str, round_id: int, source_path: str) -> str:
+        """Upload a locally rendered file in parts and keep it as the cached copy."""
+        path = self.cache_path(kind, round_id)
+        same_file = os.path.abspath(source_path) == os.path.abspath(path)
+        writer = self._writer(kind, round_id, cache=not same_file)
+        try:
+            with open(source_path, "rb") as source:
+                copy_stream(source, writer, self.part_size)
+        except BaseException:
+            writer.abort()
+            raise
+        self._finish_write(kind, round_id, writer)
         return path
 
     def delete(self, kind: str, round_id: int) -> bool:
-        existed = self.exists(kind, round_id)
+        key = self.key(kind, round_id)
+        existed = self._object_info(kind, round_id, refresh=True) is not None
         if existed:
-            self.client.delete_object(Bucket=self.bucket, Key=self.key(kind, round_id))
-        path = os.path.join(self.cache_dir, kind, self.filename(kind, round_id))
-        if os.path.exists(path):
-            os.remove(path)
+            self.client.delete_object(Bucket=self.bucket, Key=key)
+        self.index.remove(key)
+        self.cache.discard(key)
+        try:
+            os.remove(self.cache_path(kind, round_id))
+        except FileNotFoundError:
+            pass
         return existed
 
+    def list_objects(self) -> list[dict[str, Any]]:
+        """List every artifact object under the prefix with one paginated scan."""
+        items = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for kind in sorted(ROUND_ARTIFACT_KINDS):
+            prefix = "/".join(part for part in (self.prefix, kind) if part) + "/"
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                for item in page.get("Contents", []):
+                    if item["Key"].endswith(f".{kind}"):
+                        items.append({
+                            "key": item["Key"],
+                            "kind": kind,
+                            "size": int(item.get("Size", 0)),
+                            "etag": item.get("ETag"),
+                        })
+        return items
+
+    def refresh_index(self) -> list[dict[str, Any]]:
+        """Rebuild the inventory index from a bucket listing and return the listing."""
+        items = self.list_objects()
+        self.index.rebuild(items)
+        return items
+
     def inventory(self, kind: str) -> dict[str, Any]:
         if kind not in ROUND_ARTIFACT_KINDS:
             raise ValueError(f"Unsupported round artifact kind: {kind}")
-        prefix = "/".join(part for part in (self.prefix, kind) if part) + "/"
         result: dict[str, Any] = {
             "kind": kind,
             "file_count": 0,
             "total_bytes": 0,
             "ok": True,
             "error": None,
+            "source": "index",
         }
+        totals = self.index.totals(kind)
+        if totals is not None:
+            result["file_count"] = totals["file_count"]
+            result["total_bytes"] = totals["total_bytes"]
+            return result
+        result["source"] = "bucket"
         try:
-            paginator = self.client.get_paginator("list_objects_v2")
-            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
-                for item in page.get("Contents", []):
-                    if item["Key"].endswith(f".{kind}"):
-                        result["file_count"] += 1
-                        result["total_bytes"] += int(item.get("Size", 0))
+            for item in self.refresh_index():
+                if item["kind"] == kind:
+                    result["file_count"] += 1
+                    result["total_bytes"] += item["size"]
         except Exception as exc:
             result["ok"] = False
             result["error"] = str(exc)
@@ -11,6 +11,7 @@ import requests
 import json
 
 from musicround.helpers.paths import app_data_path, custom_mp3_dir
+from musicround.helpers.provider_telemetry import track_provider_call
 
 
 def is_safe_url(target):
@@ -267,12 +268,13 @@ def generate_tts_mp3(text, username, mp3_type, service='polly', voice=None, mode
             # Use neural engine if available
             engine = 'neural' if voice_id in ['Joanna', 'Matthew', 'Amy', 'Emma', 'Brian', 'Kendra'] else 'standard'
             
-            response = polly_client.synthesize_speech(
-                Text=text,
-                OutputFormat='mp3',
-                VoiceId=voice_id,
-                Engine=engine
-            )
+            with track_provider_call('polly', '/synthesize_speech'):
+                response = polly_client.synthesize_speech(
+                    Text=text,
+                    OutputFormat='mp3',
+                    VoiceId=voice_id,
+                    Engine=engine
+                )
             
             # Write the audio stream to a file
             if "AudioStream" in response:
@@ -293,13 +295,13 @@ def generate_tts_mp3(text, username, mp3_type, service='polly', voice=None, mode
             # Use provided model or default
             tts_model = model or 'tts-1'  # Options: tts-1, tts-1-hd
             
-            response = openai.audio.speech.create(
-                model=tts_model,
-                voice=voice_id,
-                input=text
-            )
-            
-            response.stream_to_file(output_path)
+            with track_provider_call('openai', '/audio/speech'):
+                response = openai.audio.speech.create(
+                    model=tts_model,
+                    voice=voice_id,
+                    input=text
+                )
+                response.stream_to_file(output_path)
             current_app.logger.info(f"Generated OpenAI TTS with voice {voice_id} for {username}/{mp3_type}")
         
         elif service == 'elevenlabs':
@@ -6,10 +6,12 @@ import os
 import time
 from secrets import compare_digest
 
+from starlette.requests import Request
 from starlette.responses import JSONResponse
 from starlette.types import ASGIApp, Receive, Scope, Send
 
-from musicround.mcp_server import mcp
+from musicround.mcp_server import mcp, run_tool_batch_on_pool, tool_pools
+from musicround.mcp_workers import ToolPoolBusyError
 
 
 _BASE_ALLOWED_HOSTS = tuple(mcp.settings.transport_security.allowed_hosts)
@@ -53,6 +55,28 @@ def _int_from_env(name: str, default: int) -> int:
         return default
 
 
+async def _batch_response(scope: Scope, receive: Receive) -> JSONResponse:
+    """Run a ``POST /batch`` body of ``{"calls": [...], "stop_on_error": bool}``."""
+    if scope.get("method") != "POST":
+        return JSONResponse({"error": "Use POST for tool batches."}, status_code=405)
+    try:
+        body = await Request(scope, receive).json()
+    except ValueError:
+        return JSONResponse({"error": "Request body must be JSON."}, status_code=400)
+    if not isinstance(body, dict):
+        return JSONResponse({"error": "Request body must be a JSON object."}, status_code=400)
+    try:
+        result = await run_tool_batch_on_pool(
+            body.get("calls"),
+            stop_on_error=bool(body.get("stop_on_error", False)),
+        )
+    except ToolPoolBusyError as exc:
+        return JSONResponse({"error": str(exc)}, headers={"Retry-After": "1"}, status_code=503)
+    except ValueError as exc:
+        return JSONResponse({"error": str(exc)}, status_code=400)
+    return JSONResponse(result)
+
+
 def _client_rate_limit_id(scope: Scope, headers: dict[bytes, bytes]) -> str:
     trust_x_forwarded_for = os.getenv("MCP_TRUST_X_FORWARDED_FOR", "False") == "True"
     forwarded_for = headers.get(b"x-forwarded-for", b"").decode("latin1")
@@ -116,6 +140,12 @@ class BearerAuthMiddleware:
             return
 
         _clear_auth_failures(rate_limit_key)
+        if scope.get("path") == "/pools":
+            await JSONResponse({"pools": tool_pools.stats()})(scope, receive, send)
+            return
+        if scope.get("path") == "/batch":
+            await (await _batch_response(scope, receive))(scope, receive, send)
+            return
         await self.app(scope, receive, send)
 
 
@@ -6,16 +6,29 @@ Run with:
 
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import Any
+import json
+import time
+from functools import lru_cache, partial, wraps
+from typing import Any, Callable
 
-from mcp.server.fastmcp import FastMCP
+import anyio
+from flask import current_app, has_app_context
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.server.fastmcp.utilities.func_metadata import func_metadata
 
-from musicround import create_app
-from musicround.services import automation
+from musicround import create_app, db
+from musicround.helpers.query_profiler import profile_scope
+from musicround.helpers.runtime_profiler import capture_profile
+from musicround.mcp_workers import TOOL_CLASSES, ToolPoolBusyError, ToolPools, _int_from_env
+from musicround.services import automation, tool_jobs
 
 
 mcp = FastMCP("Quizzical Beats")
+tool_pools = ToolPools.from_env()
+# Synchronous tools by name: (function, concurrency class, argument metadata).
+_SYNC_TOOLS: dict[str, tuple[Callable[..., Any], str, Any]] = {}
+BATCH_MAX_CALLS = _int_from_env("MCP_BATCH_MAX_CALLS", 25)
+BATCH_READ_CONCURRENCY = _int_from_env("MCP_BATCH_READ_CONCURRENCY", 4)
 
 
 @lru_cache(maxsize=1)
@@ -25,13 +38,57 @@ def _app():
 
 
 def _with_app_context(func, *args, **kwargs) -> dict[str, Any]:
-    """Run a service function inside the Quizzical Beats app context."""
+    """Run a service function inside the Quizzical Beats app context.
+
+    An app context that is already active on this thread, such as the shared
+    context of a tool batch, is reused together with its database session.
+    """
     app = _app()
+    if has_app_context() and current_app._get_current_object() is app:
+        return func(*args, **kwargs)
     with app.app_context():
         return func(*args, **kwargs)
 
 
-@mcp.tool()
+def _profiled(func):
+    """Attribute the queries of a tool body to ``mcp:<tool>`` when profiling is on.
+
+    An armed runtime profile for the tool is captured here as well.
+    """
+
+    @wraps(func)
+    def run(*args, **kwargs):
+        app = _app()
+        with profile_scope("mcp", func.__name__, app), capture_profile("mcp", func.__name__, app):
+            return func(*args, **kwargs)
+
+    return run
+
+
+def _tool(concurrency: str = "read"):
+    """Register a synchronous tool whose body runs on a worker pool.
+
+    ``concurrency`` picks the pool (``read``, ``write``, or ``heavy``; see
+    :mod:`musicround.mcp_workers`). The undecorated function is returned so
+    it can still be called directly.
+    """
+    tool_pools.pool(concurrency)
+
+    def decorator(func):
+        profiled = _profiled(func)
+
+        @wraps(func)
+        async def run_on_pool(*args, **kwargs):
+            return await tool_pools.run(concurrency, profiled, *args, **kwargs)
+
+        mcp.tool()(run_on_pool)
+        _SYNC_TOOLS[func.__name__] = (func, concurrency, func_metadata(func))
+        return func
+
+    return decorator
+
+
+@_tool("read")
 def find_songs(
     query: str | None = None,
     title: str | None = None,
@@ -83,7 +140,7 @@ def find_songs(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def add_song(
     title: str,
     artist: str,
@@ -116,7 +173,7 @@ def add_song(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def isrc_catalog_status(limit_examples: int = 10) -> dict[str, Any]:
     """Return ISRC coverage and example missing rows from the song catalog."""
     return _with_app_context(
@@ -125,7 +182,7 @@ def isrc_catalog_status(limit_examples: int = 10) -> dict[str, Any]:
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def backfill_song_isrc(
     provider: str = "auto",
     limit: int = 100,
@@ -142,7 +199,7 @@ def backfill_song_isrc(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def normalize_catalog_popularity(
     limit: int = 5000,
     dry_run: bool = True,
@@ -157,7 +214,7 @@ def normalize_catalog_popularity(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def enrich_songs_from_deezer(
     limit: int = 100,
     dry_run: bool = True,
@@ -174,7 +231,7 @@ def enrich_songs_from_deezer(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def backfill_songs_from_spotify_archive(
     batch_size: int = 50,
     dry_run: bool = True,
@@ -191,7 +248,7 @@ def backfill_songs_from_spotify_archive(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def backfill_song_audio_features_from_spotify_archive(
     batch_size: int = 50,
     dry_run: bool = True,
@@ -206,7 +263,7 @@ def backfill_song_audio_features_from_spotify_archive(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def export_song_isrc_catalog(
     missing_only: bool = False,
     limit: int = 50000,
@@ -221,25 +278,25 @@ def export_song_isrc_catalog(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def datastore_schema() -> dict[str, Any]:
     """Describe every datastore object type available to generic CRUD tools."""
     return _with_app_context(automation.datastore_schema)
 
 
-@mcp.tool()
+@_tool("read")
 def database_configuration_summary() -> dict[str, Any]:
     """Return credential-safe database readiness details for cutover planning."""
     return _with_app_context(automation.database_configuration_summary)
 
 
-@mcp.tool()
+@_tool("read")
 def database_cutover_plan() -> dict[str, Any]:
     """Return credential-safe managed database cutover steps for agents."""
     return _with_app_context(automation.database_cutover_plan_summary)
 
 
-@mcp.tool()
+@_tool("read")
 def list_datastore_objects(
     object_type: str,
     filters: dict[str, Any] | None = None,
@@ -247,8 +304,15 @@ def list_datastore_objects(
     offset: int = 0,
     order_by: str | None = None,
     include_sensitive: bool = False,
+    fields: list[str] | None = None,
+    cursor: str | None = None,
+    include_total: bool = True,
 ) -> dict[str, Any]:
-    """List datastore objects such as songs, rounds, users, tags, exports, and settings."""
+    """List datastore objects such as songs, rounds, users, tags, exports, and settings.
+
+    Pass fields to load only those columns, and the returned next_cursor
+    instead of offset to page through large tables.
+    """
     return _with_app_context(
         automation.list_datastore_objects,
         object_type=object_type,
@@ -257,25 +321,74 @@ def list_datastore_objects(
         offset=offset,
         order_by=order_by,
         include_sensitive=include_sensitive,
+        fields=fields,
+        cursor=cursor,
+        include_total=include_total,
     )
 
 
-@mcp.tool()
+@_tool("read")
+def count_datastore_objects(
+    object_type: str,
+    filters: dict[str, Any] | None = None,
+    group_by: str | None = None,
+    limit: int = 100,
+) -> dict[str, Any]:
+    """Count datastore objects matching filters, optionally grouped by one column."""
+    return _with_app_context(
+        automation.count_datastore_objects,
+        object_type=object_type,
+        filters=filters,
+        group_by=group_by,
+        limit=limit,
+    )
+
+
+@_tool("heavy")
+def export_datastore_objects(
+    object_type: str,
+    filters: dict[str, Any] | None = None,
+    fields: list[str] | None = None,
+    order_by: str | None = None,
+    include_sensitive: bool = False,
+    limit: int = 1000,
+    cursor: str | None = None,
+) -> dict[str, Any]:
+    """Export matching datastore rows as NDJSON text, one page per call.
+
+    Pass next_cursor back in for the next page. Whole tables stream from
+    GET /api/datastore/<object_type>/export on the web app.
+    """
+    return _with_app_context(
+        automation.export_datastore_objects,
+        object_type=object_type,
+        filters=filters,
+        fields=fields,
+        order_by=order_by,
+        include_sensitive=include_sensitive,
+        limit=limit,
+        cursor=cursor,
+    )
+
+
+@_tool("read")
 def get_datastore_object(
     object_type: str,
     object_id: Any,
     include_sensitive: bool = False,
+    fields: list[str] | None = None,
 ) -> dict[str, Any]:
-    """Fetch one datastore object by primary key."""
+    """Fetch one datastore object by primary key, optionally only some fields."""
     return _with_app_context(
         automation.get_datastore_object,
         object_type=object_type,
         object_id=object_id,
         include_sensitive=include_sensitive,
+        fields=fields,
     )
 
 
-@mcp.tool()
+@_tool("write")
 def create_datastore_object(
     object_type: str,
     fields: dict[str, Any],
@@ -290,7 +403,7 @@ def create_datastore_object(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def update_datastore_object(
     object_type: str,
     object_id: Any,
@@ -307,7 +420,7 @@ def update_datastore_object(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def delete_datastore_object(object_type: str, object_id: Any) -> dict[str, Any]:
     """Delete one datastore object by primary key."""
     return _with_app_context(
@@ -317,7 +430,7 @@ def delete_datastore_object(object_type: str, object_id: Any) -> dict[str, Any]:
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def import_catalog_item(
     service_name: str,
     item_type: str,
@@ -334,7 +447,7 @@ def import_catalog_item(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def import_progress_events(
     user_id: int | None = None,
     include_recent: bool = True,
@@ -350,6 +463,207 @@ def import_progress_events(
 
 
 @mcp.tool()
+async def mcp_worker_pool_stats() -> dict[str, Any]:
+    """Return running, queued, rejected, and timing counters per tool worker pool.
+
+    Answered on the event loop, so it responds even when every pool is busy.
+    """
+    return {"pools": tool_pools.stats()}
+
+
+def _parse_batch_calls(calls: Any) -> list[dict[str, Any]]:
+    if not isinstance(calls, list) or not calls:
+        raise ValueError("calls must be a non-empty list of {tool, arguments} objects.")
+    if len(calls) > BATCH_MAX_CALLS:
+        raise ValueError(f"A batch may contain at most {BATCH_MAX_CALLS} calls.")
+    parsed = []
+    for index, call in enumerate(calls):
+        if not isinstance(call, dict) or not isinstance(call.get("tool"), str):
+            raise ValueError(f"Call {index} must be an object with a tool name.")
+        arguments = call.get("arguments") or {}
+        if not isinstance(arguments, dict):
+            raise ValueError(f"Call {index} arguments must be an object.")
+        parsed.append({"id": call.get("id", index), "tool": call["tool"], "arguments": arguments})
+    return parsed
+
+
+def _call_class(call: dict[str, Any]) -> str | None:
+    registered = _SYNC_TOOLS.get(call["tool"])
+    return registered[1] if registered else None
+
+
+def _batch_concurrency(calls: list[dict[str, Any]]) -> str:
+    """Return the heaviest concurrency class among ``calls``."""
+    classes = {_call_class(call) for call in calls}
+    for tool_class in reversed(TOOL_CLASSES):
+        if tool_class in classes:
+            return tool_class
+    return "read"
+
+
+def _run_batch_call(call: dict[str, Any]) -> dict[str, Any]:
+    entry: dict[str, Any] = {"id": call["id"], "tool": call["tool"]}
+    started = time.perf_counter()
+    try:
+        if call["tool"] not in _SYNC_TOOLS:
+            raise ValueError(f"Unknown or non-batchable tool: {call['tool']}")
+        func, _concurrency, metadata = _SYNC_TOOLS[call["tool"]]
+        arguments = metadata.arg_model.model_validate(
+            metadata.pre_parse_json(call["arguments"])
+        ).model_dump_one_level()
+        app = _app()
+        with profile_scope("mcp", call["tool"], app), capture_profile("mcp", call["tool"], app):
+            entry["result"] = func(**arguments)
+        entry["ok"] = True
+    except Exception as exc:
+        if has_app_context():
+            # Keep the shared session usable for the calls that follow.
+            db.session.rollback()
+        entry.update(ok=False, error=str(exc), error_type=type(exc).__name__)
+    entry["duration_seconds"] = round(time.perf_counter() - started, 4)
+    return entry
+
+
+def _run_read_segment(segment: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Run consecutive read calls, up to ``BATCH_READ_CONCURRENCY`` at a time.
+
+    The current worker runs one call of each group itself and offers the rest
+    to the ``read`` pool, so they are admitted and counted like any other read
+    tool. A call the pool rejects, or that is still queued when the current
+    worker gets to it, runs here instead; the batch never waits on a queue it
+    may itself be holding up.
+    """
+    read_pool = tool_pools.pool("read")
+    entries: list[dict[str, Any]] = []
+    group_size = max(1, BATCH_READ_CONCURRENCY)
+    for start in range(0, len(segment), group_size):
+        group = segment[start:start + group_size]
+        offered = []
+        for call in group[1:]:
+            try:
+                offered.append((call, read_pool.submit(_run_batch_call, call)))
+            except ToolPoolBusyError:
+                offered.append((call, None))
+        entries.append(_run_batch_call(group[0]))
+        for call, future in offered:
+            if future is None or future.cancel():
+                entries.append(_run_batch_call(call))
+            else:
+                entries.append(future.result())
+    return entries
+
+
+def run_tool_batch(calls: list[dict[str, Any]], stop_on_error: bool = False) -> dict[str, Any]:
+    """Run ``[{"tool", "arguments", "id"?}, ...]`` and return per-call results.
+
+    Calls run in order inside one app context, so they share its database
+    session. Runs of consecutive ``read`` tools are independent of each other
+    and run concurrently: the current worker runs one in the shared context
+    and the others run on the ``read`` pool, each in its own context, because
+    a session cannot be shared across threads. Write and heavy calls are ordering barriers.
+    With ``stop_on_error`` the calls after the first failing step are skipped.
+    """
+    parsed = _parse_batch_calls(calls)
+    results: list[dict[str, Any]] = []
+    started = time.perf_counter()
+    failed = False
+    with _app().app_context():
+        index = 0
+        while index < len(parsed):
+            end = index + 1
+            if _call_class(parsed[index]) == "read":
+                while end < len(parsed) and _call_class(parsed[end]) == "read":
+                    end += 1
+            segment = parsed[index:end]
+            if failed and stop_on_error:
+                results.extend(
+                    {
+                        "id": call["id"],
+                        "tool": call["tool"],
+                        "ok": False,
+                        "skipped": True,
+                        "error": "Skipped after an earlier call failed.",
+                    }
+                    for call in segment
+                )
+            elif len(segment) > 1:
+                results.extend(dict(entry, mode="concurrent") for entry in _run_read_segment(segment))
+            else:
+                results.append(dict(_run_batch_call(segment[0]), mode="shared"))
+            failed = failed or any(not entry["ok"] for entry in results[index:end])
+            index = end
+
+    skipped = sum(1 for entry in results if entry.get("skipped"))
+    succeeded = sum(1 for entry in results if entry["ok"])
+    return {
+        "ok": not failed,
+        "concurrency_class": _batch_concurrency(parsed),
+        "summary": {
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded - skipped,
+            "skipped": skipped,
+        },
+        "duration_seconds": round(time.perf_counter() - started, 4),
+        "calls": results,
+    }
+
+
+async def run_tool_batch_on_pool(calls: list[dict[str, Any]], stop_on_error: bool = False) -> dict[str, Any]:
+    """Run a tool batch on the pool of its heaviest call."""
+    concurrency = _batch_concurrency(_parse_batch_calls(calls))
+    return await tool_pools.run(concurrency, run_tool_batch, calls, stop_on_error=stop_on_error)
+
+
+@mcp.tool()
+async def batch(calls: list[dict[str, Any]], stop_on_error: bool = False) -> dict[str, Any]:
+    """Run several tool calls in one round-trip.
+
+    Each call is {"tool": name, "arguments": {...}, "id": optional label}.
+    Consecutive read-only calls run concurrently; the rest run in order and
+    share one app context and database session. Returns each call's result
+    or error with its duration. Async tools cannot be batched.
+    """
+    return await run_tool_batch_on_pool(calls, stop_on_error=stop_on_error)
+
+
+@mcp.tool()
+async def watch_import_progress(
+    ctx: Context,
+    user_id: int | None = None,
+    since_sequence: int | None = None,
+    timeout_seconds: float = 30.0,
+) -> dict[str, Any]:
+    """Wait for import job transitions and push each one as a notification.
+
+    Use instead of polling import_progress_events. Progress notifications
+    carry the terminal-job count; log notifications carry the JSON frame.
+    Pass the returned next_sequence back in to resume without gaps.
+    """
+
+    async def _notify(frame: dict[str, Any]) -> None:
+        stats = frame["data"].get("stats") or {}
+        total = sum(stats.values())
+        finished = sum(stats.get(status, 0) for status in ("completed", "failed", "dead_letter"))
+        await ctx.report_progress(finished, total or None, frame["event"])
+        await ctx.info(json.dumps(frame, sort_keys=True))
+
+    def _on_event(frame: dict[str, Any]) -> None:
+        anyio.from_thread.run(_notify, frame)
+
+    return await anyio.to_thread.run_sync(
+        partial(
+            _with_app_context,
+            automation.watch_import_progress,
+            user_id=user_id,
+            since_sequence=since_sequence,
+            timeout_seconds=timeout_seconds,
+            on_event=_on_event,
+        )
+    )
+
+
+@_tool("write")
 def retry_import_job(job_id: int, reset_attempts: bool = False) -> dict[str, Any]:
     """Retry a failed or dead-letter import job."""
     return _with_app_context(
@@ -359,13 +673,13 @@ def retry_import_job(job_id: int, reset_attempts: bool = False) -> dict[str, Any
     )
 
 
-@mcp.tool()
+@_tool("read")
 def parse_text_playlist(text: str, limit: int = 100) -> dict[str, Any]:
     """Parse pasted text or CSV-like playlists into reviewable song candidates."""
     return _with_app_context(automation.parse_text_playlist, text=text, limit=limit)
 
 
-@mcp.tool()
+@_tool("read")
 def resolve_text_playlist(
     text: str,
     limit: int = 100,
@@ -380,7 +694,7 @@ def resolve_text_playlist(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def compile_round(
     name: str | None = None,
     round_type: str = "random",
@@ -403,7 +717,7 @@ def compile_round(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def rename_round(
     round_id: int,
     name: str | None,
@@ -418,7 +732,7 @@ def rename_round(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def round_review_payload(round_id: int, user_id: int | None = None, months: int = 3) -> dict[str, Any]:
     """Return songs, previews, scripts, assets, and repair hints for human review."""
     return _with_app_context(
@@ -429,7 +743,7 @@ def round_review_payload(round_id: int, user_id: int | None = None, months: int
     )
 
 
-@mcp.tool()
+@_tool("write")
 def update_round_review_status(
     round_id: int,
     review_status: str,
@@ -448,7 +762,7 @@ def update_round_review_status(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def set_round_owner(
     round_id: int,
     user_id: int | None,
@@ -463,7 +777,7 @@ def set_round_owner(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def share_round(
     round_id: int,
     user_id: int,
@@ -478,7 +792,7 @@ def share_round(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def invite_round_collaborator(
     round_id: int,
     user_query: str,
@@ -495,13 +809,13 @@ def invite_round_collaborator(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def list_round_shares(round_id: int) -> dict[str, Any]:
     """List explicit share grants for a round."""
     return _with_app_context(automation.list_round_shares, round_id=round_id)
 
 
-@mcp.tool()
+@_tool("write")
 def revoke_round_share(
     round_id: int,
     user_id: int,
@@ -514,7 +828,7 @@ def revoke_round_share(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def list_round_access_events(
     round_id: int,
     requester_user_id: int,
@@ -529,7 +843,7 @@ def list_round_access_events(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def record_round_presence(
     round_id: int,
     user_id: int,
@@ -544,7 +858,7 @@ def record_round_presence(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def list_round_presence(
     round_id: int,
     requester_user_id: int,
@@ -561,7 +875,7 @@ def list_round_presence(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def add_round_comment(
     round_id: int,
     comment: str,
@@ -576,7 +890,7 @@ def add_round_comment(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def list_round_comments(
     round_id: int,
     requester_user_id: int,
@@ -591,7 +905,7 @@ def list_round_comments(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def enable_round_public_link(
     round_id: int,
     expires_at: str | None = None,
@@ -604,7 +918,7 @@ def enable_round_public_link(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def disable_round_public_link(round_id: int) -> dict[str, Any]:
     """Disable a token-based read-only public link for a round via system automation."""
     return _with_app_context(
@@ -613,7 +927,7 @@ def disable_round_public_link(round_id: int) -> dict[str, Any]:
     )
 
 
-@mcp.tool()
+@_tool("read")
 def get_public_round(public_token: str) -> dict[str, Any]:
     """Fetch read-only round data for an active public round token."""
     return _with_app_context(
@@ -622,7 +936,7 @@ def get_public_round(public_token: str) -> dict[str, Any]:
     )
 
 
-@mcp.tool()
+@_tool("write")
 def register_seed_source(
     name: str,
     source_type: str,
@@ -647,7 +961,7 @@ def register_seed_source(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def list_seed_sources(
     source_type: str | None = None,
     active: bool | None = True,
@@ -664,7 +978,7 @@ def list_seed_sources(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def seed_default_seed_sources() -> dict[str, Any]:
     """Create or update the default chart and festival seed-source registry."""
     return _with_app_context(
@@ -672,7 +986,7 @@ def seed_default_seed_sources() -> dict[str, Any]:
     )
 
 
-@mcp.tool()
+@_tool("write")
 def record_seed_source_run(
     seed_source_id: int,
     status: str,
@@ -695,7 +1009,7 @@ def record_seed_source_run(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def fetch_seed_source_candidates(
     seed_source_id: int,
     text: str | None = None,
@@ -716,7 +1030,7 @@ def fetch_seed_source_candidates(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def refresh_due_seed_sources(
     max_sources: int = 10,
     candidate_limit: int = 100,
@@ -729,13 +1043,13 @@ def refresh_due_seed_sources(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def omdb_catalog_status() -> dict[str, Any]:
     """Return credential-safe readiness for the optional OMDB catalog mirror."""
     return _with_app_context(automation.omdb_catalog_status)
 
 
-@mcp.tool()
+@_tool("read")
 def suggest_replacement_songs(
     round_id: int | None = None,
     position: int | None = None,
@@ -780,7 +1094,7 @@ def suggest_replacement_songs(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def replace_round_song(
     round_id: int,
     position: int,
@@ -801,7 +1115,7 @@ def replace_round_song(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def suggest_additional_songs(
     round_id: int,
     limit: int = 10,
@@ -822,7 +1136,7 @@ def suggest_additional_songs(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def add_round_song(
     round_id: int,
     song_id: int,
@@ -843,7 +1157,7 @@ def add_round_song(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def recent_usage_summary(
     user_id: int | None = None,
     months: int = 3,
@@ -862,7 +1176,7 @@ def recent_usage_summary(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def quizmaster_context(user_id: int, months: int = 3) -> dict[str, Any]:
     """Return quizmaster personalization context and recent usage for round planning."""
     return _with_app_context(
@@ -872,7 +1186,7 @@ def quizmaster_context(user_id: int, months: int = 3) -> dict[str, Any]:
     )
 
 
-@mcp.tool()
+@_tool("read")
 def round_planning_brief(
     user_id: int,
     quiz_date: str | None = None,
@@ -905,7 +1219,7 @@ def round_planning_brief(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def create_planned_quiz_round(
     quiz_date: str,
     quizmaster_id: int | None = None,
@@ -928,7 +1242,7 @@ def create_planned_quiz_round(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def list_planned_quiz_rounds(
     quizmaster_id: int | None = None,
     status: str | None = None,
@@ -945,7 +1259,7 @@ def list_planned_quiz_rounds(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def update_planned_quiz_round(
     plan_id: int,
     quiz_date: str | None = None,
@@ -974,7 +1288,7 @@ def update_planned_quiz_round(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def link_planned_quiz_round(
     plan_id: int,
     round_id: int | None = None,
@@ -991,7 +1305,7 @@ def link_planned_quiz_round(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def draft_round_audio_scripts(
     round_id: int | None = None,
     user_id: int | None = None,
@@ -1012,7 +1326,7 @@ def draft_round_audio_scripts(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def save_round_audio_scripts(
     round_id: int,
     scripts: dict[str, str],
@@ -1035,7 +1349,7 @@ def save_round_audio_scripts(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def draft_round_track_hints(
     round_id: int,
     user_id: int | None = None,
@@ -1052,7 +1366,7 @@ def draft_round_track_hints(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def save_round_track_hints(
     round_id: int,
     hints: list[dict[str, Any]],
@@ -1071,7 +1385,7 @@ def save_round_track_hints(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def list_round_audio_scripts(
     round_id: int | None = None,
     user_id: int | None = None,
@@ -1088,7 +1402,7 @@ def list_round_audio_scripts(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def update_round_audio_script(
     script_id: int,
     text: str | None = None,
@@ -1105,7 +1419,7 @@ def update_round_audio_script(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def generate_tts_from_script(
     script_id: int,
     service: str = "openai",
@@ -1126,7 +1440,7 @@ def generate_tts_from_script(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def create_round_from_playlist(
     service_name: str,
     playlist_id_or_url: str,
@@ -1150,7 +1464,7 @@ def create_round_from_playlist(
         raise
 
 
-@mcp.tool()
+@_tool("write")
 def create_round_from_text_playlist(
     text: str,
     name: str | None = None,
@@ -1174,7 +1488,7 @@ def create_round_from_text_playlist(
         raise
 
 
-@mcp.tool()
+@_tool("read")
 def round_analytics_summary(
     months: int = 6,
     limit: int = 20,
@@ -1189,7 +1503,7 @@ def round_analytics_summary(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def generate_round_assets(
     round_id: int,
     user_id: int | None = None,
@@ -1206,7 +1520,7 @@ def generate_round_assets(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def generate_round_assets_batch(
     round_ids: list[int],
     user_id: int | None = None,
@@ -1223,19 +1537,19 @@ def generate_round_assets_batch(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def inspect_round_mp3(path: str | None = None, round_id: int | None = None) -> dict[str, Any]:
     """Check a round MP3 for duration, loudness, clipping, and silence issues."""
     return _with_app_context(automation.inspect_mp3_quality, path=path, round_id=round_id)
 
 
-@mcp.tool()
+@_tool("heavy")
 def inspect_round_pdf(path: str | None = None, round_id: int | None = None) -> dict[str, Any]:
     """Check that a round PDF exists and has a valid basic PDF structure."""
     return _with_app_context(automation.inspect_pdf_quality, path=path, round_id=round_id)
 
 
-@mcp.tool()
+@_tool("heavy")
 def inspect_round_package(
     round_id: int,
     user_id: int | None = None,
@@ -1256,7 +1570,7 @@ def inspect_round_package(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def round_repair_report(
     round_id: int,
     user_id: int | None = None,
@@ -1277,7 +1591,7 @@ def round_repair_report(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def inspect_round_package_batch(
     round_ids: list[int],
     user_id: int | None = None,
@@ -1298,7 +1612,7 @@ def inspect_round_package_batch(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def round_repair_plan(
     round_id: int,
     user_id: int | None = None,
@@ -1325,7 +1639,7 @@ def round_repair_plan(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def round_repair_plan_batch(
     round_ids: list[int],
     user_id: int | None = None,
@@ -1352,7 +1666,114 @@ def round_repair_plan_batch(
     )
 
 
+async def _follow_tool_job(
+    ctx: Context,
+    job_id: str,
+    since_sequence: int,
+    wait_seconds: float,
+    item_limit: int,
+) -> dict[str, Any]:
+    """Wait on a tool job and forward each finished item as a progress notification."""
+
+    async def _notify(item: dict[str, Any], job: dict[str, Any]) -> None:
+        await ctx.report_progress(
+            job["completed_items"],
+            job["total_items"],
+            f"{job['tool']}: item {item['key'] or item['sequence']} finished",
+        )
+        await ctx.info(json.dumps(item, sort_keys=True, default=str))
+
+    def _on_item(item: dict[str, Any], job: dict[str, Any]) -> None:
+        anyio.from_thread.run(_notify, item, job)
+
+    return await anyio.to_thread.run_sync(
+        partial(
+            _with_app_context,
+            tool_jobs.wait_for_tool_job,
+            job_id,
+            since_sequence=since_sequence,
+            timeout_seconds=wait_seconds,
+            item_limit=item_limit,
+            on_item=_on_item,
+        )
+    )
+
+
+@mcp.tool()
+async def start_tool_job(
+    ctx: Context,
+    tool: str,
+    arguments: dict[str, Any] | None = None,
+    wait_seconds: float = 30.0,
+    item_limit: int = 100,
+) -> dict[str, Any]:
+    """Run a long batch tool as a resumable background job.
+
+    Supports generate_round_assets_batch, inspect_round_package_batch,
+    round_repair_plan_batch, backfill_songs_from_spotify_archive, and
+    enrich_songs_from_deezer with their usual arguments. Streams a progress
+    notification per finished item for up to wait_seconds, then returns the
+    job id. Later calls to get_tool_job return the remaining items and the
+    final result. Results persist, so a reconnecting client can continue
+    from next_sequence.
+    """
+    if tool in tool_jobs.JOB_TOOLS and tool in _SYNC_TOOLS:
+        metadata = _SYNC_TOOLS[tool][2]
+        arguments = metadata.arg_model.model_validate(arguments or {}).model_dump_one_level()
+    job = await anyio.to_thread.run_sync(
+        partial(
+            _with_app_context,
+            tool_jobs.start_tool_job,
+            tool,
+            arguments,
+            submit=tool_pools.pool("heavy").submit,
+        )
+    )
+    return await _follow_tool_job(ctx, job["job_id"], 0, wait_seconds, item_limit)
+
+
 @mcp.tool()
+async def get_tool_job(
+    ctx: Context,
+    job_id: str,
+    since_sequence: int = 0,
+    wait_seconds: float = 0.0,
+    item_limit: int = 100,
+) -> dict[str, Any]:
+    """Return a tool job's items after since_sequence and its final result.
+
+    With wait_seconds, streams progress until the job finishes or the wait
+    ends. Pass the returned next_sequence back in to read only new items.
+    """
+    return await _follow_tool_job(ctx, job_id, since_sequence, wait_seconds, item_limit)
+
+
+@mcp.tool()
+async def resume_tool_job(
+    ctx: Context,
+    job_id: str,
+    wait_seconds: float = 30.0,
+    item_limit: int = 100,
+) -> dict[str, Any]:
+    """Restart a failed or interrupted tool job with only its unfinished items."""
+    job = await anyio.to_thread.run_sync(
+        partial(
+            _with_app_context,
+            tool_jobs.resume_tool_job,
+            job_id,
+            submit=tool_pools.pool("heavy").submit,
+        )
+    )
+    return await _follow_tool_job(ctx, job["job_id"], job["item_count"], wait_seconds, item_limit)
+
+
+@_tool("read")
+def list_tool_jobs(tool: str | None = None, status: str | None = None, limit: int = 20) -> dict[str, Any]:
+    """List recent tool jobs with their status and progress counters."""
+    return _with_app_context(tool_jobs.list_tool_jobs, tool=tool, status=status, limit=limit)
+
+
+@_tool("heavy")
 def schedule_round_email(
     round_id: int,
     scheduled_for: str,
@@ -1375,7 +1796,7 @@ def schedule_round_email(
     )
 
 
-@mcp.tool()
+@_tool("read")
 def list_scheduled_round_emails(
     user_id: int | None = None,
     include_processed: bool = False,
@@ -1390,7 +1811,7 @@ def list_scheduled_round_emails(
     )
 
 
-@mcp.tool()
+@_tool("write")
 def cancel_scheduled_round_email(
     export_id: int,
     user_id: int | None = None,
@@ -1405,7 +1826,7 @@ def cancel_scheduled_round_email(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def process_due_scheduled_round_emails(
     now: str | None = None,
     limit: int = 10,
@@ -1418,7 +1839,7 @@ def process_due_scheduled_round_emails(
     )
 
 
-@mcp.tool()
+@_tool("heavy")
 def send_round_email(
     round_id: int,
     recipient: str | None = None,
@@ -1446,7 +1867,7 @@ def send_round_email(
         raise
 
 
-@mcp.tool()
+@_tool("heavy")
 def generate_tts_snippet(
     user_id: int,
     mp3_type: str,
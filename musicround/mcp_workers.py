@@ -0,0 +1,184 @@
+"""Bounded worker pools that keep MCP tool bodies off the event loop.
+
+FastMCP calls synchronous tools directly on the ASGI event loop, so one MP3
+render or Deezer backfill would stall every other agent's session. Tools are
+registered with a concurrency class instead and their bodies run on that
+class's thread pool:
+
+``read``
+    Cheap catalog and round lookups. Many workers, generous queue.
+``write``
+    Short database writes. Fewer workers, so SQLite writers do not pile up.
+``heavy``
+    Renders, package inspections, provider backfills, and email delivery.
+    A couple of workers and a short queue.
+
+Each pool admits at most ``workers + queue_limit`` calls. Further calls are
+rejected immediately with :class:`ToolPoolBusyError`, rather than queueing
+without bound, and agents are told to retry. Counters for running, queued,
+rejected, and completed calls, plus wait and run times, are available from
+:meth:`ToolPools.stats`.
+
+Tool bodies use Flask app contexts and the shared SQLAlchemy engine, so they
+run on threads. A process pool would need its own app and database
+connections per worker and could not share in-process import state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+TOOL_CLASSES = ("read", "write", "heavy")
+DEFAULT_WORKERS = {"read": 8, "write": 4, "heavy": 2}
+DEFAULT_QUEUE_LIMITS = {"read": 64, "write": 32, "heavy": 4}
+
+
+class ToolPoolBusyError(RuntimeError):
+    """Raised when a tool class already has as many calls as it may admit."""
+
+
+def _int_from_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+class ToolWorkerPool:
+    """One concurrency class: a thread pool with admission control and counters."""
+
+    def __init__(self, name: str, workers: int, queue_limit: int):
+        self.name = name
+        self.workers = max(1, int(workers))
+        self.queue_limit = max(0, int(queue_limit))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix=f"mcp-{name}",
+        )
+        self._lock = threading.Lock()
+        self._running = 0
+        self._queued = 0
+        self._max_queued = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._running + self._queued >= self.workers + self.queue_limit:
+                self._rejected += 1
+                raise ToolPoolBusyError(
+                    f"The MCP server is busy with {self.name} tools "
+                    f"({self._running} running, {self._queued} queued). Retry shortly."
+                )
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+
+    def _call(self, submitted: float, func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        started = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_seconds += started - submitted
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._run_seconds += time.monotonic() - started
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any):
+        """Admit and queue ``func``; return a concurrent future."""
+        self._admit()
+        try:
+            future = self._executor.submit(self._call, time.monotonic(), func, args, kwargs)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            raise
+
+        def release_if_cancelled(done) -> None:
+            # A call cancelled before it started never reaches _call.
+            if done.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        future.add_done_callback(release_if_cancelled)
+        return future
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``func`` on this pool and await its result without blocking the loop."""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "running": self._running,
+                "queued": self._queued,
+                "max_queued": self._max_queued,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "average_wait_seconds": round(self._wait_seconds / finished, 4) if finished else 0.0,
+                "average_run_seconds": round(self._run_seconds / finished, 4) if finished else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ToolPools:
+    """The per-class worker pools of one MCP server process."""
+
+    def __init__(self, workers: dict[str, int], queue_limits: dict[str, int]):
+        self.pools = {
+            name: ToolWorkerPool(name, workers[name], queue_limits[name])
+            for name in TOOL_CLASSES
+        }
+
+    @classmethod
+    def from_env(cls) -> "ToolPools":
+        """Read ``MCP_<CLASS>_WORKERS`` and ``MCP_<CLASS>_QUEUE_LIMIT`` overrides."""
+        return cls(
+            {
+                name: _int_from_env(f"MCP_{name.upper()}_WORKERS", DEFAULT_WORKERS[name])
+                for name in TOOL_CLASSES
+            },
+            {
+                name: _int_from_env(f"MCP_{name.upper()}_QUEUE_LIMIT", DEFAULT_QUEUE_LIMITS[name])
+                for name in TOOL_CLASSES
+            },
+        )
+
+    def pool(self, tool_class: str) -> ToolWorkerPool:
+        try:
+            return self.pools[tool_class]
+        except KeyError:
+            raise ValueError(f"Unknown MCP tool concurrency class: {tool_class}") from None
+
+    async def run(self, tool_class: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await self.pool(tool_class).run(func, *args, **kwargs)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+    def shutdown(self) -> None:
+        for pool in self.pools.values():
+            pool.shutdown()
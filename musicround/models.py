@@ -544,6 +544,32 @@ class SystemSetting(db.Model):
         return {s.key: s.value for s in SystemSetting.query.all()}
 
 
+class RoundArtifactObject(db.Model):
+    """
+    Index of generated round artifacts held in object storage.
+
+    Rows are written on artifact upload and removed on delete, so inventory
+    reports and cache freshness checks do not have to list or HEAD the bucket.
+    """
+    __tablename__ = 'round_artifact_object'
+
+    id = db.Column(db.Integer, primary_key=True)
+    bucket = db.Column(db.String(255), nullable=False)
+    key = db.Column(db.String(512), nullable=False)
+    kind = db.Column(db.String(8), nullable=False)
+    size = db.Column(db.BigInteger, nullable=False, default=0)
+    etag = db.Column(db.String(128), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('bucket', 'key', name='uq_round_artifact_object_bucket_key'),
+        db.Index('idx_round_artifact_object_bucket_kind', 'bucket', 'kind'),
+    )
+
+    def __repr__(self):
+        return f"RoundArtifactObject(bucket='{self.bucket}', key='{self.key}', size={self.size})"
+
+
 class SeedSource(db.Model):
     """
     Curated chart, festival, and editorial sources used to seed the song catalog.
@@ -721,3 +747,55 @@ class ImportJobRecord(db.Model):
             elif self.item_type == 'track':
                 return f"https://www.deezer.com/track/{self.item_id}"
         return None
+
+
+class ToolJob(db.Model):
+    """
+    Long-running MCP tool call started as a job.
+
+    Each finished item is stored as a ``ToolJobItem`` while the tool runs, so
+    a client that reconnects can read partial results, and an interrupted job
+    can resume with only the items that are still missing.
+    """
+    __tablename__ = 'tool_job'
+
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    tool = db.Column(db.String(64), nullable=False)
+    arguments = db.Column(db.Text, nullable=False, default='{}')
+    status = db.Column(db.String(20), nullable=False, default='running')  # running, completed, failed
+    worker_id = db.Column(db.String(128))
+    total_items = db.Column(db.Integer)
+    completed_items = db.Column(db.Integer, nullable=False, default=0)
+    item_sequence = db.Column(db.Integer, nullable=False, default=0)
+    resume_count = db.Column(db.Integer, nullable=False, default=0)
+    result = db.Column(db.Text)
+    error_message = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('idx_tool_job_status_created', 'status', 'created_at'),
+    )
+
+    def __repr__(self):
+        return f"ToolJob(id='{self.id}', tool='{self.tool}', status='{self.status}')"
+
+
+class ToolJobItem(db.Model):
+    """One finished item of a ``ToolJob``, in the order it completed."""
+    __tablename__ = 'tool_job_item'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(32), db.ForeignKey('tool_job.id', ondelete='CASCADE'), nullable=False)
+    sequence = db.Column(db.Integer, nullable=False)
+    item_key = db.Column(db.String(64))
+    payload = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'sequence', name='uq_tool_job_item_sequence'),
+    )
+
+    def __repr__(self):
+        return f"ToolJobItem(job_id='{self.job_id}', sequence={self.sequence})"
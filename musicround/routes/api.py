@@ -1,7 +1,8 @@
 """
 API routes for song operations in the Music Round application
 """
-from flask import Blueprint, jsonify, request, current_app, session, redirect, url_for
+import json
+from flask import Blueprint, Response, jsonify, request, current_app, session, redirect, url_for, stream_with_context
 from musicround.models import Song, Tag, SongTag, db, Round
 from musicround.helpers.metadata import (
     get_deezer_track_metadata,
@@ -15,9 +16,11 @@ from sqlalchemy import or_
 from flask_login import login_required, current_user
 import requests  # Import requests for direct API calls
 from musicround.helpers.spotify_helper import get_spotify_token
+from musicround.helpers.provider_urls import spotify_api_url
 from musicround.helpers.dropbox_helper import DROPBOX_API_TIMEOUT_SECONDS
 from musicround.helpers.logging_utils import redact_authorization_header
 from musicround.services import automation
+from musicround.routes.users import automation_or_admin_required
 from musicround.helpers.spotify_archive import SpotifyArchiveError, search_spotify_archive_catalog
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
@@ -670,13 +673,13 @@ def get_spotify_album(album_id):
         }
 
         # Get album details
-        album_url = f'https://api.spotify.com/v1/albums/{album_id}'
+        album_url = spotify_api_url(f'albums/{album_id}')
         album_response = requests.get(album_url, headers=headers)
         album_response.raise_for_status()  # Raise an exception for HTTP errors
         album = album_response.json()
 
         # Get album tracks
-        album_tracks_url = f'https://api.spotify.com/v1/albums/{album_id}/tracks?limit=50'
+        album_tracks_url = spotify_api_url(f'albums/{album_id}/tracks?limit=50')
         album_tracks_response = requests.get(album_tracks_url, headers=headers)
         album_tracks_response.raise_for_status()
         album_tracks = album_tracks_response.json()
@@ -725,7 +728,7 @@ def get_spotify_playlist(playlist_id):
             'Authorization': f'Bearer {access_token}'
         }
           # Get playlist details
-        playlist_url = f'https://api.spotify.com/v1/playlists/{playlist_id}'
+        playlist_url = spotify_api_url(f'playlists/{playlist_id}')
         playlist_response = requests.get(playlist_url, headers=headers)
         playlist_response.raise_for_status()
         playlist = playlist_response.json()
@@ -816,7 +819,7 @@ def spotify_search():
     }
 
     try:
-        search_url = 'https://api.spotify.com/v1/search'
+        search_url = spotify_api_url('search')
         response = requests.get(search_url, headers=headers, params=params)
         response.raise_for_status()  # Raise an exception for HTTP errors
         search_results = response.json()
@@ -1434,3 +1437,45 @@ def list_root_folders(token, attempted_path=None):
             'message': 'An unexpected error occurred while listing Dropbox root folders',
             'attempted_path': attempted_path
         }), 500
+
+
+@api_bp.route('/datastore/<object_type>/export', methods=['GET'])
+@automation_or_admin_required
+def export_datastore(object_type):
+    """Stream matching datastore rows as NDJSON from a server-side cursor.
+
+    Query parameters: ``fields`` (comma separated), ``filters`` (JSON object
+    of column equality filters), ``order_by``, ``cursor``, and
+    ``include_sensitive``.
+    """
+    try:
+        filters = json.loads(request.args.get('filters') or '{}')
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'filters must be a JSON object'}), 400
+    if not isinstance(filters, dict):
+        return jsonify({'status': 'error', 'message': 'filters must be a JSON object'}), 400
+    fields = [field.strip() for field in (request.args.get('fields') or '').split(',') if field.strip()]
+    lines = automation.iter_datastore_ndjson(
+        object_type,
+        filters=filters,
+        fields=fields or None,
+        order_by=request.args.get('order_by') or None,
+        include_sensitive=bool(_bool_arg('include_sensitive')),
+        cursor=request.args.get('cursor') or None,
+    )
+    # Pull the first line now so invalid arguments still get a JSON error.
+    try:
+        first_line = next(lines, None)
+    except automation.AutomationError as exc:
+        return jsonify({'status': 'error', 'message': str(exc)}), 400
+
+    def generate():
+        if first_line is None:
+            return
+        yield first_line
+        yield from lines
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
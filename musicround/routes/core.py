@@ -4,6 +4,7 @@ Core routes for the Music Round application
 import os
 import json
 import time
+from secrets import compare_digest
 from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, session, jsonify, abort, send_from_directory
 from flask_login import login_required, current_user
 from musicround.models import db, Round, Song
@@ -12,7 +13,9 @@ import requests
 import traceback
 from musicround.helpers.auth_helpers import oauth, update_oauth_tokens
 from musicround.helpers.paths import app_data_dir, app_data_path
+from musicround.helpers.provider_urls import spotify_api_url
 from musicround.helpers.spotify_helper import get_spotify_token, get_spotify_user_info
+from musicround.routes.users import automation_or_admin_required
 from datetime import datetime
 from authlib.integrations.base_client.errors import OAuthError
 from sqlalchemy import func, or_
@@ -22,12 +25,36 @@ core_bp = Blueprint('core', __name__)
 @core_bp.route('/healthz')
 def healthz():
     """Public-safe health endpoint for uptime and deployment checks."""
-    from musicround.helpers.service_health import application_health_payload
+    from musicround.helpers.service_health import cached_application_health_payload
 
-    payload = application_health_payload()
+    payload = cached_application_health_payload()
     return jsonify(payload), 200 if payload["ok"] else 503
 
 
+def _metrics_response():
+    from musicround.helpers.provider_telemetry import provider_telemetry
+
+    return current_app.response_class(
+        provider_telemetry.prometheus_text(),
+        mimetype='text/plain; version=0.0.4',
+    )
+
+
+@automation_or_admin_required
+def _automation_metrics():
+    return _metrics_response()
+
+
+@core_bp.route('/metrics')
+def metrics():
+    """Prometheus text metrics for outbound provider calls."""
+    expected = current_app.config.get('METRICS_TOKEN') or ''
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if expected and scheme.lower() == 'bearer' and compare_digest(token.strip(), expected):
+        return _metrics_response()
+    return _automation_metrics()
+
+
 @core_bp.route('/')
 def index():
     """
@@ -92,7 +119,7 @@ def search_results():
         if current_user.spotify_token_expiry and current_user.spotify_token_expiry < datetime.now():
             current_app.logger.info(f"User {current_user.id}'s Spotify token appears expired. Authlib will attempt refresh.")
 
-    search_api_url = 'https://api.spotify.com/v1/search'
+    search_api_url = spotify_api_url('search')
     search_term = request.form.get('search_term', '')
     if not search_term:
         return redirect(url_for('core.search'))
@@ -7,6 +7,7 @@ from musicround.models import Song, Round, Tag, db
 from musicround.helpers.auth_helpers import oauth
 from musicround.helpers.import_helper import ImportHelper
 from musicround.helpers.spotify_helper import get_spotify_token
+from musicround.helpers.provider_urls import spotify_api_url
 from musicround.services import automation
 from musicround.services.automation import AutomationError
 
@@ -530,8 +531,9 @@ def get_songs_from_spotify_playlist(playlist_id):
                     all_spotify_ids.append(track['id'])
             next_url = data.get('next')
             # If next_url is a full URL, convert to relative for sp.get
-            if next_url and next_url.startswith('https://api.spotify.com/v1/'):
-                next_url = next_url.replace('https://api.spotify.com/v1/', '')
+            api_base = spotify_api_url() + '/'
+            if next_url and next_url.startswith(api_base):
+                next_url = next_url[len(api_base):]
         if not all_spotify_ids:
             current_app.logger.warning(f"No valid tracks found in Spotify playlist {playlist_id}")
             return []
@@ -4,15 +4,29 @@ Import routes for the Music Round application
 import json
 import time
 import random
+import threading
 from datetime import datetime  # Add datetime import
 from urllib.parse import urlsplit
-from flask import Blueprint, render_template, redirect, url_for, request, current_app, flash, session, jsonify
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    session,
+    stream_with_context,
+    url_for,
+)
 from flask_login import current_user, login_required
 from musicround.models import Song, db
 from musicround.routes.import_songs import import_pl
 from musicround.helpers.import_helper import ImportHelper
 from musicround.helpers.auth_helpers import oauth
 from musicround.helpers.spotify_helper import get_spotify_token
+from musicround.helpers.provider_urls import spotify_api_url
 from musicround.services import automation
 
 import_bp = Blueprint('import', __name__, url_prefix='/import')
@@ -131,7 +145,7 @@ def fetch_all_user_playlists(oauth_client, token, user_id, limit=50):
     while loop_count < max_loops:
         loop_count += 1
         try:
-            api_url = f'https://api.spotify.com/v1/users/{user_id}/playlists'
+            api_url = spotify_api_url(f'users/{user_id}/playlists')
             params = {'limit': limit, 'offset': offset}
             
             current_app.logger.info(f"Fetching playlists for {user_id} with offset={offset}, limit={limit}, loop={loop_count}")
@@ -994,6 +1008,73 @@ def queue_status_json():
     })
 
 
+def _sse_frame(frame):
+    """Encode one import progress frame as a server-sent event."""
+    if frame['event'] == 'heartbeat':
+        return ': keepalive\n\n'
+    return (
+        f"id: {frame['sequence']}\n"
+        f"event: {frame['event']}\n"
+        f"data: {json.dumps(frame['data'], sort_keys=True)}\n\n"
+    )
+
+
+# Each open event stream holds one server thread, so streams are capped per
+# process; clients that find every slot taken fall back to polling.
+_event_stream_slots_lock = threading.Lock()
+
+
+def _event_stream_slots():
+    """Return this app's semaphore of IMPORT_EVENT_STREAM_MAX_CLIENTS slots."""
+    slots = current_app.extensions.get('import_event_stream_slots')
+    if slots is None:
+        with _event_stream_slots_lock:
+            slots = current_app.extensions.get('import_event_stream_slots')
+            if slots is None:
+                limit = max(1, int(current_app.config.get('IMPORT_EVENT_STREAM_MAX_CLIENTS', 2)))
+                slots = current_app.extensions['import_event_stream_slots'] = threading.BoundedSemaphore(limit)
+    return slots
+
+
+@import_bp.route('/queue-events')
+@login_required
+def queue_events():
+    """Push import job transitions to admin clients as server-sent events."""
+    if not current_user.is_admin:
+        return jsonify({'error': 'Admin access required'}), 403
+
+    queue = current_app.config.get('import_queue')
+    if not queue:
+        return jsonify({'error': 'Import queue not initialized'}), 503
+
+    slots = _event_stream_slots()
+    if not slots.acquire(blocking=False):
+        response = jsonify({
+            'error': 'Too many live import streams are open. Poll /import/queue-status.json instead.',
+            'code': 'import_event_streams_full',
+        })
+        response.status_code = 503
+        response.headers['Retry-After'] = '30'
+        return response
+
+    since_sequence = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        since_sequence = int(since_sequence) if since_sequence is not None else None
+    except (TypeError, ValueError):
+        since_sequence = None
+
+    def generate():
+        yield 'retry: 3000\n\n'
+        for frame in automation.import_progress_stream(since_sequence=since_sequence):
+            yield _sse_frame(frame)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.call_on_close(slots.release)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @import_bp.route('/jobs/<int:job_id>/retry', methods=['POST'])
 @login_required
 def retry_import_job(job_id):
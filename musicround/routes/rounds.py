@@ -5,6 +5,7 @@ import tempfile
 import requests
 import logging
 from datetime import datetime
+from contextlib import ExitStack
 from io import BytesIO
 import re
 import zipfile
@@ -15,7 +16,7 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from flask import Blueprint, session, redirect, request, render_template, url_for, current_app, send_file, jsonify, flash, abort
 from flask_login import current_user, login_required
-from sqlalchemy import or_
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import contains_eager, joinedload
 from musicround.models import PlannedQuizRound, Round, RoundAccessEvent, RoundAudioScript, RoundExport, RoundShare, Song, SystemSetting, User, db
 from pydub import AudioSegment
@@ -24,8 +25,10 @@ from reportlab.pdfgen import canvas
 from musicround.helpers.auth_helpers import oauth
 from musicround.helpers.email_helper import send_email as send_quiz_email
 from musicround.helpers.paths import app_data_path
+from musicround.helpers.provider_urls import spotify_api_url
 from musicround.helpers import round_notifications
 from musicround.helpers.storage_health import (
+    ROUND_ARTIFACT_CONTENT_TYPES,
     check_round_artifact_storage,
     round_artifact_store,
     round_mp3_path,
@@ -111,41 +114,53 @@ def _scheduled_datetime_value(raw_value):
     return scheduled.replace(tzinfo=local_timezone).isoformat()
 
 
+def _resolved_song_ids(rounds):
+    """Return which stored song IDs of ``rounds`` still exist, in one query."""
+    song_ids = {song_id for round_ in rounds for song_id in round_.song_id_list}
+    if not song_ids:
+        return set()
+    return set(db.session.scalars(select(Song.id).where(Song.id.in_(song_ids))))
+
+
+def _first_email_export_by_round(round_ids, order_by, *criteria):
+    """Return the first email export per round in ``order_by`` order, ranked in SQL."""
+    rank = func.row_number().over(partition_by=RoundExport.round_id, order_by=order_by).label('rank')
+    ranked = (
+        select(RoundExport.id, rank)
+        .where(RoundExport.round_id.in_(round_ids), RoundExport.export_type == 'email', *criteria)
+        .subquery()
+    )
+    exports = RoundExport.query.join(ranked, RoundExport.id == ranked.c.id).filter(ranked.c.rank == 1)
+    return {export.round_id: export for export in exports}
+
+
 def _rounds_list_statuses(rounds):
-    """Build compact readiness and schedule metadata for the rounds list."""
+    """Build compact readiness and schedule metadata for the rounds list.
+
+    Runs a fixed number of queries for the whole page: one for song IDs and
+    one each for the next scheduled and the latest email export per round.
+    """
     round_ids = [round_.id for round_ in rounds]
     scheduled_by_round = {}
     latest_email_by_round = {}
+    resolved_song_ids = _resolved_song_ids(rounds)
     if round_ids:
-        scheduled_exports = (
-            RoundExport.query
-            .filter(
-                RoundExport.round_id.in_(round_ids),
-                RoundExport.export_type == 'email',
-                RoundExport.status == 'scheduled',
-                RoundExport.scheduled_for.isnot(None),
-            )
-            .order_by(RoundExport.scheduled_for.asc(), RoundExport.id.asc())
-            .all()
+        scheduled_by_round = _first_email_export_by_round(
+            round_ids,
+            (RoundExport.scheduled_for.asc(), RoundExport.id.asc()),
+            RoundExport.status == 'scheduled',
+            RoundExport.scheduled_for.isnot(None),
         )
-        for export in scheduled_exports:
-            scheduled_by_round.setdefault(export.round_id, export)
-        latest_email_exports = (
-            RoundExport.query
-            .filter(
-                RoundExport.round_id.in_(round_ids),
-                RoundExport.export_type == 'email',
-            )
-            .order_by(RoundExport.timestamp.desc(), RoundExport.id.desc())
-            .all()
+        latest_email_by_round = _first_email_export_by_round(
+            round_ids,
+            (RoundExport.timestamp.desc(), RoundExport.id.desc()),
         )
-        for export in latest_email_exports:
-            latest_email_by_round.setdefault(export.round_id, export)
 
     statuses = {}
     for round_ in rounds:
-        stored_song_count = len(round_.song_id_list)
-        resolved_song_count = len(round_.song_list)
+        song_ids = round_.song_id_list
+        stored_song_count = len(song_ids)
+        resolved_song_count = sum(1 for song_id in song_ids if song_id in resolved_song_ids)
         if stored_song_count != 8:
             readiness = {
                 'label': f'Songs {stored_song_count}/8',
@@ -492,7 +507,11 @@ def rounds_list():
     """Display a paginated list of rounds."""
     page = _int_arg('page', default=1, minimum=1)
     per_page = _int_arg('per_page', default=25, minimum=1, maximum=100)
-    query = _visible_rounds_query().order_by(Round.created_at.desc(), Round.id.desc())
+    query = (
+        _visible_rounds_query()
+        .options(joinedload(Round.owner))
+        .order_by(Round.created_at.desc(), Round.id.desc())
+    )
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
     rounds = pagination.items
     query_args = {'per_page': per_page}
@@ -522,6 +541,11 @@ def rounds_calendar():
         )
     planned_rounds = (
         planned_query
+        .options(
+            joinedload(PlannedQuizRound.quizmaster),
+            joinedload(PlannedQuizRound.round),
+            joinedload(PlannedQuizRound.export),
+        )
         .order_by(PlannedQuizRound.quiz_date.asc(), PlannedQuizRound.id.asc())
         .limit(100)
         .all()
@@ -531,7 +555,7 @@ def rounds_calendar():
         for plan in planned_rounds
     }
     exports = (
-        RoundExport.query.filter(
+        RoundExport.query.options(joinedload(RoundExport.round)).filter(
             RoundExport.round_id.in_(visible_round_ids),
             RoundExport.export_type == 'email',
             RoundExport.scheduled_for.isnot(None),
@@ -621,7 +645,7 @@ def round_detail(round_id):
             if current_user.is_authenticated and current_user.spotify_token:
                 # Use oauth.spotify to get user info
                 # Ensure the token is fresh or handle potential MissingTokenError
-                user_info_response = oauth.spotify.get('https://api.spotify.com/v1/me')
+                user_info_response = oauth.spotify.get(spotify_api_url('me'))
                 user_info_response.raise_for_status()  # Raise an exception for bad status codes
                 user_info = user_info_response.json()
         except Exception as e:  # Catch a broader range of exceptions, including MissingTokenError
@@ -1358,9 +1382,9 @@ def round_mp3(round_id):
         try:
             combined_audio.export(mp3_file_path, format="mp3")
             # The S3 backend uses this ephemeral path only for rendering. Persist
-            # the generated asset through the backend before reporting success.
-            with open(mp3_file_path, "rb") as mp3_file:
-                round_artifact_store().write_bytes("mp3", round_id, mp3_file.read())
+            # the generated asset through the backend before reporting success;
+            # it is streamed in parts rather than read into memory.
+            round_artifact_store().persist_file("mp3", round_id, mp3_file_path)
             current_app.logger.info(f"MP3 file successfully generated at: {mp3_file_path}")
             
             # Update the round object to indicate MP3 has been generated and update timestamp
@@ -1389,31 +1413,54 @@ def round_mp3(round_id):
                 ROUND_MP3_EXPORT_ERROR,
             )
 
+def _send_round_artifact(kind, round_id):
+    """Send a stored round artifact, or None when it has not been generated.
+
+    Files on local disk, including current copies in the object-store
+    cache, are sent by path so Werkzeug can serve ranges and conditional
+    requests. Other object-store artifacts are streamed straight from the
+    store, which keeps a copy in the cache for the next download.
+    """
+    store = round_artifact_store()
+    if not store.exists(kind, round_id):
+        return None
+    as_attachment = request.args.get('inline') != '1'
+    if store.backend == 'filesystem':
+        return send_file(store.path(kind, round_id), as_attachment=as_attachment)
+    download_name = store.filename(kind, round_id)
+    cached_path = store.cached_path(kind, round_id)
+    if cached_path is not None:
+        return send_file(cached_path, as_attachment=as_attachment, download_name=download_name)
+    response = send_file(
+        store.open_read(kind, round_id),
+        mimetype=ROUND_ARTIFACT_CONTENT_TYPES[kind],
+        as_attachment=as_attachment,
+        download_name=download_name,
+    )
+    response.content_length = store.size(kind, round_id)
+    return response
+
 @rounds_bp.route('/download/mp3/round_<int:round_id>', methods=['GET'])
 @login_required
 def download_mp3(round_id):
     """Download an MP3 file for a round"""
     _get_visible_round_or_404(round_id)
-    mp3_file_path = round_mp3_path(round_id)
-    
-    if not os.path.exists(mp3_file_path):
+    response = _send_round_artifact('mp3', round_id)
+    if response is None:
         flash('MP3 file not found. Please generate the MP3 first.', 'error')
         return redirect(url_for('rounds.round_detail', round_id=round_id))
-        
-    return send_file(mp3_file_path, as_attachment=request.args.get('inline') != '1')
+    return response
 
 @rounds_bp.route('/download/pdf/round_<int:round_id>', methods=['GET'])
 @login_required
 def download_pdf(round_id):
     """Download a PDF file for a round"""
     _get_visible_round_or_404(round_id)
-    pdf_file_path = round_pdf_path(round_id)
-    
-    if not os.path.exists(pdf_file_path):
+    response = _send_round_artifact('pdf', round_id)
+    if response is None:
         flash('PDF file not found. Please generate the PDF first.', 'error')
         return redirect(url_for('rounds.round_detail', round_id=round_id))
-        
-    return send_file(pdf_file_path, as_attachment=request.args.get('inline') != '1')
+    return response
 
 def generate_pdf(round_id):
     """
@@ -1785,7 +1832,9 @@ def send_email(round_id):
         )
 
     try:
-        with open(mp3_file_path, 'rb') as mp3_file:
+        # The MP3 is handed over as an open stream; the email helper encodes
+        # it block by block instead of holding a second raw copy.
+        with round_artifact_store().open_read('mp3', round_id) as mp3_file:
             attachments = [
                 {
                     'data': pdf_data,
@@ -1793,18 +1842,18 @@ def send_email(round_id):
                     'mimetype': 'application/pdf',
                 },
                 {
-                    'data': mp3_file.read(),
+                    'data': mp3_file,
                     'filename': f'round_{round_id}.mp3',
                     'mimetype': 'audio/mpeg',
                 },
             ]
 
-        success, message = send_quiz_email(
-            mail_recipient,
-            round_title,
-            'Attached please find the MP3 and PDF files for the quiz round.',
-            attachments,
-        )
+            success, message = send_quiz_email(
+                mail_recipient,
+                round_title,
+                'Attached please find the MP3 and PDF files for the quiz round.',
+                attachments,
+            )
         if not success:
             raise RuntimeError(message)
 
@@ -1994,86 +2043,11 @@ def export_to_dropbox(round_id):
         
         current_app.logger.debug(f"Created metadata JSON ({len(metadata_json)} bytes)")
         
-        # Upload metadata JSON
-        from musicround.helpers.dropbox_helper import upload_to_dropbox, create_shared_link
-        
-        json_path = f"{metadata_folder}/round_{round_id}_metadata.json"
-        current_app.logger.info(f"Uploading JSON metadata to {json_path}")
-        
-        json_upload = upload_to_dropbox(
-            access_token, 
-            json_path, 
-            metadata_json, 
-            mode='text'
-        )
-        
-        current_app.logger.debug(f"JSON upload result: {json_upload}")
-        
-        if not json_upload['success']:
-            current_app.logger.error(f"Error uploading JSON metadata: {json_upload}")
-            raise Exception(f"Error uploading JSON metadata: {json_upload['message']}")
-        
-        # Create shared link for JSON
-        current_app.logger.info(f"Creating shared link for JSON at {json_path}")
-        json_link = create_shared_link(access_token, json_path)
-        current_app.logger.debug(f"JSON shared link result: {json_link}")
-        
-        if json_link['success']:
-            response_data['shared_links']['text'] = json_link['url']
-        
-        # 2. Export PDF if requested
-        if include_pdf:
-            current_app.logger.info(f"PDF export requested for round {round_id}")
-            
-            # Generate PDF if not already generated
-            if not round_obj.pdf_generated:
-                current_app.logger.debug("PDF not generated yet, generating now")
-                pdf_data = generate_pdf(round_id)
-                if isinstance(pdf_data, str):
-                    current_app.logger.error(f"Error generating PDF: {pdf_data}")
-                    raise Exception(f"Error generating PDF: {pdf_data}")
-            else:
-                # PDF already exists, read it
-                pdf_file_path = round_pdf_path(round_id)
-                current_app.logger.debug(f"Reading existing PDF from {pdf_file_path}")
-                
-                if not os.path.exists(pdf_file_path):
-                    current_app.logger.error(f"PDF file doesn't exist at {pdf_file_path} despite pdf_generated=True")
-                    # Generate it anyway
-                    pdf_data = generate_pdf(round_id)
-                else:
-                    pdf_data = round_artifact_store().read_bytes('pdf', round_id)
-                    current_app.logger.debug(f"Read {len(pdf_data)} bytes from PDF file")
-            
-            # Upload PDF
-            pdf_path = f"{round_folder}/round_{round_id}.pdf"
-            current_app.logger.info(f"Uploading PDF to {pdf_path}")
-            
-            pdf_upload = upload_to_dropbox(
-                access_token, 
-                pdf_path, 
-                pdf_data
-            )
-            
-            current_app.logger.debug(f"PDF upload result: {pdf_upload}")
-            
-            if not pdf_upload['success']:
-                current_app.logger.error(f"Error uploading PDF: {pdf_upload}")
-                raise Exception(f"Error uploading PDF: {pdf_upload['message']}")
-            
-            # Create shared link for PDF
-            current_app.logger.info(f"Creating shared link for PDF at {pdf_path}")
-            pdf_link = create_shared_link(access_token, pdf_path)
-            current_app.logger.debug(f"PDF shared link result: {pdf_link}")
-            
-            if pdf_link['success']:
-                response_data['shared_links']['pdf'] = pdf_link['url']
-        
-        # 3. Export MP3 if requested
+        # Check the MP3 before uploading anything so a pending MP3 does not
+        # leave a partial export in the user's Dropbox.
         if include_mp3s:
             current_app.logger.info(f"MP3 export requested for round {round_id}")
             
-            # Check if MP3 exists, generate if not
             mp3_file_path = round_mp3_path(round_id)
             current_app.logger.debug(f"Checking for MP3 at {mp3_file_path}")
             current_app.logger.debug(f"MP3 generated flag: {round_obj.mp3_generated}")
@@ -2091,35 +2065,65 @@ def export_to_dropbox(round_id):
                 db.session.commit()
                 
                 return jsonify(response_data)
+        
+        pdf_data = None
+        if include_pdf:
+            current_app.logger.info(f"PDF export requested for round {round_id}")
             
-            # MP3 exists, upload it
-            current_app.logger.debug(f"Reading MP3 file from {mp3_file_path}")
-            mp3_data = round_artifact_store().read_bytes('mp3', round_id)
-            
-            current_app.logger.debug(f"Read {len(mp3_data)} bytes from MP3 file")
-            
-            mp3_path = f"{round_folder}/round_{round_id}.mp3"
-            current_app.logger.info(f"Uploading MP3 to {mp3_path}")
-            
-            mp3_upload = upload_to_dropbox(
-                access_token, 
-                mp3_path, 
-                mp3_data
-            )
-            
-            current_app.logger.debug(f"MP3 upload result: {mp3_upload}")
-            
-            if not mp3_upload['success']:
-                current_app.logger.error(f"Error uploading MP3: {mp3_upload}")
-                raise Exception(f"Error uploading MP3: {mp3_upload['message']}")
-            
-            # Create shared link for MP3
-            current_app.logger.info(f"Creating shared link for MP3 at {mp3_path}")
-            mp3_link = create_shared_link(access_token, mp3_path)
-            current_app.logger.debug(f"MP3 shared link result: {mp3_link}")
-            
-            if mp3_link['success']:
-                response_data['shared_links']['mp3'] = mp3_link['url']
+            # Generate PDF if not already generated
+            if not round_obj.pdf_generated:
+                current_app.logger.debug("PDF not generated yet, generating now")
+                pdf_data = generate_pdf(round_id)
+                if isinstance(pdf_data, str):
+                    current_app.logger.error(f"Error generating PDF: {pdf_data}")
+                    raise Exception(f"Error generating PDF: {pdf_data}")
+            else:
+                pdf_file_path = round_pdf_path(round_id)
+                if not os.path.exists(pdf_file_path):
+                    current_app.logger.error(f"PDF file doesn't exist at {pdf_file_path} despite pdf_generated=True")
+                    # Generate it anyway
+                    pdf_data = generate_pdf(round_id)
+        
+        # Upload the metadata JSON, PDF, and MP3 concurrently. Stored artifacts
+        # are streamed; large ones go through chunked upload sessions.
+        from musicround.helpers.dropbox_helper import upload_files_to_dropbox, create_shared_links
+        
+        store = round_artifact_store()
+        with ExitStack() as streams:
+            uploads = [{
+                'kind': 'text',
+                'path': f"{metadata_folder}/round_{round_id}_metadata.json",
+                'data': metadata_json,
+                'mode': 'text',
+            }]
+            if include_pdf:
+                uploads.append({
+                    'kind': 'pdf',
+                    'path': f"{round_folder}/round_{round_id}.pdf",
+                    'data': pdf_data if pdf_data is not None else streams.enter_context(store.open_read('pdf', round_id)),
+                })
+            if include_mp3s:
+                uploads.append({
+                    'kind': 'mp3',
+                    'path': f"{round_folder}/round_{round_id}.mp3",
+                    'data': streams.enter_context(store.open_read('mp3', round_id)),
+                })
+            for upload in uploads:
+                current_app.logger.info(f"Uploading {upload['kind']} to {upload['path']}")
+            upload_results = upload_files_to_dropbox(access_token, uploads)
+        
+        for upload, result in zip(uploads, upload_results):
+            current_app.logger.debug(f"{upload['kind']} upload result: {result}")
+            if not result['success']:
+                current_app.logger.error(f"Error uploading {upload['kind']}: {result}")
+                raise Exception(f"Error uploading {upload['kind']}: {result['message']}")
+        
+        # Create shared links for all uploaded files
+        links = create_shared_links(access_token, [upload['path'] for upload in uploads])
+        for upload, link in zip(uploads, links):
+            current_app.logger.debug(f"{upload['kind']} shared link result: {link}")
+            if link['success']:
+                response_data['shared_links'][upload['kind']] = link['url']
         
         # Update export record as success
         round_export.status = 'success'
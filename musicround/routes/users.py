@@ -22,6 +22,7 @@ from musicround.helpers.oauth_status import dropbox_token_status, spotify_token_
 from musicround.helpers.email_helper import send_account_verification_email
 from musicround.helpers.paths import app_data_dir, backup_dir
 from musicround.helpers.service_health import artifact_storage_service_health
+from musicround.helpers.provider_urls import spotify_api_url
 from musicround.helpers.spotify_helper import (
     clear_manual_spotify_bearer_token,
     get_spotify_token,
@@ -700,7 +701,7 @@ def profile():
         # If token_source indicates it's a user-like token or generic 'manual'
         if token_source in ['manual', 'user_manual', 'user']: # 'user' if somehow set without db token
             try:
-                resp = oauth.spotify.get('https://api.spotify.com/v1/me', token={'access_token': session_bearer, 'token_type': 'Bearer'})
+                resp = oauth.spotify.get(spotify_api_url('me'), token={'access_token': session_bearer, 'token_type': 'Bearer'})
                 if resp.ok:
                     spotify_user_info = resp.json()
                     if spotify_user_info and 'id' in spotify_user_info:
@@ -733,7 +734,7 @@ def profile():
         # If token_source indicates it's client_credentials or if user fetch failed, it might be client_credentials
         if not spotify_user_info and token_source in ['client_credentials', 'client_credentials_manual']:
             try:
-                resp_cc = oauth.spotify.get('https://api.spotify.com/v1/browse/new-releases', params={'limit':1}, token={'access_token': session_bearer, 'token_type': 'Bearer'})
+                resp_cc = oauth.spotify.get(spotify_api_url('browse/new-releases'), params={'limit':1}, token={'access_token': session_bearer, 'token_type': 'Bearer'})
                 if resp_cc.ok:
                     current_app.logger.info("Manual/Session token confirmed as working client credentials.")
                     if token_source == 'client_credentials_manual':
@@ -1090,7 +1091,7 @@ def update_bearer_token():
         )
 
         try:
-            resp_me = oauth.spotify.get('https://api.spotify.com/v1/me', token={'access_token': bearer_token, 'token_type': 'Bearer'})
+            resp_me = oauth.spotify.get(spotify_api_url('me'), token={'access_token': bearer_token, 'token_type': 'Bearer'})
             user_info = resp_me.json() if resp_me.ok else None
 
             if user_info and 'id' in user_info:
@@ -1107,7 +1108,7 @@ def update_bearer_token():
         except Exception as user_error:
             current_app.logger.warning(f"Validating as user token failed: {str(user_error)}. Checking if client credentials token...")
             try:
-                resp_browse = oauth.spotify.get('https://api.spotify.com/v1/browse/new-releases', params={'limit':1}, token={'access_token': bearer_token, 'token_type': 'Bearer'})
+                resp_browse = oauth.spotify.get(spotify_api_url('browse/new-releases'), params={'limit':1}, token={'access_token': bearer_token, 'token_type': 'Bearer'})
                 browse_results = resp_browse.json() if resp_browse.ok else None
 
                 if browse_results and 'albums' in browse_results:
@@ -1549,6 +1550,149 @@ def storage_status():
     return render_template('admin/storage_status.html', storage=storage)
 
 
+def _query_profile_snapshot():
+    from musicround.helpers.query_profiler import query_profiler
+
+    profiler = query_profiler()
+    if profiler is None:
+        return {
+            "enabled": False,
+            "scopes": [],
+            "slow_queries": [],
+            "hint": "Set QUERY_PROFILER_ENABLED=True and restart to collect per-request query statistics.",
+        }
+    return profiler.snapshot(kind=request.args.get('kind') or None)
+
+
+@users_bp.route('/query-profile')
+@login_required
+@admin_required
+def query_profile():
+    """Show per-endpoint query counts, database time, and likely N+1 statements."""
+    return render_template('admin/query_profile.html', profile=_query_profile_snapshot())
+
+
+@users_bp.route('/query-profile.json')
+@automation_or_admin_required
+def query_profile_json():
+    """Return the query profile as JSON for scripts and regression checks."""
+    return jsonify(_query_profile_snapshot())
+
+
+@users_bp.route('/query-profile/reset', methods=['POST'])
+@login_required
+@admin_required
+def reset_query_profile():
+    from musicround.helpers.query_profiler import query_profiler
+
+    profiler = query_profiler()
+    if profiler is not None:
+        profiler.reset()
+        flash('Query profile statistics were reset.', 'success')
+    return redirect(url_for('users.query_profile'))
+
+
+def _runtime_profiles_snapshot():
+    from dataclasses import asdict
+
+    from musicround.helpers.runtime_profiler import runtime_profiler
+
+    profiler = runtime_profiler()
+    return {
+        "directory": profiler.directory,
+        "sample_interval_ms": profiler.sample_interval_ms,
+        "arms": [asdict(arm) for arm in profiler.arms()],
+        "profiles": profiler.profiles(),
+    }
+
+
+@users_bp.route('/runtime-profiles')
+@login_required
+@admin_required
+def runtime_profiles():
+    """Arm on-demand CPU profiles and download the saved ones."""
+    from musicround.helpers.runtime_profiler import PROFILE_KINDS, PROFILE_MODES
+
+    return render_template(
+        'admin/runtime_profiles.html',
+        snapshot=_runtime_profiles_snapshot(),
+        kinds=PROFILE_KINDS,
+        modes=PROFILE_MODES,
+        endpoints=sorted(name for name in current_app.view_functions if name != 'static'),
+    )
+
+
+@users_bp.route('/runtime-profiles.json')
+@automation_or_admin_required
+def runtime_profiles_json():
+    """Return armed captures and saved runtime profiles as JSON."""
+    return jsonify(_runtime_profiles_snapshot())
+
+
+@users_bp.route('/runtime-profiles/arm', methods=['POST'])
+@login_required
+@admin_required
+def arm_runtime_profile():
+    from musicround.helpers.runtime_profiler import runtime_profiler
+
+    try:
+        arm = runtime_profiler().arm(
+            kind=request.form.get('kind', 'request'),
+            name=request.form.get('name', ''),
+            count=int(request.form.get('count') or 1),
+            mode=request.form.get('mode', 'sample'),
+            armed_by=current_user.username,
+            ttl_seconds=int(request.form.get('ttl_minutes') or 60) * 60,
+        )
+    except (OSError, ValueError) as exc:
+        flash(f'Could not arm the profiler: {exc}', 'danger')
+    else:
+        flash(f'Armed a {arm.mode} profile for the next {arm.count} {arm.kind} call(s) matching {arm.name}.', 'success')
+    return redirect(url_for('users.runtime_profiles'))
+
+
+@users_bp.route('/runtime-profiles/arms/<arm_id>/disarm', methods=['POST'])
+@login_required
+@admin_required
+def disarm_runtime_profile(arm_id):
+    from musicround.helpers.runtime_profiler import runtime_profiler
+
+    if runtime_profiler().disarm(arm_id):
+        flash('Profile arm removed.', 'success')
+    return redirect(url_for('users.runtime_profiles'))
+
+
+@users_bp.route('/runtime-profiles/<profile_id>/download')
+@login_required
+@admin_required
+def download_runtime_profile(profile_id):
+    """Download a folded-stack (flamegraph) or pstats profile."""
+    from flask import abort, send_file
+
+    from musicround.helpers.runtime_profiler import runtime_profiler
+
+    metadata = runtime_profiler().profile(profile_id)
+    if metadata is None:
+        abort(404)
+    return send_file(
+        metadata['path'],
+        mimetype='text/plain' if metadata['mode'] == 'sample' else 'application/octet-stream',
+        as_attachment=True,
+        download_name=metadata['filename'],
+    )
+
+
+@users_bp.route('/runtime-profiles/<profile_id>/delete', methods=['POST'])
+@login_required
+@admin_required
+def delete_runtime_profile(profile_id):
+    from musicround.helpers.runtime_profiler import runtime_profiler
+
+    if runtime_profiler().delete_profile(profile_id):
+        flash('Runtime profile deleted.', 'success')
+    return redirect(url_for('users.runtime_profiles'))
+
+
 @users_bp.route('/seed-sources')
 @login_required
 @admin_required
@@ -1833,13 +1977,20 @@ def create_backup():
     # Get options for what to include
     include_mp3s = request.form.get('include_mp3s', 'true') == 'true'
     include_config = request.form.get('include_config', 'true') == 'true'
+    incremental = request.form.get('incremental', 'false') == 'true'
+    logical = request.form.get('logical', 'false') == 'true'
     
     # Create the backup
-    result = create_backup_helper(
-        backup_name=backup_name if backup_name else None,
-        include_mp3s=include_mp3s,
-        include_config=include_config
-    )
+    try:
+        result = create_backup_helper(
+            backup_name=backup_name if backup_name else None,
+            include_mp3s=include_mp3s,
+            include_config=include_config,
+            incremental=incremental,
+            logical=logical
+        )
+    except ValueError as exc:
+        result = {"status": "error", "message": str(exc), "path": None}
     
     # If this is an API request, return JSON
     if request.headers.get('Accept') == 'application/json' or automation_request:
@@ -1892,10 +2043,14 @@ def schedule_backup():
 @admin_required
 def verify_backup(filename):
     """Verify the integrity of a backup file"""
+    from musicround.helpers.backup_helper import VERIFY_FULL, VERIFY_LEVELS
     from musicround.helpers.backup_helper import verify_backup as verify_backup_helper
     
-    # Verify the backup
-    result = verify_backup_helper(filename)
+    # Verify the backup; the admin button runs the full checksum pass
+    level = request.values.get('level', VERIFY_FULL)
+    if level not in VERIFY_LEVELS:
+        level = VERIFY_FULL
+    result = verify_backup_helper(filename, level=level)
     
     # Store the result for display
     session['backup_notification'] = {
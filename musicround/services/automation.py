@@ -6,6 +6,7 @@ import os
 import re
 import csv
 import json
+import base64
 import math
 import secrets
 import tempfile
@@ -13,10 +14,13 @@ import hashlib
 from html import unescape
 from io import StringIO
 from copy import deepcopy
-from collections.abc import Iterable, Mapping, Sequence
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
 from datetime import datetime, timedelta, timezone
 from threading import RLock
 from time import monotonic, sleep
+from types import SimpleNamespace
 from typing import Any
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
@@ -26,7 +30,7 @@ from flask_login import login_user, logout_user
 from pydub import AudioSegment
 from sqlalchemy import func
 from sqlalchemy import inspect as sa_inspect
-from sqlalchemy import or_
+from sqlalchemy import and_, false, or_, select, update
 from sqlalchemy.orm import joinedload, selectinload
 
 from musicround import db
@@ -39,16 +43,22 @@ from musicround.helpers.database_config import (
     managed_database_requirement_error,
     postgres_env_readiness,
 )
-from musicround.helpers.email_helper import send_email
+from musicround.helpers.email_helper import SMTPConnectionPool, send_email
 from musicround.helpers.import_helper import ImportHelper
+from musicround.helpers.import_queue import IMPORT_JOB_STATUSES, apply_import_event_to_stats
 from musicround.helpers.metadata import get_deezer_track_metadata, normalize_deezer_rank
 from musicround.helpers.omdb import OmdbError, omdb_catalog_status, search_omdb_catalog
+from musicround.helpers.provider_urls import spotify_api_url
 from musicround.helpers.spotify_archive import (
+    BULK_AUDIO_FEATURE_LOOKUP_LIMIT,
+    BULK_ISRC_LOOKUP_LIMIT,
+    ISRC_LOOKUP_LIMIT,
     SpotifyArchiveError,
-    bulk_lookup_spotify_archive_audio_features,
-    bulk_lookup_spotify_archive_isrcs,
     lookup_spotify_archive_isrcs,
+    pipelined_spotify_archive_lookup,
     search_spotify_archive_catalog,
+    stream_spotify_archive_audio_features,
+    stream_spotify_archive_isrcs,
 )
 from musicround.helpers.round_notifications import send_round_blocked_notification
 from musicround.helpers.paths import app_data_path
@@ -586,7 +596,7 @@ def _extract_spotify_isrc(song: Song) -> tuple[str | None, str]:
         return None, "spotify_token_missing"
     try:
         response = requests.get(
-            f"https://api.spotify.com/v1/tracks/{song.spotify_id}",
+            spotify_api_url(f"tracks/{song.spotify_id}"),
             headers={"Authorization": f"Bearer {access_token}"},
             timeout=10,
         )
@@ -755,8 +765,14 @@ def _archive_additional_data(song: Song, metadata: dict[str, Any]) -> str:
     return json.dumps(payload, sort_keys=True)
 
 
-def _apply_archive_metadata(song: Song, metadata: dict[str, Any]) -> list[str]:
-    """Fill missing stable fields from an exact ISRC archive match."""
+def _apply_archive_metadata(
+    song: Song, metadata: dict[str, Any], taken_spotify_ids: set[str] | None = None
+) -> list[str]:
+    """Fill missing stable fields from an exact ISRC archive match.
+
+    ``taken_spotify_ids`` lets batch callers check Spotify-ID conflicts
+    against a prefetched set instead of querying once per song.
+    """
     changed: list[str] = []
     for field_name in ("album_name", "year", "duration_ms", "spotify_cover_url", "cover_url"):
         source_field = "cover_url" if field_name in {"spotify_cover_url", "cover_url"} else field_name
@@ -772,10 +788,15 @@ def _apply_archive_metadata(song: Song, metadata: dict[str, Any]) -> list[str]:
         changed.append(field_name)
     spotify_id = metadata.get("spotify_id")
     if spotify_id and not song.spotify_id:
-        conflict = Song.query.filter(Song.spotify_id == spotify_id, Song.id != song.id).first()
+        if taken_spotify_ids is not None:
+            conflict = spotify_id in taken_spotify_ids
+        else:
+            conflict = Song.query.filter(Song.spotify_id == spotify_id, Song.id != song.id).first()
         if not conflict:
             song.spotify_id = spotify_id
             changed.append("spotify_id")
+            if taken_spotify_ids is not None:
+                taken_spotify_ids.add(spotify_id)
     if song.popularity is None or not 0 <= song.popularity <= 100:
         popularity = metadata.get("popularity")
         if popularity is not None:
@@ -799,12 +820,16 @@ def backfill_songs_from_spotify_archive(
     dry_run: bool = True,
     limit: int | None = None,
     song_ids: list[int] | None = None,
+    on_item: Callable[[dict[str, Any], int, int], None] | None = None,
 ) -> dict[str, Any]:
     """Backfill QB metadata from exact ISRC matches in the offline archive.
 
-    An explicit ``song_ids`` list uses bounded identifier lookups. This lets
-    provider enrichment pipeline each completed batch without repeatedly
-    scanning the complete disk-backed Spotify archive.
+    Full-library runs stream matches over NDJSON and commit each batch while
+    the archive scan is still returning rows. An explicit ``song_ids`` list
+    uses bounded identifier lookups, so provider enrichment can pipeline each
+    completed batch without repeatedly scanning the complete disk-backed
+    Spotify archive. ``on_item(batch, matched, total)`` is called after each
+    archive result batch.
     """
     if not 1 <= batch_size <= 500:
         raise AutomationError("batch_size must be between 1 and 500.")
@@ -819,42 +844,137 @@ def backfill_songs_from_spotify_archive(
         query = query.filter(Song.id.in_(clean_song_ids))
     if limit is not None:
         query = query.limit(limit)
-    songs = query.all()
-    processed = matched = updated = 0
-    examples: list[dict[str, Any]] = []
+    songs = _archive_song_rows(query, _ARCHIVE_METADATA_COLUMNS)
+    songs_by_isrc: dict[str, list[SimpleNamespace]] = {}
+    for song in songs:
+        songs_by_isrc.setdefault(str(song.isrc).strip().upper(), []).append(song)
+    isrcs = list(songs_by_isrc)
+    if song_ids is None:
+        batches = pipelined_spotify_archive_lookup(
+            current_app._get_current_object(), isrcs, stream_spotify_archive_isrcs, chunk_size=BULK_ISRC_LOOKUP_LIMIT,
+        )
+    else:
+        batches = pipelined_spotify_archive_lookup(
+            current_app._get_current_object(),
+            isrcs,
+            lambda app, chunk: lookup_spotify_archive_isrcs(app, chunk)["results"],
+            chunk_size=ISRC_LOOKUP_LIMIT,
+        )
+    taken_spotify_ids: set[str] = set()
+
+    def prefetch_taken_spotify_ids(results: list[dict[str, Any]]) -> None:
+        candidates = {str(item["spotify_id"]) for item in results if item.get("spotify_id")}
+        candidates -= taken_spotify_ids
+        if candidates:
+            taken_spotify_ids.update(
+                spotify_id
+                for (spotify_id,) in db.session.query(Song.spotify_id).filter(Song.spotify_id.in_(candidates))
+            )
+
+    batch_count = 0
+
+    def report_batch(matched: int, updated: int) -> None:
+        nonlocal batch_count
+        batch_count += 1
+        on_item(
+            {"batch": batch_count, "matched_count": matched, "updated_count": updated},
+            matched,
+            len(songs),
+        )
+
+    matched, updated, examples = _apply_archive_results(
+        songs_by_isrc,
+        batches,
+        key=lambda item: str(item.get("isrc") or "").upper(),
+        apply=lambda song, metadata: _apply_archive_metadata(song, metadata, taken_spotify_ids),
+        prepare=prefetch_taken_spotify_ids,
+        batch_size=batch_size,
+        dry_run=dry_run,
+        on_batch=report_batch if on_item is not None else None,
+    )
+    return {
+        "dry_run": dry_run,
+        "processed_count": len(songs),
+        "matched_count": matched,
+        "updated_count": updated,
+        "examples": examples,
+    }
+
+
+_ARCHIVE_METADATA_COLUMNS = (
+    "id", "isrc", "album_name", "year", "duration_ms", "spotify_cover_url", "cover_url",
+    "spotify_id", "popularity", "additional_data", "metadata_sources",
+)
+
+
+def _archive_song_rows(query, columns: Sequence[str]) -> list[SimpleNamespace]:
+    """Load only the columns an archive backfill reads, as detached mutable rows.
+
+    The archive apply helpers only get and set plain attributes, so they work
+    on these rows unchanged while the ORM unit of work stays out of the way.
+    """
+    rows = query.with_entities(*(getattr(Song, column) for column in columns)).all()
+    return [SimpleNamespace(**row._asdict()) for row in rows]
+
+
+def _apply_archive_results(
+    songs_by_key: dict[str, list[SimpleNamespace]],
+    batches: Iterable[list[dict[str, Any]]],
+    *,
+    key: Callable[[dict[str, Any]], str],
+    apply: Callable[[SimpleNamespace, dict[str, Any]], list[str]],
+    batch_size: int,
+    dry_run: bool,
+    prepare: Callable[[list[dict[str, Any]]], None] | None = None,
+    on_batch: Callable[[int, int], None] | None = None,
+) -> tuple[int, int, list[dict[str, Any]]]:
+    """Apply archive result batches as they arrive with executemany bulk UPDATEs.
+
+    ``batches`` comes from the pipelined archive client, so this thread writes
+    one batch while later chunks are still in flight. Changed columns are
+    written every ``batch_size`` songs with one ORM bulk ``UPDATE`` by primary
+    key. Batches committed before a lookup failure are kept.
+    ``on_batch(matched, updated)`` reports running totals after each batch.
+    """
+    matched = updated = 0
+    example_changes: dict[int, list[str]] = {}
+    pending: list[dict[str, Any]] = []
+
+    def write_pending() -> None:
+        db.session.execute(update(Song), pending)
+        db.session.commit()
+        pending.clear()
+
     try:
-        isrcs = [song.isrc for song in songs]
-        if song_ids is None:
-            results = []
-            for start in range(0, len(isrcs), 10_000):
-                results.extend(
-                    bulk_lookup_spotify_archive_isrcs(current_app, isrcs[start:start + 10_000])["results"]
-                )
-        else:
-            results = []
-            for start in range(0, len(isrcs), 500):
-                results.extend(
-                    lookup_spotify_archive_isrcs(current_app, isrcs[start:start + 500])["results"]
-                )
+        for results in batches:
+            if prepare is not None and not dry_run:
+                prepare(results)
+            for metadata in results:
+                for song in songs_by_key.pop(key(metadata), ()):
+                    matched += 1
+                    changed = apply(song, metadata) if not dry_run else []
+                    if changed:
+                        updated += 1
+                        pending.append({"id": song.id, **{field: getattr(song, field) for field in changed}})
+                    if len(example_changes) < 100:
+                        example_changes[song.id] = changed
+                    if len(pending) >= batch_size:
+                        write_pending()
+            if on_batch is not None:
+                on_batch(matched, updated)
     except SpotifyArchiveError as exc:
-        raise AutomationError(str(exc)) from exc
-    matches = {str(item.get("isrc") or "").upper(): item for item in results}
-    for start in range(0, len(songs), batch_size):
-        batch = songs[start:start + batch_size]
-        for song in batch:
-            processed += 1
-            metadata = matches.get(str(song.isrc).upper())
-            if not metadata:
-                continue
-            matched += 1
-            changed = _apply_archive_metadata(song, metadata) if not dry_run else []
-            if changed:
-                updated += 1
-            if len(examples) < 100:
-                examples.append({"song": _song_summary(song), "matched": True, "changed_fields": changed})
         if not dry_run:
-            db.session.commit()
-    return {"dry_run": dry_run, "processed_count": processed, "matched_count": matched, "updated_count": updated, "examples": examples}
+            db.session.rollback()
+        raise AutomationError(str(exc)) from exc
+    if pending:
+        write_pending()
+    songs = {song.id: song for song in Song.query.filter(Song.id.in_(example_changes))} if example_changes else {}
+    examples = [
+        {"song": _song_summary(songs[song_id]), "matched": True, "changed_fields": changed}
+        for song_id, changed in example_changes.items()
+        if song_id in songs
+    ]
+    return matched, updated, examples
 
 
 _ARCHIVE_AUDIO_FEATURE_FIELDS = (
@@ -905,7 +1025,10 @@ def backfill_song_audio_features_from_spotify_archive(
     dry_run: bool = True,
     limit: int | None = None,
 ) -> dict[str, Any]:
-    """Fill missing QB audio fields from exact Spotify IDs in the offline snapshot."""
+    """Fill missing QB audio fields from exact Spotify IDs in the offline snapshot.
+
+    Matches are streamed from the archive and applied batch by batch.
+    """
     if not 1 <= batch_size <= 500:
         raise AutomationError("batch_size must be between 1 and 500.")
     if limit is not None and not 1 <= limit <= 50_000:
@@ -918,34 +1041,28 @@ def backfill_song_audio_features_from_spotify_archive(
     ).order_by(Song.id)
     if limit is not None:
         query = query.limit(limit)
-    songs = query.all()
-    processed = matched = updated = 0
-    examples: list[dict[str, Any]] = []
-    try:
-        response = bulk_lookup_spotify_archive_audio_features(
-            current_app, [song.spotify_id for song in songs]
-        )
-    except SpotifyArchiveError as exc:
-        raise AutomationError(str(exc)) from exc
-    matches = {str(item.get("spotify_id") or ""): item for item in response["results"]}
-    for start in range(0, len(songs), batch_size):
-        batch = songs[start:start + batch_size]
-        for song in batch:
-            processed += 1
-            metadata = matches.get(str(song.spotify_id))
-            if not metadata:
-                continue
-            matched += 1
-            changed = _apply_archive_audio_features(song, metadata) if not dry_run else []
-            if changed:
-                updated += 1
-            if len(examples) < 100:
-                examples.append({"song": _song_summary(song), "matched": True, "changed_fields": changed})
-        if not dry_run:
-            db.session.commit()
+    songs = _archive_song_rows(
+        query, ("id", "spotify_id", *_ARCHIVE_AUDIO_FEATURE_FIELDS, "additional_data", "metadata_sources"),
+    )
+    songs_by_spotify_id: dict[str, list[SimpleNamespace]] = {}
+    for song in songs:
+        songs_by_spotify_id.setdefault(str(song.spotify_id), []).append(song)
+    matched, updated, examples = _apply_archive_results(
+        songs_by_spotify_id,
+        pipelined_spotify_archive_lookup(
+            current_app._get_current_object(),
+            list(songs_by_spotify_id),
+            stream_spotify_archive_audio_features,
+            chunk_size=BULK_AUDIO_FEATURE_LOOKUP_LIMIT,
+        ),
+        key=lambda item: str(item.get("spotify_id") or ""),
+        apply=_apply_archive_audio_features,
+        batch_size=batch_size,
+        dry_run=dry_run,
+    )
     return {
         "dry_run": dry_run,
-        "processed_count": processed,
+        "processed_count": len(songs),
         "matched_count": matched,
         "updated_count": updated,
         "examples": examples,
@@ -1056,8 +1173,14 @@ def enrich_songs_from_deezer(
     dry_run: bool = True,
     overwrite: bool = False,
     song_ids: list[int] | None = None,
+    on_item: Callable[[dict[str, Any], int, int], None] | None = None,
 ) -> dict[str, Any]:
-    """Enrich incomplete catalog rows from Deezer without calling paid providers."""
+    """Enrich incomplete catalog rows from Deezer without calling paid providers.
+
+    ``on_item(result, completed, total)`` is called after each song. Changed
+    songs are then committed one at a time, so every reported update is
+    already stored when a job records it.
+    """
     if limit < 1 or limit > 1000:
         raise AutomationError("limit must be between 1 and 1000.")
     query = Song.query.filter(Song.deezer_id.isnot(None))
@@ -1079,6 +1202,8 @@ def enrich_songs_from_deezer(
         if not metadata.get("deezer_id"):
             results.append({"song": _song_summary(song), "status": "not_found", "changed_fields": []})
             skipped_count += 1
+            if on_item is not None:
+                on_item(results[-1], len(results), len(songs))
             continue
         if dry_run:
             changed_fields = _apply_deezer_metadata_preview(song, metadata, overwrite=overwrite)
@@ -1092,6 +1217,10 @@ def enrich_songs_from_deezer(
             "changed_fields": changed_fields,
             "provider": "deezer",
         })
+        if on_item is not None:
+            if changed_fields and not dry_run:
+                db.session.commit()
+            on_item(results[-1], len(results), len(songs))
         if index < len(songs) - 1:
             sleep(DEEZER_ENRICHMENT_REQUEST_DELAY_SECONDS)
     if not dry_run and updated_count:
@@ -1943,6 +2072,158 @@ def datastore_schema() -> dict[str, Any]:
     return {"object_types": [item["object_type"] for item in objects], "objects": objects}
 
 
+DATASTORE_EXPORT_BATCH_SIZE = 1000
+DATASTORE_EXPORT_PAGE_LIMIT = 10000
+
+
+def _datastore_fields(model: type[db.Model], fields: Sequence[str] | None) -> list[str]:
+    """Return the projected column keys; primary key fields are always included."""
+    columns = _column_map(model)
+    if not fields:
+        return list(columns)
+    unknown = [field_name for field_name in fields if field_name not in columns]
+    if unknown:
+        raise AutomationError(f"Unknown field(s): {unknown}")
+    primary_key = [column.key for column in _primary_key_columns(model)]
+    return list(dict.fromkeys([*primary_key, *fields]))
+
+
+def _datastore_order(model: type[db.Model], order_by: str | None) -> list[tuple[Any, bool]]:
+    """Return ``(column, descending)`` pairs ending in the primary key, so every row has a unique position."""
+    columns = _column_map(model)
+    order: list[tuple[Any, bool]] = []
+    if order_by:
+        descending = order_by.startswith("-")
+        field_name = order_by[1:] if descending else order_by
+        if field_name not in columns:
+            raise AutomationError(f"Unknown order_by field '{field_name}'.")
+        order.append((columns[field_name], descending))
+    for column in _primary_key_columns(model):
+        if all(existing is not column for existing, _descending in order):
+            order.append((column, False))
+    return order
+
+
+def _datastore_order_clauses(order: list[tuple[Any, bool]]) -> list[Any]:
+    # NULLs sort as the smallest value on every backend, which the keyset
+    # condition below relies on.
+    clauses = []
+    for column, descending in order:
+        clause = column.desc() if descending else column.asc()
+        if column.nullable:
+            clause = clause.nulls_last() if descending else clause.nulls_first()
+        clauses.append(clause)
+    return clauses
+
+
+def _keyset_after(order: list[tuple[Any, bool]], values: list[Any]) -> Any:
+    """Match rows that sort strictly after ``values`` in ``order``."""
+    clauses = []
+    equal: list[Any] = []
+    for (column, descending), value in zip(order, values):
+        if value is None:
+            after = false() if descending else column.isnot(None)
+            same = column.is_(None)
+        elif descending:
+            after = or_(column < value, column.is_(None))
+            same = column == value
+        else:
+            after = column > value
+            same = column == value
+        clauses.append(and_(*equal, after))
+        equal.append(same)
+    return or_(*clauses)
+
+
+def _encode_datastore_cursor(order_by: str | None, values: list[Any]) -> str:
+    payload = json.dumps({"order_by": order_by or "", "after": [_json_value(value) for value in values]})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_datastore_cursor(cursor: str, order_by: str | None, order: list[tuple[Any, bool]]) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["after"]
+    except (ValueError, TypeError, KeyError):
+        raise AutomationError("cursor is not a valid datastore cursor.") from None
+    if payload.get("order_by") != (order_by or "") or not isinstance(values, list) or len(values) != len(order):
+        raise AutomationError("cursor was issued for a different order_by; restart without a cursor.")
+    return [_coerce_column_value(column, value) for (column, _descending), value in zip(order, values)]
+
+
+def _datastore_select(model: type[db.Model], keys: Sequence[str], extra_columns: Iterable[Any] = ()) -> Any:
+    columns = _column_map(model)
+    selected = {key: columns[key] for key in keys}
+    for column in extra_columns:
+        selected.setdefault(column.key, column)
+    return select(*[column.label(key) for key, column in selected.items()])
+
+
+def _serialize_datastore_row(row: Any, keys: Sequence[str], *, include_sensitive: bool = False) -> dict[str, Any]:
+    mapping = row._mapping
+    return {
+        key: _json_value(mapping[key], sensitive=_is_sensitive_field(key), include_sensitive=include_sensitive)
+        for key in keys
+    }
+
+
+def _iter_datastore_rows(
+    model: type[db.Model],
+    keys: Sequence[str],
+    order: list[tuple[Any, bool]],
+    filters: dict[str, Any] | None,
+    cursor_values: list[Any] | None,
+    limit: int | None,
+    batch_size: int,
+    offset: int = 0,
+) -> Iterator[Any]:
+    """Stream projected rows, plus any hidden order columns, in keyset order."""
+    statement = _apply_datastore_filters(
+        _datastore_select(model, keys, (column for column, _descending in order)), model, filters
+    )
+    if cursor_values is not None:
+        statement = statement.where(_keyset_after(order, cursor_values))
+    statement = statement.order_by(*_datastore_order_clauses(order)).offset(offset or None)
+    if limit is not None:
+        statement = statement.limit(limit)
+    result = db.session.execute(statement.execution_options(yield_per=max(1, batch_size)))
+    try:
+        yield from result
+    finally:
+        result.close()
+
+
+def count_datastore_objects(
+    object_type: str,
+    filters: dict[str, Any] | None = None,
+    group_by: str | None = None,
+    limit: int = 100,
+) -> dict[str, Any]:
+    """Count matching rows in the database, optionally grouped by one column."""
+    if limit < 1 or limit > 1000:
+        raise AutomationError("limit must be between 1 and 1000.")
+    model = _get_model(object_type)
+    statement = _apply_datastore_filters(select(func.count()).select_from(model), model, filters)
+    total = db.session.execute(statement).scalar_one()
+    result: dict[str, Any] = {"object_type": _canonical_model_key(model), "total": total}
+    if group_by:
+        column = _column_map(model).get(group_by)
+        if column is None:
+            raise AutomationError(f"Unknown group_by field '{group_by}'.")
+        grouped = _apply_datastore_filters(
+            select(column.label("value"), func.count().label("count")).select_from(model),
+            model,
+            filters,
+        )
+        rows = db.session.execute(
+            grouped.group_by(column).order_by(func.count().desc(), column).limit(limit)
+        ).all()
+        result["group_by"] = group_by
+        result["groups"] = [{"value": _json_value(row.value), "count": row.count} for row in rows]
+    return result
+
+
 def list_datastore_objects(
     object_type: str,
     filters: dict[str, Any] | None = None,
@@ -1950,37 +2231,111 @@ def list_datastore_objects(
     offset: int = 0,
     order_by: str | None = None,
     include_sensitive: bool = False,
+    fields: list[str] | None = None,
+    cursor: str | None = None,
+    include_total: bool = True,
 ) -> dict[str, Any]:
-    """List persisted rows for a mapped datastore object."""
+    """List persisted rows for a mapped datastore object.
+
+    ``fields`` selects only those columns (plus the primary key) in SQL.
+    ``next_cursor`` continues after the last row by keyset, so deep pages
+    cost the same as the first; ``offset`` is kept for existing callers.
+    """
     if limit < 1 or limit > 500:
         raise AutomationError("limit must be between 1 and 500.")
     if offset < 0:
         raise AutomationError("offset must not be negative.")
+    if cursor and offset:
+        raise AutomationError("Use either offset or cursor, not both.")
 
     model = _get_model(object_type)
-    query = _apply_datastore_filters(model.query, model, filters)
-    total = query.count()
-
-    if order_by:
-        descending = order_by.startswith("-")
-        field_name = order_by[1:] if descending else order_by
-        if field_name not in _column_map(model):
-            raise AutomationError(f"Unknown order_by field '{field_name}'.")
-        column = getattr(model, field_name)
-        query = query.order_by(column.desc() if descending else column.asc())
-    else:
-        primary_key = _primary_key_columns(model)
-        if primary_key:
-            query = query.order_by(*[getattr(model, column.key).asc() for column in primary_key])
-
-    rows = query.offset(offset).limit(limit).all()
+    keys = _datastore_fields(model, fields)
+    order = _datastore_order(model, order_by)
+    cursor_values = _decode_datastore_cursor(cursor, order_by, order) if cursor else None
+    rows = list(_iter_datastore_rows(model, keys, order, filters, cursor_values, limit + 1, limit + 1, offset))
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]._mapping
+        next_cursor = _encode_datastore_cursor(order_by, [last[column.key] for column, _descending in order])
     return {
         "object_type": _canonical_model_key(model),
         "count": len(rows),
-        "total": total,
+        "total": count_datastore_objects(object_type, filters)["total"] if include_total else None,
         "limit": limit,
         "offset": offset,
-        "objects": [_serialize_model(row, include_sensitive=include_sensitive) for row in rows],
+        "fields": keys,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+        "objects": [_serialize_datastore_row(row, keys, include_sensitive=include_sensitive) for row in rows],
+    }
+
+
+def iter_datastore_ndjson(
+    object_type: str,
+    filters: dict[str, Any] | None = None,
+    fields: list[str] | None = None,
+    order_by: str | None = None,
+    include_sensitive: bool = False,
+    cursor: str | None = None,
+    batch_size: int = DATASTORE_EXPORT_BATCH_SIZE,
+) -> Iterator[str]:
+    """Yield matching rows as NDJSON lines from a ``yield_per`` server-side cursor.
+
+    Only ``batch_size`` rows are buffered at a time, so full-table exports run
+    in constant memory. Must be consumed inside an app context.
+    """
+    model = _get_model(object_type)
+    keys = _datastore_fields(model, fields)
+    order = _datastore_order(model, order_by)
+    cursor_values = _decode_datastore_cursor(cursor, order_by, order) if cursor else None
+    for row in _iter_datastore_rows(model, keys, order, filters, cursor_values, None, batch_size):
+        yield json.dumps(
+            _serialize_datastore_row(row, keys, include_sensitive=include_sensitive), default=str
+        ) + "\n"
+
+
+def export_datastore_objects(
+    object_type: str,
+    filters: dict[str, Any] | None = None,
+    fields: list[str] | None = None,
+    order_by: str | None = None,
+    include_sensitive: bool = False,
+    limit: int = 1000,
+    cursor: str | None = None,
+) -> dict[str, Any]:
+    """Return one NDJSON page of matching rows plus a cursor for the next page."""
+    if limit < 1 or limit > DATASTORE_EXPORT_PAGE_LIMIT:
+        raise AutomationError(f"limit must be between 1 and {DATASTORE_EXPORT_PAGE_LIMIT}.")
+    model = _get_model(object_type)
+    keys = _datastore_fields(model, fields)
+    order = _datastore_order(model, order_by)
+    cursor_values = _decode_datastore_cursor(cursor, order_by, order) if cursor else None
+    lines: list[str] = []
+    last = None
+    has_more = False
+    for row in _iter_datastore_rows(
+        model, keys, order, filters, cursor_values, limit + 1, DATASTORE_EXPORT_BATCH_SIZE
+    ):
+        if len(lines) == limit:
+            has_more = True
+            break
+        lines.append(json.dumps(
+            _serialize_datastore_row(row, keys, include_sensitive=include_sensitive), default=str
+        ) + "\n")
+        last = row._mapping
+    next_cursor = None
+    if has_more:
+        next_cursor = _encode_datastore_cursor(order_by, [last[column.key] for column, _descending in order])
+    return {
+        "object_type": _canonical_model_key(model),
+        "format": "ndjson",
+        "fields": keys,
+        "row_count": len(lines),
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+        "ndjson": "".join(lines),
     }
 
 
@@ -1988,13 +2343,31 @@ def get_datastore_object(
     object_type: str,
     object_id: Any,
     include_sensitive: bool = False,
+    fields: list[str] | None = None,
 ) -> dict[str, Any]:
-    """Fetch a single persisted datastore object by primary key."""
+    """Fetch a single persisted datastore object by primary key.
+
+    With ``fields``, only those columns (plus the primary key) are loaded.
+    """
     model = _get_model(object_type)
-    instance = _get_datastore_instance(model, object_id)
+    if not fields:
+        instance = _get_datastore_instance(model, object_id)
+        return {
+            "object_type": _canonical_model_key(model),
+            "object": _serialize_model(instance, include_sensitive=include_sensitive),
+        }
+    keys = _datastore_fields(model, fields)
+    identity = _identity_for_object(model, object_id)
+    primary_key = _primary_key_columns(model)
+    values = identity if isinstance(identity, tuple) else (identity,)
+    row = db.session.execute(
+        _datastore_select(model, keys).where(*[column == value for column, value in zip(primary_key, values)])
+    ).first()
+    if row is None:
+        raise AutomationError(f"{_canonical_model_key(model)} {object_id} was not found.")
     return {
         "object_type": _canonical_model_key(model),
-        "object": _serialize_model(instance, include_sensitive=include_sensitive),
+        "object": _serialize_datastore_row(row, keys, include_sensitive=include_sensitive),
     }
 
 
@@ -4839,8 +5212,12 @@ def generate_round_assets_batch(
     include_pdf: bool = True,
     include_mp3: bool = True,
     force_mp3_regenerate: bool = True,
+    on_item: Callable[[dict[str, Any], int, int], None] | None = None,
 ) -> dict[str, Any]:
-    """Generate requested assets for several rounds without aborting the whole batch."""
+    """Generate requested assets for several rounds without aborting the whole batch.
+
+    ``on_item(result, completed, total)`` is called after each round.
+    """
     normalized_round_ids = _normalize_round_ids(round_ids)
     results: list[dict[str, Any]] = []
     success_count = 0
@@ -4866,18 +5243,19 @@ def generate_round_assets_batch(
                     "details": exc.details,
                 }
             )
-            continue
-
-        success_count += 1
-        results.append(
-            {
-                "round_id": round_id,
-                "ok": True,
-                "status": "generated",
-                "assets": assets,
-                "review_url_path": assets.get("review_url_path"),
-            }
-        )
+        else:
+            success_count += 1
+            results.append(
+                {
+                    "round_id": round_id,
+                    "ok": True,
+                    "status": "generated",
+                    "assets": assets,
+                    "review_url_path": assets.get("review_url_path"),
+                }
+            )
+        if on_item is not None:
+            on_item(results[-1], len(results), len(normalized_round_ids))
 
     return {
         "ok": error_count == 0,
@@ -5616,8 +5994,12 @@ def inspect_round_package_batch(
     min_preview_seconds: float = 20.0,
     max_preview_seconds: float = 35.0,
     duration_tolerance_seconds: float = DEFAULT_MP3_DURATION_TOLERANCE_SECONDS,
+    on_item: Callable[[dict[str, Any], int, int], None] | None = None,
 ) -> dict[str, Any]:
-    """Inspect multiple round packages without aborting on one bad round."""
+    """Inspect multiple round packages without aborting on one bad round.
+
+    ``on_item(result, completed, total)`` is called after each round.
+    """
     normalized_round_ids = _normalize_round_ids(round_ids)
 
     rounds: list[dict[str, Any]] = []
@@ -5650,6 +6032,8 @@ def inspect_round_package_batch(
                     "needs_repair": True,
                 }
             )
+            if on_item is not None:
+                on_item(rounds[-1], len(rounds), len(normalized_round_ids))
             continue
 
         report = quality.get("report") or _round_repair_report(quality)
@@ -5684,6 +6068,8 @@ def inspect_round_package_batch(
                 "summary": report.get("summary"),
             }
         )
+        if on_item is not None:
+            on_item(rounds[-1], len(rounds), len(normalized_round_ids))
 
     status = "ok"
     if error_count:
@@ -5849,8 +6235,12 @@ def round_repair_plan_batch(
     min_preview_seconds: float = 20.0,
     max_preview_seconds: float = 35.0,
     duration_tolerance_seconds: float = DEFAULT_MP3_DURATION_TOLERANCE_SECONDS,
+    on_item: Callable[[dict[str, Any], int, int], None] | None = None,
 ) -> dict[str, Any]:
-    """Build non-mutating repair plans for several rounds in one agent call."""
+    """Build non-mutating repair plans for several rounds in one agent call.
+
+    ``on_item(result, completed, total)`` is called after each round.
+    """
     normalized_round_ids = _normalize_round_ids(round_ids)
     plans: list[dict[str, Any]] = []
     ready_count = 0
@@ -5882,15 +6272,16 @@ def round_repair_plan_batch(
                     "needs_repair": True,
                 }
             )
-            continue
-
-        needs_repair = not bool(plan.get("ok"))
-        if needs_repair:
-            repair_count += 1
         else:
-            ready_count += 1
-        plan["needs_repair"] = needs_repair
-        plans.append(plan)
+            needs_repair = not bool(plan.get("ok"))
+            if needs_repair:
+                repair_count += 1
+            else:
+                ready_count += 1
+            plan["needs_repair"] = needs_repair
+            plans.append(plan)
+        if on_item is not None:
+            on_item(plans[-1], len(plans), len(normalized_round_ids))
 
     status = "ok"
     if error_count:
@@ -6042,6 +6433,22 @@ def import_job_status_metadata(record: ImportJobRecord) -> dict[str, Any]:
     }
 
 
+def _import_queue():
+    return current_app.config.get("IMPORT_QUEUE") or current_app.config.get("import_queue")
+
+
+def import_status_counts(user_id: int | None = None) -> dict[str, int]:
+    """Return import job counts per status from one grouped query."""
+    query = db.session.query(ImportJobRecord.status, func.count(ImportJobRecord.id))
+    if user_id is not None:
+        query = query.filter(ImportJobRecord.user_id == user_id)
+    stats = {status: 0 for status in IMPORT_JOB_STATUSES}
+    for status, count in query.group_by(ImportJobRecord.status).all():
+        if status in stats:
+            stats[status] = int(count or 0)
+    return stats
+
+
 def import_progress_events(
     user_id: int | None = None,
     include_recent: bool = True,
@@ -6051,16 +6458,12 @@ def import_progress_events(
     if limit < 1 or limit > 100:
         raise AutomationError("limit must be between 1 and 100.")
 
-    queue = current_app.config.get("IMPORT_QUEUE")
+    queue = _import_queue()
     query = ImportJobRecord.query
     if user_id is not None:
         query = query.filter_by(user_id=user_id)
 
-    statuses = ("pending", "processing", "completed", "failed", "dead_letter")
-    stats = {
-        status: query.filter_by(status=status).count()
-        for status in statuses
-    }
+    stats = import_status_counts(user_id)
     active_jobs = (
         query.filter(ImportJobRecord.status.in_(("pending", "processing")))
         .order_by(
@@ -6089,11 +6492,132 @@ def import_progress_events(
         "queue_initialized": queue is not None,
         "queue_size": queue.qsize() if queue else None,
         "queue_snapshot": queue.snapshot() if queue else [],
+        "event_sequence": queue.events.latest_sequence if queue else None,
         "stats": stats,
         "active_jobs": [_import_job_summary(record) for record in active_jobs],
         "recent_jobs": [_import_job_summary(record) for record in recent_jobs],
         "hints": [
-            "Poll this tool while imports are active. Dead-letter jobs require manual review."
+            "Prefer watch_import_progress or /import/queue-events while imports are active; "
+            "dead-letter jobs require manual review."
+        ],
+    }
+
+
+def import_progress_stream(
+    user_id: int | None = None,
+    since_sequence: int | None = None,
+    max_seconds: float | None = None,
+    heartbeat_seconds: float | None = None,
+    resync_seconds: float | None = None,
+) -> Iterable[dict[str, Any]]:
+    """Yield import progress frames as workers publish job transitions.
+
+    The first frame is a ``snapshot`` with grouped status counts. Later
+    ``job`` frames carry one transition each and the counters are moved in
+    memory, so the job table is not polled while imports run. A ``stats``
+    frame is emitted when the periodic resync notices changes made by
+    workers in other processes, and ``heartbeat`` frames keep idle
+    connections alive. Must be consumed inside an app context.
+    """
+    config = current_app.config
+    if max_seconds is None:
+        max_seconds = float(config.get("IMPORT_EVENT_STREAM_MAX_SECONDS", 60))
+    if heartbeat_seconds is None:
+        heartbeat_seconds = float(config.get("IMPORT_EVENT_STREAM_HEARTBEAT_SECONDS", 15))
+    if resync_seconds is None:
+        resync_seconds = float(config.get("IMPORT_EVENT_STREAM_RESYNC_SECONDS", 60))
+    heartbeat_seconds = max(0.5, heartbeat_seconds)
+
+    queue = _import_queue()
+    bus = queue.events if queue else None
+    stats = import_status_counts(user_id)
+    db.session.remove()
+
+    sequence = bus.latest_sequence if bus else 0
+    replay: list[dict[str, Any]] = []
+    if bus and since_sequence is not None and since_sequence < sequence:
+        replay = bus.events_since(since_sequence)
+    yield {"event": "snapshot", "sequence": sequence, "data": {"stats": dict(stats)}}
+
+    def _job_frame(event: dict[str, Any]) -> dict[str, Any]:
+        return {"event": "job", "sequence": event["sequence"], "data": {"job": event, "stats": dict(stats)}}
+
+    for event in replay:
+        if user_id is None or event.get("user_id") == user_id:
+            yield _job_frame(event)
+
+    started = monotonic()
+    last_resync = started
+    while True:
+        elapsed = monotonic() - started
+        if elapsed >= max_seconds:
+            return
+        wait_seconds = min(heartbeat_seconds, max_seconds - elapsed)
+        if resync_seconds > 0:
+            wait_seconds = min(wait_seconds, max(0.0, last_resync + resync_seconds - monotonic()))
+        events = bus.wait_for_events(sequence, wait_seconds) if bus else []
+        if not bus and wait_seconds > 0:
+            sleep(wait_seconds)
+
+        for event in events:
+            sequence = max(sequence, event["sequence"])
+            if user_id is not None and event.get("user_id") != user_id:
+                continue
+            apply_import_event_to_stats(stats, event)
+            yield _job_frame(event)
+
+        if resync_seconds > 0 and monotonic() - last_resync >= resync_seconds:
+            last_resync = monotonic()
+            fresh_stats = import_status_counts(user_id)
+            db.session.remove()
+            if fresh_stats != stats:
+                stats = fresh_stats
+                yield {"event": "stats", "sequence": sequence, "data": {"stats": dict(stats)}}
+                continue
+
+        if not events:
+            yield {"event": "heartbeat", "sequence": sequence, "data": {}}
+
+
+def watch_import_progress(
+    user_id: int | None = None,
+    since_sequence: int | None = None,
+    timeout_seconds: float = 30.0,
+    on_event: Any = None,
+) -> dict[str, Any]:
+    """Collect pushed import transitions for up to ``timeout_seconds``.
+
+    ``on_event`` is called with every non-heartbeat frame as it arrives so
+    MCP transports can forward them as notifications. The returned
+    ``next_sequence`` resumes the watch without missing buffered events.
+    """
+    if timeout_seconds < 0 or timeout_seconds > 300:
+        raise AutomationError("timeout_seconds must be between 0 and 300.")
+
+    stats: dict[str, int] = {}
+    events: list[dict[str, Any]] = []
+    sequence = since_sequence or 0
+    for frame in import_progress_stream(
+        user_id=user_id,
+        since_sequence=since_sequence,
+        max_seconds=timeout_seconds,
+    ):
+        sequence = max(sequence, frame["sequence"])
+        if frame["event"] == "heartbeat":
+            continue
+        stats = frame["data"].get("stats", stats)
+        if frame["event"] == "job":
+            events.append(frame["data"]["job"])
+        if on_event is not None:
+            on_event(frame)
+
+    return {
+        "ok": True,
+        "stats": stats,
+        "events": events,
+        "next_sequence": sequence,
+        "hints": [
+            "Call again with since_sequence=next_sequence to keep watching without polling."
         ],
     }
 
@@ -6108,6 +6632,7 @@ def retry_import_job(job_id: int, reset_attempts: bool = False) -> dict[str, Any
             f"Import job {job_id} is {record.status}; only failed or dead_letter jobs can retry."
         )
 
+    previous_status = record.status
     record.status = "pending"
     record.started_at = None
     record.completed_at = None
@@ -6116,9 +6641,10 @@ def retry_import_job(job_id: int, reset_attempts: bool = False) -> dict[str, Any
         record.attempt_count = 0
     db.session.commit()
 
-    queue = current_app.config.get("IMPORT_QUEUE") or current_app.config.get("import_queue")
+    queue = _import_queue()
     enqueued = False
     if queue:
+        queue.events.publish(record, previous_status=previous_status)
         queue.enqueue_record(record)
         enqueued = True
 
@@ -8057,62 +8583,158 @@ def cancel_scheduled_round_email(
     return {"cancelled": True, "export": _round_export_summary(export)}
 
 
-def process_due_scheduled_round_emails(
-    now: str | datetime | None = None,
-    limit: int = 10,
-) -> dict[str, Any]:
-    """Send scheduled round emails that are due and still pending."""
-    if limit < 1 or limit > 100:
-        raise AutomationError("limit must be between 1 and 100.")
+def _claim_due_scheduled_round_emails(now_utc: datetime, limit: int) -> list[int]:
+    """Move up to ``limit`` due scheduled email exports to processing; return their ids.
 
-    now_utc = _parse_datetime_utc(now) if now is not None else datetime.utcnow()
-    due_exports = (
-        RoundExport.query.filter_by(export_type="email", status="scheduled")
-        .filter(RoundExport.scheduled_for.isnot(None))
-        .filter(RoundExport.scheduled_for <= now_utc)
-        .order_by(RoundExport.scheduled_for.asc(), RoundExport.id.asc())
-        .limit(limit)
-        .all()
+    The claim is a conditional UPDATE on ``status``, so two schedulers running
+    at the same time never pick up the same export. A claimed export records
+    the claim time in ``processed_at``; one that is still processing after
+    ``SCHEDULED_EMAIL_CLAIM_TIMEOUT_SECONDS`` belonged to a scheduler that
+    died mid-batch and is claimed again.
+    """
+    table = RoundExport.__table__
+    claimed_at = datetime.utcnow()
+    timeout = int(current_app.config.get("SCHEDULED_EMAIL_CLAIM_TIMEOUT_SECONDS", 1800))
+    # Exports claimed before claims were timestamped only have their creation time.
+    claim_started = func.coalesce(table.c.processed_at, table.c.timestamp)
+    claimable = or_(
+        table.c.status == "scheduled",
+        and_(
+            table.c.status == "processing",
+            claim_started < claimed_at - timedelta(seconds=timeout),
+        ),
     )
+    candidate_ids = [
+        export_id
+        for (export_id,) in (
+            db.session.query(RoundExport.id)
+            .filter(RoundExport.export_type == "email", claimable)
+            .filter(RoundExport.scheduled_for.isnot(None))
+            .filter(RoundExport.scheduled_for <= now_utc)
+            .order_by(RoundExport.scheduled_for.asc(), RoundExport.id.asc())
+            .limit(limit)
+        )
+    ]
+    if not candidate_ids:
+        return []
+    claim = table.update().where(claimable).values(status="processing", processed_at=claimed_at)
+    if db.engine.dialect.update_returning:
+        claimed = set(
+            db.session.execute(
+                claim.where(table.c.id.in_(candidate_ids)).returning(table.c.id)
+            ).scalars()
+        )
+    else:
+        claimed = {
+            export_id
+            for export_id in candidate_ids
+            if db.session.execute(claim.where(table.c.id == export_id)).rowcount
+        }
+    claimed_ids = [export_id for export_id in candidate_ids if export_id in claimed]
+    db.session.commit()
+    return claimed_ids
 
-    results = []
-    for export in due_exports:
-        export.status = "processing"
-        db.session.commit()
+
+def _deliver_scheduled_round_email(
+    app: Any,
+    job: dict[str, Any],
+    smtp_pool: SMTPConnectionPool,
+) -> dict[str, Any]:
+    """Send one claimed export on a worker thread and report the outcome."""
+    with app.app_context():
         try:
             delivery = email_round(
-                export.round_id,
-                recipient=export.destination,
-                user_id=export.user_id,
-                subject=export.subject,
-                body_text=export.body_text,
+                job["round_id"],
+                recipient=job["destination"],
+                user_id=job["user_id"],
+                subject=job["subject"],
+                body_text=job["body_text"],
                 record_export=False,
+                smtp_pool=smtp_pool,
             )
-            export.status = "success"
-            export.processed_at = datetime.utcnow()
-            export.error_message = delivery.get("message")
-            db.session.commit()
-            results.append({"export": _round_export_summary(export), "delivery": delivery})
+            return {"id": job["id"], "delivery": delivery}
         except Exception as exc:
-            export.status = "failed"
-            export.processed_at = datetime.utcnow()
-            safe_error_message = _scheduled_email_error_message(exc)
+            db.session.rollback()
             current_app.logger.error(
                 "Scheduled round email export %s failed: %s",
-                export.id,
+                job["id"],
                 exc,
                 exc_info=True,
             )
-            export.error_message = safe_error_message
-            db.session.commit()
-            details = getattr(exc, "details", None)
-            results.append(
-                {
-                    "export": _round_export_summary(export),
-                    "error": safe_error_message,
-                    "details": details,
-                }
-            )
+            return {
+                "id": job["id"],
+                "error": _scheduled_email_error_message(exc),
+                "details": getattr(exc, "details", None),
+            }
+
+
+def process_due_scheduled_round_emails(
+    now: str | datetime | None = None,
+    limit: int = 10,
+) -> dict[str, Any]:
+    """Send scheduled round emails that are due and still pending.
+
+    Due exports are claimed in one statement and sent concurrently on
+    ``SCHEDULED_EMAIL_WORKERS`` threads over pooled SMTP connections. Each
+    export's final status is committed as soon as its delivery finishes.
+    """
+    if limit < 1 or limit > 100:
+        raise AutomationError("limit must be between 1 and 100.")
+
+    now_utc = _parse_datetime_utc(now) if now is not None else datetime.utcnow()
+    claimed_ids = _claim_due_scheduled_round_emails(now_utc, limit)
+    if not claimed_ids:
+        return {"processed_count": 0, "now": _datetime_payload(now_utc), "results": []}
+
+    exports = (
+        RoundExport.query.filter(RoundExport.id.in_(claimed_ids))
+        .order_by(RoundExport.scheduled_for.asc(), RoundExport.id.asc())
+        .all()
+    )
+    jobs = [
+        {
+            "id": export.id,
+            "round_id": export.round_id,
+            "destination": export.destination,
+            "user_id": export.user_id,
+            "subject": export.subject,
+            "body_text": export.body_text,
+        }
+        for export in exports
+    ]
+    workers = max(1, min(int(current_app.config.get("SCHEDULED_EMAIL_WORKERS", 4)), len(jobs)))
+    app = current_app._get_current_object()
+    smtp_pool = SMTPConnectionPool(size=workers)
+    exports_by_id = {export.id: export for export in exports}
+    results_by_id: dict[int, dict[str, Any]] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scheduled-email") as executor:
+            futures = [
+                executor.submit(_deliver_scheduled_round_email, app, job, smtp_pool) for job in jobs
+            ]
+            # Each outcome is committed as soon as it arrives, so a crash later
+            # in the batch cannot leave an email that was sent marked processing.
+            for future in as_completed(futures):
+                outcome = future.result()
+                export = exports_by_id[outcome["id"]]
+                export.processed_at = datetime.utcnow()
+                if "delivery" in outcome:
+                    export.status = "success"
+                    export.error_message = outcome["delivery"].get("message")
+                    result = {"export": _round_export_summary(export), "delivery": outcome["delivery"]}
+                else:
+                    export.status = "failed"
+                    export.error_message = outcome["error"]
+                    result = {
+                        "export": _round_export_summary(export),
+                        "error": outcome["error"],
+                        "details": outcome["details"],
+                    }
+                db.session.commit()
+                results_by_id[export.id] = result
+    finally:
+        smtp_pool.close()
+    results = [results_by_id[export.id] for export in exports]
 
     return {
         "processed_count": len(results),
@@ -8130,6 +8752,7 @@ def email_round(
     record_export: bool = True,
     admin_override_user_id: int | None = None,
     review_override_reason: str | None = None,
+    smtp_pool: SMTPConnectionPool | None = None,
 ) -> dict[str, Any]:
     """Generate assets and send a round as an email attachment bundle."""
     user = _find_user(user_id)
@@ -8184,25 +8807,25 @@ def email_round(
     email_subject = subject or title
     email_body = body_text or "Attached are the MP3 and PDF files for your quiz round."
 
-    attachments = []
-    with open(assets["pdf"]["path"], "rb") as pdf_file:
-        attachments.append(
+    # Attachments are passed as open streams from the artifact store, which
+    # may be S3, and encoded block by block.
+    store = round_artifact_store()
+    with ExitStack() as files:
+        attachments = [
             {
-                "data": pdf_file.read(),
+                "data": files.enter_context(store.open_read("pdf", round_id)),
                 "filename": f"round_{round_id}.pdf",
                 "mimetype": "application/pdf",
-            }
-        )
-    with open(assets["mp3"]["path"], "rb") as mp3_file:
-        attachments.append(
+            },
             {
-                "data": mp3_file.read(),
+                "data": files.enter_context(store.open_read("mp3", round_id)),
                 "filename": f"round_{round_id}.mp3",
                 "mimetype": "audio/mpeg",
-            }
+            },
+        ]
+        success, message = send_email(
+            target, email_subject, email_body, attachments, smtp_pool=smtp_pool
         )
-
-    success, message = send_email(target, email_subject, email_body, attachments)
     if record_export:
         export = RoundExport(
             round_id=round_id,
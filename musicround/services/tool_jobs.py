@@ -0,0 +1,367 @@
+"""Resumable job handles for long-running MCP tools.
+
+The round batch tools and the catalog backfills only return once every item
+is done, and clients often time out long before a large batch finishes.
+:func:`start_tool_job` runs one of them in the background instead and stores
+every finished item as a ``ToolJobItem`` row as soon as the tool reports it.
+Callers can then read partial or final results by job id from any process or
+session (:func:`tool_job_status`), wait for new items (:func:`wait_for_tool_job`),
+and restart a job that was interrupted (:func:`resume_tool_job`). Rounds or
+songs that were already recorded are skipped on restart; backfills that report
+progress in batches run again and leave already updated songs unchanged.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Any, Callable
+
+from flask import current_app
+from sqlalchemy import update
+
+from musicround import db
+from musicround.helpers.query_profiler import profile_scope
+from musicround.helpers.runtime_profiler import capture_profile
+from musicround.models import ToolJob, ToolJobItem
+from musicround.services import automation
+from musicround.services.automation import AutomationError
+
+# Job-capable tools and the argument whose values they report one item each.
+# The archive backfill reports result batches rather than songs, so a resumed
+# run cannot tell which of its ``song_ids`` finished and runs them all again.
+JOB_TOOLS = {
+    "generate_round_assets_batch": "round_ids",
+    "inspect_round_package_batch": "round_ids",
+    "round_repair_plan_batch": "round_ids",
+    "backfill_songs_from_spotify_archive": None,
+    "enrich_songs_from_deezer": "song_ids",
+}
+DEFAULT_STALE_SECONDS = 900
+POLL_SECONDS = 1.0
+
+_WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+_ACTIVE_JOBS: set[str] = set()
+_CHANGED = threading.Condition()
+
+
+def _notify_changed() -> None:
+    with _CHANGED:
+        _CHANGED.notify_all()
+
+
+def _item_key(item: dict[str, Any]) -> str | None:
+    if item.get("round_id") is not None:
+        return str(item["round_id"])
+    song = item.get("song")
+    if isinstance(song, dict) and song.get("id") is not None:
+        return str(song["id"])
+    if item.get("batch") is not None:
+        return f"batch-{item['batch']}"
+    return None
+
+
+def _job_status(job: ToolJob) -> str:
+    """Report ``interrupted`` for running jobs whose worker is gone."""
+    if job.status != "running" or job.id in _ACTIVE_JOBS:
+        return job.status
+    if job.worker_id == _WORKER_ID:
+        return "interrupted"
+    stale_seconds = current_app.config.get("TOOL_JOB_STALE_SECONDS", DEFAULT_STALE_SECONDS)
+    if datetime.utcnow() - job.updated_at > timedelta(seconds=stale_seconds):
+        return "interrupted"
+    return "running"
+
+
+def _tool_job_summary(job: ToolJob) -> dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "tool": job.tool,
+        "status": _job_status(job),
+        "arguments": json.loads(job.arguments or "{}"),
+        "total_items": job.total_items,
+        "completed_items": job.completed_items,
+        "item_count": job.item_sequence,
+        "resume_count": job.resume_count,
+        "error": job.error_message,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+    }
+
+
+def _get_job(job_id: str) -> ToolJob:
+    # Workers commit from their own sessions; always read the current row.
+    job = db.session.get(ToolJob, job_id, populate_existing=True)
+    if job is None:
+        raise AutomationError(f"Tool job {job_id} was not found.")
+    return job
+
+
+def _record_item(job_id: str, item: dict[str, Any], completed: int, total: int) -> None:
+    job = _get_job(job_id)
+    job.item_sequence += 1
+    job.completed_items = completed
+    job.total_items = total
+    job.updated_at = datetime.utcnow()
+    db.session.add(ToolJobItem(
+        job_id=job_id,
+        sequence=job.item_sequence,
+        item_key=_item_key(item),
+        payload=json.dumps(item, default=str),
+    ))
+    db.session.commit()
+    _notify_changed()
+
+
+def _finish_job(job_id: str, result: dict[str, Any] | None, error: str | None) -> None:
+    job = _get_job(job_id)
+    job.status = "failed" if error else "completed"
+    job.error_message = error
+    job.result = json.dumps(result, default=str) if result is not None else None
+    job.updated_at = job.completed_at = datetime.utcnow()
+    db.session.commit()
+
+
+def _run_job(app, job_id: str, tool: str, arguments: dict[str, Any], completed_offset: int = 0) -> None:
+    """Run the job body; ``completed_offset`` items finished before a resume."""
+    with app.app_context():
+        try:
+            with profile_scope("job", tool, app), capture_profile("job", tool, app):
+                result = getattr(automation, tool)(
+                    **arguments,
+                    on_item=lambda item, completed, total: _record_item(
+                        job_id, item, completed_offset + completed, completed_offset + total
+                    ),
+                )
+        except Exception as exc:
+            db.session.rollback()
+            current_app.logger.warning("Tool job %s (%s) failed: %s", job_id, tool, exc)
+            _finish_job(job_id, None, str(exc) or type(exc).__name__)
+        else:
+            _finish_job(job_id, result, None)
+        finally:
+            _ACTIVE_JOBS.discard(job_id)
+            db.session.remove()
+            _notify_changed()
+
+
+def _start_thread(func: Callable[..., Any], *args: Any) -> None:
+    threading.Thread(target=func, args=args, name="tool-job", daemon=True).start()
+
+
+def _launch(
+    job: ToolJob,
+    arguments: dict[str, Any],
+    submit: Callable[..., Any] | None,
+    completed_offset: int = 0,
+) -> None:
+    """Schedule a job that the caller already marked active and committed."""
+    app = current_app._get_current_object()
+    try:
+        (submit or _start_thread)(_run_job, app, job.id, job.tool, arguments, completed_offset)
+    except Exception as exc:
+        _ACTIVE_JOBS.discard(job.id)
+        _finish_job(job.id, None, str(exc))
+        raise
+
+
+def start_tool_job(
+    tool: str,
+    arguments: dict[str, Any] | None = None,
+    submit: Callable[..., Any] | None = None,
+) -> dict[str, Any]:
+    """Start ``tool`` in the background and return its job summary.
+
+    ``submit(func, *args)`` schedules the job body; by default it runs on a
+    daemon thread.
+    """
+    if tool not in JOB_TOOLS:
+        raise AutomationError(
+            f"{tool} cannot run as a job.", {"job_tools": sorted(JOB_TOOLS)}
+        )
+    arguments = dict(arguments or {})
+    if "on_item" in arguments:
+        raise AutomationError("on_item cannot be passed as a tool argument.")
+    job = ToolJob(
+        id=uuid.uuid4().hex,
+        tool=tool,
+        arguments=json.dumps(arguments),
+        status="running",
+        worker_id=_WORKER_ID,
+    )
+    db.session.add(job)
+    _ACTIVE_JOBS.add(job.id)
+    db.session.commit()
+    _launch(job, arguments, submit)
+    return _tool_job_summary(job)
+
+
+def tool_job_status(job_id: str, since_sequence: int = 0, item_limit: int = 100) -> dict[str, Any]:
+    """Return a job's state, items after ``since_sequence``, and its final result."""
+    if item_limit < 1 or item_limit > 1000:
+        raise AutomationError("item_limit must be between 1 and 1000.")
+    job = _get_job(job_id)
+    items = (
+        ToolJobItem.query
+        .filter(ToolJobItem.job_id == job_id, ToolJobItem.sequence > since_sequence)
+        .order_by(ToolJobItem.sequence.asc())
+        .limit(item_limit)
+        .all()
+    )
+    summary = _tool_job_summary(job)
+    finished = summary["status"] in ("completed", "failed")
+    next_sequence = items[-1].sequence if items else max(since_sequence, 0)
+    hints = []
+    if next_sequence < job.item_sequence:
+        hints.append("More items are stored; call again with since_sequence=next_sequence.")
+    if summary["status"] == "running":
+        hints.append("Call get_tool_job with wait_seconds to receive progress as items finish.")
+    elif summary["status"] in ("interrupted", "failed") and JOB_TOOLS[job.tool]:
+        hints.append("Call resume_tool_job to finish only the items that are still missing.")
+    elif summary["status"] in ("interrupted", "failed"):
+        hints.append("Call resume_tool_job to run the backfill again; songs it already updated stay unchanged.")
+    return {
+        "ok": summary["status"] != "failed",
+        "job": summary,
+        "items": [
+            {"sequence": item.sequence, "key": item.item_key, "item": json.loads(item.payload)}
+            for item in items
+        ],
+        "next_sequence": next_sequence,
+        "finished": finished,
+        "result": json.loads(job.result) if finished and job.result else None,
+        "hints": hints,
+    }
+
+
+def wait_for_tool_job(
+    job_id: str,
+    since_sequence: int = 0,
+    timeout_seconds: float = 0.0,
+    item_limit: int = 100,
+    on_item: Callable[[dict[str, Any], dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Wait up to ``timeout_seconds`` for a job to finish, reporting items as they land.
+
+    ``on_item(item, job_summary)`` is called once for every new item so MCP
+    transports can forward progress notifications. Jobs running in another
+    process are picked up by polling the item table.
+    """
+    if timeout_seconds < 0 or timeout_seconds > 300:
+        raise AutomationError("timeout_seconds must be between 0 and 300.")
+    deadline = monotonic() + timeout_seconds
+    seen = max(since_sequence, 0)
+    while True:
+        status = tool_job_status(job_id, seen, 1000)
+        for item in status["items"]:
+            if on_item is not None:
+                on_item(item, status["job"])
+            seen = item["sequence"]
+        # End the read transaction so the next poll sees new commits.
+        db.session.remove()
+        remaining = deadline - monotonic()
+        if status["job"]["status"] != "running" or remaining <= 0:
+            break
+        if seen < status["job"]["item_count"]:
+            continue
+        with _CHANGED:
+            _CHANGED.wait(min(POLL_SECONDS, remaining))
+    return tool_job_status(job_id, since_sequence, item_limit)
+
+
+def resume_tool_job(job_id: str, submit: Callable[..., Any] | None = None) -> dict[str, Any]:
+    """Restart a failed or interrupted job with only its unfinished items.
+
+    Round batches and Deezer enrichment runs with ``song_ids`` skip every
+    recorded item, and their progress counts carry on from the items already
+    recorded. Catalog-wide backfills and the archive backfill, which reports
+    result batches rather than songs, run again with their original
+    arguments; rows they already updated are stored, and a second pass leaves
+    them unchanged.
+
+    The job is claimed with a conditional update, so when several callers
+    resume the same job at once only one of them launches it.
+    """
+    job = _get_job(job_id)
+    status = _job_status(job)
+    if status not in ("failed", "interrupted"):
+        raise AutomationError(
+            f"Tool job {job_id} is {status}; only failed or interrupted jobs can resume."
+        )
+    arguments = json.loads(job.arguments or "{}")
+    id_argument = JOB_TOOLS[job.tool]
+    explicit_items = id_argument is not None and bool(arguments.get(id_argument))
+    completed_offset = 0
+    if explicit_items:
+        done = {
+            key for (key,) in db.session.query(ToolJobItem.item_key).filter(ToolJobItem.job_id == job_id)
+        }
+        requested = arguments[id_argument]
+        arguments[id_argument] = [value for value in requested if str(value) not in done]
+        completed_offset = len(requested) - len(arguments[id_argument])
+    finished = explicit_items and not arguments[id_argument]
+    now = datetime.utcnow()
+    values: dict[str, Any] = {
+        "resume_count": ToolJob.resume_count + 1,
+        "worker_id": _WORKER_ID,
+        "error_message": None,
+        "updated_at": now,
+    }
+    if finished:
+        values.update(
+            status="completed",
+            completed_at=now,
+            result=json.dumps({
+                "ok": True,
+                "status": "completed",
+                "hints": ["Every item finished before the interruption; read them with get_tool_job."],
+            }),
+        )
+    else:
+        values.update(status="running", result=None, completed_at=None)
+    # Only the caller whose update still finds the row as it was read above
+    # owns the resume; anyone racing it sees rowcount 0.
+    claim = (
+        update(ToolJob)
+        .where(
+            ToolJob.id == job_id,
+            ToolJob.status == job.status,
+            ToolJob.resume_count == job.resume_count,
+            ToolJob.updated_at == job.updated_at,
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if db.session.execute(claim).rowcount != 1:
+        db.session.rollback()
+        raise AutomationError(
+            f"Tool job {job_id} changed while it was being resumed; read it again with get_tool_job."
+        )
+    if not finished:
+        _ACTIVE_JOBS.add(job_id)
+    db.session.commit()
+    job = _get_job(job_id)
+    if not finished:
+        _launch(job, arguments, submit, completed_offset)
+    return _tool_job_summary(job)
+
+
+def list_tool_jobs(tool: str | None = None, status: str | None = None, limit: int = 20) -> dict[str, Any]:
+    """Return recent tool jobs, newest first."""
+    if limit < 1 or limit > 100:
+        raise AutomationError("limit must be between 1 and 100.")
+    query = ToolJob.query
+    if tool:
+        query = query.filter(ToolJob.tool == tool)
+    if status:
+        # Interrupted jobs are stored as running; see _job_status.
+        query = query.filter(ToolJob.status == ("running" if status == "interrupted" else status))
+    jobs = [_tool_job_summary(job) for job in query.order_by(ToolJob.created_at.desc()).limit(limit)]
+    if status:
+        jobs = [job for job in jobs if job["status"] == status]
+    return {"ok": True, "jobs": jobs, "job_tools": sorted(JOB_TOOLS)}
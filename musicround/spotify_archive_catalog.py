@@ -2,24 +2,42 @@
 
 The service opens SQLite from disk with a bounded page cache. It never copies
 the catalog into Python memory and never serves audio or preview bytes.
+Connections are pooled per database file so the page cache and compiled
+statements stay warm between requests.
 """
 
 from __future__ import annotations
 
+import argparse
+import json
 import os
+import re
 import sqlite3
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 
 
 DEFAULT_DB_PATH = "/archive/spotify_clean.sqlite3"
 DEFAULT_AUDIO_FEATURES_DB_PATH = "/archive/spotify_clean_audio_features.sqlite3"
+DEFAULT_SEARCH_INDEX_PATH = "/archive/spotify_clean_search.sqlite3"
+SEARCH_INDEX_FORMAT = 1
+SEARCH_INDEX_BATCH_SIZE = 50_000
 DEFAULT_MIN_POPULARITY = 20
 DEFAULT_QUERY_TIMEOUT_SECONDS = 2.0
+DEFAULT_POOL_SIZE = 8
+DEFAULT_POOL_TIMEOUT_SECONDS = 30.0
+# Per connection: 8 pooled connections use up to 64 MiB of page cache.
+DEFAULT_CACHE_SIZE_KIB = 8192
+DEFAULT_MMAP_SIZE = 0
+DEFAULT_CACHED_STATEMENTS = 256
 SNAPSHOT = "spotify_archive_2025_07"
+NDJSON_MIMETYPE = "application/x-ndjson"
+_IDENTIFIER = re.compile(r"[A-Za-z0-9_]+")
 
 
 def _int_env(name: str, default: int) -> int:
@@ -29,20 +47,242 @@ def _int_env(name: str, default: int) -> int:
         return default
 
 
-def _connection(database_path: str, *, allow_temp_writes: bool = False) -> sqlite3.Connection:
+def _bool_env(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off", "")
+
+
+def _set_pragma(connection: sqlite3.Connection, name: str, value: int) -> None:
+    """Set an integer PRAGMA; PRAGMA values cannot be bound as parameters."""
+    if not isinstance(value, int) or not _IDENTIFIER.fullmatch(name):
+        raise ValueError(f"Invalid PRAGMA {name}={value!r}.")
+    statement = f"PRAGMA {name}={value}"
+    connection.execute(statement)
+
+
+def _connection(
+    database_path: str,
+    *,
+    allow_temp_writes: bool = False,
+    cache_size_kib: int = 8192,
+    mmap_size: int = 0,
+    shared_cache: bool = False,
+    cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+) -> sqlite3.Connection:
     """Open the archive as immutable, disk-backed SQLite with bounded memory use."""
     uri = f"file:{Path(database_path).resolve()}?mode=ro&immutable=1"
-    connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    if shared_cache:
+        uri += "&cache=shared"
+    connection = sqlite3.connect(
+        uri,
+        uri=True,
+        check_same_thread=False,
+        cached_statements=cached_statements,
+    )
     connection.row_factory = sqlite3.Row
     if not allow_temp_writes:
         connection.execute("PRAGMA query_only=ON")
     connection.execute("PRAGMA trusted_schema=OFF")
-    connection.execute("PRAGMA mmap_size=0")
-    connection.execute("PRAGMA cache_size=-8192")
+    _set_pragma(connection, "mmap_size", max(0, int(mmap_size)))
+    _set_pragma(connection, "cache_size", -max(1, int(cache_size_kib)))
     connection.execute("PRAGMA temp_store=FILE")
     return connection
 
 
+class ArchivePoolTimeout(RuntimeError):
+    """Raised when every pooled archive connection stays busy past the timeout."""
+
+
+class ArchiveConnectionPool:
+    """Bounded pool of read-only archive connections with thread affinity.
+
+    A thread gets back the connection it used last when that one is idle, so
+    its statement cache stays hot. ``shared_cache`` makes every connection
+    read through one SQLite shared cache instead of its own page cache; it is
+    off by default because shared-cache mode serializes b-tree access across
+    connections, which undoes the pool's concurrency. The archive is opened
+    ``immutable``, so a replaced or re-downloaded file is detected by its
+    stat identity and every connection from the old file is recycled.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        *,
+        max_connections: int = DEFAULT_POOL_SIZE,
+        timeout_seconds: float = DEFAULT_POOL_TIMEOUT_SECONDS,
+        cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        shared_cache: bool = False,
+        cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+    ) -> None:
+        self.database_path = database_path
+        self.max_connections = max(1, int(max_connections))
+        self.timeout_seconds = max(0.0, float(timeout_seconds))
+        self.cache_size_kib = max(1, int(cache_size_kib))
+        self.mmap_size = max(0, int(mmap_size))
+        self.shared_cache = shared_cache
+        self.cached_statements = max(0, int(cached_statements))
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._idle: list[sqlite3.Connection] = []
+        self._generations: dict[int, int] = {}
+        self._generation = 0
+        self._file_identity: tuple[int, int, int, int] | None = None
+        self._counters = {
+            "created": 0,
+            "reused": 0,
+            "thread_affinity_hits": 0,
+            "recycled": 0,
+            "waits": 0,
+            "timeouts": 0,
+        }
+
+    def _current_file_identity(self) -> tuple[int, int, int, int] | None:
+        try:
+            stat = os.stat(self.database_path)
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _close(self, connection: sqlite3.Connection) -> None:
+        self._generations.pop(id(connection), None)
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass
+
+    def _refresh_generation(self) -> None:
+        """Drop idle connections when the archive file was swapped on disk."""
+        identity = self._current_file_identity()
+        if identity == self._file_identity:
+            return
+        if self._file_identity is not None:
+            self._generation += 1
+            for connection in self._idle:
+                self._close(connection)
+                self._counters["recycled"] += 1
+            self._idle.clear()
+        self._file_identity = identity
+
+    def _take_idle(self) -> sqlite3.Connection | None:
+        preferred = getattr(self._local, "connection", None)
+        if preferred is not None and preferred in self._idle:
+            self._idle.remove(preferred)
+            self._counters["thread_affinity_hits"] += 1
+            return preferred
+        if self._idle:
+            return self._idle.pop()
+        return None
+
+    def _acquire(self) -> sqlite3.Connection:
+        deadline = time.monotonic() + self.timeout_seconds
+        with self._condition:
+            self._refresh_generation()
+            waited = False
+            while True:
+                connection = self._take_idle()
+                if connection is not None:
+                    self._counters["reused"] += 1
+                    break
+                if len(self._generations) < self.max_connections:
+                    connection = _connection(
+                        self.database_path,
+                        allow_temp_writes=True,
+                        cache_size_kib=self.cache_size_kib,
+                        mmap_size=self.mmap_size,
+                        shared_cache=self.shared_cache,
+                        cached_statements=self.cached_statements,
+                    )
+                    self._generations[id(connection)] = self._generation
+                    self._counters["created"] += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise ArchivePoolTimeout("All archive connections are busy; retry shortly.")
+                if not waited:
+                    self._counters["waits"] += 1
+                    waited = True
+                self._condition.wait(remaining)
+        self._local.connection = connection
+        return connection
+
+    def _release(self, connection: sqlite3.Connection, *, healthy: bool) -> None:
+        with self._condition:
+            stale = self._generations.get(id(connection)) != self._generation
+            if not healthy or stale:
+                self._close(connection)
+                if stale:
+                    self._counters["recycled"] += 1
+            else:
+                self._idle.append(connection)
+            self._condition.notify()
+
+    @staticmethod
+    def _reset_session(connection: sqlite3.Connection) -> None:
+        """Drop per-request temp tables so a reused connection starts clean."""
+        if connection.in_transaction:
+            connection.rollback()
+        temp_tables = connection.execute(
+            "SELECT name FROM sqlite_temp_master WHERE type = 'table'"
+        ).fetchall()
+        for (table_name,) in temp_tables:
+            # Identifiers cannot be bound; only names the lookups create are dropped.
+            if not _IDENTIFIER.fullmatch(table_name):
+                raise sqlite3.DatabaseError(f"Unexpected temp table {table_name!r} on archive connection.")
+            statement = f"DROP TABLE IF EXISTS temp.{table_name}"
+            connection.execute(statement)
+        connection.set_progress_handler(None, 0)
+
+    @contextmanager
+    def connection(self, *, allow_temp_writes: bool = False) -> Iterator[sqlite3.Connection]:
+        """Check out a pooled connection, read-only unless temp writes are needed."""
+        connection = self._acquire()
+        healthy = True
+        try:
+            connection.execute("PRAGMA query_only=OFF" if allow_temp_writes else "PRAGMA query_only=ON")
+            yield connection
+        except sqlite3.Error:
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                try:
+                    self._reset_session(connection)
+                except sqlite3.Error:
+                    healthy = False
+            self._release(connection, healthy=healthy)
+
+    def stats(self) -> dict[str, Any]:
+        """Return pool sizing and reuse counters for health reporting."""
+        with self._condition:
+            open_connections = len(self._generations)
+            idle = len(self._idle)
+            return {
+                "max_connections": self.max_connections,
+                "open_connections": open_connections,
+                "idle_connections": idle,
+                "in_use_connections": open_connections - idle,
+                "generation": self._generation,
+                "shared_cache": self.shared_cache,
+                "cache_size_kib": self.cache_size_kib,
+                "mmap_size": self.mmap_size,
+                "cached_statements": self.cached_statements,
+                **self._counters,
+            }
+
+    def close(self) -> None:
+        """Close every idle connection; busy ones close when returned."""
+        with self._condition:
+            self._generation += 1
+            for connection in self._idle:
+                self._close(connection)
+            self._idle.clear()
+
+
 def _exact_results(connection: sqlite3.Connection, query: str, limit: int) -> list[dict[str, Any]]:
     """Use the source's identifier indexes for fast exact ISRC or Spotify-ID lookups."""
     rows = connection.execute(
@@ -107,68 +347,99 @@ def _isrc_results(connection: sqlite3.Connection, isrcs: list[str]) -> list[dict
     return list(chosen.values())
 
 
-def _bulk_isrc_results(connection: sqlite3.Connection, isrcs: list[str]) -> list[dict[str, Any]]:
+def _iter_bulk_isrc_results(
+    connection: sqlite3.Connection, isrcs: list[str]
+) -> Iterator[dict[str, Any]]:
     """Scan tracks once against a file-backed temporary set of requested ISRCs.
 
     The source ISRC index is excellent for one interactive lookup but causes
     thousands of random reads on network storage during a catalog true-up.
     ``CROSS JOIN`` preserves the sequential ``tracks`` scan order while the
-    temporary SQLite table remains file-backed via ``temp_store=FILE``.
+    temporary SQLite tables remain file-backed via ``temp_store=FILE``. The
+    most popular track per ISRC is kept by an upsert into a temporary table,
+    so duplicate ISRCs never accumulate in Python before rows are yielded.
     """
     connection.execute("CREATE TEMP TABLE requested_isrcs (isrc TEXT PRIMARY KEY)")
     connection.executemany(
         "INSERT OR IGNORE INTO requested_isrcs (isrc) VALUES (?)",
         ((isrc,) for isrc in isrcs),
     )
-    rows = connection.execute(
+    connection.execute(
+        """
+        CREATE TEMP TABLE best_isrc_tracks (
+            isrc TEXT PRIMARY KEY, track_rowid INTEGER NOT NULL,
+            popularity INTEGER, spotify_id TEXT
+        )
+        """
+    )
+    connection.execute(
+        """
+        INSERT INTO best_isrc_tracks (isrc, track_rowid, popularity, spotify_id)
+        SELECT tracks.external_id_isrc, tracks.rowid, tracks.popularity, tracks.id
+        FROM tracks NOT INDEXED
+        CROSS JOIN requested_isrcs ON requested_isrcs.isrc = tracks.external_id_isrc
+        JOIN albums ON albums.rowid = tracks.album_rowid
+        WHERE true
+        ON CONFLICT(isrc) DO UPDATE SET
+            track_rowid = excluded.track_rowid,
+            popularity = excluded.popularity,
+            spotify_id = excluded.spotify_id
+        WHERE (excluded.popularity, excluded.spotify_id)
+            > (best_isrc_tracks.popularity, best_isrc_tracks.spotify_id)
+        """
+    )
+    cursor = connection.execute(
         """
         SELECT tracks.id AS spotify_id, tracks.external_id_isrc AS isrc,
                tracks.name AS title, tracks.popularity AS popularity,
                tracks.duration_ms AS duration_ms, albums.name AS album_name,
                albums.release_date AS release_date
-        FROM tracks NOT INDEXED
-        CROSS JOIN requested_isrcs ON requested_isrcs.isrc = tracks.external_id_isrc
+        FROM best_isrc_tracks AS best
+        JOIN tracks ON tracks.rowid = best.track_rowid
         JOIN albums ON albums.rowid = tracks.album_rowid
+        ORDER BY best.isrc
         """
-    ).fetchall()
-    chosen: dict[str, dict[str, Any]] = {}
-    for row in rows:
-        release_date = row["release_date"]
-        payload = {
-            "spotify_id": row["spotify_id"],
-            "isrc": row["isrc"],
-            "title": row["title"],
-            "artists": None,
-            "album_name": row["album_name"],
-            "year": int(release_date[:4]) if release_date and release_date[:4].isdigit() else None,
-            "popularity": row["popularity"],
-            "duration_ms": row["duration_ms"],
-            "cover_url": None,
-            "source": SNAPSHOT,
-        }
-        existing = chosen.get(payload["isrc"])
-        if existing is None or (payload["popularity"], payload["spotify_id"]) > (
-            existing["popularity"], existing["spotify_id"]
-        ):
-            chosen[payload["isrc"]] = payload
-    return list(chosen.values())
+    )
+    try:
+        for row in cursor:
+            release_date = row["release_date"]
+            yield {
+                "spotify_id": row["spotify_id"],
+                "isrc": row["isrc"],
+                "title": row["title"],
+                "artists": None,
+                "album_name": row["album_name"],
+                "year": int(release_date[:4]) if release_date and release_date[:4].isdigit() else None,
+                "popularity": row["popularity"],
+                "duration_ms": row["duration_ms"],
+                "cover_url": None,
+                "source": SNAPSHOT,
+            }
+    finally:
+        cursor.close()
 
 
-def _bulk_audio_feature_results(
+def _bulk_isrc_results(connection: sqlite3.Connection, isrcs: list[str]) -> list[dict[str, Any]]:
+    """Return the complete bulk ISRC result list for non-streaming clients."""
+    return list(_iter_bulk_isrc_results(connection, isrcs))
+
+
+def _iter_bulk_audio_feature_results(
     connection: sqlite3.Connection, spotify_ids: list[str]
-) -> list[dict[str, Any]]:
+) -> Iterator[dict[str, Any]]:
     """Scan audio features once against a file-backed requested-ID set.
 
     The 39-GB archive lives on network-backed storage. A single sequential scan
     avoids thousands of random index reads when trueing up the whole library.
     The temporary requested-ID table stays on disk through ``temp_store=FILE``.
+    Rows are yielded as the scan reaches them.
     """
     connection.execute("CREATE TEMP TABLE requested_spotify_ids (spotify_id TEXT PRIMARY KEY)")
     connection.executemany(
         "INSERT OR IGNORE INTO requested_spotify_ids (spotify_id) VALUES (?)",
         ((spotify_id,) for spotify_id in spotify_ids),
     )
-    rows = connection.execute(
+    cursor = connection.execute(
         """
         SELECT features.track_id AS spotify_id, features.duration_ms,
                features.time_signature, features.tempo, features.key, features.mode,
@@ -179,8 +450,28 @@ def _bulk_audio_feature_results(
         CROSS JOIN requested_spotify_ids
           ON requested_spotify_ids.spotify_id = features.track_id
         """
-    ).fetchall()
-    return [dict(row) for row in rows]
+    )
+    try:
+        for row in cursor:
+            yield dict(row)
+    finally:
+        cursor.close()
+
+
+def _bulk_audio_feature_results(
+    connection: sqlite3.Connection, spotify_ids: list[str]
+) -> list[dict[str, Any]]:
+    """Return the complete audio-feature result list for non-streaming clients."""
+    return list(_iter_bulk_audio_feature_results(connection, spotify_ids))
+
+
+def _wants_ndjson() -> bool:
+    """Return whether the caller asked for a newline-delimited JSON stream."""
+    return NDJSON_MIMETYPE in request.headers.get("Accept", "")
+
+
+def _ndjson_line(frame: dict[str, Any]) -> str:
+    return json.dumps(frame, separators=(",", ":")) + "\n"
 
 
 def _text_results(
@@ -223,6 +514,216 @@ def _text_results(
     return [_row_payload(row) for row in rows]
 
 
+def _fts_match_expression(query: str) -> str | None:
+    """Turn free text into an FTS5 AND query with a prefix on the last word."""
+    tokens = re.findall(r"\w+", query.lower())
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    if len(tokens[-1]) >= 2:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_index_metadata(index_connection: sqlite3.Connection) -> dict[str, str]:
+    """Return the key/value build metadata stored in a search index sidecar."""
+    rows = index_connection.execute("SELECT key, value FROM search_index_meta").fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def _source_fingerprint(connection: sqlite3.Connection, database_path: str) -> dict[str, str]:
+    """Return cheap identity facts tying a sidecar to one archive file."""
+    max_rowid = connection.execute("SELECT MAX(rowid) FROM tracks").fetchone()[0]
+    return {
+        "source_size": str(os.stat(database_path).st_size),
+        "source_max_track_rowid": str(max_rowid or 0),
+    }
+
+
+def search_index_matches_source(
+    metadata: dict[str, str],
+    connection: sqlite3.Connection,
+    database_path: str,
+) -> bool:
+    """Return whether a sidecar was built from the archive file now on disk."""
+    try:
+        fingerprint = _source_fingerprint(connection, database_path)
+    except OSError:
+        return False
+    return (
+        metadata.get("format") == str(SEARCH_INDEX_FORMAT)
+        and metadata.get("snapshot") == SNAPSHOT
+        and all(metadata.get(key) == value for key, value in fingerprint.items())
+    )
+
+
+def _fulltext_results(
+    index_connection: sqlite3.Connection,
+    connection: sqlite3.Connection,
+    query: str,
+    limit: int,
+    timeout_seconds: float,
+) -> list[dict[str, Any]] | None:
+    """Search every track through the FTS5 sidecar, most popular first.
+
+    Index rowids were assigned in popularity order at build time, so FTS5
+    walks its doclists in rowid order and stops after ``limit`` matches
+    instead of ranking every hit. Returns ``None`` when the query has no
+    indexable words so the caller can fall back to the bounded scan.
+    """
+    match = _fts_match_expression(query)
+    if match is None:
+        return None
+    deadline = time.monotonic() + timeout_seconds
+    index_connection.set_progress_handler(lambda: int(time.monotonic() >= deadline), 10_000)
+    try:
+        track_rowids = [
+            row[0]
+            for row in index_connection.execute(
+                """
+                SELECT map.track_rowid
+                FROM (
+                    SELECT rowid AS search_rowid FROM track_search
+                    WHERE track_search MATCH :match
+                    ORDER BY rowid
+                    LIMIT :limit
+                ) AS hits
+                JOIN track_search_map AS map ON map.search_rowid = hits.search_rowid
+                ORDER BY hits.search_rowid
+                """,
+                {"match": match, "limit": limit},
+            ).fetchall()
+        ]
+    except sqlite3.OperationalError as exc:
+        if "interrupted" in str(exc).lower():
+            raise ValueError("Search took too long; use an ISRC, Spotify ID, or a more specific query.") from exc
+        raise
+    finally:
+        index_connection.set_progress_handler(None, 0)
+    if not track_rowids:
+        return []
+    placeholders = ", ".join("?" for _ in track_rowids)
+    rows = connection.execute(
+        f"""
+        SELECT tracks.id AS spotify_id, tracks.external_id_isrc AS isrc,
+               tracks.name AS title, tracks.popularity AS popularity,
+               tracks.preview_url AS preview_url, tracks.duration_ms AS duration_ms,
+               albums.name AS album_name, albums.release_date AS release_date,
+               (SELECT url FROM album_images WHERE album_rowid = albums.rowid ORDER BY width DESC LIMIT 1) AS cover_url,
+               GROUP_CONCAT(artists.name, ', ') AS artists
+        FROM tracks
+        JOIN albums ON albums.rowid = tracks.album_rowid
+        JOIN track_artists ON track_artists.track_rowid = tracks.rowid
+        JOIN artists ON artists.rowid = track_artists.artist_rowid
+        WHERE tracks.rowid IN ({placeholders})
+        GROUP BY tracks.rowid
+        ORDER BY tracks.popularity DESC, tracks.id ASC
+        """,
+        track_rowids,
+    ).fetchall()
+    return [_row_payload(row) for row in rows]
+
+
+def build_search_index(
+    database_path: str,
+    output_path: str,
+    *,
+    batch_size: int = SEARCH_INDEX_BATCH_SIZE,
+    progress: Any = None,
+) -> dict[str, Any]:
+    """Build the immutable FTS5 companion file for full-archive text search.
+
+    Tracks are read once in ``popularity DESC, id ASC`` order and written to a
+    contentless FTS5 table whose rowids follow that order, plus a map back to
+    the archive's track rowids. The file is built next to ``output_path`` and
+    atomically renamed into place, so a running service never sees a
+    half-built index; it recycles its connections when the file changes.
+    """
+    output = Path(output_path)
+    temporary = output.with_name(f".{output.name}.building")
+    temporary.unlink(missing_ok=True)
+    started = time.monotonic()
+
+    source = _connection(database_path, allow_temp_writes=True)
+    index = sqlite3.connect(temporary)
+    try:
+        fingerprint = _source_fingerprint(source, database_path)
+        index.execute("PRAGMA journal_mode=OFF")
+        index.execute("PRAGMA synchronous=OFF")
+        index.executescript(
+            """
+            CREATE VIRTUAL TABLE track_search USING fts5(
+                title, artists,
+                content='', detail=none,
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            );
+            CREATE TABLE track_search_map (
+                search_rowid INTEGER PRIMARY KEY,
+                track_rowid INTEGER NOT NULL
+            );
+            CREATE TABLE search_index_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """
+        )
+        cursor = source.execute(
+            """
+            SELECT tracks.rowid AS track_rowid, tracks.name AS title,
+                   (SELECT GROUP_CONCAT(artists.name, ' ')
+                    FROM track_artists
+                    JOIN artists ON artists.rowid = track_artists.artist_rowid
+                    WHERE track_artists.track_rowid = tracks.rowid) AS artists
+            FROM tracks
+            ORDER BY tracks.popularity DESC, tracks.id ASC
+            """
+        )
+        indexed = 0
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            search_rows = [
+                (indexed + offset + 1, row["title"], row["artists"] or "")
+                for offset, row in enumerate(rows)
+            ]
+            index.executemany(
+                "INSERT INTO track_search(rowid, title, artists) VALUES (?, ?, ?)",
+                search_rows,
+            )
+            index.executemany(
+                "INSERT INTO track_search_map(search_rowid, track_rowid) VALUES (?, ?)",
+                ((indexed + offset + 1, row["track_rowid"]) for offset, row in enumerate(rows)),
+            )
+            indexed += len(rows)
+            index.commit()
+            if progress is not None:
+                progress(indexed)
+        index.execute("INSERT INTO track_search(track_search) VALUES ('optimize')")
+        metadata = {
+            "format": str(SEARCH_INDEX_FORMAT),
+            "snapshot": SNAPSHOT,
+            **fingerprint,
+            "row_count": str(indexed),
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        index.executemany("INSERT INTO search_index_meta(key, value) VALUES (?, ?)", metadata.items())
+        index.commit()
+    except BaseException:
+        index.close()
+        temporary.unlink(missing_ok=True)
+        raise
+    finally:
+        source.close()
+    index.close()
+    os.replace(temporary, output)
+    return {
+        "ok": True,
+        "output_path": str(output),
+        "row_count": indexed,
+        "duration_seconds": round(time.monotonic() - started, 3),
+        "snapshot": SNAPSHOT,
+    }
+
+
 def _row_payload(row: sqlite3.Row) -> dict[str, Any]:
     """Return a minimal metadata-only candidate without audio delivery data."""
     release_date = row["release_date"]
@@ -252,13 +753,116 @@ def create_app(
             audio_features_database_path
             or os.getenv("SPOTIFY_ARCHIVE_AUDIO_FEATURES_DB_PATH", DEFAULT_AUDIO_FEATURES_DB_PATH)
         ),
+        SPOTIFY_ARCHIVE_SEARCH_INDEX_PATH=os.getenv(
+            "SPOTIFY_ARCHIVE_SEARCH_INDEX_PATH", DEFAULT_SEARCH_INDEX_PATH
+        ),
         SPOTIFY_ARCHIVE_MIN_POPULARITY=_int_env(
             "SPOTIFY_ARCHIVE_MIN_POPULARITY", DEFAULT_MIN_POPULARITY
         ),
         SPOTIFY_ARCHIVE_QUERY_TIMEOUT_SECONDS=float(
             os.getenv("SPOTIFY_ARCHIVE_QUERY_TIMEOUT_SECONDS", DEFAULT_QUERY_TIMEOUT_SECONDS)
         ),
+        SPOTIFY_ARCHIVE_POOL_SIZE=_int_env("SPOTIFY_ARCHIVE_POOL_SIZE", DEFAULT_POOL_SIZE),
+        SPOTIFY_ARCHIVE_POOL_TIMEOUT_SECONDS=float(
+            os.getenv("SPOTIFY_ARCHIVE_POOL_TIMEOUT_SECONDS", DEFAULT_POOL_TIMEOUT_SECONDS)
+        ),
+        SPOTIFY_ARCHIVE_CACHE_SIZE_KIB=_int_env(
+            "SPOTIFY_ARCHIVE_CACHE_SIZE_KIB", DEFAULT_CACHE_SIZE_KIB
+        ),
+        SPOTIFY_ARCHIVE_MMAP_SIZE=_int_env("SPOTIFY_ARCHIVE_MMAP_SIZE", DEFAULT_MMAP_SIZE),
+        SPOTIFY_ARCHIVE_SHARED_CACHE=_bool_env("SPOTIFY_ARCHIVE_SHARED_CACHE", False),
     )
+    pools: dict[str, ArchiveConnectionPool] = {}
+    pools_lock = threading.Lock()
+
+    def _pool(config_key: str) -> ArchiveConnectionPool:
+        database_path = app.config[config_key]
+        with pools_lock:
+            pool = pools.get(config_key)
+            if pool is None or pool.database_path != database_path:
+                if pool is not None:
+                    pool.close()
+                pool = ArchiveConnectionPool(
+                    database_path,
+                    max_connections=app.config["SPOTIFY_ARCHIVE_POOL_SIZE"],
+                    timeout_seconds=app.config["SPOTIFY_ARCHIVE_POOL_TIMEOUT_SECONDS"],
+                    cache_size_kib=app.config["SPOTIFY_ARCHIVE_CACHE_SIZE_KIB"],
+                    mmap_size=app.config["SPOTIFY_ARCHIVE_MMAP_SIZE"],
+                    shared_cache=app.config["SPOTIFY_ARCHIVE_SHARED_CACHE"],
+                )
+                pools[config_key] = pool
+            return pool
+
+    app.extensions["spotify_archive_pools"] = pools
+
+    def _search_index_status(connection: sqlite3.Connection | None = None) -> dict[str, Any]:
+        index_path = app.config["SPOTIFY_ARCHIVE_SEARCH_INDEX_PATH"]
+        database_path = app.config["SPOTIFY_ARCHIVE_DB_PATH"]
+        status: dict[str, Any] = {"present": bool(index_path) and Path(index_path).is_file()}
+        if not status["present"] or not Path(database_path).is_file():
+            status["usable"] = False
+            return status
+        try:
+            with _pool("SPOTIFY_ARCHIVE_SEARCH_INDEX_PATH").connection() as index_connection:
+                metadata = search_index_metadata(index_connection)
+            if connection is None:
+                with _pool("SPOTIFY_ARCHIVE_DB_PATH").connection() as source_connection:
+                    usable = search_index_matches_source(metadata, source_connection, database_path)
+            else:
+                usable = search_index_matches_source(metadata, connection, database_path)
+        except sqlite3.Error:
+            app.logger.exception("Spotify archive search index is unreadable")
+            status["usable"] = False
+            return status
+        status.update(
+            usable=usable,
+            row_count=int(metadata.get("row_count") or 0),
+            built_at=metadata.get("built_at"),
+        )
+        return status
+
+    def _ndjson_response(
+        config_key: str,
+        iter_results: Callable[[sqlite3.Connection, list[str]], Iterator[dict[str, Any]]],
+        values: list[str],
+        failure_message: str,
+    ) -> Response:
+        """Stream bulk rows as NDJSON while the pooled cursor iterates.
+
+        The first line carries the snapshot, each match follows as a
+        ``result`` frame, and a final ``end`` frame with the row count lets
+        clients tell a complete stream from a dropped connection. Failures
+        after the headers are sent become an ``error`` frame instead.
+        """
+        pool = _pool(config_key)
+
+        def generate() -> Iterator[str]:
+            yield _ndjson_line({"type": "meta", "snapshot": SNAPSHOT, "requested": len(values)})
+            count = 0
+            try:
+                with pool.connection(allow_temp_writes=True) as connection:
+                    results = iter_results(connection, values)
+                    try:
+                        for result in results:
+                            count += 1
+                            yield _ndjson_line({"type": "result", "result": result})
+                    finally:
+                        results.close()
+            except (sqlite3.Error, ArchivePoolTimeout):
+                app.logger.exception(failure_message)
+                yield _ndjson_line({"type": "error", "error": failure_message})
+                return
+            yield _ndjson_line({"type": "end", "count": count})
+
+        return Response(
+            generate(),
+            mimetype=NDJSON_MIMETYPE,
+            headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+        )
+
+    @app.errorhandler(ArchivePoolTimeout)
+    def pool_timeout(exc):
+        return jsonify({"error": str(exc)}), 503
 
     @app.get("/healthz")
     def healthz():
@@ -270,6 +874,11 @@ def create_app(
             "read_only": True,
             "database_present": path.is_file(),
             "audio_features_database_present": audio_features_path.is_file(),
+            "search_index": _search_index_status(),
+            "connection_pools": {
+                "metadata": _pool("SPOTIFY_ARCHIVE_DB_PATH").stats(),
+                "audio_features": _pool("SPOTIFY_ARCHIVE_AUDIO_FEATURES_DB_PATH").stats(),
+            },
         }), 200 if path.is_file() else 503
 
     @app.get("/v1/search")
@@ -285,10 +894,22 @@ def create_app(
         if not Path(database_path).is_file():
             return jsonify({"error": "Archive database is not ready."}), 503
         try:
-            with _connection(database_path) as connection:
+            with _pool("SPOTIFY_ARCHIVE_DB_PATH").connection() as connection:
                 results = _exact_results(connection, query, limit)
                 mode = "identifier" if results else "text"
-                if not results:
+                if not results and _search_index_status(connection)["usable"]:
+                    with _pool("SPOTIFY_ARCHIVE_SEARCH_INDEX_PATH").connection() as index_connection:
+                        fulltext = _fulltext_results(
+                            index_connection,
+                            connection,
+                            query,
+                            limit,
+                            app.config["SPOTIFY_ARCHIVE_QUERY_TIMEOUT_SECONDS"],
+                        )
+                    if fulltext is not None:
+                        results = fulltext
+                        mode = "fulltext"
+                if not results and mode == "text":
                     results = _text_results(
                         connection,
                         query,
@@ -316,7 +937,7 @@ def create_app(
         if not Path(database_path).is_file():
             return jsonify({"error": "Archive database is not ready."}), 503
         try:
-            with _connection(database_path) as connection:
+            with _pool("SPOTIFY_ARCHIVE_DB_PATH").connection() as connection:
                 results = _isrc_results(connection, isrcs)
         except sqlite3.Error:
             app.logger.exception("Spotify archive ISRC lookup failed")
@@ -336,8 +957,13 @@ def create_app(
         database_path = app.config["SPOTIFY_ARCHIVE_DB_PATH"]
         if not Path(database_path).is_file():
             return jsonify({"error": "Archive database is not ready."}), 503
+        if _wants_ndjson():
+            return _ndjson_response(
+                "SPOTIFY_ARCHIVE_DB_PATH", _iter_bulk_isrc_results, isrcs,
+                "Archive ISRC bulk lookup failed.",
+            )
         try:
-            with _connection(database_path, allow_temp_writes=True) as connection:
+            with _pool("SPOTIFY_ARCHIVE_DB_PATH").connection(allow_temp_writes=True) as connection:
                 results = _bulk_isrc_results(connection, isrcs)
         except sqlite3.Error:
             app.logger.exception("Spotify archive bulk ISRC lookup failed")
@@ -357,8 +983,15 @@ def create_app(
         database_path = app.config["SPOTIFY_ARCHIVE_AUDIO_FEATURES_DB_PATH"]
         if not Path(database_path).is_file():
             return jsonify({"error": "Archive audio-features database is not ready."}), 503
+        if _wants_ndjson():
+            return _ndjson_response(
+                "SPOTIFY_ARCHIVE_AUDIO_FEATURES_DB_PATH", _iter_bulk_audio_feature_results,
+                spotify_ids, "Archive audio-features bulk lookup failed.",
+            )
         try:
-            with _connection(database_path, allow_temp_writes=True) as connection:
+            with _pool("SPOTIFY_ARCHIVE_AUDIO_FEATURES_DB_PATH").connection(
+                allow_temp_writes=True
+            ) as connection:
                 results = _bulk_audio_feature_results(connection, spotify_ids)
         except sqlite3.Error:
             app.logger.exception("Spotify archive audio-features bulk lookup failed")
@@ -368,5 +1001,46 @@ def create_app(
     return app
 
 
-if __name__ == "__main__":
+def main(argv: list[str] | None = None) -> int:
+    """Serve the catalog, or build its search index with ``build-search-index``."""
+    parser = argparse.ArgumentParser(description="Offline Spotify archive catalog service")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("serve", help="Run the read-only HTTP catalog service (default)")
+    build_parser = subparsers.add_parser(
+        "build-search-index",
+        help="Build the immutable FTS5 sidecar used by /v1/search",
+    )
+    build_parser.add_argument(
+        "--database",
+        default=os.getenv("SPOTIFY_ARCHIVE_DB_PATH", DEFAULT_DB_PATH),
+        help="Archive SQLite file to index.",
+    )
+    build_parser.add_argument(
+        "--output",
+        default=os.getenv("SPOTIFY_ARCHIVE_SEARCH_INDEX_PATH", DEFAULT_SEARCH_INDEX_PATH),
+        help="Sidecar file to write; replaced atomically when the build finishes.",
+    )
+    build_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=SEARCH_INDEX_BATCH_SIZE,
+        help="Tracks to index per transaction.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "build-search-index":
+        result = build_search_index(
+            args.database,
+            args.output,
+            batch_size=max(1, args.batch_size),
+            progress=lambda count: print(f"Indexed {count} tracks", flush=True),
+        )
+        print(json.dumps(result, indent=2, sort_keys=True))
+        return 0
+
     create_app().run(host="0.0.0.0", port=8080, threaded=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -61,6 +61,28 @@ def _configured_database_uri_without_fallback(app):
     return database_uri_from_postgres_env(os.environ)
 
 
+def _print_bench_comparison(comparison, json_output):
+    """Print a benchmark comparison as JSON or one line per scenario."""
+    if json_output:
+        print(json.dumps(comparison, indent=2, sort_keys=True))
+        return
+    status = "passed" if comparison["ok"] else "found regressions"
+    print(
+        f"Benchmark comparison {status} ({comparison['metric']}, "
+        f"tolerance {comparison['tolerance']:.0%}):"
+    )
+    for warning in comparison["warnings"]:
+        print(f"! {warning}")
+    for row in comparison["scenarios"]:
+        if row["status"] == "not_compared":
+            print(f"- {row['name']}: not compared (baseline {row['baseline_status']}, current {row['current_status']})")
+            continue
+        line = f"- {row['name']}: {row['baseline_ms']}ms -> {row['current_ms']}ms [{row['status']}]"
+        if row.get("reasons"):
+            line += f" {'; '.join(row['reasons'])}"
+        print(line)
+
+
 def main():
     # Create argument parser
     parser = argparse.ArgumentParser(description='Quizzical Beats Management Script')
@@ -73,6 +95,17 @@ def main():
     # Create backup action
     create_parser = backup_subparsers.add_parser('create', help='Create a new backup')
     create_parser.add_argument('--auto', action='store_true', help='Create backup with automatic name')
+    create_format = create_parser.add_mutually_exclusive_group()
+    create_format.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Store only changed chunks in the deduplicating chunk store and write a manifest',
+    )
+    create_format.add_argument(
+        '--logical',
+        action='store_true',
+        help='Dump the database as per-table NDJSON; works with SQLite and PostgreSQL',
+    )
 
     readiness_parser = backup_subparsers.add_parser(
         'readiness',
@@ -89,6 +122,30 @@ def main():
     retention_parser = backup_subparsers.add_parser('retention', help='Apply backup retention policy')
     retention_parser.add_argument('--days', type=int, default=30, help='Number of days to keep backups')
 
+    backup_subparsers.add_parser(
+        'gc',
+        help='Delete chunk-store data no incremental backup manifest references',
+    )
+
+    verify_parser = backup_subparsers.add_parser('verify', help='Verify a backup file')
+    verify_parser.add_argument('filename', help='Backup file name in the backup directory')
+    verify_parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Decompress and SHA-256 check every member instead of the quick manifest/header check',
+    )
+    verify_parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore a cached result for an unchanged backup file',
+    )
+    verify_parser.add_argument(
+        '--json',
+        action='store_true',
+        dest='json_output',
+        help='Print the verification result as JSON',
+    )
+
     database_parser = subparsers.add_parser('database', help='Database diagnostics')
     database_subparsers = database_parser.add_subparsers(dest='database_action', help='Database action to perform')
     status_parser = database_subparsers.add_parser(
@@ -188,6 +245,10 @@ def main():
         action='store_true',
         help='Allow filesystem-style artifact storage for single-writer deployments',
     )
+    storage_subparsers.add_parser(
+        'reindex',
+        help='Rebuild the object-storage artifact inventory index from a bucket listing',
+    )
 
     scheduled_emails_parser = subparsers.add_parser(
         'scheduled-emails',
@@ -331,6 +392,111 @@ def main():
         default=750.0,
         help='Maximum acceptable round-review payload duration when --synthetic is used.',
     )
+    bench_parser = performance_subparsers.add_parser(
+        'bench',
+        help='Benchmark search, analytics, rounds, and MP3 assembly against a bulk synthetic catalog',
+    )
+    bench_parser.add_argument(
+        '--scale',
+        choices=['small', 'medium', 'large'],
+        default='small',
+        help='Fixture preset: small (2k songs), medium (100k), or large (1M).',
+    )
+    bench_parser.add_argument('--songs', type=int, help='Override the preset song count.')
+    bench_parser.add_argument('--rounds', type=int, help='Override the preset round count.')
+    bench_parser.add_argument('--tags', type=int, help='Override the preset tag count.')
+    bench_parser.add_argument('--exports-per-round', type=int, help='Override the preset export count per round.')
+    bench_parser.add_argument('--import-jobs', type=int, help='Override the preset import job count.')
+    bench_parser.add_argument(
+        '--scenario',
+        action='append',
+        dest='scenarios',
+        help='Run only this scenario; repeat for several. Defaults to all scenarios.',
+    )
+    bench_parser.add_argument('--repeat', type=int, default=5, help='Measured runs per scenario.')
+    bench_parser.add_argument('--warmup', type=int, default=1, help='Unmeasured runs before measuring.')
+    bench_parser.add_argument('--seed', type=int, default=1, help='Seed for the synthetic fixture contents.')
+    bench_parser.add_argument(
+        '--audio-fixture',
+        help='Local MP3 the provider stand-in serves as every song preview for MP3 assembly. Defaults to the bundled outro clip.',
+    )
+    bench_parser.add_argument('--output', help='Write the result JSON to this file, e.g. to save a baseline.')
+    bench_parser.add_argument('--baseline', help='Compare the result with this saved baseline JSON.')
+    bench_parser.add_argument(
+        '--json',
+        action='store_true',
+        dest='json_output',
+        help='Print machine-readable benchmark results.',
+    )
+    compare_parser = performance_subparsers.add_parser(
+        'compare',
+        help='Compare two saved benchmark results and flag regressions',
+    )
+    compare_parser.add_argument('baseline', help='Baseline result JSON.')
+    compare_parser.add_argument('current', help='Current result JSON.')
+    for comparison_parser in (bench_parser, compare_parser):
+        comparison_parser.add_argument(
+            '--metric',
+            choices=['min', 'mean', 'p50', 'p90', 'p99', 'max'],
+            default='p50',
+            help='Duration statistic to compare.',
+        )
+        comparison_parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.2,
+            help='Allowed relative slowdown before a scenario counts as regressed (0.2 = 20%%).',
+        )
+        comparison_parser.add_argument(
+            '--min-delta-ms',
+            type=float,
+            default=5.0,
+            help='Ignore slowdowns smaller than this many milliseconds.',
+        )
+    compare_parser.add_argument(
+        '--json',
+        action='store_true',
+        dest='json_output',
+        help='Print machine-readable comparison results.',
+    )
+
+    providers_parser = subparsers.add_parser('providers', help='Provider API tools')
+    providers_subparsers = providers_parser.add_subparsers(
+        dest='providers_action',
+        help='Provider action to perform',
+    )
+    standin_parser = providers_subparsers.add_parser(
+        'standin',
+        help='Serve an offline Deezer/Spotify stand-in for CI and load tests',
+    )
+    standin_parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on.')
+    standin_parser.add_argument('--port', type=int, default=8765, help='Port to listen on.')
+    standin_parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay added to every provider response.')
+    standin_parser.add_argument('--jitter-ms', type=float, default=0.0, help='Random +/- variation of the delay.')
+    standin_parser.add_argument(
+        '--error-rate',
+        type=float,
+        default=0.0,
+        help='Share of provider requests answered with HTTP 500 (0-1).',
+    )
+    standin_parser.add_argument(
+        '--rate-limit-rate',
+        type=float,
+        default=0.0,
+        help='Share of provider requests answered with HTTP 429 (0-1).',
+    )
+    standin_parser.add_argument(
+        '--retry-after',
+        type=int,
+        default=1,
+        dest='retry_after_seconds',
+        help='Retry-After seconds sent with injected 429 responses.',
+    )
+    standin_parser.add_argument('--seed', type=int, help='Seed for reproducible latency and fault injection.')
+    standin_parser.add_argument(
+        '--audio-dir',
+        help='Directory of MP3s (or one MP3) served as previews. Defaults to the bundled audio clips.',
+    )
 
     notifications_parser = subparsers.add_parser('notifications', help='Notification jobs')
     notifications_subparsers = notifications_parser.add_subparsers(
@@ -436,7 +602,19 @@ def main():
         with app.app_context():
             if args.backup_action == 'create':
                 from musicround.helpers.backup_helper import create_backup
-                result = create_backup(backup_name=None if args.auto else f"manual_{VERSION_INFO['version']}")
+
+                def report_snapshot(copied, total):
+                    if total:
+                        print(f"\rDatabase snapshot: {copied * 100 // total}%", end='', file=sys.stderr, flush=True)
+
+                result = create_backup(
+                    backup_name=None if args.auto else f"manual_{VERSION_INFO['version']}",
+                    incremental=args.incremental,
+                    logical=args.logical,
+                    progress=report_snapshot if sys.stderr.isatty() else None,
+                )
+                if sys.stderr.isatty():
+                    print(file=sys.stderr)
                 if result["status"] == "success":
                     print(f"Backup created successfully: {result['path']}")
                     return 0
@@ -452,6 +630,38 @@ def main():
                 else:
                     print(f"Retention policy failed: {result['message']}")
                     return 1
+            elif args.backup_action == 'gc':
+                from musicround.helpers.backup_helper import garbage_collect_backup_chunks
+                result = garbage_collect_backup_chunks()
+                if result["status"] == "success":
+                    print(
+                        f"Backup chunk GC: removed {result['removed_chunks']} chunks, "
+                        f"freed {result['freed_bytes']} bytes"
+                    )
+                    return 0
+                print(f"Backup chunk GC failed: {result['message']}")
+                return 1
+            elif args.backup_action == 'verify':
+                from musicround.helpers.backup_helper import VERIFY_FULL, VERIFY_QUICK, verify_backup
+
+                def report_progress(done, total):
+                    if total:
+                        print(f"\rVerifying: {done * 100 // total}%", end='', file=sys.stderr, flush=True)
+
+                result = verify_backup(
+                    args.filename,
+                    level=VERIFY_FULL if args.full else VERIFY_QUICK,
+                    progress=None if args.json_output else report_progress,
+                    use_cache=not args.no_cache,
+                )
+                if args.json_output:
+                    print(json.dumps(result, indent=2, sort_keys=True))
+                else:
+                    if args.full and not result.get('cached'):
+                        print(file=sys.stderr)
+                    cached = " (cached)" if result.get('cached') else ""
+                    print(f"{result['message']}{cached}")
+                return 0 if result.get("is_valid") else 1
             elif args.backup_action == 'readiness':
                 from musicround.helpers.backup_helper import backup_readiness_report
 
@@ -711,6 +921,19 @@ def main():
             payload = application_health_payload()
             print(json.dumps(payload, indent=2, sort_keys=True))
             return 0 if payload["ok"] else 1
+    elif args.command == 'storage' and args.storage_action == 'reindex':
+        with contextlib.redirect_stdout(sys.stderr):
+            app = create_app()
+        with app.app_context():
+            from musicround.helpers.storage_health import round_artifact_store
+
+            store = round_artifact_store()
+            if not hasattr(store, 'refresh_index'):
+                print(f"The {store.backend} artifact backend has no inventory index.")
+                return 0
+            items = store.refresh_index()
+            print(f"Indexed {len(items)} artifact objects in s3://{store.bucket}/{store.prefix}")
+            return 0
     elif args.command == 'storage':
         app = _create_storage_readiness_cli_app()
         with app.app_context():
@@ -808,6 +1031,22 @@ def main():
                     print(f"- {check['name']}: {check['message']} [{check_status}]")
             return 0 if result["ok"] else 1
     elif args.command == 'performance':
+        if args.performance_action == 'compare':
+            from musicround.helpers.performance_bench import compare_bench_results, load_bench_result
+
+            try:
+                comparison = compare_bench_results(
+                    load_bench_result(args.baseline),
+                    load_bench_result(args.current),
+                    metric=args.metric,
+                    tolerance=args.tolerance,
+                    min_delta_ms=args.min_delta_ms,
+                )
+            except (OSError, ValueError) as exc:
+                print(f"Performance compare error: {exc}", file=sys.stderr)
+                return 78
+            _print_bench_comparison(comparison, args.json_output)
+            return 0 if comparison["ok"] else 1
         with contextlib.redirect_stdout(sys.stderr):
             app = create_app()
         with app.app_context():
@@ -838,6 +1077,97 @@ def main():
                             f"/ {check['threshold_ms']}ms [{check_status}]"
                         )
                 return 0 if result["ok"] else 1
+            if args.performance_action == 'bench':
+                from musicround.helpers.performance_bench import (
+                    BenchScale,
+                    compare_bench_results,
+                    load_bench_result,
+                    run_performance_bench,
+                )
+
+                try:
+                    baseline = load_bench_result(args.baseline) if args.baseline else None
+                    scale = BenchScale.resolve(
+                        args.scale,
+                        songs=args.songs,
+                        rounds=args.rounds,
+                        tags=args.tags,
+                        exports_per_round=args.exports_per_round,
+                        import_jobs=args.import_jobs,
+                    )
+                    result = run_performance_bench(
+                        scale=scale,
+                        repeat=args.repeat,
+                        warmup=args.warmup,
+                        scenarios=args.scenarios,
+                        audio_fixture=args.audio_fixture,
+                        seed=args.seed,
+                    )
+                except (OSError, ValueError) as exc:
+                    print(f"Performance bench error: {exc}", file=sys.stderr)
+                    return 78
+                if args.output:
+                    with open(args.output, 'w', encoding='utf-8') as handle:
+                        json.dump(result, handle, indent=2, sort_keys=True)
+                        handle.write('\n')
+                comparison = None
+                if baseline is not None:
+                    comparison = compare_bench_results(
+                        baseline,
+                        result,
+                        metric=args.metric,
+                        tolerance=args.tolerance,
+                        min_delta_ms=args.min_delta_ms,
+                    )
+                if args.json_output:
+                    print(json.dumps({**result, "comparison": comparison}, indent=2, sort_keys=True))
+                else:
+                    scale_info = result["scale"]
+                    print(
+                        f"Performance bench ({scale_info['name']}: {scale_info['songs']} songs, "
+                        f"{scale_info['rounds']} rounds; fixture {result['fixture_seconds']}s):"
+                    )
+                    for name, scenario in result["scenarios"].items():
+                        if scenario["status"] != "ok":
+                            print(f"- {name}: {scenario['status']} ({scenario['message']})")
+                            continue
+                        duration = scenario["duration_ms"]
+                        print(
+                            f"- {name}: p50 {duration['p50']}ms, p90 {duration['p90']}ms, "
+                            f"max {duration['max']}ms, {scenario['query_count']['p50']:g} queries"
+                        )
+                    if comparison is not None:
+                        _print_bench_comparison(comparison, False)
+                if not result["ok"]:
+                    return 1
+                return 0 if comparison is None or comparison["ok"] else 1
+    elif args.command == 'providers' and args.providers_action == 'standin':
+        from werkzeug.serving import run_simple
+
+        from musicround.helpers.provider_standin import (
+            StandinOptions,
+            create_standin_app,
+            standin_config_overrides,
+        )
+
+        try:
+            options = StandinOptions(
+                latency_ms=args.latency_ms,
+                jitter_ms=args.jitter_ms,
+                error_rate=args.error_rate,
+                rate_limit_rate=args.rate_limit_rate,
+                retry_after_seconds=args.retry_after_seconds,
+                seed=args.seed,
+                audio_dir=args.audio_dir,
+            )
+        except ValueError as exc:
+            print(f"Provider stand-in error: {exc}", file=sys.stderr)
+            return 78
+        print("Point the app at the stand-in with:")
+        for key, value in standin_config_overrides(f"http://{args.host}:{args.port}").items():
+            print(f"  {key}={value}")
+        run_simple(args.host, args.port, create_standin_app(options), threaded=True)
+        return 0
     elif args.command == 'notifications':
         with contextlib.redirect_stdout(sys.stderr):
             app = create_app()
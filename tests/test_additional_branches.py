@@ -342,6 +342,103 @@ class TestSystemHealthRoute:
         assert data['status'] == 'degraded'
         assert data['services']['artifact_storage']['issues'][0]['code'] == 'artifact_storage_not_writable'
 
+    def test_healthz_serves_cached_samples_with_age(self, app, client, monkeypatch):
+        """Repeated probes should reuse component results until their interval passes."""
+        from musicround.helpers import service_health
+
+        calls = []
+        original = service_health.check_round_artifact_storage
+
+        def counting_storage_check(include_mp3=True, include_pdf=True):
+            calls.append(1)
+            return original(include_mp3=include_mp3, include_pdf=include_pdf)
+
+        monkeypatch.setattr(service_health, 'check_round_artifact_storage', counting_storage_check)
+
+        first = client.get('/healthz').get_json()
+        second = client.get('/healthz').get_json()
+
+        assert len(calls) == 1
+        assert first['stale'] is False
+        sample = second['services']['artifact_storage']['sample']
+        assert sample['interval_seconds'] == app.config['HEALTH_STORAGE_SAMPLE_INTERVAL_SECONDS']
+        assert sample['age_seconds'] >= 0
+        assert sample['stale'] is False
+        assert second['services']['database']['sample']['sampled_at']
+
+    def test_healthz_reports_slow_component_without_waiting_for_it(self, app, client, monkeypatch):
+        """A hung check should be reported after the timeout and never run twice at once."""
+        import threading
+        import time
+        from musicround.helpers import service_health
+
+        release = threading.Event()
+        calls = []
+
+        def hung_storage_check(include_mp3=True, include_pdf=True):
+            calls.append(1)
+            release.wait(10)
+            return {'ok': True, 'checks': [], 'issues': [], 'hints': []}
+
+        monkeypatch.setattr(service_health, 'check_round_artifact_storage', hung_storage_check)
+        app.config['HEALTH_CHECK_TIMEOUT_SECONDS'] = 0.2
+        try:
+            started = time.monotonic()
+            response = client.get('/healthz')
+            second = client.get('/healthz').get_json()
+            elapsed = time.monotonic() - started
+        finally:
+            release.set()
+
+        data = response.get_json()
+        assert response.status_code == 503
+        assert elapsed < 2
+        storage = data['services']['artifact_storage']
+        assert storage['issues'][0]['code'] == 'health_check_timed_out'
+        assert storage['sample']['stale'] is True
+        assert data['services']['database']['ok'] is True
+        assert second['services']['artifact_storage']['issues'][0]['code'] == 'health_check_timed_out'
+        assert len(calls) == 1
+
+    def test_health_sampler_fails_check_that_hangs_after_first_success(self, app):
+        """A check that stops answering must not keep serving its last good result."""
+        import threading
+        import time
+        from musicround.helpers.service_health import HealthSampler
+
+        release = threading.Event()
+        calls = []
+
+        def storage_check():
+            calls.append(1)
+            if len(calls) > 1:
+                release.wait(10)
+            return {'status': 'ok', 'ok': True, 'issues': []}
+
+        sampler = HealthSampler(
+            app,
+            {'artifact_storage': storage_check, 'database': lambda: {'status': 'ok', 'ok': True, 'issues': []}},
+            {'artifact_storage': 0.1, 'database': 60},
+            timeout=0.2,
+        )
+        try:
+            assert sampler.snapshot()['ok'] is True
+            time.sleep(0.15)
+            hung = sampler.snapshot()
+            time.sleep(0.5)
+            stale = sampler.snapshot()
+        finally:
+            release.set()
+            sampler.stop()
+
+        storage = hung['services']['artifact_storage']
+        assert hung['ok'] is False
+        assert storage['issues'][0]['code'] == 'health_check_timed_out'
+        assert storage['sample']['running_seconds'] >= 0.2
+        assert stale['ok'] is False and stale['stale'] is True
+        assert hung['services']['database']['ok'] is True
+        assert len(calls) == 2
+
     def test_healthz_database_error_hides_exception_details(self, app, client, monkeypatch):
         """Database probe failures must not expose raw driver errors or credentials."""
         def fail_probe(*args, **kwargs):
@@ -751,3 +751,38 @@ class TestDropboxFolderApi:
         assert data['attempted_path'] == '/Missing'
         assert 'provider-root-secret' not in response.get_data(as_text=True)
         assert 'old-dropbox-access' not in response.get_data(as_text=True)
+
+
+class TestDatastoreExportApi:
+    """Tests for /api/datastore/<object_type>/export."""
+
+    def test_export_streams_projected_ndjson_for_automation_token(self, app, client):
+        """Automation clients can stream projected rows without logging in."""
+        app.config['AUTOMATION_TOKEN'] = 'automation-secret'
+        _create_song(app, title='First', genre='Rock')
+        _create_song(app, title='Second', genre='Pop')
+
+        response = client.get(
+            '/api/datastore/song/export?fields=title&filters={"genre":"Pop"}',
+            headers={'X-Automation-Token': 'automation-secret'},
+        )
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [set(row) for row in rows] == [{'id', 'title'}]
+        assert rows[0]['title'] == 'Second'
+
+    def test_export_rejects_unknown_fields_and_anonymous_callers(self, app, client):
+        """Invalid arguments return JSON errors and anonymous callers are refused."""
+        app.config['AUTOMATION_TOKEN'] = 'automation-secret'
+
+        bad_field = client.get(
+            '/api/datastore/song/export?fields=nope',
+            headers={'X-Automation-Token': 'automation-secret'},
+        )
+        anonymous = client.get('/api/datastore/song/export', headers={'Accept': 'application/json'})
+
+        assert bad_field.status_code == 400
+        assert 'Unknown field' in bad_field.get_json()['message']
+        assert anonymous.status_code == 401
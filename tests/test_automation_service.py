@@ -4,11 +4,14 @@ import os
 import json
 import shutil
 import tempfile
+import threading
+import time
 from datetime import datetime, timedelta
 from unittest.mock import patch
 
 import pytest
 from pydub import AudioSegment
+from sqlalchemy import select
 
 os.environ.setdefault("SECRET_KEY", "test-secret-key-for-testing-only")
 os.environ.setdefault("AUTOMATION_TOKEN", "test-automation-token-for-testing")
@@ -2278,6 +2281,24 @@ class TestAssetInspection:
             assert mock_plan.call_args_list[0].kwargs["additional_limit"] == 6
             assert mock_plan.call_args_list[0].kwargs["verify_previews"] is True
 
+    def test_round_repair_plan_batch_reports_each_round_as_it_finishes(self, app):
+        with app.app_context():
+            def fake_plan(round_id, **kwargs):
+                if round_id == 2:
+                    raise automation.AutomationError("Round 2 was not found.")
+                return {"round_id": round_id, "ok": True, "status": "ok"}
+
+            reported = []
+            with patch("musicround.services.automation.round_repair_plan", side_effect=fake_plan):
+                automation.round_repair_plan_batch(
+                    [1, 2, 3],
+                    on_item=lambda item, completed, total: reported.append(
+                        (item["round_id"], item["status"], completed, total)
+                    ),
+                )
+
+            assert reported == [(1, "ok", 1, 3), (2, "error", 2, 3), (3, "ok", 3, 3)]
+
     def test_round_repair_plan_batch_validates_ids(self, app):
         with app.app_context():
             with pytest.raises(automation.AutomationError, match="at least one"):
@@ -2437,15 +2458,20 @@ class TestAssetInspection:
                 round_type="manual",
                 song_ids=[song.id],
             )["round"]["id"]
-            pdf_path = tmp_path / "round.pdf"
-            mp3_path = tmp_path / "round.mp3"
-            pdf_path.write_bytes(b"%PDF-1.4\n%%EOF\n")
-            mp3_path.write_bytes(b"mp3")
+            store = automation.round_artifact_store()
+            store.write_bytes("pdf", round_id, b"%PDF-1.4\n%%EOF\n")
+            store.write_bytes("mp3", round_id, b"mp3")
+            sent = {}
+
+            def fake_send_email(target, subject, body, attachments, smtp_pool=None):
+                sent.update({item["filename"]: item["data"].read() for item in attachments})
+                return True, "sent"
 
             with (
                 patch(
                     "musicround.services.automation.generate_round_assets",
-                    return_value={"pdf": {"path": str(pdf_path)}, "mp3": {"path": str(mp3_path)}},
+                    # The attachments come from the artifact store, not these paths.
+                    return_value={"pdf": {"path": str(tmp_path / "gone.pdf")}, "mp3": {"path": str(tmp_path / "gone.mp3")}},
                 ),
                 patch(
                     "musicround.services.automation.inspect_round_package",
@@ -2453,7 +2479,7 @@ class TestAssetInspection:
                 ),
                 patch(
                     "musicround.services.automation.send_email",
-                    return_value=(True, "sent"),
+                    side_effect=fake_send_email,
                 ),
             ):
                 result = automation.email_round(
@@ -2464,6 +2490,7 @@ class TestAssetInspection:
                 )
 
             assert result["success"] is True
+            assert sent == {f"round_{round_id}.pdf": b"%PDF-1.4\n%%EOF\n", f"round_{round_id}.mp3": b"mp3"}
             assert result["review_gate"]["override"] is True
             round_obj = db.session.get(Round, round_id)
             assert round_obj.review_status == "sent"
@@ -3154,6 +3181,126 @@ class TestAssetInspection:
             assert export.status == "success"
             assert export.processed_at is not None
 
+    def test_process_due_scheduled_round_emails_claims_batch_and_sends_concurrently(self, app):
+        with app.app_context():
+            _configure_mail(app)
+            app.config["SCHEDULED_EMAIL_WORKERS"] = 3
+            user = _create_user()
+            song = _create_song(title="Burst", artist="Artist")
+            round_id = automation.create_round(
+                name="Burst Round",
+                round_type="manual",
+                song_ids=[song.id],
+            )["round"]["id"]
+            due_at = datetime(2026, 7, 9, 18, 0)
+            exports = []
+            for index, status in enumerate(["scheduled", "scheduled", "scheduled", "processing"]):
+                export = RoundExport(
+                    round_id=round_id,
+                    user_id=user.id,
+                    export_type="email",
+                    destination=f"team{index}@example.test",
+                    include_mp3s=True,
+                    status=status,
+                    scheduled_for=datetime(2026, 7, 9, 17, index),
+                )
+                db.session.add(export)
+                exports.append(export)
+            db.session.commit()
+            export_ids = [export.id for export in exports]
+
+            barrier = threading.Barrier(3, timeout=5)
+
+            def fake_email_round(round_id, **kwargs):
+                # All three deliveries must be in flight at the same time.
+                barrier.wait()
+                if kwargs["recipient"] == "team1@example.test":
+                    raise RuntimeError("smtp-secret")
+                return {"success": True, "message": f"sent to {kwargs['recipient']}"}
+
+            with patch(
+                "musicround.services.automation.email_round",
+                side_effect=fake_email_round,
+            ) as mock_email:
+                result = automation.process_due_scheduled_round_emails(now=due_at)
+
+            assert result["processed_count"] == 3
+            assert mock_email.call_count == 3
+            pools = {call.kwargs["smtp_pool"] for call in mock_email.call_args_list}
+            assert len(pools) == 1
+            assert [item["export"]["id"] for item in result["results"]] == export_ids[:3]
+            db.session.expire_all()
+            statuses = [db.session.get(RoundExport, export_id).status for export_id in export_ids]
+            assert statuses == ["success", "failed", "success", "processing"]
+            assert db.session.get(RoundExport, export_ids[0]).error_message == "sent to team0@example.test"
+
+            again = automation.process_due_scheduled_round_emails(now=due_at)
+            assert again["processed_count"] == 0
+
+    def test_process_due_scheduled_round_emails_reclaims_stale_claims_and_commits_each_outcome(self, app):
+        with app.app_context():
+            _configure_mail(app)
+            app.config["SCHEDULED_EMAIL_WORKERS"] = 1
+            app.config["SCHEDULED_EMAIL_CLAIM_TIMEOUT_SECONDS"] = 600
+            user = _create_user()
+            song = _create_song(title="Stale", artist="Artist")
+            round_id = automation.create_round(
+                name="Stale Round",
+                round_type="manual",
+                song_ids=[song.id],
+            )["round"]["id"]
+            due_at = datetime(2026, 7, 9, 18, 0)
+            claimed_at = {
+                "stale": datetime.utcnow() - timedelta(hours=1),
+                "fresh": datetime.utcnow() - timedelta(minutes=1),
+                "scheduled": None,
+            }
+            exports = {}
+            for index, (label, processed_at) in enumerate(claimed_at.items()):
+                exports[label] = RoundExport(
+                    round_id=round_id,
+                    user_id=user.id,
+                    export_type="email",
+                    destination=f"{label}@example.test",
+                    include_mp3s=True,
+                    status="scheduled" if processed_at is None else "processing",
+                    scheduled_for=datetime(2026, 7, 9, 17, index),
+                    processed_at=processed_at,
+                )
+                db.session.add(exports[label])
+            db.session.commit()
+            export_ids = {label: export.id for label, export in exports.items()}
+            committed_before_second_send = []
+
+            def fake_email_round(round_id, **kwargs):
+                if kwargs["recipient"] == "scheduled@example.test":
+                    # The first outcome must reach the database while this send is still running.
+                    deadline = time.monotonic() + 5
+                    status = None
+                    while status != "success" and time.monotonic() < deadline:
+                        with db.engine.connect() as connection:
+                            status = connection.execute(
+                                select(RoundExport.status).where(RoundExport.id == export_ids["stale"])
+                            ).scalar_one()
+                        time.sleep(0.01)
+                    committed_before_second_send.append(status)
+                return {"success": True, "message": f"sent to {kwargs['recipient']}"}
+
+            with patch(
+                "musicround.services.automation.email_round",
+                side_effect=fake_email_round,
+            ) as mock_email:
+                result = automation.process_due_scheduled_round_emails(now=due_at)
+
+            assert [call.kwargs["recipient"] for call in mock_email.call_args_list] == [
+                "stale@example.test",
+                "scheduled@example.test",
+            ]
+            assert result["processed_count"] == 2
+            assert committed_before_second_send == ["success"]
+            db.session.expire_all()
+            assert db.session.get(RoundExport, export_ids["fresh"]).status == "processing"
+
     def test_process_due_scheduled_round_email_hides_exception_text(self, app):
         with app.app_context():
             _configure_mail(app)
@@ -3356,6 +3503,72 @@ class TestDatastoreCrudAutomation:
             assert result["object"]["spotify_token"] == "[redacted]"
             assert result["object"]["password_hash"] == "[redacted]"
 
+    def test_list_projects_fields_and_pages_by_keyset_cursor(self, app):
+        with app.app_context():
+            for index, year in enumerate([1990, None, 1985, None, 1990]):
+                _create_song(title=f"Song {index}", artist="Cursor", year=year)
+
+            seen = {}
+            for order_by in ("year", "-year"):
+                cursor = None
+                rows = []
+                while True:
+                    page = automation.list_datastore_objects(
+                        "song",
+                        filters={"artist": "Cursor"},
+                        limit=2,
+                        order_by=order_by,
+                        fields=["year"],
+                        cursor=cursor,
+                        include_total=False,
+                    )
+                    rows.extend(page["objects"])
+                    cursor = page["next_cursor"]
+                    if not page["has_more"]:
+                        break
+                seen[order_by] = rows
+
+            assert seen["year"][0] == {"id": seen["year"][0]["id"], "year": None}
+            assert [row["year"] for row in seen["year"]] == [None, None, 1985, 1990, 1990]
+            assert [row["year"] for row in seen["-year"]] == [1990, 1990, 1985, None, None]
+            assert len({row["id"] for row in seen["-year"]}) == 5
+            assert page["total"] is None
+            year_cursor = automation.list_datastore_objects("song", limit=1, order_by="year")["next_cursor"]
+            with pytest.raises(automation.AutomationError, match="different order_by"):
+                automation.list_datastore_objects("song", order_by="title", cursor=year_cursor)
+            with pytest.raises(automation.AutomationError, match="Unknown field"):
+                automation.list_datastore_objects("song", fields=["nope"])
+
+    def test_count_groups_and_export_pages_ndjson(self, app):
+        with app.app_context():
+            for genre in ["rock", "rock", "pop"]:
+                _create_song(title=f"{genre} song", artist="Counter", genre=genre)
+
+            counts = automation.count_datastore_objects(
+                "song", filters={"artist": "Counter"}, group_by="genre"
+            )
+            first = automation.export_datastore_objects(
+                "song", filters={"artist": "Counter"}, fields=["title"], limit=2
+            )
+            second = automation.export_datastore_objects(
+                "song", filters={"artist": "Counter"}, fields=["title"], limit=2,
+                cursor=first["next_cursor"],
+            )
+            fetched = automation.get_datastore_object("song", json.loads(
+                first["ndjson"].splitlines()[0]
+            )["id"], fields=["genre"])
+
+            assert counts["total"] == 3
+            assert counts["groups"] == [{"value": "rock", "count": 2}, {"value": "pop", "count": 1}]
+            assert first["row_count"] == 2 and first["has_more"] is True
+            assert second["row_count"] == 1 and second["has_more"] is False
+            titles = [
+                json.loads(line)["title"]
+                for line in (first["ndjson"] + second["ndjson"]).splitlines()
+            ]
+            assert titles == ["rock song", "rock song", "pop song"]
+            assert set(fetched["object"]) == {"id", "genre"}
+
 
 class TestAgentPlanningAutomation:
     """Tests for agent-facing planning and review helpers."""
@@ -3385,6 +3598,68 @@ class TestAgentPlanningAutomation:
             assert result["active_jobs"][0]["id"] == record.id
             assert result["queue_snapshot"][0]["record_id"] == record.id
 
+    def test_import_status_counts_uses_one_grouped_query(self, app):
+        with app.app_context():
+            user = _create_user(username="groupedcounts", email="groupedcounts@example.test")
+            for status in ("pending", "pending", "processing", "dead_letter"):
+                db.session.add(
+                    ImportJobRecord(
+                        service_name="deezer",
+                        item_type="track",
+                        item_id=f"{status}-track",
+                        user_id=user.id,
+                        status=status,
+                    )
+                )
+            db.session.commit()
+            user_id = user.id
+            statements = []
+
+            def _record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            from sqlalchemy import event
+
+            event.listen(db.engine, "before_cursor_execute", _record)
+            try:
+                stats = automation.import_status_counts(user_id=user_id)
+            finally:
+                event.remove(db.engine, "before_cursor_execute", _record)
+
+            assert stats == {
+                "pending": 2,
+                "processing": 1,
+                "completed": 0,
+                "failed": 0,
+                "dead_letter": 1,
+            }
+            assert len(statements) == 1
+            assert "GROUP BY" in statements[0]
+
+    def test_watch_import_progress_returns_pushed_transitions(self, app):
+        with app.app_context():
+            user = _create_user(username="watchprogress", email="watchprogress@example.test")
+            queue = ImportQueue()
+            app.config["IMPORT_QUEUE"] = queue
+            record = queue.enqueue("deezer", "album", "watch-album", user.id)
+            frames = []
+
+            result = automation.watch_import_progress(
+                since_sequence=0,
+                timeout_seconds=0,
+                on_event=frames.append,
+            )
+
+            assert result["stats"]["pending"] == 1
+            assert result["next_sequence"] == queue.events.latest_sequence
+            assert [event["job_id"] for event in result["events"]] == [record.id]
+            assert [frame["event"] for frame in frames] == ["snapshot", "job"]
+
+    def test_watch_import_progress_rejects_long_timeouts(self, app):
+        with app.app_context():
+            with pytest.raises(automation.AutomationError):
+                automation.watch_import_progress(timeout_seconds=301)
+
     def test_import_progress_events_includes_repair_metadata(self, app):
         with app.app_context():
             user = _create_user(username="repairmeta", email="repairmeta@example.test")
@@ -676,3 +676,427 @@ class TestGenerateBackupConfigSuggestion:
         result = generate_backup_config_suggestion(retention_days=30)
         # Check for some expected keys
         assert result is not None
+
+
+@pytest.fixture
+def incremental_env(app, tmp_path):
+    """Point backups, the live SQLite DB, MP3s, and .env at a temp directory."""
+    live_db = tmp_path / 'live.db'
+    _write_sqlite_db(live_db, marker='first')
+    mp3_dir = tmp_path / 'mp3'
+    mp3_dir.mkdir()
+    (mp3_dir / 'a.mp3').write_bytes(os.urandom(20000))
+    (mp3_dir / 'b.mp3').write_bytes(os.urandom(20000))
+    env_file = tmp_path / '.env'
+    env_file.write_text('EXAMPLE=1\n')
+    app.config.update(
+        DATA_DIR=str(tmp_path / 'data'),
+        SQLALCHEMY_DATABASE_URI=f'sqlite:///{live_db}',
+        DATABASE_BACKEND='sqlite',
+        BACKUP_CHUNK_SIZE=8192,
+        BACKUP_GC_GRACE_SECONDS=0,
+    )
+    with patch('musicround.helpers.backup_helper._mp3_source_dir', return_value=str(mp3_dir)), \
+         patch('musicround.helpers.backup_helper._env_file_path', return_value=str(env_file)):
+        yield {'live_db': live_db, 'mp3_dir': mp3_dir, 'backups': tmp_path / 'data' / 'backups'}
+
+
+class TestIncrementalBackup:
+    """Tests for chunk-store incremental backups."""
+
+    def test_second_backup_stores_only_changed_data(self, app, incremental_env):
+        from musicround.helpers.backup_helper import create_backup, list_backups
+
+        first = create_backup('first', incremental=True)
+        (incremental_env['mp3_dir'] / 'c.mp3').write_bytes(os.urandom(10000))
+        second = create_backup('second', incremental=True)
+
+        assert first['status'] == 'success'
+        assert second['status'] == 'success'
+        assert second['stats']['unchanged_files'] == 3  # a.mp3, b.mp3, .env
+        assert second['stats']['read_bytes'] < first['stats']['read_bytes']
+        assert second['stats']['stored_bytes'] < first['stats']['stored_bytes']
+        listed = {backup['file_name']: backup for backup in list_backups()}
+        assert listed['second.manifest.json']['backup_format'] == 'incremental'
+
+    def test_restore_rewrites_only_files_that_differ(self, app, incremental_env):
+        from musicround.helpers.backup_helper import create_backup, restore_backup
+
+        create_backup('snapshot', incremental=True)
+        mp3_dir = incremental_env['mp3_dir']
+        original_b = (mp3_dir / 'b.mp3').read_bytes()
+        (mp3_dir / 'b.mp3').write_bytes(b'changed')
+        (mp3_dir / 'extra.mp3').write_bytes(b'extra')
+        _write_sqlite_db(incremental_env['live_db'], marker='second')
+
+        result = restore_backup('snapshot.manifest.json')
+
+        assert result['status'] == 'success'
+        assert result['restored_files'] == 1
+        assert result['unchanged_files'] == 1
+        assert (mp3_dir / 'b.mp3').read_bytes() == original_b
+        assert not (mp3_dir / 'extra.mp3').exists()
+        assert _read_sqlite_marker(incremental_env['live_db']) == 'first'
+        set_aside = list(mp3_dir.parent.glob('mp3.*.bak'))
+        assert set_aside and sorted(p.name for p in set_aside[0].iterdir()) == ['b.mp3', 'extra.mp3']
+
+    def test_retention_collects_chunks_only_expired_manifests_used(self, app, incremental_env):
+        from musicround.helpers.backup_helper import (
+            _chunk_store,
+            apply_retention_policy,
+            create_backup,
+            verify_backup,
+        )
+
+        create_backup('old', incremental=True)
+        (incremental_env['mp3_dir'] / 'a.mp3').unlink()
+        create_backup('new', incremental=True)
+        old_manifest = incremental_env['backups'] / 'old.manifest.json'
+        manifest = json.loads(old_manifest.read_text())
+        manifest['timestamp'] = '2000-01-01T00:00:00'
+        old_manifest.write_text(json.dumps(manifest))
+        a_chunks = next(e['chunks'] for e in manifest['files'] if e['path'] == 'mp3/a.mp3')
+
+        result = apply_retention_policy(retention_days=30)
+
+        store = _chunk_store()
+        assert result['deleted_count'] == 1
+        assert result['garbage_collection']['removed_chunks'] >= len(a_chunks)
+        assert not any(store.has_chunk(digest) for digest in a_chunks)
+        assert verify_backup('new.manifest.json')['is_valid'] is True
+
+    def test_verify_reports_missing_chunks(self, app, incremental_env):
+        from musicround.helpers.backup_helper import _chunk_store, create_backup, verify_backup
+
+        create_backup('broken', incremental=True)
+        manifest = json.loads((incremental_env['backups'] / 'broken.manifest.json').read_text())
+        os.remove(_chunk_store().chunk_path(manifest['files'][0]['chunks'][0]))
+
+        result = verify_backup('broken.manifest.json')
+
+        assert result['is_valid'] is False
+        assert 'missing 1 stored chunks' in result['message']
+
+    def test_chunk_store_rejects_corrupt_chunks(self, tmp_path):
+        from musicround.helpers.backup_store import ChunkStore, ChunkStoreError
+
+        store = ChunkStore(str(tmp_path), chunk_size=4096)
+        digest, written = store.put_chunk(b'payload')
+        assert store.put_chunk(b'payload') == (digest, 0)
+        with open(store.chunk_path(digest), 'wb') as handle:
+            handle.write(b'not zlib')
+
+        with pytest.raises(ChunkStoreError, match='corrupt'):
+            store.read_chunk(digest)
+
+
+class TestStreamingArchiveBackup:
+    """Tests for ZIP backups streamed without a staging directory."""
+
+    def test_archive_streams_members_and_writes_checksum_manifest(self, app, incremental_env):
+        import hashlib
+        from musicround.helpers.backup_helper import create_backup, restore_backup
+
+        result = create_backup('streamed')
+
+        assert result['status'] == 'success'
+        backups = incremental_env['backups']
+        assert sorted(p.name for p in backups.iterdir()) == ['streamed.zip']
+        with zipfile.ZipFile(result['path']) as zipf:
+            infos = {info.filename: info for info in zipf.infolist()}
+            manifest = json.loads(zipf.read('backup_manifest.json'))
+            for entry in manifest['files']:
+                assert hashlib.sha256(zipf.read(entry['path'])).hexdigest() == entry['sha256']
+        assert infos['mp3/a.mp3'].compress_type == zipfile.ZIP_STORED
+        assert infos['song_data.db'].compress_type == zipfile.ZIP_DEFLATED
+        assert {entry['path'] for entry in manifest['files']} >= {
+            'song_data.db', 'mp3/a.mp3', 'mp3/b.mp3', 'config/.env', 'backup_metadata.json'
+        }
+
+        _write_sqlite_db(incremental_env['live_db'], marker='second')
+        assert restore_backup('streamed.zip')['status'] == 'success'
+        assert _read_sqlite_marker(incremental_env['live_db']) == 'first'
+
+    def test_member_digest_covers_bytes_written_while_source_grows(self, tmp_path):
+        import builtins
+        from musicround.helpers import backup_archive
+        from musicround.helpers.backup_archive import BackupArchiveWriter, verify_archive_members
+
+        source = tmp_path / 'growing.log'
+        source.write_bytes(b'a' * 10)
+        opened = []
+        real_open = builtins.open
+
+        def tracking_open(path, *args, **kwargs):
+            handle = real_open(path, *args, **kwargs)
+            if str(path) == str(source):
+                opened.append(path)
+                # A writer appends after the backup has started reading.
+                with real_open(source, 'ab') as writer:
+                    writer.write(b'b' * 5)
+            return handle
+
+        archive_path = str(tmp_path / 'grow.zip')
+        with patch.object(backup_archive, '_READ_BLOCK_SIZE', 4), \
+             patch('builtins.open', tracking_open):
+            with BackupArchiveWriter(archive_path, workers=1) as writer:
+                writer.add_files([(str(source), 'logs/growing.log')])
+                entries = writer.entries
+
+        assert len(opened) == 1
+        with zipfile.ZipFile(archive_path) as zipf:
+            assert zipf.getinfo('logs/growing.log').file_size == entries[0]['size']
+        assert verify_archive_members(archive_path, entries) == []
+
+    def test_failed_archive_leaves_no_partial_files(self, app, incremental_env):
+        from musicround.helpers.backup_helper import create_backup
+
+        with patch('musicround.helpers.backup_archive.BackupArchiveWriter.add_files',
+                   side_effect=OSError('disk full')):
+            result = create_backup('broken')
+
+        assert result['status'] == 'error'
+        assert list(incremental_env['backups'].iterdir()) == []
+
+
+class TestLogicalBackup:
+    """Tests for backend-agnostic per-table NDJSON backups."""
+
+    def test_logical_backup_cannot_also_be_incremental(self, app, incremental_env):
+        from musicround.helpers.backup_helper import create_backup
+
+        with pytest.raises(ValueError, match="incremental or logical"):
+            create_backup('both', incremental=True, logical=True)
+
+        assert not list(incremental_env['backups'].glob('both*'))
+
+    def test_logical_backup_round_trips_tables_in_keyset_batches(self, app, incremental_env):
+        from datetime import datetime
+        from musicround.helpers.backup_helper import create_backup, restore_backup
+        from musicround.models import Song, db
+
+        app.config['BACKUP_LOGICAL_BATCH_SIZE'] = 2
+        played = datetime(2024, 5, 6, 7, 8, 9)
+        for index in range(5):
+            db.session.add(Song(title=f'Song {index}', artist='Artist', last_used=played))
+        db.session.commit()
+
+        result = create_backup('dump', logical=True)
+
+        assert result['status'] == 'success'
+        assert result['path'].endswith('dump.logical.zip')
+        with zipfile.ZipFile(result['path']) as zipf:
+            manifest = json.loads(zipf.read('database/manifest.json'))
+        song_entry = next(t for t in manifest['tables'] if t['name'] == 'song')
+        assert song_entry['rows'] == 5
+
+        db.session.delete(db.session.get(Song, 2))
+        db.session.get(Song, 3).title = 'Edited'
+        db.session.commit()
+
+        restored = restore_backup('dump.logical.zip')
+
+        assert restored['status'] == 'success'
+        songs = db.session.execute(db.select(Song).order_by(Song.id)).scalars().all()
+        assert [song.title for song in songs] == [f'Song {i}' for i in range(5)]
+        assert all(song.last_used == played for song in songs)
+        db.session.add(Song(title='After restore', artist='Artist'))
+        db.session.commit()
+        assert db.session.execute(db.select(db.func.max(Song.id))).scalar() == 6
+
+    def test_sqlite_dump_reads_one_snapshot_while_rows_are_inserted(self, tmp_path):
+        import io
+        from contextlib import contextmanager
+        from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+        from musicround.helpers.logical_backup import dump_database
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'live.db'}")
+        metadata = MetaData()
+        items = Table('items', metadata, Column('id', Integer, primary_key=True), Column('name', String))
+        metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.exec_driver_sql('PRAGMA journal_mode=WAL')
+            connection.execute(items.insert(), [{'name': f'row {index}'} for index in range(10)])
+
+        @contextmanager
+        def open_member(name):
+            # Another writer commits while the dump is already under way.
+            with engine.begin() as writer:
+                writer.execute(items.insert(), [{'name': 'late'} for _ in range(10)])
+            yield io.BytesIO()
+
+        manifest = dump_database(engine, metadata, open_member, batch_size=3)
+
+        assert manifest['tables'][0]['rows'] == 10
+        engine.dispose()
+
+    def test_truncated_table_rolls_back_logical_restore(self, app, incremental_env):
+        from musicround.helpers.backup_helper import create_backup, restore_backup
+        from musicround.models import Song, db
+
+        db.session.add(Song(title='Kept', artist='Artist'))
+        db.session.commit()
+        path = create_backup('short', logical=True)['path']
+        with zipfile.ZipFile(path) as zipf:
+            members = {name: zipf.read(name) for name in zipf.namelist()}
+        manifest = json.loads(members['database/manifest.json'])
+        next(t for t in manifest['tables'] if t['name'] == 'song')['rows'] = 2
+        members['database/manifest.json'] = json.dumps(manifest).encode()
+        with zipfile.ZipFile(path, 'w') as zipf:
+            for name, data in members.items():
+                zipf.writestr(name, data)
+        db.session.add(Song(title='Current', artist='Artist'))
+        db.session.commit()
+
+        result = restore_backup('short.logical.zip')
+
+        assert result['status'] == 'error'
+        titles = db.session.execute(db.select(Song.title).order_by(Song.id)).scalars().all()
+        assert titles == ['Kept', 'Current']
+
+
+def _rewrite_zip_member(zip_path, member_name, data):
+    with zipfile.ZipFile(zip_path) as zipf:
+        members = [(info, zipf.read(info.filename)) for info in zipf.infolist()]
+    with zipfile.ZipFile(zip_path, 'w') as zipf:
+        for info, content in members:
+            zipf.writestr(info, data if info.filename == member_name else content)
+
+
+class TestBackupVerificationLevels:
+    """Tests for quick/full verification and the per-file result cache."""
+
+    def test_full_check_catches_same_size_corruption_quick_check_skips(self, app, incremental_env):
+        from musicround.helpers.backup_helper import create_backup, verify_backup
+
+        path = create_backup('checked')['path']
+        size = os.path.getsize(incremental_env['mp3_dir'] / 'a.mp3')
+        _rewrite_zip_member(path, 'mp3/a.mp3', b'\0' * size)
+        progress = []
+
+        quick = verify_backup('checked.zip')
+        full = verify_backup('checked.zip', level='full', progress=lambda done, total: progress.append((done, total)))
+
+        assert quick['is_valid'] is True and quick['level'] == 'quick'
+        assert full['is_valid'] is False
+        assert 'mp3/a.mp3' in full['message']
+        assert progress[-1][0] == progress[-1][1] > 0
+
+    def test_results_are_cached_per_file_and_mtime(self, app, incremental_env):
+        from musicround.helpers.backup_helper import create_backup, list_backups, verify_backup
+
+        path = create_backup('cached')['path']
+        first = verify_backup('cached.zip', level='full')
+
+        with patch('musicround.helpers.backup_helper.verify_archive_members') as members:
+            again = verify_backup('cached.zip', level='full')
+            quick = verify_backup('cached.zip')
+        members.assert_not_called()
+        assert first['is_valid'] and again['cached'] and quick['cached']
+        listed = {backup['file_name']: backup for backup in list_backups()}
+        assert listed['cached.zip']['verification']['level'] == 'full'
+
+        stat_result = os.stat(path)
+        os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+        assert verify_backup('cached.zip').get('cached') is None
+
+    def test_full_check_rehashes_incremental_chunks(self, app, incremental_env):
+        from musicround.helpers.backup_helper import _chunk_store, create_backup, verify_backup
+
+        create_backup('chunks', incremental=True)
+        manifest = json.loads((incremental_env['backups'] / 'chunks.manifest.json').read_text())
+        digest = next(e['chunks'][0] for e in manifest['files'] if e['path'] == 'mp3/a.mp3')
+        with open(_chunk_store().chunk_path(digest), 'wb') as handle:
+            handle.write(b'garbage')
+
+        assert verify_backup('chunks.manifest.json')['is_valid'] is True
+        result = verify_backup('chunks.manifest.json', level='full')
+        assert result['is_valid'] is False
+        assert '1 corrupt stored chunks' in result['message']
+
+    def test_incremental_cache_ignores_full_requests_and_tracks_chunk_gc(self, app, incremental_env):
+        from musicround.helpers.backup_helper import (
+            _chunk_store,
+            create_backup,
+            garbage_collect_backup_chunks,
+            verify_backup,
+        )
+
+        create_backup('gc', incremental=True)
+        assert verify_backup('gc.manifest.json', level='full')['is_valid'] is True
+        assert verify_backup('gc.manifest.json')['cached'] is True
+
+        manifest = json.loads((incremental_env['backups'] / 'gc.manifest.json').read_text())
+        digest = next(e['chunks'][0] for e in manifest['files'] if e['path'] == 'mp3/a.mp3')
+        store = _chunk_store()
+        os.remove(store.chunk_path(digest))
+        stray = store.chunk_path('0' * 64)
+        os.makedirs(os.path.dirname(stray), exist_ok=True)
+        with open(stray, 'wb') as handle:
+            handle.write(b'unreferenced')
+        os.utime(stray, (0, 0))
+        assert verify_backup('gc.manifest.json')['cached'] is True
+
+        assert garbage_collect_backup_chunks(grace_seconds=0)['removed_chunks'] == 1
+        quick = verify_backup('gc.manifest.json')
+        assert quick.get('cached') is None and quick['is_valid'] is False
+
+        full = verify_backup('gc.manifest.json', level='full')
+        assert full.get('cached') is None and full['is_valid'] is False
+
+
+class TestSteppedSqliteBackup:
+    """Tests for the page-stepped SQLite online backup."""
+
+    def _make_large_db(self, path, rows=400, wal=False):
+        conn = sqlite3.connect(path)
+        try:
+            if wal:
+                conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE smoke (value TEXT)')
+            conn.executemany('INSERT INTO smoke (value) VALUES (?)', [('x' * 500,)] * rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def test_copies_in_steps_with_progress_and_pauses(self, tmp_path):
+        from musicround.helpers.sqlite_backup import online_backup
+
+        source = tmp_path / 'live.db'
+        self._make_large_db(source, wal=True)
+        progress = []
+
+        with patch('musicround.helpers.sqlite_backup.time.sleep') as sleep:
+            stats = online_backup(str(source), str(tmp_path / 'copy.db'), pages=8,
+                                  progress=lambda done, total: progress.append((done, total)))
+
+        assert stats['journal_mode'] == 'wal'
+        assert stats['steps'] > 1 and stats['restarts'] == 0
+        assert sleep.call_count == stats['steps'] - 1
+        assert progress[-1][0] == progress[-1][1] == stats['pages']
+        copy = sqlite3.connect(tmp_path / 'copy.db')
+        assert copy.execute('SELECT COUNT(*) FROM smoke').fetchone()[0] == 400
+        copy.close()
+
+    def test_finishes_in_one_step_after_too_many_write_restarts(self, tmp_path):
+        from musicround.helpers.sqlite_backup import online_backup
+
+        source = tmp_path / 'live.db'
+        self._make_large_db(source)
+        writer = sqlite3.connect(source)
+
+        def write_between_steps(done, total):
+            writer.execute("INSERT INTO smoke (value) VALUES ('late')")
+            writer.commit()
+
+        try:
+            stats = online_backup(str(source), str(tmp_path / 'copy.db'), pages=8,
+                                  sleep_seconds=0, max_restarts=1, progress=write_between_steps)
+        finally:
+            writer.close()
+
+        assert stats['single_step_fallback'] is True
+        copy = sqlite3.connect(tmp_path / 'copy.db')
+        assert copy.execute('PRAGMA integrity_check').fetchone()[0] == 'ok'
+        assert copy.execute("SELECT COUNT(*) FROM smoke WHERE value = 'late'").fetchone()[0] >= 1
+        copy.close()
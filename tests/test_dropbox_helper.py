@@ -234,3 +234,132 @@ def test_get_dropbox_account_info_uses_timeout(app):
 
         assert result == {'account_id': 'dbid:123'}
         assert mock_post.call_args.kwargs['timeout'] == dropbox_helper.DROPBOX_API_TIMEOUT_SECONDS
+
+
+class _FakeDropboxSessions:
+    """Records upload-session calls and answers like the Dropbox content API."""
+
+    def __init__(self, fail_append_once_at=None):
+        self.calls = []
+        self.received = b''
+        self.fail_append_once_at = fail_append_once_at
+
+    def __call__(self, url, headers=None, data=None, json=None, timeout=None):
+        endpoint = url.rsplit('/2/', 1)[-1]
+        arg = dropbox_helper.json.loads(headers.get('Dropbox-API-Arg', '{}'))
+        self.calls.append((endpoint, arg, len(data) if data is not None else None, timeout))
+        if endpoint == 'files/upload_session/start':
+            self.received = bytes(data)
+            return _make_response(200, {'session_id': 'session-1'})
+        if endpoint == 'files/upload_session/append_v2':
+            offset = arg['cursor']['offset']
+            if offset != len(self.received):
+                return _make_response(409, {'error': {
+                    '.tag': 'incorrect_offset', 'correct_offset': len(self.received),
+                }})
+            if self.fail_append_once_at is not None:
+                # The first half of this chunk lands, then the connection drops.
+                self.received += bytes(data[:self.fail_append_once_at])
+                self.fail_append_once_at = None
+                raise dropbox_helper.requests.ConnectionError('reset')
+            self.received += bytes(data)
+            return _make_response(200, None)
+        if endpoint == 'files/upload_session/finish_batch_v2':
+            return _make_response(200, {'entries': [
+                {'.tag': 'success', 'path_display': entry['commit']['path'], 'size': entry['cursor']['offset']}
+                for entry in json['entries']
+            ]})
+        raise AssertionError(f'unexpected Dropbox call {endpoint}')
+
+
+def test_upload_files_to_dropbox_uses_chunked_session_for_large_files(app):
+    chunk = 4 * 1024 * 1024
+    payload = bytes(range(256)) * (chunk * 2 // 256) + b'tail'
+    fake = _FakeDropboxSessions()
+    with app.app_context():
+        with patch('musicround.helpers.dropbox_helper.requests.post', side_effect=fake), \
+                patch('musicround.helpers.dropbox_helper.upload_to_dropbox') as mock_simple:
+            mock_simple.return_value = {'success': True, 'message': 'ok', 'metadata': {}}
+            results = dropbox_helper.upload_files_to_dropbox(
+                'token',
+                [
+                    {'path': '/rounds/meta.json', 'data': '{}', 'mode': 'text'},
+                    {'path': '/rounds/round.mp3', 'data': dropbox_helper.io.BytesIO(payload)},
+                ],
+                chunk_size=chunk,
+            )
+
+    assert [result['success'] for result in results] == [True, True]
+    assert results[1]['metadata'] == {'path_display': '/rounds/round.mp3', 'size': len(payload)}
+    mock_simple.assert_called_once_with('token', '/rounds/meta.json', b'{}', mode='text')
+    assert fake.received == payload
+    assert [(call[0], call[2]) for call in fake.calls] == [
+        ('files/upload_session/start', chunk),
+        ('files/upload_session/append_v2', chunk),
+        ('files/upload_session/append_v2', 4),
+        ('files/upload_session/finish_batch_v2', None),
+    ]
+    assert fake.calls[0][1] == {'close': False}
+    assert fake.calls[2][1]['close'] is True
+    assert fake.calls[1][3] == dropbox_helper.DROPBOX_CONTENT_TIMEOUT_SECONDS
+
+
+def test_upload_session_resumes_from_reported_offset(app):
+    chunk = 4 * 1024 * 1024
+    payload = b'a' * chunk + b'b' * chunk + b'c' * 10
+    fake = _FakeDropboxSessions(fail_append_once_at=1024)
+    with app.app_context():
+        with patch('musicround.helpers.dropbox_helper.requests.post', side_effect=fake), \
+                patch('musicround.helpers.dropbox_helper.time.sleep') as mock_sleep:
+            results = dropbox_helper.upload_files_to_dropbox(
+                'token',
+                [{'path': '/rounds/round.mp3', 'data': dropbox_helper.io.BytesIO(payload)}],
+                chunk_size=chunk,
+            )
+
+    assert results[0]['success'] is True
+    assert fake.received == payload
+    appends = [call for call in fake.calls if call[0] == 'files/upload_session/append_v2']
+    # Dropped append, retried append rejected with the correct offset, then
+    # only the missing remainder of the chunk, then the final chunk.
+    assert [(call[1]['cursor']['offset'], call[2]) for call in appends] == [
+        (chunk, chunk),
+        (chunk, chunk),
+        (chunk + 1024, chunk - 1024),
+        (2 * chunk, 10),
+    ]
+    mock_sleep.assert_called_once()
+
+
+def test_upload_session_failure_is_reported_without_provider_details(app):
+    with app.app_context():
+        with patch('musicround.helpers.dropbox_helper.requests.post') as mock_post:
+            mock_post.return_value = _make_response(400, text='provider-secret-body')
+            results = dropbox_helper.upload_files_to_dropbox(
+                'token',
+                [{'path': '/rounds/round.mp3', 'data': b'x' * (5 * 1024 * 1024)}],
+                chunk_size=4 * 1024 * 1024,
+            )
+
+    assert results == [{
+        'success': False,
+        'message': dropbox_helper.DROPBOX_UPLOAD_ERROR_MESSAGE,
+        'status_code': 400,
+    }]
+
+
+def test_create_shared_links_reuses_existing_link_from_conflict(app):
+    def fake_post(url, headers=None, json=None, timeout=None):
+        if json['path'] == '/rounds/a.pdf':
+            return _make_response(200, {'url': 'https://dropbox.test/new'})
+        return _make_response(409, {'error': {
+            '.tag': 'shared_link_already_exists',
+            'shared_link_already_exists': {'metadata': {'url': 'https://dropbox.test/existing'}},
+        }})
+
+    with app.app_context():
+        with patch('musicround.helpers.dropbox_helper.requests.post', side_effect=fake_post) as mock_post:
+            links = dropbox_helper.create_shared_links('token', ['/rounds/a.pdf', '/rounds/b.mp3'])
+
+    assert [link['url'] for link in links] == ['https://dropbox.test/new', 'https://dropbox.test/existing']
+    assert mock_post.call_count == 2
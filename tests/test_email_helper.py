@@ -1,9 +1,12 @@
 """Tests for email helper SMTP transport behavior."""
+import email
+import io
 import smtplib
 
 from musicround.helpers.email_helper import (
     EMAIL_CONFIGURATION_ERROR,
     EMAIL_DELIVERY_ERROR,
+    SMTPConnectionPool,
     send_email,
     verify_email_delivery,
 )
@@ -109,6 +112,90 @@ def test_send_email_plain_smtp_does_not_start_tls_when_disabled(app, monkeypatch
     assert FakeSmtpServer.instances[0].starttls_called is False
 
 
+def test_send_email_encodes_stream_attachments_in_blocks(app, monkeypatch):
+    """Stream attachments should arrive identical to byte attachments."""
+    _configure_mail(app)
+    FakeSmtpServer.instances = []
+    monkeypatch.setattr('musicround.helpers.email_helper.smtplib.SMTP', FakeSmtpServer)
+    monkeypatch.setattr('musicround.helpers.email_helper.ATTACHMENT_ENCODE_BLOCK_SIZE', 57)
+    payload = bytes(range(256)) * 10
+
+    success, _message = send_email('to@example.test', 'Subject', 'Body', [
+        {'data': io.BytesIO(payload), 'filename': 'round_1.mp3', 'mimetype': 'audio/mpeg'},
+        {'data': payload, 'filename': 'round_1.bin', 'mimetype': 'application/octet-stream'},
+    ])
+
+    assert success is True
+    message = email.message_from_string(FakeSmtpServer.instances[0].sendmail_args[2])
+    streamed, inline = message.get_payload()[1:]
+    assert streamed['Content-Transfer-Encoding'] == 'base64'
+    assert streamed.get_content_type() == 'audio/mpeg'
+    assert streamed.get_payload(decode=True) == payload
+    assert inline.get_payload(decode=True) == payload
+
+
+class PooledSmtpServer(FakeSmtpServer):
+    """SMTP test double that keeps every message and can drop the connection once."""
+
+    drop_next = False
+
+    def __init__(self, host, port, timeout=None):
+        super().__init__(host, port, timeout)
+        self.sent = []
+        self.quit_called = False
+
+    def sendmail(self, sender, recipient, message):
+        if self.__class__.drop_next:
+            self.__class__.drop_next = False
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        self.sent.append(recipient)
+
+    def quit(self):
+        self.quit_called = True
+
+    def close(self):
+        pass
+
+
+def test_send_email_reuses_pooled_smtp_connection(app, monkeypatch):
+    """A pool should log in once and send every message over that connection."""
+    _configure_mail(app, use_tls=True)
+    FakeSmtpServer.instances = []
+    monkeypatch.setattr('musicround.helpers.email_helper.smtplib.SMTP', PooledSmtpServer)
+
+    pool = SMTPConnectionPool(size=2)
+    results = [
+        send_email(f'to{index}@example.test', 'Subject', 'Body', smtp_pool=pool)
+        for index in range(3)
+    ]
+    pool.close()
+
+    assert [success for success, _message in results] == [True, True, True]
+    assert len(FakeSmtpServer.instances) == 1
+    server = FakeSmtpServer.instances[0]
+    assert server.starttls_called is True
+    assert server.login_args == ('mailer', 'secret')
+    assert server.sent == ['to0@example.test', 'to1@example.test', 'to2@example.test']
+    assert server.quit_called is True
+
+
+def test_send_email_reconnects_when_pooled_connection_was_dropped(app, monkeypatch):
+    """An idle connection closed by the server should be replaced, not fail the send."""
+    _configure_mail(app)
+    FakeSmtpServer.instances = []
+    monkeypatch.setattr('musicround.helpers.email_helper.smtplib.SMTP', PooledSmtpServer)
+
+    pool = SMTPConnectionPool(size=1)
+    assert send_email('first@example.test', 'Subject', 'Body', smtp_pool=pool)[0] is True
+    PooledSmtpServer.drop_next = True
+    success, _message = send_email('second@example.test', 'Subject', 'Body', smtp_pool=pool)
+    pool.close()
+
+    assert success is True
+    assert len(FakeSmtpServer.instances) == 2
+    assert FakeSmtpServer.instances[1].sent == ['second@example.test']
+    assert pool.opened == 2
+
 def test_send_email_returns_safe_message_for_missing_configuration(app):
     """Missing SMTP configuration should not leak exact missing secret names."""
     app.config.update(
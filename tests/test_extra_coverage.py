@@ -292,7 +292,8 @@ class TestImportQueueStatusRoute:
         assert b'Import Queue' in response.data
         assert b'data-status-url="/import/queue-status.json"' in response.data
         assert b'data-stat="queue_size"' in response.data
-        assert b'Live polling every 15 seconds.' in response.data
+        assert b'data-events-url="/import/queue-events"' in response.data
+        assert b'Live updates connecting.' in response.data
 
     def test_queue_status_shows_failed_job_details_for_admin(self, app, client):
         """Test queue-status renders persisted failure details."""
@@ -443,6 +444,65 @@ class TestImportQueueStatusRoute:
         assert recent_job['progress_label'] == 'Waiting in queue'
         assert recent_job['repair_hints']
 
+    def test_queue_events_requires_admin(self, app, client):
+        """Test the import event stream rejects non-admin users."""
+        _login(app, client, 'nonadmin_qs_events', 'nonadmin_qs_events@example.com')
+
+        response = client.get('/import/queue-events')
+
+        assert response.status_code == 403
+        assert response.get_json()['error'] == 'Admin access required'
+
+    def test_queue_events_streams_snapshot_and_buffered_transitions(self, app, client):
+        """Test the SSE stream sends grouped counts and replays job transitions."""
+        _login_admin(app, client)
+        app.config['IMPORT_EVENT_STREAM_MAX_SECONDS'] = 0
+        queue = app.config['import_queue']
+        with app.app_context():
+            user = User.query.filter_by(username='extra_admin').first()
+            record = ImportJobRecord(
+                service_name='spotify',
+                item_type='playlist',
+                item_id='sse-playlist',
+                user_id=user.id,
+                status='processing',
+            )
+            db.session.add(record)
+            db.session.commit()
+            since = queue.events.latest_sequence
+            record.status = 'completed'
+            db.session.commit()
+            queue.events.publish(record, previous_status='processing')
+
+        response = client.get('/import/queue-events', headers={'Last-Event-ID': str(since)})
+        body = response.get_data(as_text=True)
+
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        assert 'event: snapshot' in body
+        assert '"completed": 1' in body
+        assert 'event: job' in body
+        assert '"item_id": "sse-playlist"' in body
+        assert '"previous_status": "processing"' in body
+
+    def test_queue_events_refuses_streams_over_the_process_limit(self, app, client):
+        """Test a full stream limit answers 503 and frees its slot on close."""
+        _login_admin(app, client)
+        app.config['IMPORT_EVENT_STREAM_MAX_SECONDS'] = 0
+        app.config['IMPORT_EVENT_STREAM_MAX_CLIENTS'] = 1
+
+        first = client.get('/import/queue-events')
+        refused = client.get('/import/queue-events')
+        first.close()
+        again = client.get('/import/queue-events')
+        again.close()
+
+        assert first.status_code == 200
+        assert refused.status_code == 503
+        assert refused.headers['Retry-After'] == '30'
+        assert refused.get_json()['code'] == 'import_event_streams_full'
+        assert again.status_code == 200
+
     def test_retry_import_job_requires_admin(self, app, client):
         """Test retrying an import job requires admin access."""
         _login(app, client, 'nonadmin_retry', 'nonadmin_retry@example.com')
@@ -9,9 +9,11 @@ from unittest.mock import patch
 from sqlalchemy.exc import SQLAlchemyError
 
 from musicround.helpers.import_queue import (
+    ImportEventBus,
     ImportJob,
     ImportQueue,
     ImportWorker,
+    apply_import_event_to_stats,
     enqueue_import_job,
 )
 from musicround.models import ImportJobRecord, User, UserPreferences, db
@@ -265,6 +267,80 @@ class TestImportQueue:
             assert 'restarted' in updated.error_message
 
 
+class TestImportEventBus:
+    """Tests for pushed import job transitions."""
+
+    def test_publish_assigns_sequence_and_replays_since(self, app):
+        """Test buffered events can be replayed after a reconnect."""
+        with app.app_context():
+            bus = ImportEventBus()
+            record = ImportJobRecord(
+                id=7, service_name='deezer', item_type='album', item_id='9', user_id=1,
+                status='processing',
+            )
+
+            first = bus.publish(record, previous_status='pending')
+            record.status = 'completed'
+            second = bus.publish(record, previous_status='processing')
+
+            assert (first['sequence'], second['sequence']) == (1, 2)
+            assert bus.latest_sequence == 2
+            assert bus.events_since(1) == [second]
+            assert bus.publish(None) is None
+
+    def test_wait_for_events_wakes_on_publish(self, app):
+        """Test waiting subscribers are woken by a publishing worker."""
+        bus = ImportEventBus()
+        record = ImportJobRecord(
+            id=3, service_name='spotify', item_type='track', item_id='x', user_id=1,
+            status='processing',
+        )
+        received = []
+
+        def waiter():
+            received.extend(bus.wait_for_events(0, timeout=5))
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.05)
+        bus.publish(record, previous_status='pending')
+        thread.join(timeout=5)
+
+        assert [event['job_id'] for event in received] == [3]
+        assert bus.wait_for_events(1, timeout=0.01) == []
+
+    def test_apply_import_event_moves_counters(self):
+        """Test stats move between statuses without going negative."""
+        stats = {'pending': 1, 'processing': 0, 'completed': 0}
+
+        apply_import_event_to_stats(stats, {'previous_status': 'pending', 'status': 'processing'})
+        apply_import_event_to_stats(stats, {'previous_status': 'processing', 'status': 'completed'})
+        apply_import_event_to_stats(stats, {'previous_status': 'processing', 'status': 'completed'})
+
+        assert stats == {'pending': 0, 'processing': 0, 'completed': 2}
+
+    def test_worker_publishes_claim_and_completion(self, app):
+        """Test workers push processing and completed transitions."""
+        with app.app_context():
+            user = User(username='eventworker', email='eventworker@example.com')
+            user.password = 'WorkerPass123!'
+            db.session.add(user)
+            db.session.commit()
+
+            queue = ImportQueue()
+            record = queue.enqueue('deezer', 'track', '321', user.id)
+            job = queue.get_job(timeout=0.1)
+
+            with patch('musicround.helpers.import_queue.ImportHelper.import_item', return_value=[]):
+                ImportWorker(app, queue)._process_job(job)
+
+            transitions = [
+                (event['previous_status'], event['status']) for event in queue.events.events_since(0)
+            ]
+            assert transitions == [(None, 'pending'), ('pending', 'processing'), ('processing', 'completed')]
+            assert all(event['job_id'] == record.id for event in queue.events.events_since(0))
+
+
 class TestImportWorker:
     """Tests for ImportWorker job processing."""
 
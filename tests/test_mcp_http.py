@@ -8,6 +8,7 @@ from starlette.testclient import TestClient
 os.environ.setdefault("SECRET_KEY", "test-secret-key-for-testing-only")
 os.environ.setdefault("AUTOMATION_TOKEN", "test-automation-token-for-testing")
 
+from musicround import mcp_http  # noqa: E402
 from musicround.mcp_http import (  # noqa: E402
     _AUTH_FAILURES,
     _client_rate_limit_id,
@@ -122,3 +123,48 @@ def test_allowed_hosts_are_replaced_between_builds(monkeypatch):
 
     assert "first.example" not in mcp.settings.transport_security.allowed_hosts
     assert "second.example" in mcp.settings.transport_security.allowed_hosts
+
+
+def test_pool_stats_require_auth_and_report_each_class(monkeypatch):
+    monkeypatch.setenv("MCP_BEARER_TOKEN", "test-mcp-token")
+    _AUTH_FAILURES.clear()
+    client = TestClient(BearerAuthMiddleware(_dummy_app))
+
+    anonymous = client.get("/pools")
+    response = client.get("/pools", headers={"Authorization": "Bearer test-mcp-token"})
+
+    assert anonymous.status_code == 401
+    assert response.status_code == 200
+    pools = response.json()["pools"]
+    assert set(pools) == {"read", "write", "heavy"}
+    assert {"running", "queued", "rejected"} <= set(pools["heavy"])
+
+
+def test_batch_endpoint_requires_auth_and_runs_calls(monkeypatch):
+    monkeypatch.setenv("MCP_BEARER_TOKEN", "test-mcp-token")
+    _AUTH_FAILURES.clear()
+    seen = {}
+
+    async def fake_run_tool_batch_on_pool(calls, stop_on_error=False):
+        seen["calls"] = calls
+        seen["stop_on_error"] = stop_on_error
+        if not calls:
+            raise ValueError("calls must be a non-empty list of {tool, arguments} objects.")
+        return {"ok": True, "calls": [{"id": 0, "tool": calls[0]["tool"], "ok": True}]}
+
+    monkeypatch.setattr(mcp_http, "run_tool_batch_on_pool", fake_run_tool_batch_on_pool)
+    client = TestClient(BearerAuthMiddleware(_dummy_app))
+    headers = {"Authorization": "Bearer test-mcp-token"}
+    body = {"calls": [{"tool": "find_songs", "arguments": {"query": "abba"}}], "stop_on_error": True}
+
+    anonymous = client.post("/batch", json=body)
+    wrong_method = client.get("/batch", headers=headers)
+    invalid = client.post("/batch", json={"calls": []}, headers=headers)
+    response = client.post("/batch", json=body, headers=headers)
+
+    assert anonymous.status_code == 401
+    assert wrong_method.status_code == 405
+    assert invalid.status_code == 400
+    assert response.status_code == 200
+    assert response.json()["calls"][0]["tool"] == "find_songs"
+    assert seen == {"calls": body["calls"], "stop_on_error": True}
@@ -0,0 +1,225 @@
+"""Tests for the MCP tool worker pools."""
+
+import asyncio
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-testing-only")
+os.environ.setdefault("AUTOMATION_TOKEN", "test-automation-token-for-testing")
+
+from mcp.server.fastmcp.utilities.func_metadata import func_metadata  # noqa: E402
+
+from musicround import db, mcp_server  # noqa: E402
+from musicround.mcp_workers import ToolPoolBusyError, ToolPools, ToolWorkerPool  # noqa: E402
+
+
+def test_heavy_tool_does_not_block_read_tools():
+    pools = ToolPools({"read": 2, "write": 1, "heavy": 1}, {"read": 4, "write": 4, "heavy": 1})
+    release = threading.Event()
+
+    def render():
+        release.wait(5)
+        return "rendered"
+
+    async def scenario():
+        heavy = asyncio.ensure_future(pools.run("heavy", render))
+        await asyncio.sleep(0.05)
+        read = await asyncio.wait_for(pools.run("read", lambda: "catalog"), timeout=1)
+        still_running = not heavy.done()
+        release.set()
+        return read, still_running, await heavy
+
+    try:
+        assert asyncio.run(scenario()) == ("catalog", True, "rendered")
+        stats = pools.stats()
+        assert stats["heavy"]["completed"] == 1
+        assert stats["read"]["completed"] == 1
+        assert stats["read"]["running"] == 0
+    finally:
+        release.set()
+        pools.shutdown()
+
+
+def test_pool_rejects_calls_beyond_workers_plus_queue_limit():
+    pool = ToolWorkerPool("heavy", workers=1, queue_limit=1)
+    release = threading.Event()
+    try:
+        running = pool.submit(release.wait, 5)
+        queued = pool.submit(release.wait, 5)
+        with pytest.raises(ToolPoolBusyError, match="busy with heavy tools"):
+            pool.submit(release.wait, 5)
+
+        stats = pool.stats()
+        assert stats["rejected"] == 1
+        assert stats["running"] + stats["queued"] == 2
+        assert stats["max_queued"] >= 1
+
+        release.set()
+        assert running.result(5) is True
+        assert queued.result(5) is True
+        assert pool.stats()["completed"] == 2
+        assert pool.stats()["queued"] == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_cancelled_queued_call_frees_its_slot():
+    pool = ToolWorkerPool("write", workers=1, queue_limit=1)
+    release = threading.Event()
+    try:
+        pool.submit(release.wait, 5)
+        queued = pool.submit(release.wait, 5)
+        assert queued.cancel() is True
+        assert pool.stats()["queued"] == 0
+        pool.submit(release.wait, 5)
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_registered_sync_tools_run_on_their_pool():
+    seen = {}
+
+    def fake_with_app_context(func, **kwargs):
+        seen["thread"] = threading.current_thread().name
+        seen["query"] = kwargs["query"]
+        return {"songs": []}
+
+    async def scenario():
+        tools = {tool.name: tool for tool in await mcp_server.mcp.list_tools()}
+        with patch.object(mcp_server, "_with_app_context", fake_with_app_context):
+            await mcp_server.mcp.call_tool("find_songs", {"query": "abba"})
+        return tools
+
+    tools = asyncio.run(scenario())
+
+    assert "round_id" in tools["generate_round_assets"].inputSchema["properties"]
+    assert "mcp_worker_pool_stats" in tools
+    assert seen["query"] == "abba"
+    assert seen["thread"].startswith("mcp-read")
+    # The module attribute stays a plain function for direct callers.
+    assert not asyncio.iscoroutinefunction(mcp_server.find_songs)
+
+
+def _batch_tools(**tools):
+    return {
+        name: (func, concurrency, func_metadata(func))
+        for name, (func, concurrency) in tools.items()
+    }
+
+
+def test_batch_runs_reads_concurrently_and_writes_in_the_shared_session(app):
+    barrier = threading.Barrier(2, timeout=5)
+    seen = {}
+
+    def lookup(label: str) -> dict:
+        barrier.wait()
+        return {"label": label, "thread": threading.current_thread().name}
+
+    def save(value: int) -> dict:
+        seen.setdefault("sessions", []).append(db.session())
+        return {"value": value}
+
+    tools = _batch_tools(lookup=(lookup, "read"), save=(save, "write"))
+    pools = ToolPools({"read": 2, "write": 1, "heavy": 1}, {"read": 4, "write": 4, "heavy": 1})
+    with (
+        patch.dict(mcp_server._SYNC_TOOLS, tools),
+        patch.object(mcp_server, "_app", lambda: app),
+        patch.object(mcp_server, "tool_pools", pools),
+    ):
+        result = mcp_server.run_tool_batch([
+            {"tool": "lookup", "arguments": {"label": "a"}},
+            {"tool": "lookup", "arguments": {"label": "b"}, "id": "second"},
+            {"tool": "save", "arguments": {"value": "3"}},
+            {"tool": "save", "arguments": {"value": 4}},
+        ])
+
+    assert result["ok"] is True
+    assert result["concurrency_class"] == "write"
+    assert result["summary"] == {"total": 4, "succeeded": 4, "failed": 0, "skipped": 0}
+    calls = result["calls"]
+    # Both lookups passed the barrier together, so they ran at the same time.
+    assert [call["mode"] for call in calls] == ["concurrent", "concurrent", "shared", "shared"]
+    assert calls[1]["id"] == "second"
+    # One lookup ran on the batch's own thread, the other was admitted by the read pool.
+    assert calls[0]["result"]["thread"] == threading.current_thread().name
+    assert calls[1]["result"]["thread"].startswith("mcp-read")
+    assert pools.stats()["read"]["completed"] == 1
+    pools.shutdown()
+    assert calls[2]["result"] == {"value": 3}
+    assert seen["sessions"][0] is seen["sessions"][1]
+    assert all(call["duration_seconds"] >= 0 for call in calls)
+
+
+def test_batch_reads_run_on_the_batch_worker_when_the_read_pool_is_full(app):
+    release = threading.Event()
+    pools = ToolPools({"read": 1, "write": 1, "heavy": 1}, {"read": 0, "write": 1, "heavy": 1})
+    tools = _batch_tools(lookup=(lambda: {"thread": threading.current_thread().name}, "read"))
+    try:
+        pools.pool("read").submit(release.wait, 5)
+        with (
+            patch.dict(mcp_server._SYNC_TOOLS, tools),
+            patch.object(mcp_server, "_app", lambda: app),
+            patch.object(mcp_server, "tool_pools", pools),
+        ):
+            result = mcp_server.run_tool_batch([{"tool": "lookup"}] * 3)
+    finally:
+        release.set()
+        pools.shutdown()
+
+    assert result["ok"] is True
+    assert {call["result"]["thread"] for call in result["calls"]} == {threading.current_thread().name}
+    assert pools.stats()["read"]["rejected"] == 2
+
+
+def test_batch_reports_failures_and_can_stop_on_error(app):
+    def explode() -> dict:
+        raise RuntimeError("boom")
+
+    tools = _batch_tools(explode=(explode, "write"), ping=(lambda: {"pong": True}, "read"))
+    with patch.dict(mcp_server._SYNC_TOOLS, tools), patch.object(mcp_server, "_app", lambda: app):
+        continued = mcp_server.run_tool_batch([
+            {"tool": "explode"},
+            {"tool": "watch_import_progress"},
+            {"tool": "ping"},
+        ])
+        stopped = mcp_server.run_tool_batch(
+            [{"tool": "explode"}, {"tool": "ping"}],
+            stop_on_error=True,
+        )
+
+    assert continued["ok"] is False
+    assert continued["calls"][0]["error"] == "boom"
+    assert continued["calls"][0]["error_type"] == "RuntimeError"
+    assert "non-batchable" in continued["calls"][1]["error"]
+    assert continued["calls"][2]["result"] == {"pong": True}
+    assert stopped["summary"] == {"total": 2, "succeeded": 0, "failed": 1, "skipped": 1}
+    assert stopped["calls"][1]["skipped"] is True
+
+    with pytest.raises(ValueError, match="non-empty list"):
+        mcp_server.run_tool_batch([])
+    with pytest.raises(ValueError, match="at most"):
+        mcp_server.run_tool_batch([{"tool": "ping"}] * (mcp_server.BATCH_MAX_CALLS + 1))
+
+
+def test_batch_tool_runs_on_the_pool_of_its_heaviest_call():
+    seen = {}
+
+    def fake_run_tool_batch(calls, stop_on_error=False):
+        seen["thread"] = threading.current_thread().name
+        return {"ok": True, "calls": []}
+
+    async def scenario():
+        with patch.object(mcp_server, "run_tool_batch", fake_run_tool_batch):
+            await mcp_server.mcp.call_tool(
+                "batch",
+                {"calls": [{"tool": "find_songs"}, {"tool": "generate_round_assets", "arguments": {"round_id": 1}}]},
+            )
+
+    asyncio.run(scenario())
+
+    assert seen["thread"].startswith("mcp-heavy")
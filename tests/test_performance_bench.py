@@ -0,0 +1,128 @@
+"""Tests for the scalable performance benchmark suite."""
+
+import json
+
+import pytest
+
+from musicround.helpers.performance_bench import (
+    BENCH_SCENARIOS,
+    BenchScale,
+    cleanup_bench_fixture,
+    compare_bench_results,
+    create_bench_fixture,
+    load_bench_result,
+    run_performance_bench,
+)
+from musicround.models import db, ImportJobRecord, Round, RoundExport, Song, SongTag, Tag, User
+
+
+def _result(duration_ms, queries=10, status="ok"):
+    scenario = {"status": status}
+    if status == "ok":
+        scenario["duration_ms"] = {"min": duration_ms, "mean": duration_ms, "p50": duration_ms, "p90": duration_ms, "p99": duration_ms, "max": duration_ms}
+        scenario["query_count"] = {"min": queries, "mean": queries, "p50": queries, "p90": queries, "p99": queries, "max": queries}
+    return scenario
+
+
+def test_fixture_generator_bulk_loads_requested_scale_and_cleans_up(app):
+    scale = BenchScale.resolve("small", songs=60, rounds=6, tags=4, exports_per_round=2, import_jobs=5)
+
+    with app.app_context():
+        fixture = create_bench_fixture(scale)
+        marker = fixture.marker
+
+        assert Song.query.filter_by(source=marker).count() == 60
+        assert Tag.query.filter(Tag.name.like(f"{marker}-tag-%")).count() == 4
+        assert SongTag.query.count() >= 60
+        assert len(fixture.round_ids) == 6
+        assert all(len(db.session.get(Round, round_id).song_id_list) == 8 for round_id in fixture.round_ids)
+        assert RoundExport.query.filter(RoundExport.round_id.in_(fixture.round_ids)).count() == 12
+        assert ImportJobRecord.query.filter_by(user_id=fixture.user_id).count() == 5
+
+        cleanup_bench_fixture(marker)
+
+        assert Song.query.filter_by(source=marker).count() == 0
+        assert Round.query.count() == RoundExport.query.count() == SongTag.query.count() == 0
+        assert User.query.filter_by(username=marker).count() == 0
+
+
+def test_bench_runs_scenarios_with_percentiles(app):
+    scale = BenchScale.resolve("small", songs=80, rounds=5, tags=5, import_jobs=3)
+
+    with app.app_context():
+        result = run_performance_bench(scale=scale, repeat=2, warmup=0)
+
+        assert result["ok"] is True
+        assert result["scale"]["name"] == "small+custom"
+        assert set(result["scenarios"]) == set(BENCH_SCENARIOS)
+        for name, scenario in result["scenarios"].items():
+            if name == "mp3_assembly" and scenario["status"] == "skipped":
+                continue
+            assert scenario["status"] == "ok", (name, scenario)
+            assert scenario["duration_ms"]["p50"] <= scenario["duration_ms"]["max"]
+        assert result["scenarios"]["resolve_text_playlist"]["details"]["resolved_count"] == 50
+        assert result["scenarios"]["find_songs"]["query_count"]["p50"] > 0
+        assert Song.query.count() == 0
+
+        with pytest.raises(ValueError, match="Unknown scenarios"):
+            run_performance_bench(scale=scale, scenarios=["nope"])
+
+
+def test_compare_flags_slowdowns_and_query_growth():
+    baseline = {"scale": {"songs": 1}, "scenarios": {
+        "find_songs": _result(100.0),
+        "rounds_list": _result(10.0, queries=3),
+        "view_songs": _result(50.0),
+        "mp3_assembly": _result(0, status="skipped"),
+    }}
+    current = {"scale": {"songs": 1}, "scenarios": {
+        "find_songs": _result(130.0),
+        "rounds_list": _result(10.5, queries=4),
+        "view_songs": _result(52.0),
+        "mp3_assembly": _result(900.0),
+    }}
+
+    comparison = compare_bench_results(baseline, current, tolerance=0.2, min_delta_ms=5.0)
+    statuses = {row["name"]: row["status"] for row in comparison["scenarios"]}
+
+    assert comparison["ok"] is False
+    assert statuses == {
+        "find_songs": "regressed",
+        "rounds_list": "regressed",
+        "view_songs": "unchanged",
+        "mp3_assembly": "not_compared",
+    }
+    assert comparison["regressions"][1]["reasons"] == ["queries 3 -> 4"]
+    assert compare_bench_results(current, baseline)["ok"] is True
+
+
+def test_bench_and_compare_commands_write_and_read_baselines(app, monkeypatch, capsys, tmp_path):
+    import sys
+
+    import run
+
+    baseline_path = tmp_path / "baseline.json"
+    monkeypatch.setattr(run, "create_app", lambda: app)
+    monkeypatch.setattr(sys, "argv", [
+        "run.py", "performance", "bench", "--songs", "40", "--rounds", "3", "--repeat", "1",
+        "--scenario", "find_songs", "--scenario", "rounds_list", "--output", str(baseline_path),
+    ])
+
+    assert run.main() == 0
+    assert "find_songs: p50" in capsys.readouterr().out
+    saved = load_bench_result(str(baseline_path))
+    assert set(saved["scenarios"]) == {"find_songs", "rounds_list"}
+
+    slower = json.loads(baseline_path.read_text())
+    slower["scenarios"]["find_songs"]["duration_ms"]["p50"] += 1000
+    current_path = tmp_path / "current.json"
+    current_path.write_text(json.dumps(slower))
+    monkeypatch.setattr(sys, "argv", ["run.py", "performance", "compare", str(baseline_path), str(current_path), "--json"])
+
+    assert run.main() == 1
+    payload = json.loads(capsys.readouterr().out)
+    assert [row["name"] for row in payload["regressions"]] == ["find_songs"]
+
+    current_path.write_text("{}")
+    assert run.main() == 78
+    assert "not a version 1 benchmark result" in capsys.readouterr().err
@@ -0,0 +1,104 @@
+"""Tests for the offline Deezer/Spotify stand-in server."""
+
+import pytest
+
+from musicround.deezer_client import DeezerClient
+from musicround.helpers.metadata import get_deezer_data
+from musicround.helpers.provider_standin import (
+    StandinOptions,
+    create_standin_app,
+    running_provider_standin,
+    standin_config_overrides,
+)
+from musicround.helpers.provider_urls import deezer_api_url, spotify_api_url
+
+
+@pytest.fixture
+def standin():
+    return create_standin_app(StandinOptions(seed=7)).test_client()
+
+
+def test_deezer_routes_serve_deterministic_catalog(standin):
+    track = standin.get("/deezer/track/25").get_json()
+
+    assert track["title"] == "Standin Song 25"
+    assert track["isrc"] == "QZS000000025"
+    assert track["album"]["id"] == 3
+    assert track["preview"].startswith("http://localhost/previews/")
+    assert standin.get("/deezer/track/isrc:QZS000000025").get_json()["id"] == 25
+    assert standin.get("/deezer/track/isrc:unknown").get_json()["error"]["code"] == 800
+
+    album_tracks = standin.get("/deezer/album/3/tracks").get_json()["data"]
+    assert [item["id"] for item in album_tracks] == list(range(25, 37))
+
+    playlist = standin.get("/deezer/playlist/30").get_json()
+    first_page = standin.get("/deezer/playlist/30/tracks?limit=20").get_json()
+    assert playlist["nb_tracks"] == first_page["total"] == 50
+    assert first_page["next"] == "http://localhost/deezer/playlist/30/tracks?limit=20&index=20"
+    assert len(standin.get("/deezer/search/track?q=abba&limit=5").get_json()["data"]) == 5
+
+    preview = standin.get(track["preview"].replace("http://localhost", ""))
+    assert preview.status_code == 200
+    assert preview.mimetype == "audio/mpeg"
+    assert preview.data[:3] in {b"ID3", b"\xff\xfb", b"\xff\xf3"}
+
+
+def test_spotify_routes_require_token_and_page(standin):
+    assert standin.get("/spotify/v1/tracks/standin000000000000025").status_code == 401
+
+    token = standin.post("/spotify/accounts/api/token", data={"grant_type": "client_credentials"}).get_json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+    track = standin.get("/spotify/v1/tracks/standin000000000000025", headers=headers).get_json()
+    assert track["external_ids"]["isrc"] == "QZS000000025"
+    features = standin.get("/spotify/v1/audio-features?ids=standin000000000000025,other", headers=headers).get_json()
+    assert [item["id"] for item in features["audio_features"]][0] == track["id"]
+
+    page = standin.get("/spotify/v1/playlists/standin000000000000180/tracks?limit=100", headers=headers).get_json()
+    assert page["total"] == 200
+    assert page["next"].endswith("/tracks?limit=100&offset=100")
+    search = standin.get("/spotify/v1/search?q=abba&type=track,album&limit=3", headers=headers).get_json()
+    assert len(search["tracks"]["items"]) == len(search["albums"]["items"]) == 3
+
+
+def test_fault_injection_is_seeded_and_adjustable(standin):
+    response = standin.get("/deezer/track/1", headers={"X-Standin-Fault": "429"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+    assert standin.post("/_standin/faults", json={"error_rate": 2}).status_code == 400
+    assert standin.post("/_standin/faults", json={"error_rate": 0.5}).status_code == 200
+    statuses = [standin.get(f"/deezer/track/{track_id}").status_code for track_id in range(40)]
+    assert set(statuses) == {200, 500}
+
+    replay = create_standin_app(StandinOptions(seed=7, error_rate=0.5)).test_client()
+    replay.get("/deezer/track/1")
+    assert [replay.get(f"/deezer/track/{track_id}").status_code for track_id in range(40)] == statuses
+
+    stats = standin.get("/_standin/stats").get_json()
+    assert stats["faults"]["429"] == 1
+    assert stats["faults"]["500"] == statuses.count(500)
+    assert stats["requests"]["/deezer/track/<track_ref>"] == 41
+
+    with pytest.raises(ValueError):
+        StandinOptions(error_rate=0.7, rate_limit_rate=0.5)
+
+
+def test_app_clients_use_configured_standin(app):
+    with running_provider_standin(StandinOptions(seed=1)) as base_url:
+        overrides = standin_config_overrides(base_url)
+        app.config.update(overrides, deezer=None)
+        with app.app_context():
+            assert deezer_api_url("track/1") == f"{base_url}/deezer/track/1"
+            assert spotify_api_url("me") == f"{base_url}/spotify/v1/me"
+
+            client = DeezerClient(overrides["DEEZER_API_BASE_URL"])
+            assert client.get_track(25)["isrc"] == "QZS000000025"
+            assert len(client.get_playlist_tracks(30)) == 25
+
+            metadata = get_deezer_data("QZS000000025", app)
+            assert metadata["title"] == "Standin Song 25"
+            assert metadata["deezer_preview_url"].startswith(f"{base_url}/previews/")
+            assert metadata["year"] == "1963"
+
+    assert deezer_api_url("track/1", {}) == "https://api.deezer.com/track/1"
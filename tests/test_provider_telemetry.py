@@ -0,0 +1,176 @@
+"""Tests for outbound provider telemetry and the /metrics endpoint."""
+
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+import requests
+from urllib3 import HTTPResponse
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-testing-only")
+os.environ.setdefault("AUTOMATION_TOKEN", "test-automation-token-for-testing")
+
+from musicround.helpers.notification_summary import notification_admin_summary  # noqa: E402
+from musicround.helpers.provider_standin import standin_config_overrides  # noqa: E402
+from musicround.helpers.provider_telemetry import (  # noqa: E402
+    ProviderTelemetry,
+    endpoint_label,
+    install_requests_telemetry,
+    provider_telemetry,
+    track_provider_call,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_telemetry():
+    provider_telemetry.reset()
+    yield
+    provider_telemetry.reset()
+
+
+def test_endpoint_label_collapses_ids():
+    assert endpoint_label("/track/3135556") == "/track/{id}"
+    assert endpoint_label("/v1/tracks/4uLU6hMCjMI75M1A2tKUQC") == "/v1/tracks/{id}"
+    assert endpoint_label("/track/isrc:GBAYE0601498") == "/track/isrc:{id}"
+    assert endpoint_label("/2/files/upload_session/append_v2") == "/2/files/upload_session/append_v2"
+    assert endpoint_label("/search/playlist") == "/search/playlist"
+
+
+def test_classify_uses_known_and_configured_hosts():
+    telemetry = ProviderTelemetry()
+    telemetry.configure({"OMDB_SERVER_URL": "http://omdb.internal:8080/api"})
+
+    assert telemetry.classify("https://api.deezer.com/album/302127?limit=5") == ("deezer", "/album/{id}")
+    assert telemetry.classify("https://content.dropboxapi.com/2/files/upload") == ("dropbox", "/2/files/upload")
+    assert telemetry.classify("http://omdb.internal:8080/api/movie") == ("omdb", "/api/movie")
+    assert telemetry.classify("https://example.com/track/1") is None
+
+    telemetry.configure(standin_config_overrides("http://127.0.0.1:8765"))
+    assert telemetry.classify("http://127.0.0.1:8765/deezer/track/3135556") == ("deezer", "/deezer/track/{id}")
+    assert telemetry.classify("http://127.0.0.1:8765/spotify/v1/me") == ("spotify", "/spotify/v1/me")
+    assert telemetry.classify("http://127.0.0.1:8765/previews/1.mp3") is None
+
+
+def test_histogram_quota_and_prometheus_text():
+    telemetry = ProviderTelemetry(buckets=(0.1, 1.0))
+    telemetry.record("spotify", "/v1/tracks/{id}", 0.05, 200, headers={"X-RateLimit-Remaining": "40", "X-RateLimit-Limit": "100"})
+    telemetry.record("spotify", "/v1/tracks/{id}", 0.5, 429, headers={"Retry-After": "7"}, retries=1)
+    telemetry.record_retry("spotify", "/v1/tracks/{id}")
+
+    provider = telemetry.summary()["providers"][0]
+    assert provider["calls"] == 2
+    assert provider["rate_limited"] == 1
+    assert provider["retries"] == 2
+    assert provider["p95_ms_upper_bound"] == 1000.0
+    assert provider["quota"]["remaining"] == 40
+    assert provider["quota"]["retry_after_seconds"] == 7
+
+    text = telemetry.prometheus_text()
+    labels = 'provider="spotify",endpoint="/v1/tracks/{id}"'
+    assert f'qb_provider_requests_total{{{labels},status="429"}} 1' in text
+    assert f'qb_provider_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'qb_provider_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"qb_provider_retries_total{{{labels}}} 2" in text
+    assert 'qb_provider_quota_limit{provider="spotify"} 100' in text
+
+
+def test_requests_calls_to_providers_are_recorded_without_urls():
+    install_requests_telemetry()
+    install_requests_telemetry()
+
+    def fake_urlopen(self, method, url, **kwargs):
+        return HTTPResponse(
+            body=io.BytesIO(b"{}"),
+            status=429,
+            headers={"Retry-After": "3"},
+            preload_content=False,
+        )
+
+    with patch("urllib3.connectionpool.HTTPConnectionPool.urlopen", fake_urlopen):
+        response = requests.get("https://api.deezer.com/search?q=secret-query", timeout=1)
+
+    assert response.status_code == 429
+    provider = provider_telemetry.summary()["providers"][0]
+    assert provider["provider"] == "deezer"
+    assert provider["endpoints"][0]["endpoint"] == "/search"
+    assert provider["quota"]["retry_after_seconds"] == 3
+    assert "secret-query" not in provider_telemetry.prometheus_text()
+
+
+def test_track_provider_call_records_errors():
+    with pytest.raises(RuntimeError):
+        with track_provider_call("polly", "/synthesize_speech"):
+            raise RuntimeError("boom")
+
+    endpoint = provider_telemetry.summary()["providers"][0]["endpoints"][0]
+    assert endpoint["statuses"] == {"error": 1}
+    assert endpoint["errors"] == 1
+
+
+def test_metrics_endpoint_requires_token(client, app):
+    provider_telemetry.record("lastfm", "/2.0", 0.2, 200)
+    app.config["METRICS_TOKEN"] = "scrape-token"
+
+    denied = client.get("/metrics", headers={"Accept": "application/json"})
+    automation = client.get("/metrics", headers={"X-Automation-Token": app.config["AUTOMATION_TOKEN"]})
+    bearer = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+
+    assert denied.status_code == 401
+    assert automation.status_code == 200
+    assert automation.mimetype == "text/plain"
+    assert 'qb_provider_requests_total{provider="lastfm",endpoint="/2.0",status="200"} 1' in bearer.get_data(as_text=True)
+
+
+def test_notification_summary_includes_provider_calls(app):
+    provider_telemetry.record("omdb", "/", 0.3, 429, headers={"X-RateLimit-Remaining": "0"})
+
+    with app.app_context():
+        summary = notification_admin_summary(include_operational_health=False)
+
+    assert summary["provider_telemetry"] == [
+        {
+            "provider": "omdb",
+            "calls": 1,
+            "errors": 0,
+            "rate_limited": 1,
+            "retries": 0,
+            "average_ms": 300.0,
+            "p95_ms_upper_bound": 500.0,
+            "quota_remaining": 0,
+            "quota_limit": None,
+        }
+    ]
+
+
+def test_shared_directory_merges_worker_counters(tmp_path):
+    directory = str(tmp_path / "telemetry")
+    first = ProviderTelemetry(buckets=(0.1, 1.0))
+    second = ProviderTelemetry(buckets=(0.1, 1.0))
+    first.share(directory, flush_seconds=60)
+    second.share(directory, flush_seconds=60)
+
+    first.record("deezer", "/track/{id}", 0.05, 200, headers={"X-RateLimit-Remaining": "9"})
+    second.record("deezer", "/track/{id}", 0.5, 429)
+    second.record("spotify", "/v1/me", 0.05, 200)
+    first.flush()
+    second.flush()
+
+    labels = 'provider="deezer",endpoint="/track/{id}"'
+    for telemetry in (first, second):
+        text = telemetry.prometheus_text()
+        assert f'qb_provider_requests_total{{{labels},status="200"}} 1' in text
+        assert f'qb_provider_requests_total{{{labels},status="429"}} 1' in text
+        assert f'qb_provider_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert 'qb_provider_requests_total{provider="spotify",endpoint="/v1/me",status="200"} 1' in text
+    assert first.summary()["providers"][0]["quota"]["last_rate_limited_at"]
+
+    # A worker that exits keeps its file, so totals never go backwards.
+    second.reset()
+    assert f'qb_provider_requests_total{{{labels},status="429"}} 1' in first.prometheus_text()
+    stale = os.path.join(directory, "1-deadbeef.json")
+    with open(stale, "w", encoding="utf-8") as handle:
+        handle.write("{}")
+    os.utime(stale, (0, 0))
+    first.flush(force=True)
+    assert not os.path.exists(stale)
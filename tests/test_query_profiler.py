@@ -0,0 +1,126 @@
+"""Tests for the opt-in SQL query profiler."""
+
+from unittest.mock import patch
+
+from musicround.helpers import query_profiler
+from musicround.helpers.query_profiler import (
+    QueryProfiler,
+    capture_queries,
+    init_query_profiler,
+    statement_fingerprint,
+)
+from musicround.models import Song, db
+from musicround.services import automation, tool_jobs
+
+
+def _enable_profiler(app, **config):
+    app.config.update(QUERY_PROFILER_ENABLED=True, **config)
+    init_query_profiler(app)
+    return app.extensions["query_profiler"]
+
+
+def test_fingerprint_collapses_literals_and_in_lists():
+    first = statement_fingerprint("SELECT * FROM song WHERE id IN (?, ?, ?) AND title = 'A'")
+    second = statement_fingerprint("SELECT *\n  FROM song WHERE id IN (?, ?) AND title = 'B''s'")
+
+    assert first == second == "SELECT * FROM song WHERE id IN (?) AND title = ?"
+    assert statement_fingerprint("SELECT anon_1.id FROM t LIMIT 10") == "SELECT anon_1.id FROM t LIMIT ?"
+
+
+def test_capture_counts_queries_and_flags_repeated_statements(app):
+    songs = [Song(title=f"Song {index}", artist="Profiler") for index in range(6)]
+    db.session.add_all(songs)
+    db.session.commit()
+    song_ids = [song.id for song in songs]
+    db.session.expunge_all()
+
+    with capture_queries(repeat_threshold=5) as scope:
+        for song_id in song_ids:
+            db.session.get(Song, song_id)
+        Song.query.count()
+
+    assert scope.query_count == 7
+    assert scope.db_seconds > 0
+    assert [item["count"] for item in scope.repeated_statements()] == [6]
+    assert "FROM song" in scope.repeated_statements()[0]["fingerprint"]
+    assert query_profiler.current_query_scope() is None
+
+
+def test_failed_statements_leave_no_timing_state_on_the_connection(app):
+    with capture_queries() as scope, db.engine.connect() as connection:
+        for _attempt in range(3):
+            try:
+                connection.exec_driver_sql("SELECT * FROM missing_profiler_table")
+            except Exception:
+                connection.rollback()
+        connection.exec_driver_sql("SELECT 1")
+
+        assert not any(key.startswith("query_profiler") for key in connection.info)
+    assert scope.query_count == 1
+
+
+def test_requests_are_profiled_with_headers_and_slow_query_log(app, client):
+    profiler = _enable_profiler(app, QUERY_PROFILER_HEADERS=True, QUERY_PROFILER_SLOW_MS=0)
+    app.config["AUTOMATION_TOKEN"] = "automation-secret"
+
+    response = client.get("/api/tags")
+    profile = client.get(
+        "/users/query-profile.json",
+        headers={"X-Automation-Token": "automation-secret"},
+    ).get_json()
+
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Query-Count"]) >= 1
+    assert "X-DB-Time-Ms" in response.headers
+    scope = next(item for item in profile["scopes"] if item["scope"] == "request:api.list_tags")
+    assert scope["count"] == 1
+    assert scope["queries"]["max"] >= 1
+    assert profile["slow_queries"][0]["scope"].startswith("request:")
+    assert profiler.snapshot(kind="request")["scopes"]
+
+
+def test_profile_reports_disabled_state_and_percentiles():
+    profiler = QueryProfiler(repeat_threshold=2)
+    for count in range(1, 11):
+        with profiler.scope("mcp", "find_songs") as scope:
+            for _ in range(count):
+                scope.record("SELECT 1", 0.001)
+
+    snapshot = profiler.snapshot()
+
+    row = snapshot["scopes"][0]
+    assert row["scope"] == "mcp:find_songs"
+    assert row["queries"] == {"p50": 5, "p90": 9, "p99": 10, "max": 10}
+    assert row["repeated_statements"] == [{"fingerprint": "SELECT ?", "occurrences": 9, "max_count": 10}]
+    profiler.reset()
+    assert profiler.snapshot()["scopes"] == []
+
+
+def test_query_profile_json_without_profiler_explains_how_to_enable(app, client):
+    app.config["AUTOMATION_TOKEN"] = "automation-secret"
+
+    profile = client.get(
+        "/users/query-profile.json",
+        headers={"X-Automation-Token": "automation-secret"},
+    ).get_json()
+
+    assert profile["enabled"] is False
+    assert "QUERY_PROFILER_ENABLED" in profile["hint"]
+
+
+def test_tool_jobs_are_profiled_per_tool(app):
+    profiler = _enable_profiler(app)
+
+    def fake_batch(round_ids, on_item=None, **kwargs):
+        Song.query.count()
+        return {"ok": True}
+
+    with patch.object(automation, "inspect_round_package_batch", fake_batch):
+        tool_jobs.start_tool_job(
+            "inspect_round_package_batch",
+            {"round_ids": [1]},
+            submit=lambda func, *args: func(*args),
+        )
+
+    scopes = {row["scope"]: row for row in profiler.snapshot(kind="job")["scopes"]}
+    assert scopes["job:inspect_round_package_batch"]["queries"]["max"] >= 1
@@ -1,5 +1,6 @@
 """Tests for generated round artifact storage helpers."""
 
+import json
 import os
 from io import BytesIO
 
@@ -26,8 +27,9 @@ class _FakeS3Paginator:
         self.client = client
 
     def paginate(self, Bucket, Prefix):
+        self.client.listings += 1
         contents = [
-            {"Key": key, "Size": len(value)}
+            {"Key": key, "Size": len(value), "ETag": self.client._etag(value)}
             for key, value in self.client.objects.items()
             if key.startswith(Prefix)
         ]
@@ -35,8 +37,13 @@ class _FakeS3Paginator:
 
 
 class _FakeS3Client:
+    """Local S3 stand-in covering the object, multipart, and ranged-GET calls."""
+
     def __init__(self):
         self.objects = {}
+        self.uploads = {}
+        self.ranges = []
+        self.listings = 0
 
     def head_bucket(self, Bucket):
         return {}
@@ -44,12 +51,44 @@ class _FakeS3Client:
     def head_object(self, Bucket, Key):
         if Key not in self.objects:
             raise _FakeS3Error("404")
-        return {"ContentLength": len(self.objects[Key])}
+        return {"ContentLength": len(self.objects[Key]), "ETag": self._etag(self.objects[Key])}
 
-    def get_object(self, Bucket, Key):
+    def get_object(self, Bucket, Key, Range=None, IfMatch=None):
         if Key not in self.objects:
             raise _FakeS3Error("404")
-        return {"Body": BytesIO(self.objects[Key])}
+        data = self.objects[Key]
+        if IfMatch is not None and IfMatch != self._etag(data):
+            raise _FakeS3Error("PreconditionFailed")
+        if Range is not None:
+            self.ranges.append(Range)
+            start, end = Range.removeprefix("bytes=").split("-")
+            data = data[int(start):int(end) + 1]
+        return {"Body": BytesIO(data)}
+
+    @staticmethod
+    def _etag(data):
+        return f'"{len(data)}"'
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {"key": Key, "parts": {}, "state": "open"}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.uploads[UploadId]["parts"][PartNumber] = Body
+        return {"ETag": f'"part-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads[UploadId]
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert numbers == sorted(upload["parts"])
+        self.objects[Key] = b"".join(upload["parts"][number] for number in numbers)
+        upload["state"] = "completed"
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads[UploadId]["state"] = "aborted"
+        return {}
 
     def download_fileobj(self, Bucket, Key, Fileobj):
         Fileobj.write(self.objects[Key])
@@ -184,6 +223,200 @@ def test_s3_artifact_store_reads_writes_and_reports_shared_capabilities(app, mon
         assert store.exists("mp3", 9) is False
 
 
+def _use_fake_s3(app, monkeypatch, tmp_path):
+    from musicround.helpers import storage_health
+
+    client = _FakeS3Client()
+    monkeypatch.setattr(storage_health, "_s3_client", lambda: client)
+    app.config.update(
+        ROUND_ARTIFACT_STORAGE_BACKEND="s3",
+        ROUND_ARTIFACT_S3_BUCKET="quiz-artifacts",
+        ROUND_ARTIFACT_S3_PREFIX="production",
+        ROUND_ARTIFACT_CACHE_DIR=str(tmp_path / "cache"),
+        ROUND_ARTIFACT_S3_PART_SIZE_MB=5,
+        ROUND_ARTIFACT_S3_MAX_CONCURRENCY=3,
+    )
+    return client
+
+
+def test_filesystem_artifact_store_streams_and_keeps_old_file_on_failure(app, tmp_path):
+    with app.app_context():
+        app.config["ROUND_MP3_DIR"] = str(tmp_path / "rounds")
+        store = round_artifact_store()
+        with store.open_write("mp3", 3) as artifact:
+            artifact.write(b"first ")
+            artifact.write(b"version")
+
+        with pytest.raises(RuntimeError):
+            with store.open_write("mp3", 3) as artifact:
+                artifact.write(b"partial")
+                raise RuntimeError("render failed")
+
+        with store.open_read("mp3", 3) as artifact:
+            assert artifact.read() == b"first version"
+        assert os.listdir(tmp_path / "rounds") == ["round_3.mp3"]
+
+        source = tmp_path / "render.mp3"
+        source.write_bytes(b"rendered")
+        assert store.persist_file("mp3", 3, str(source)) == round_mp3_path(3)
+        assert store.read_bytes("mp3", 3) == b"rendered"
+
+
+def test_s3_artifact_store_streams_large_objects_in_parallel_parts(app, monkeypatch, tmp_path):
+    client = _use_fake_s3(app, monkeypatch, tmp_path)
+    part_size = 5 * 1024 * 1024
+    payload = os.urandom(1024) * (2 * part_size // 1024 + 700)
+    with app.app_context():
+        store = round_artifact_store()
+        with store.open_write("mp3", 11) as artifact:
+            for offset in range(0, len(payload), 1024 * 1024):
+                artifact.write(payload[offset:offset + 1024 * 1024])
+
+        (upload,) = client.uploads.values()
+        assert upload["state"] == "completed"
+        assert sorted(upload["parts"]) == [1, 2, 3]
+        assert len(upload["parts"][1]) == part_size
+        assert client.objects["production/mp3/round_11.mp3"] == payload
+        with open(store.cache_path("mp3", 11), "rb") as cached:
+            assert cached.read() == payload
+
+        store.cache.discard("production/mp3/round_11.mp3")
+        with store.open_read("mp3", 11) as artifact:
+            assert artifact.size == len(payload)
+            assert artifact.read(10) == payload[:10]
+            artifact.seek(part_size - 5)
+            assert artifact.read(10) == payload[part_size - 5:part_size + 5]
+            artifact.seek(0)
+            assert artifact.read() == payload
+        assert set(client.ranges) == {
+            f"bytes=0-{part_size - 1}",
+            f"bytes={part_size}-{2 * part_size - 1}",
+            f"bytes={2 * part_size}-{len(payload) - 1}",
+        }
+
+
+def test_s3_artifact_store_aborts_multipart_upload_on_error(app, monkeypatch, tmp_path):
+    client = _use_fake_s3(app, monkeypatch, tmp_path)
+    with app.app_context():
+        store = round_artifact_store()
+        store.write_bytes("mp3", 12, b"previous")
+
+        with pytest.raises(RuntimeError):
+            with store.open_write("mp3", 12) as artifact:
+                artifact.write(b"x" * (6 * 1024 * 1024))
+                raise RuntimeError("encoder crashed")
+
+        (upload,) = client.uploads.values()
+        assert upload["state"] == "aborted"
+        assert client.objects["production/mp3/round_12.mp3"] == b"previous"
+        assert store.read_bytes("mp3", 12) == b"previous"
+        assert os.listdir(tmp_path / "cache" / "mp3") == ["round_12.mp3"]
+
+
+def test_s3_artifact_store_persists_small_render_with_single_put(app, monkeypatch, tmp_path):
+    client = _use_fake_s3(app, monkeypatch, tmp_path)
+    with app.app_context():
+        store = round_artifact_store()
+        render_path = store.cache_path("mp3", 13)
+        os.makedirs(os.path.dirname(render_path), exist_ok=True)
+        with open(render_path, "wb") as rendered:
+            rendered.write(b"ID3 small round")
+
+        assert store.persist_file("mp3", 13, render_path) == render_path
+
+        assert client.uploads == {}
+        assert client.objects["production/mp3/round_13.mp3"] == b"ID3 small round"
+        with open(render_path, "rb") as cached:
+            assert cached.read() == b"ID3 small round"
+
+
+def test_s3_artifact_store_serves_repeat_reads_from_local_cache(app, monkeypatch, tmp_path):
+    client = _use_fake_s3(app, monkeypatch, tmp_path)
+    client.objects["production/mp3/round_21.mp3"] = b"uploaded elsewhere"
+    with app.app_context():
+        store = round_artifact_store()
+        assert store.cached_path("mp3", 21) is None
+
+        with store.open_read("mp3", 21) as artifact:
+            assert artifact.read() == b"uploaded elsewhere"
+        assert len(client.ranges) == 1
+
+        def no_remote_reads(**_kwargs):
+            raise AssertionError("cached artifact was fetched from S3 again")
+
+        monkeypatch.setattr(client, "get_object", no_remote_reads)
+        monkeypatch.setattr(client, "head_object", no_remote_reads)
+        assert store.cached_path("mp3", 21) == store.cache_path("mp3", 21)
+        with store.open_read("mp3", 21) as artifact:
+            assert artifact.read() == b"uploaded elsewhere"
+        assert store.read_bytes("mp3", 21) == b"uploaded elsewhere"
+
+
+def test_s3_artifact_cache_misses_when_another_replica_replaces_the_object(app, monkeypatch, tmp_path):
+    client = _use_fake_s3(app, monkeypatch, tmp_path)
+    with app.app_context():
+        store = round_artifact_store()
+        store.write_bytes("pdf", 22, b"%PDF old")
+        # Another replica uploads a new version and updates the shared index.
+        client.objects["production/pdf/round_22.pdf"] = b"%PDF newer!"
+        store.index.record("production/pdf/round_22.pdf", "pdf", 11, client._etag(b"%PDF newer!"))
+
+        assert store.cached_path("pdf", 22) is None
+        assert store.read_bytes("pdf", 22) == b"%PDF newer!"
+        assert store.cached_path("pdf", 22) is not None
+
+
+def test_artifact_disk_cache_evicts_least_recently_used_files(tmp_path):
+    from musicround.helpers.artifact_cache import ArtifactDiskCache
+
+    cache = ArtifactDiskCache(str(tmp_path), max_bytes=10)
+    for name in ("a", "b", "c"):
+        fill = cache.fill(name, str(tmp_path / "mp3" / name), f"etag-{name}", 4)
+        fill.write(b"1234")
+        fill.commit()
+        if name == "b":
+            assert cache.lookup("a", "etag-a") is not None
+
+    assert cache.lookup("b", "etag-b") is None
+    assert not (tmp_path / "mp3" / "b").exists()
+    assert cache.lookup("a", "etag-a") == str(tmp_path / "mp3" / "a")
+    assert cache.lookup("c", "etag-c") == str(tmp_path / "mp3" / "c")
+    assert cache.lookup("c", "etag-other") is None
+    assert cache.stats() == {"entries": 2, "bytes": 8, "max_bytes": 10}
+
+
+def test_s3_inventory_reads_the_persisted_index_instead_of_listing(app, monkeypatch, tmp_path):
+    client = _use_fake_s3(app, monkeypatch, tmp_path)
+    client.objects["production/mp3/round_1.mp3"] = b"1234"
+    with app.app_context():
+        first = round_artifact_storage_inventory()
+        assert first["total_bytes"] == 4
+        assert first["artifacts"]["mp3"]["source"] == "bucket"
+        listings = client.listings
+
+        store = round_artifact_store()
+        store.write_bytes("pdf", 2, b"abcdef")
+        store.write_bytes("mp3", 3, b"12")
+        store.delete("mp3", 1)
+
+        second = round_artifact_storage_inventory()
+        assert client.listings == listings
+        assert second["artifacts"]["mp3"] == {
+            "kind": "mp3", "file_count": 1, "total_bytes": 2, "ok": True, "error": None, "source": "index",
+        }
+        assert second["artifacts"]["pdf"]["total_bytes"] == 6
+        assert second["total_file_count"] == 2
+
+        from musicround.models import SystemSetting, db
+        setting = SystemSetting.query.filter_by(key="round_artifact_index").one()
+        marker = json.loads(setting.value)
+        marker["synced_at"] = "2000-01-01T00:00:00"
+        setting.value = json.dumps(marker)
+        db.session.commit()
+        assert round_artifact_storage_inventory()["total_bytes"] == 8
+        assert client.listings > listings
+
+
 def test_s3_artifact_storage_fails_closed_when_bucket_is_missing(app):
     with app.app_context():
         app.config["ROUND_ARTIFACT_STORAGE_BACKEND"] = "s3"
@@ -8,6 +8,7 @@ from flask import jsonify
 from pydub import AudioSegment
 from pydub.generators import Sine
 from musicround.helpers.paths import app_data_path
+from musicround.helpers.query_profiler import capture_queries
 from musicround.models import db, PlannedQuizRound, User, Song, Round, RoundAccessEvent, RoundAudioScript, RoundExport, RoundShare, SystemSetting
 from musicround.routes.rounds import (
     ROUND_QUALITY_SESSION_REPORT_MAX_CHARS,
@@ -254,6 +255,59 @@ class TestRoundsListRoute:
         assert b'Paged Round 29' not in second_page.data
         assert b'Page 2 of 2' in second_page.data
 
+    def test_rounds_list_and_calendar_query_count_does_not_grow_with_page_size(self, app, client):
+        """Readiness, owners, and exports should be batch-loaded for the whole page."""
+        _login(app, client)
+        owner_id = _user_id(app, 'roundsuser')
+        song_ids = _create_songs(app, 8, title_prefix='Batch Song')
+
+        def add_rounds(count, offset):
+            with app.app_context():
+                for index in range(offset, offset + count):
+                    round_ = Round(
+                        name=f'Batch Round {index}',
+                        round_type='genre',
+                        round_criteria_used='Rock',
+                        songs=','.join(str(song_id) for song_id in song_ids),
+                        user_id=owner_id,
+                    )
+                    db.session.add(round_)
+                    db.session.flush()
+                    for status in ('failed', 'scheduled'):
+                        export = RoundExport(
+                            round_id=round_.id,
+                            export_type='email',
+                            status=status,
+                            destination='batch@example.test',
+                            scheduled_for=datetime(2026, 7, 9, 17, 0),
+                        )
+                        db.session.add(export)
+                        db.session.flush()
+                    db.session.add(PlannedQuizRound(
+                        quiz_date=datetime(2026, 7, 9, 17, 0),
+                        quizmaster_id=owner_id,
+                        round_id=round_.id,
+                        export_id=export.id,
+                    ))
+                db.session.commit()
+
+        def query_counts():
+            counts = []
+            for path in ('/rounds/', '/rounds/calendar'):
+                with capture_queries() as scope:
+                    response = client.get(path)
+                assert response.status_code == 200
+                counts.append(scope.query_count)
+            return counts
+
+        add_rounds(2, 0)
+        query_counts()  # Warm per-process caches.
+        small_page = query_counts()
+        add_rounds(10, 2)
+        large_page = query_counts()
+
+        assert large_page == small_page
+
     def test_round_calendar_shows_scheduled_exports(self, app, client):
         """Round calendar should expose scheduled delivery dates."""
         _login(app, client)
@@ -2033,6 +2087,34 @@ class TestLegacyEmptyRoundRoutes:
                 'Round export to Dropbox failed. Please try again later or reconnect Dropbox.'
             )
 
+    def test_dropbox_export_checks_mp3_before_uploading(self, app, client):
+        """A round without its MP3 must not leave a partial export in Dropbox."""
+        _login(app, client)
+        song_id = _create_song(app, title='Dropbox Pending Mp3 Song')
+        round_id = _create_round(app, [song_id], name='Dropbox Pending Mp3 Round')
+        with app.app_context():
+            user = User.query.filter_by(username='roundsuser').one()
+            user.dropbox_token = 'dropbox-access-token'
+            user.dropbox_refresh_token = 'dropbox-refresh-token'
+            db.session.commit()
+
+        with patch(
+            'musicround.helpers.dropbox_helper.refresh_dropbox_token_if_needed',
+            return_value={'success': True, 'message': 'ok'},
+        ), patch('musicround.helpers.dropbox_helper.upload_to_dropbox') as mock_upload:
+            response = client.post(
+                f'/rounds/{round_id}/export-to-dropbox',
+                data={'include_mp3s': 'true', 'include_pdf': 'false'},
+            )
+
+        payload = response.get_json()
+        assert payload['success'] is False
+        assert payload['message'] == 'MP3 needs to be generated first'
+        mock_upload.assert_not_called()
+        with app.app_context():
+            export = RoundExport.query.filter_by(round_id=round_id, export_type='dropbox').one()
+            assert export.status == 'pending_mp3'
+
 
 class TestRoundMp3Hints:
     """Tests for optional per-track hint audio in generated MP3s."""
@@ -2219,6 +2301,8 @@ class TestRoundEmailRoute:
         assert recipient == 'rounds@example.com'
         assert subject == 'Mailable Round'
         assert 'Attached please find' in body
+        mp3_stream = attachments[1].pop('data')
+        assert mp3_stream.read() == b'ID3 test mp3'
         assert attachments == [
             {
                 'data': b'%PDF',
@@ -2226,7 +2310,6 @@ class TestRoundEmailRoute:
                 'mimetype': 'application/pdf',
             },
             {
-                'data': b'ID3 test mp3',
                 'filename': f'round_{round_id}.mp3',
                 'mimetype': 'audio/mpeg',
             },
@@ -0,0 +1,142 @@
+"""Tests for on-demand runtime profiles of requests, MCP tools, and jobs."""
+
+import os
+import pstats
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from musicround.helpers.runtime_profiler import RuntimeProfiler, capture_profile
+from musicround.models import User, db
+from musicround.services import automation, tool_jobs
+
+
+@pytest.fixture
+def profiler(app, tmp_path):
+    profiler = RuntimeProfiler(str(tmp_path / "profiles"), sample_interval_ms=1)
+    app.extensions["runtime_profiler"] = profiler
+    return profiler
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(200))
+
+
+def test_unarmed_profiler_does_not_touch_disk_and_arms_are_shared(tmp_path):
+    directory = tmp_path / "profiles"
+    web = RuntimeProfiler(str(directory))
+    worker = RuntimeProfiler(str(directory))
+
+    assert web.start("request", "rounds.view_round") is None
+    assert not directory.exists()
+
+    arm = web.arm("job", "import_*", count=2, mode="sample", armed_by="admin")
+    assert worker.claim("job", "export_round") is None
+    assert worker.claim("job", "import_deezer_playlist").id == arm.id
+    assert web.claim("job", "import_spotify_album").remaining == 0
+    assert worker.claim("job", "import_deezer_playlist") is None
+    assert web.arms() == []
+
+    short = web.arm("request", "core.index", ttl_seconds=1)
+    assert short.matches("request", "core.index", datetime.utcnow())
+    assert not short.matches("request", "core.index", datetime.utcnow() + timedelta(seconds=2))
+    assert web.disarm(short.id) is True
+    assert web.disarm(short.id) is False
+
+    with pytest.raises(ValueError, match="Unknown profile kind"):
+        web.arm("cron", "x")
+    with pytest.raises(ValueError, match="Count"):
+        web.arm("job", "x", count=0)
+
+
+def test_sampled_job_profile_is_saved_as_folded_stacks(app, profiler):
+    profiler.arm("job", "slow_job")
+
+    with capture_profile("job", "slow_job", app) as capture:
+        _busy(0.05)
+    with capture_profile("job", "slow_job", app) as second:
+        pass
+
+    assert capture is not None and second is None
+    [saved] = profiler.profiles()
+    assert saved["mode"] == "sample" and saved["status"] == "ok"
+    assert saved["sample_count"] > 0
+    metadata = profiler.profile(saved["id"])
+    with open(metadata["path"], encoding="utf-8") as handle:
+        lines = handle.read().splitlines()
+    assert any("tests.test_runtime_profiler:_busy" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert profiler.profile("../armed") is None
+
+
+def test_armed_requests_and_tool_jobs_are_profiled(app, client, profiler):
+    app.config["AUTOMATION_TOKEN"] = "automation-secret"
+    profiler.arm("request", "api.list_tags", count=2, mode="cprofile")
+    profiler.arm("job", "inspect_round_package_batch")
+
+    for _ in range(3):
+        assert client.get("/api/tags").status_code == 200
+
+    def fake_batch(round_ids, on_item=None, **kwargs):
+        _busy(0.02)
+        return {"ok": True}
+
+    with patch.object(automation, "inspect_round_package_batch", fake_batch):
+        tool_jobs.start_tool_job(
+            "inspect_round_package_batch",
+            {"round_ids": [1]},
+            submit=lambda func, *args: func(*args),
+        )
+
+    snapshot = client.get(
+        "/users/runtime-profiles.json",
+        headers={"X-Automation-Token": "automation-secret"},
+    ).get_json()
+    targets = sorted((item["kind"], item["name"], item["mode"]) for item in snapshot["profiles"])
+    assert snapshot["arms"] == []
+    assert targets == [
+        ("job", "inspect_round_package_batch", "sample"),
+        ("request", "api.list_tags", "cprofile"),
+        ("request", "api.list_tags", "cprofile"),
+    ]
+    request_profile = next(item for item in snapshot["profiles"] if item["kind"] == "request")
+    stats = pstats.Stats(profiler.profile(request_profile["id"])["path"])
+    assert stats.total_calls > 0
+    assert request_profile["top_functions"][0]["calls"] >= 1
+
+
+def test_admin_arms_downloads_and_deletes_profiles(app, client, profiler):
+    admin = User(username="profile_admin", email="profileadmin@example.com", is_admin=True)
+    admin.password = "TestPass123!"
+    db.session.add(admin)
+    db.session.commit()
+    client.post("/users/login", data={"username": "profile_admin", "password": "TestPass123!"})
+
+    response = client.post("/users/runtime-profiles/arm", data={
+        "kind": "job", "name": "render_*", "count": "1", "mode": "sample", "ttl_minutes": "5",
+    })
+    assert response.status_code == 302
+    [arm] = profiler.arms()
+    assert (arm.name, arm.armed_by) == ("render_*", "profile_admin")
+    assert client.post("/users/runtime-profiles/arm", data={"kind": "job", "name": ""}).status_code == 302
+    assert len(profiler.arms()) == 1
+
+    with capture_profile("job", "render_round", app):
+        _busy(0.02)
+    [saved] = profiler.profiles()
+
+    page = client.get("/users/runtime-profiles").get_data(as_text=True)
+    assert "job:render_round" in page
+    download = client.get(f"/users/runtime-profiles/{saved['id']}/download")
+    assert download.status_code == 200
+    assert download.headers["Content-Disposition"].endswith(f"{saved['id']}.folded")
+    download.close()
+    assert client.get("/users/runtime-profiles/missing/download").status_code == 404
+
+    client.post(f"/users/runtime-profiles/{saved['id']}/delete")
+    assert profiler.profiles() == []
+    assert sorted(os.listdir(profiler.directory)) == ["armed.json", "armed.lock"]
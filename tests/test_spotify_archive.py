@@ -1,15 +1,27 @@
 """Tests for the disk-backed offline Spotify archive search path."""
 
+import json
 import sqlite3
+import threading
+import time
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+
+import pytest
 
 from musicround.helpers.spotify_archive import (
     SpotifyArchiveError,
     search_spotify_archive_catalog,
     spotify_archive_catalog_status,
+    pipelined_spotify_archive_lookup,
+    stream_spotify_archive_audio_features,
+    stream_spotify_archive_isrcs,
+)
+from musicround.spotify_archive_catalog import (
+    ArchiveConnectionPool,
+    build_search_index,
+    create_app,
 )
-from musicround.spotify_archive_catalog import create_app
 from tests.test_api_extended import _create_user_and_login
 
 
@@ -152,6 +164,260 @@ def test_archive_catalog_bulk_audio_features_lookup_is_read_only(tmp_path):
     }]
 
 
+def _ndjson_frames(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_archive_catalog_streams_bulk_isrc_lookup_as_ndjson(tmp_path):
+    database_path = tmp_path / "spotify_clean.sqlite3"
+    _archive_db(database_path)
+    connection = sqlite3.connect(database_path)
+    connection.execute(
+        "INSERT INTO tracks(rowid, id, external_id_isrc, name, popularity, preview_url, duration_ms, album_rowid) "
+        "VALUES (2, 'spotify-remaster', 'DEABC1234567', 'Archive Song (Remaster)', 91, NULL, 181000, 1)"
+    )
+    connection.commit()
+    connection.close()
+    client = create_app(str(database_path)).test_client()
+
+    response = client.post(
+        '/v1/isrc-bulk-lookup',
+        json={'isrcs': ['DEABC1234567', 'DEMISSING0001']},
+        headers={'Accept': 'application/x-ndjson'},
+    )
+    frames = _ndjson_frames(response)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert frames[0] == {'type': 'meta', 'snapshot': 'spotify_archive_2025_07', 'requested': 2}
+    assert [frame['result']['spotify_id'] for frame in frames[1:-1]] == ['spotify-remaster']
+    assert frames[-1] == {'type': 'end', 'count': 1}
+    buffered = client.post('/v1/isrc-bulk-lookup', json={'isrcs': ['DEABC1234567']}).get_json()
+    assert buffered['results'] == [frames[1]['result']]
+
+
+def test_archive_catalog_streams_audio_features_and_releases_connection(tmp_path):
+    metadata_path = tmp_path / "spotify_clean.sqlite3"
+    audio_features_path = tmp_path / "spotify_clean_audio_features.sqlite3"
+    _archive_db(metadata_path)
+    _audio_features_db(audio_features_path)
+    app = create_app(str(metadata_path), str(audio_features_path))
+    client = app.test_client()
+
+    response = client.post(
+        '/v1/audio-features-bulk-lookup',
+        json={'spotify_ids': ['spotify-id']},
+        headers={'Accept': 'application/x-ndjson'},
+    )
+    frames = _ndjson_frames(response)
+
+    assert [frame['type'] for frame in frames] == ['meta', 'result', 'end']
+    assert frames[1]['result']['tempo'] == 120
+    stats = app.extensions['spotify_archive_pools']['SPOTIFY_ARCHIVE_AUDIO_FEATURES_DB_PATH'].stats()
+    assert stats['in_use_connections'] == 0
+
+
+def _streamed_post(lines):
+    response = MagicMock(ok=True, headers={'Content-Type': 'application/x-ndjson'})
+    response.iter_lines.return_value = iter(lines)
+    return response
+
+
+def test_qb_archive_stream_client_yields_rows_from_the_service(app, tmp_path):
+    database_path = tmp_path / "spotify_clean.sqlite3"
+    _archive_db(database_path)
+    service = create_app(str(database_path)).test_client()
+    body = service.post(
+        '/v1/isrc-bulk-lookup',
+        json={'isrcs': ['DEABC1234567']},
+        headers={'Accept': 'application/x-ndjson'},
+    ).get_data()
+    app.config['SPOTIFY_ARCHIVE_CATALOG_URL'] = 'http://archive.test'
+
+    with patch('musicround.helpers.spotify_archive.requests.Session.post') as post:
+        post.return_value = _streamed_post(body.splitlines())
+        results = list(stream_spotify_archive_isrcs(app, ['deabc1234567 ']))
+
+    assert [result['spotify_id'] for result in results] == ['spotify-id']
+    assert post.call_args.kwargs['stream'] is True
+    assert post.call_args.kwargs['json'] == {'isrcs': ['DEABC1234567']}
+    post.return_value.close.assert_called_once()
+
+
+def test_qb_archive_stream_client_rejects_truncated_or_failed_streams(app):
+    app.config['SPOTIFY_ARCHIVE_CATALOG_URL'] = 'http://archive.test'
+    row = json.dumps({'type': 'result', 'result': {'spotify_id': 'spotify-id'}})
+
+    with patch('musicround.helpers.spotify_archive.requests.Session.post') as post:
+        post.return_value = _streamed_post([b'{"type": "meta"}', row.encode()])
+        stream = stream_spotify_archive_audio_features(app, ['spotify-id'])
+        assert next(stream) == {'spotify_id': 'spotify-id'}
+        with pytest.raises(SpotifyArchiveError, match='ended early'):
+            next(stream)
+
+        post.return_value = _streamed_post([b'{"type": "error", "error": "boom"}'])
+        with pytest.raises(SpotifyArchiveError, match='audio-features lookup failed'):
+            list(stream_spotify_archive_audio_features(app, ['spotify-id']))
+
+
+def test_archive_catalog_reuses_pooled_connections_and_reports_stats(tmp_path):
+    database_path = tmp_path / "spotify_clean.sqlite3"
+    _archive_db(database_path)
+    client = create_app(str(database_path)).test_client()
+
+    for _ in range(2):
+        assert client.post('/v1/isrc-bulk-lookup', json={'isrcs': ['DEABC1234567']}).status_code == 200
+    assert client.get('/v1/search?q=DEABC1234567').status_code == 200
+    pool_stats = client.get('/healthz').get_json()['connection_pools']['metadata']
+
+    assert pool_stats['created'] == 1
+    assert pool_stats['reused'] == 2
+    assert pool_stats['idle_connections'] == 1
+    assert pool_stats['in_use_connections'] == 0
+    assert pool_stats['shared_cache'] is False
+
+
+def test_archive_pool_discards_connection_with_unexpected_temp_table(tmp_path):
+    database_path = tmp_path / "spotify_clean.sqlite3"
+    _archive_db(database_path)
+    pool = ArchiveConnectionPool(str(database_path), max_connections=1)
+
+    with pool.connection(allow_temp_writes=True) as connection:
+        connection.execute("CREATE TEMP TABLE requested_isrcs (isrc TEXT)")
+    with pool.connection(allow_temp_writes=True) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM sqlite_temp_master").fetchone()[0] == 0
+        connection.execute('CREATE TEMP TABLE "odd""; name" (value TEXT)')
+
+    stats = pool.stats()
+    assert stats['open_connections'] == 0
+    assert stats['created'] == 1
+
+
+def test_archive_pool_recycles_connections_when_file_changes(tmp_path):
+    database_path = tmp_path / "spotify_clean.sqlite3"
+    _archive_db(database_path)
+    pool = ArchiveConnectionPool(str(database_path), max_connections=2)
+
+    with pool.connection() as connection:
+        assert connection.execute('SELECT COUNT(*) FROM tracks').fetchone()[0] == 1
+    replacement = tmp_path / "replacement.sqlite3"
+    _archive_db(replacement)
+    extra = sqlite3.connect(replacement)
+    extra.execute(
+        "INSERT INTO tracks(rowid, id, external_id_isrc, name, popularity, duration_ms, album_rowid) "
+        "VALUES (2, 'second-id', 'DEABC7654321', 'Second Song', 10, 1000, 1)"
+    )
+    extra.commit()
+    extra.close()
+    replacement.replace(database_path)
+
+    with pool.connection() as connection:
+        assert connection.execute('SELECT COUNT(*) FROM tracks').fetchone()[0] == 2
+    stats = pool.stats()
+
+    assert stats['generation'] == 1
+    assert stats['recycled'] == 1
+    assert stats['open_connections'] == 1
+
+
+def test_archive_pool_is_read_only_unless_temp_writes_are_requested(tmp_path):
+    database_path = tmp_path / "spotify_clean.sqlite3"
+    _archive_db(database_path)
+    pool = ArchiveConnectionPool(str(database_path), max_connections=1)
+
+    with pool.connection(allow_temp_writes=True) as connection:
+        connection.execute("CREATE TEMP TABLE scratch (value TEXT)")
+    with pool.connection() as connection:
+        assert connection.execute("SELECT name FROM sqlite_temp_master").fetchall() == []
+        with pytest.raises(sqlite3.OperationalError):
+            connection.execute("CREATE TEMP TABLE scratch (value TEXT)")
+
+    assert pool.stats()['open_connections'] == 1
+
+
+def test_archive_catalog_returns_503_when_pool_is_exhausted(tmp_path):
+    database_path = tmp_path / "spotify_clean.sqlite3"
+    _archive_db(database_path)
+    app = create_app(str(database_path))
+    app.config.update(SPOTIFY_ARCHIVE_POOL_SIZE=1, SPOTIFY_ARCHIVE_POOL_TIMEOUT_SECONDS=0)
+    client = app.test_client()
+    client.get('/healthz')
+    pool = app.extensions['spotify_archive_pools']['SPOTIFY_ARCHIVE_DB_PATH']
+
+    with pool.connection():
+        response = client.get('/v1/search?q=DEABC1234567')
+
+    assert response.status_code == 503
+    assert pool.stats()['timeouts'] == 1
+
+
+def _add_obscure_track(path: Path) -> None:
+    connection = sqlite3.connect(path)
+    connection.execute("INSERT INTO artists(rowid, name) VALUES (2, 'Basement Björk Tribute')")
+    connection.execute(
+        "INSERT INTO tracks(rowid, id, external_id_isrc, name, popularity, duration_ms, album_rowid) "
+        "VALUES (2, 'obscure-id', 'DEABC7654321', 'Hidden Gem', 0, 1000, 1)"
+    )
+    connection.execute("INSERT INTO track_artists(track_rowid, artist_rowid) VALUES (2, 2)")
+    connection.commit()
+    connection.close()
+
+
+def test_archive_search_index_reaches_tracks_below_popularity_floor(tmp_path):
+    database_path = tmp_path / "spotify_clean.sqlite3"
+    index_path = tmp_path / "spotify_clean_search.sqlite3"
+    _archive_db(database_path)
+    _add_obscure_track(database_path)
+    app = create_app(str(database_path))
+    app.config['SPOTIFY_ARCHIVE_SEARCH_INDEX_PATH'] = str(index_path)
+    client = app.test_client()
+
+    fallback = client.get('/v1/search?q=Hidden Gem').get_json()
+    built = build_search_index(str(database_path), str(index_path), batch_size=1)
+    fulltext = client.get('/v1/search?q=bjork hid').get_json()
+    health = client.get('/healthz').get_json()
+
+    assert fallback == {'results': [], 'query_mode': 'text', 'snapshot': 'spotify_archive_2025_07'}
+    assert built['row_count'] == 2
+    assert fulltext['query_mode'] == 'fulltext'
+    assert [row['spotify_id'] for row in fulltext['results']] == ['obscure-id']
+    assert health['search_index']['usable'] is True
+    assert health['search_index']['row_count'] == 2
+
+
+def test_archive_search_index_orders_matches_by_popularity(tmp_path):
+    database_path = tmp_path / "spotify_clean.sqlite3"
+    index_path = tmp_path / "spotify_clean_search.sqlite3"
+    _archive_db(database_path)
+    _add_obscure_track(database_path)
+    build_search_index(str(database_path), str(index_path))
+    app = create_app(str(database_path))
+    app.config['SPOTIFY_ARCHIVE_SEARCH_INDEX_PATH'] = str(index_path)
+
+    response = app.test_client().get('/v1/search?q=a&limit=1')
+    payload = app.test_client().get('/v1/search?q=so').get_json()
+
+    assert response.status_code == 400
+    assert payload['query_mode'] == 'fulltext'
+    assert [row['spotify_id'] for row in payload['results']] == ['spotify-id']
+
+
+def test_archive_search_ignores_index_built_from_another_file(tmp_path):
+    database_path = tmp_path / "spotify_clean.sqlite3"
+    index_path = tmp_path / "spotify_clean_search.sqlite3"
+    _archive_db(database_path)
+    build_search_index(str(database_path), str(index_path))
+    _add_obscure_track(database_path)
+    app = create_app(str(database_path))
+    app.config['SPOTIFY_ARCHIVE_SEARCH_INDEX_PATH'] = str(index_path)
+    client = app.test_client()
+
+    payload = client.get('/v1/search?q=Archive').get_json()
+
+    assert payload['query_mode'] == 'text'
+    assert client.get('/healthz').get_json()['search_index']['usable'] is False
+
+
 def test_qb_archive_client_returns_review_only_candidates(app):
     app.config['SPOTIFY_ARCHIVE_CATALOG_URL'] = 'http://archive.test'
 
@@ -204,15 +470,12 @@ def test_archive_backfill_fills_missing_fields_without_replacing_existing_previe
         )
         db.session.add(song)
         db.session.commit()
-        with patch('musicround.services.automation.bulk_lookup_spotify_archive_isrcs') as lookup:
-            lookup.return_value = {
-                'results': [{
-                    'isrc': 'DEABC1234567', 'spotify_id': 'spotify-id', 'album_name': 'Archive Album',
-                    'year': 1999, 'duration_ms': 180000, 'cover_url': 'https://example.test/cover',
-                    'popularity': 78,
-                }],
-                'snapshot': 'spotify_archive_2025_07',
-            }
+        with patch('musicround.services.automation.stream_spotify_archive_isrcs') as lookup:
+            lookup.return_value = iter([{
+                'isrc': 'DEABC1234567', 'spotify_id': 'spotify-id', 'album_name': 'Archive Album',
+                'year': 1999, 'duration_ms': 180000, 'cover_url': 'https://example.test/cover',
+                'popularity': 78,
+            }])
             result = automation.backfill_songs_from_spotify_archive(dry_run=False)
         refreshed = db.session.get(Song, song.id)
 
@@ -235,7 +498,7 @@ def test_archive_backfill_uses_bounded_identifier_lookup_for_explicit_song_ids(a
         db.session.add(song)
         db.session.commit()
         with patch('musicround.services.automation.lookup_spotify_archive_isrcs') as lookup, patch(
-            'musicround.services.automation.bulk_lookup_spotify_archive_isrcs'
+            'musicround.services.automation.stream_spotify_archive_isrcs'
         ) as bulk_lookup:
             lookup.return_value = {
                 'results': [{'isrc': 'DEABC1234567', 'spotify_id': 'spotify-id', 'popularity': 78}],
@@ -260,13 +523,13 @@ def test_archive_audio_backfill_fills_only_missing_audio_fields(app):
         song = Song(title='Existing title', artist='Existing artist', spotify_id='spotify-id', tempo=99)
         db.session.add(song)
         db.session.commit()
-        with patch('musicround.services.automation.bulk_lookup_spotify_archive_audio_features') as lookup:
-            lookup.return_value = {'results': [{
+        with patch('musicround.services.automation.stream_spotify_archive_audio_features') as lookup:
+            lookup.return_value = iter([{
                 'spotify_id': 'spotify-id', 'duration_ms': 180000, 'time_signature': 4,
                 'tempo': 120, 'key': 7, 'mode': 1, 'danceability': .7, 'energy': .8,
                 'loudness': -5.5, 'speechiness': .05, 'acousticness': .1,
                 'instrumentalness': .0, 'liveness': .2, 'valence': .9,
-            }]}
+            }])
             result = automation.backfill_song_audio_features_from_spotify_archive(dry_run=False)
         refreshed = db.session.get(Song, song.id)
 
@@ -277,3 +540,138 @@ def test_archive_audio_backfill_fills_only_missing_audio_fields(app):
     assert refreshed.energy == .8
     assert refreshed.time_signature == 4
     assert 'spotify_archive_2025_07_audio_features' in refreshed.metadata_sources
+
+
+def test_archive_backfill_commits_streamed_batches_before_lookup_finishes(app):
+    from musicround.models import Song, db
+    from musicround.services import automation
+    from musicround.services.automation import AutomationError
+
+    def stream(_app, _isrcs):
+        yield {'isrc': 'DEABC1234567', 'spotify_id': 'spotify-first', 'popularity': 60}
+        raise SpotifyArchiveError('Offline Spotify archive catalog stream ended early.')
+
+    with app.app_context():
+        first = Song(title='First', artist='Artist', isrc='DEABC1234567')
+        second = Song(title='Second', artist='Artist', isrc='DEABC7654321')
+        db.session.add_all([first, second])
+        db.session.commit()
+        first_id = first.id
+        with patch('musicround.services.automation.stream_spotify_archive_isrcs', side_effect=stream):
+            with pytest.raises(AutomationError, match='ended early'):
+                automation.backfill_songs_from_spotify_archive(batch_size=1, dry_run=False)
+        db.session.expire_all()
+        refreshed = db.session.get(Song, first_id)
+
+    assert refreshed.spotify_id == 'spotify-first'
+
+
+def test_pipelined_archive_lookup_bounds_requests_in_flight(app):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def lookup(_app, chunk):
+        with lock:
+            active.append(chunk)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(chunk)
+        return [{'isrc': value} for value in chunk]
+
+    values = [f'ISRC{index:04d}' for index in range(10)]
+    batches = list(pipelined_spotify_archive_lookup(
+        app, values, lookup, chunk_size=2, max_in_flight=2, batch_rows=1,
+    ))
+
+    assert sorted(row['isrc'] for batch in batches for row in batch) == values
+    assert all(len(batch) == 1 for batch in batches)
+    assert max(peak) == 2
+
+
+def test_pipelined_archive_lookup_raises_after_delivering_received_rows(app):
+    def lookup(_app, chunk):
+        yield {'isrc': chunk[0]}
+        raise SpotifyArchiveError('Offline Spotify archive catalog stream ended early.')
+
+    batches = pipelined_spotify_archive_lookup(app, ['ISRC1'], lookup, chunk_size=10)
+
+    assert next(batches) == [{'isrc': 'ISRC1'}]
+    with pytest.raises(SpotifyArchiveError, match='ended early'):
+        next(batches)
+
+
+def test_archive_backfills_hand_workers_a_usable_app(app):
+    from musicround.models import Song, db
+    from musicround.services import automation
+
+    app.config['SPOTIFY_ARCHIVE_CATALOG_URL'] = 'http://archive.test'
+    worker_threads = []
+
+    def stream(worker_app, isrcs):
+        worker_threads.append(threading.current_thread().name)
+        assert worker_app.config['SPOTIFY_ARCHIVE_CATALOG_URL'] == 'http://archive.test'
+        worker_app.logger.debug('archive lookup for %s values', len(isrcs))
+        yield from ({'isrc': isrc, 'spotify_id': f'spotify-{isrc}'} for isrc in isrcs)
+
+    def features(worker_app, spotify_ids):
+        assert worker_app.config['SPOTIFY_ARCHIVE_CATALOG_URL'] == 'http://archive.test'
+        return iter([{'spotify_id': spotify_id, 'tempo': 120} for spotify_id in spotify_ids])
+
+    def lookup(worker_app, isrcs):
+        return {'results': list(stream(worker_app, isrcs))}
+
+    with app.app_context():
+        song = Song(title='Worker', artist='Artist', isrc='DEABC1112223')
+        db.session.add_all([song, Song(title='Features', artist='Artist', spotify_id='spotify-features')])
+        db.session.commit()
+        with patch('musicround.services.automation.stream_spotify_archive_isrcs', side_effect=stream), \
+                patch('musicround.services.automation.lookup_spotify_archive_isrcs', side_effect=lookup), \
+                patch('musicround.services.automation.stream_spotify_archive_audio_features', side_effect=features):
+            catalog = automation.backfill_songs_from_spotify_archive(dry_run=True)
+            selected = automation.backfill_songs_from_spotify_archive(dry_run=True, song_ids=[song.id])
+            audio = automation.backfill_song_audio_features_from_spotify_archive(dry_run=True)
+
+    assert catalog['matched_count'] == selected['matched_count'] == 1
+    assert audio['matched_count'] == 1
+    assert all(name.startswith('spotify-archive') for name in worker_threads)
+
+
+def test_archive_backfill_writes_matches_with_one_bulk_update(app):
+    from sqlalchemy import event
+
+    from musicround.models import Song, db
+    from musicround.services import automation
+
+    with app.app_context():
+        songs = [
+            Song(title=f'Song {index}', artist='Artist', isrc=f'DEABC000000{index}')
+            for index in range(3)
+        ]
+        db.session.add_all(songs)
+        db.session.commit()
+        song_ids = [song.id for song in songs]
+        results = [
+            {'isrc': f'DEABC000000{index}', 'album_name': 'Archive Album', 'popularity': 50 + index}
+            for index in range(3)
+        ]
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('UPDATE SONG'):
+                statements.append(executemany)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            with patch('musicround.services.automation.stream_spotify_archive_isrcs') as lookup:
+                lookup.return_value = iter(results)
+                result = automation.backfill_songs_from_spotify_archive(dry_run=False)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+        refreshed = [db.session.get(Song, song_id) for song_id in song_ids]
+
+    assert result['updated_count'] == 3
+    assert statements == [True]
+    assert [song.popularity for song in refreshed] == [50, 51, 52]
+    assert {song.album_name for song in refreshed} == {'Archive Album'}
@@ -0,0 +1,180 @@
+"""Tests for resumable MCP tool jobs."""
+
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import update
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-testing-only")
+os.environ.setdefault("AUTOMATION_TOKEN", "test-automation-token-for-testing")
+
+from musicround.models import ToolJob, ToolJobItem, db  # noqa: E402
+from musicround.services import automation, tool_jobs  # noqa: E402
+
+
+def _run_now(func, *args):
+    func(*args)
+
+
+def _fake_generate_round_assets(round_id, **kwargs):
+    if round_id == 3:
+        raise automation.AutomationError("Round 3 has no songs.")
+    return {"review_url_path": f"/rounds/{round_id}"}
+
+
+def test_job_records_each_item_and_final_result(app):
+    with patch.object(automation, "generate_round_assets", _fake_generate_round_assets):
+        job = tool_jobs.start_tool_job(
+            "generate_round_assets_batch",
+            {"round_ids": [1, 2, 3]},
+            submit=_run_now,
+        )
+        status = tool_jobs.tool_job_status(job["job_id"])
+        page = tool_jobs.tool_job_status(job["job_id"], since_sequence=1, item_limit=1)
+
+    assert status["finished"] is True
+    assert status["job"]["status"] == "completed"
+    assert status["job"]["completed_items"] == status["job"]["total_items"] == 3
+    assert [item["key"] for item in status["items"]] == ["1", "2", "3"]
+    assert status["items"][2]["item"]["status"] == "error"
+    assert status["result"]["failed_round_ids"] == [3]
+    assert [item["sequence"] for item in page["items"]] == [2]
+    assert page["next_sequence"] == 2
+    assert "More items are stored" in page["hints"][0]
+
+
+def test_interrupted_job_resumes_with_only_unfinished_rounds(app):
+    calls = []
+
+    def fake_batch(round_ids, on_item=None, **kwargs):
+        calls.append(list(round_ids))
+        for index, round_id in enumerate(round_ids, start=1):
+            on_item({"round_id": round_id, "ok": True}, index, len(round_ids))
+        return {"ok": True, "round_ids": list(round_ids)}
+
+    job = tool_jobs.start_tool_job(
+        "inspect_round_package_batch",
+        {"round_ids": [4, 5, 6]},
+        submit=lambda func, *args: None,
+    )
+    # The worker recorded one round and then its process went away.
+    tool_jobs._record_item(job["job_id"], {"round_id": 4, "ok": True}, 1, 3)
+    tool_jobs._ACTIVE_JOBS.discard(job["job_id"])
+    assert tool_jobs.tool_job_status(job["job_id"])["job"]["status"] == "interrupted"
+    assert [job_row["job_id"] for job_row in tool_jobs.list_tool_jobs(status="interrupted")["jobs"]] == [job["job_id"]]
+
+    with patch.object(automation, "inspect_round_package_batch", fake_batch):
+        resumed = tool_jobs.resume_tool_job(job["job_id"], submit=_run_now)
+
+    status = tool_jobs.tool_job_status(job["job_id"])
+    assert calls == [[5, 6]]
+    assert resumed["resume_count"] == 1
+    assert status["job"]["status"] == "completed"
+    assert status["job"]["completed_items"] == status["job"]["total_items"] == 3
+    assert [item["key"] for item in status["items"]] == ["4", "5", "6"]
+    with pytest.raises(automation.AutomationError, match="only failed or interrupted"):
+        tool_jobs.resume_tool_job(job["job_id"])
+
+
+def test_only_one_of_two_racing_resumes_launches_the_job(app):
+    job = tool_jobs.start_tool_job(
+        "inspect_round_package_batch",
+        {"round_ids": [4, 5]},
+        submit=lambda func, *args: None,
+    )
+    tool_jobs._ACTIVE_JOBS.discard(job["job_id"])
+    real_job_status = tool_jobs._job_status
+    launched = []
+
+    def status_then_lose_the_race(job_row):
+        status = real_job_status(job_row)
+        # Another process resumes the job between our status check and our claim.
+        with db.engine.begin() as connection:
+            connection.execute(
+                update(ToolJob)
+                .where(ToolJob.id == job_row.id)
+                .values(resume_count=ToolJob.resume_count + 1, worker_id="other-host:1:abc")
+            )
+        return status
+
+    with patch.object(tool_jobs, "_job_status", status_then_lose_the_race):
+        with pytest.raises(automation.AutomationError, match="changed while it was being resumed"):
+            tool_jobs.resume_tool_job(job["job_id"], submit=lambda func, *args: launched.append(args))
+
+    assert launched == []
+    assert job["job_id"] not in tool_jobs._ACTIVE_JOBS
+    assert db.session.get(ToolJob, job["job_id"], populate_existing=True).resume_count == 1
+
+
+def test_interrupted_archive_job_reruns_every_requested_song(app):
+    calls = []
+
+    def fake_backfill(song_ids=None, on_item=None, **kwargs):
+        calls.append(list(song_ids))
+        on_item({"batch": 1, "matched_count": len(song_ids), "updated_count": 0}, len(song_ids), len(song_ids))
+        return {"processed_count": len(song_ids)}
+
+    job = tool_jobs.start_tool_job(
+        "backfill_songs_from_spotify_archive",
+        {"song_ids": [7, 8, 9], "dry_run": False},
+        submit=lambda func, *args: None,
+    )
+    tool_jobs._record_item(job["job_id"], {"batch": 1, "matched_count": 2, "updated_count": 2}, 2, 3)
+    tool_jobs._ACTIVE_JOBS.discard(job["job_id"])
+    interrupted = tool_jobs.tool_job_status(job["job_id"])
+    assert "run the backfill again" in interrupted["hints"][0]
+
+    with patch.object(automation, "backfill_songs_from_spotify_archive", fake_backfill):
+        tool_jobs.resume_tool_job(job["job_id"], submit=_run_now)
+
+    status = tool_jobs.tool_job_status(job["job_id"])
+    assert calls == [[7, 8, 9]]
+    assert status["job"]["status"] == "completed"
+    assert [item["key"] for item in status["items"]] == ["batch-1", "batch-1"]
+
+
+def test_wait_for_job_reports_items_as_they_finish(app):
+    release = threading.Event()
+
+    def fake_backfill(on_item=None, **kwargs):
+        on_item({"batch": 1, "matched_count": 2, "updated_count": 1}, 2, 4)
+        release.wait(5)
+        on_item({"batch": 2, "matched_count": 4, "updated_count": 3}, 4, 4)
+        return {"processed_count": 4, "updated_count": 3}
+
+    seen = []
+
+    def on_item(item, job):
+        seen.append((item["key"], job["completed_items"]))
+        release.set()
+
+    with patch.object(automation, "backfill_songs_from_spotify_archive", fake_backfill):
+        job = tool_jobs.start_tool_job("backfill_songs_from_spotify_archive", {"dry_run": False})
+        result = tool_jobs.wait_for_tool_job(job["job_id"], timeout_seconds=5, on_item=on_item)
+
+    assert [key for key, _completed in seen] == ["batch-1", "batch-2"]
+    assert result["finished"] is True
+    assert result["result"] == {"processed_count": 4, "updated_count": 3}
+    assert result["next_sequence"] == 2
+
+
+def test_failed_job_keeps_partial_items_and_rejects_unknown_tools(app):
+    def fake_enrich(on_item=None, **kwargs):
+        on_item({"song": {"id": 9}, "status": "updated"}, 1, 2)
+        raise automation.AutomationError("Deezer is unavailable.")
+
+    with patch.object(automation, "enrich_songs_from_deezer", fake_enrich):
+        job = tool_jobs.start_tool_job("enrich_songs_from_deezer", {"song_ids": [9, 10]}, submit=_run_now)
+
+    status = tool_jobs.tool_job_status(job["job_id"])
+    assert status["ok"] is False
+    assert status["job"]["status"] == "failed"
+    assert status["job"]["error"] == "Deezer is unavailable."
+    assert [item["key"] for item in status["items"]] == ["9"]
+    assert db.session.query(ToolJobItem).count() == 1
+    assert db.session.get(ToolJob, job["job_id"]).result is None
+
+    with pytest.raises(automation.AutomationError, match="cannot run as a job"):
+        tool_jobs.start_tool_job("add_song", {})